@@ -19,13 +19,32 @@ import numpy as np
 import mediapipe as mp
 import time
 from collections import deque
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Callable
+
+from app.core.inference_scheduler import InferenceScheduler, LandmarkExtrapolator
+from app.core.roi_tracker import PoseROITracker
+from app.core.overlay_compositor import OverlayCompositor
+from app.core.landmark_payload import build_payload
+from app.core.landmark_frame import LandmarkFrame, PoseResults, landmark_indices
+from app.core.angle_filters import AngleFilterBank
+from app.core.repetition_counter import RepetitionCounter, summarize_repetitions
+from app.core.session_stats import ChannelStats, summarize_session_stats
+from app.core.angle_engine import segment_angle
 
 # Inicializar MediaPipe Pose
 mp_pose = mp.solutions.pose
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
 
+# Landmarks de la vista frontal (orden del dict de puntos de _measure_frontal_view)
+FRONTAL_LANDMARKS = landmark_indices(
+    mp_pose.PoseLandmark.LEFT_SHOULDER, mp_pose.PoseLandmark.RIGHT_SHOULDER,
+    mp_pose.PoseLandmark.LEFT_HIP, mp_pose.PoseLandmark.RIGHT_HIP,
+    mp_pose.PoseLandmark.LEFT_ELBOW, mp_pose.PoseLandmark.RIGHT_ELBOW,
+    mp_pose.PoseLandmark.LEFT_WRIST, mp_pose.PoseLandmark.RIGHT_WRIST
+)
+SHOULDER_LANDMARKS = landmark_indices(mp_pose.PoseLandmark.LEFT_SHOULDER, mp_pose.PoseLandmark.RIGHT_SHOULDER)
+
 
 class ShoulderFrontalAnalyzer:
     """
@@ -48,7 +67,15 @@ class ShoulderFrontalAnalyzer:
         self, 
         processing_width: int = 640, 
         processing_height: int = 480,
-        show_skeleton: bool = False
+        show_skeleton: bool = False,
+        inference_fps: Optional[float] = None,
+        inference_budget: Optional[float] = None,
+        roi_tracking: bool = False,
+        pose_factory: Optional[Callable[..., Any]] = None,
+        angle_filters: Optional[Dict[str, Any]] = None,
+        smooth_landmarks: bool = True,
+        repetition_options: Optional[Dict[str, Any]] = None,
+        stats_options: Optional[Dict[str, Any]] = None
     ):
         """
         Inicializa el analizador para vista FRONTAL
@@ -57,15 +84,47 @@ class ShoulderFrontalAnalyzer:
             processing_width: Ancho para procesamiento de MediaPipe
             processing_height: Alto para procesamiento de MediaPipe
             show_skeleton: Si mostrar el skeleton completo de MediaPipe
+            inference_fps: Inferencias de MediaPipe por segundo (None = cada frame);
+                los frames intermedios usan landmarks extrapolados
+            inference_budget: Alternativa a inference_fps: fracción (0-1] del
+                tiempo dedicada a inferencia
+            roi_tracking: Recortar alrededor de la última pose (con la proporción
+                de procesamiento) en vez de redimensionar el frame completo
+            pose_factory: Constructor del grafo con la interfaz de mp_pose.Pose
+                (ej: PoseWorkerPool.create_pose para inferir en otro proceso);
+                None = MediaPipe en este proceso
+            angle_filters: Filtro temporal por canal de ángulo (ver
+                AngleFilterBank); None = ángulos sin filtrar
+            smooth_landmarks: Suavizado de landmarks de MediaPipe (con un
+                filtro 'one_euro' en los ángulos se puede desactivar)
+            repetition_options: Parámetros de RepetitionCounter (min_amplitude,
+                return_ratio, min_duration, ...); None = valores por defecto
+            stats_options: Parámetros de ChannelStats (low_percentile,
+                high_percentile, bands, max_gap); None = valores por defecto
         """
-        self.pose = mp_pose.Pose(
+        self.pose = (pose_factory or mp_pose.Pose)(
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5,
             model_complexity=0,  # Lite model (2x más rápido, error adicional: ±0.8°)
             enable_segmentation=False,  # Desactivar segmentación para mayor velocidad
-            smooth_landmarks=True  # Suavizado de landmarks para mejor estabilidad
+            smooth_landmarks=smooth_landmarks  # Suavizado de landmarks para mejor estabilidad
         )
         
+        # Filtros temporales de los ángulos (un canal por ángulo medido)
+        self.angle_filters = AngleFilterBank(angle_filters)
+        
+        # Repeticiones de abducción por lado
+        self.rep_counters = {
+            side: RepetitionCounter(side, **(repetition_options or {}))
+            for side in ('left', 'right')
+        }
+        
+        # Estadísticas de sesión por lado (percentiles, bandas)
+        self.angle_stats = {
+            side: ChannelStats(side, **(stats_options or {}))
+            for side in ('left', 'right')
+        }
+        
         # Resolución de procesamiento
         self.processing_width = processing_width
         self.processing_height = processing_height
@@ -76,6 +135,7 @@ class ShoulderFrontalAnalyzer:
         self.left_max_rom = 0.0
         self.right_max_rom = 0.0
         self.asymmetry = 0.0  # Diferencia entre ambos lados
+        self.confidence = 0.0
         self.frame_count = 0
         
         # Configuración de visualización
@@ -86,6 +146,22 @@ class ShoulderFrontalAnalyzer:
         self.processing_times = deque(maxlen=30)
         self.last_time = time.time()
         
+        # Inferencia desacoplada del display
+        self.inference_scheduler = InferenceScheduler(
+            target_fps=inference_fps,
+            time_budget=inference_budget
+        )
+        self.landmark_extrapolator = LandmarkExtrapolator()
+        self._measured_frame = True  # False si el frame usa landmarks extrapolados
+        
+        # Región de interés para la entrada de MediaPipe
+        self.roi_tracker = None
+        if roi_tracking:
+            self.roi_tracker = PoseROITracker(processing_size=(processing_width, processing_height))
+        
+        # Compositor del HUD (paneles y textos pre-renderizados)
+        self.overlay = OverlayCompositor()
+        
         # Caché de colores
         self.color_cache = {
             'white': (255, 255, 255),
@@ -131,44 +207,24 @@ class ShoulderFrontalAnalyzer:
             float: Ángulo de abducción en grados (0-180)
         """
         # Vector vertical de referencia (hombro → cadera)
-        vertical_vector = np.array([hip[0] - shoulder[0], hip[1] - shoulder[1]])
-        
-        # Vector del brazo (hombro → codo)
-        arm_vector = np.array([elbow[0] - shoulder[0], elbow[1] - shoulder[1]])
-        
-        # Normalizar vectores
-        vertical_norm = np.linalg.norm(vertical_vector)
-        arm_norm = np.linalg.norm(arm_vector)
-        
-        if vertical_norm == 0 or arm_norm == 0:
-            return 0.0
-        
-        vertical_normalized = vertical_vector / vertical_norm
-        arm_normalized = arm_vector / arm_norm
+        vertical_vector = (hip[0] - shoulder[0], hip[1] - shoulder[1])
         
-        # Calcular ángulo usando producto punto
-        dot_product = np.dot(vertical_normalized, arm_normalized)
-        dot_product = np.clip(dot_product, -1.0, 1.0)
-        angle = np.degrees(np.arccos(dot_product))
-        
-        return float(angle)
+        # Brazo (hombro → codo) vs referencia, ambos normalizados
+        # (misma aritmética que segment_angles)
+        return segment_angle(shoulder, elbow, vertical_vector)
     
     def detect_frontal_orientation(self, landmarks) -> Tuple[bool, float]:
         """
         Detecta si la persona está en vista frontal
         
         Args:
-            landmarks: Lista de landmarks de MediaPipe
+            landmarks: LandmarkFrame del frame (o lista de landmarks de MediaPipe)
         
         Returns:
             tuple: (es_frontal: bool, confianza: float)
         """
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        
         # En vista frontal, ambos hombros tienen visibilidad similar y alta
-        left_vis = left_shoulder.visibility
-        right_vis = right_shoulder.visibility
+        left_vis, right_vis = LandmarkFrame.coerce(landmarks).visibility[SHOULDER_LANDMARKS].tolist()
         
         avg_visibility = (left_vis + right_vis) / 2
         visibility_diff = abs(left_vis - right_vis)
@@ -209,6 +265,9 @@ class ShoulderFrontalAnalyzer:
         
         MÉTODO PRINCIPAL - Llamar en cada frame del video stream
         
+        Equivale a render(frame, infer(frame)). El pipeline de streaming
+        llama a ambas etapas por separado para solaparlas en hilos distintos.
+        
         Args:
             frame: Frame de OpenCV (BGR numpy array)
         
@@ -216,14 +275,49 @@ class ShoulderFrontalAnalyzer:
             np.ndarray: Frame procesado con anotaciones visuales
         """
         start_time = time.time()
-        self.frame_count += 1
+        results = self.infer(frame)
+        inference_ms = (time.time() - start_time) * 1000
         
-        # Guardar dimensiones originales
-        original_h, original_w = frame.shape[:2]
+        return self.render(frame, results, inference_ms)
+    
+    def infer(self, frame: np.ndarray):
+        """
+        Etapa de INFERENCIA: ejecuta MediaPipe Pose sobre el frame
+        
+        Estado que pertenece a esta etapa (solo lo modifica infer()): el grafo
+        (self.pose), inference_scheduler, roi_tracker y landmark_extrapolator.
+        No toca el estado del análisis (ángulos, ROM, filtros, repeticiones,
+        estadísticas), que es de render() / process_landmarks_only(); por eso
+        puede ejecutarse en un hilo en paralelo con render() del frame anterior.
+        El único cruce es get_current_data() leyendo effective_fps del
+        scheduler, protegido por su lock. Dos infer() a la vez sobre el mismo
+        analyzer NO son seguros.
+        
+        Args:
+            frame: Frame de OpenCV (BGR numpy array)
+        
+        Con inferencia desacoplada, solo los frames elegidos por el scheduler
+        pasan por MediaPipe; el resto recibe landmarks extrapolados.
+        
+        Returns:
+            PoseResults: landmark_frame (33, 4) con los landmarks del frame
+                (results.pose_landmarks sigue disponible para dibujar)
+        """
+        now = time.time()
+        decoupled = self.inference_scheduler.mode != 'every_frame'
+        
+        if decoupled and not self.inference_scheduler.should_infer(now):
+            return self.landmark_extrapolator.predict(now)
+        
+        # Recortar a la región de la persona (misma proporción que el procesamiento)
+        source = frame
+        roi = None
+        if self.roi_tracker is not None:
+            source, roi = self.roi_tracker.crop(frame)
         
         # Reducir resolución para procesamiento
         small_frame = cv2.resize(
-            frame, 
+            source, 
             (self.processing_width, self.processing_height), 
             interpolation=cv2.INTER_LINEAR
         )
@@ -232,22 +326,51 @@ class ShoulderFrontalAnalyzer:
         image_rgb = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
         image_rgb.flags.writeable = False
         
-        # Procesar con MediaPipe
-        results = self.pose.process(image_rgb)
+        # Procesar con MediaPipe (landmarks copiados una vez a un array)
+        results = PoseResults.from_mediapipe(self.pose.process(image_rgb))
+        
+        # Landmarks de la ROI → coordenadas del frame completo
+        if roi is not None:
+            results = self.roi_tracker.map_results(results, roi, frame.shape)
+        
+        self.inference_scheduler.record_inference(time.time() - now, now)
+        
+        if decoupled:
+            self.landmark_extrapolator.update(results, now)
+        
+        return results
+    
+    def render(
+        self, 
+        frame: np.ndarray, 
+        results, 
+        inference_ms: float = 0.0
+    ) -> np.ndarray:
+        """
+        Etapa de RENDER: actualiza el estado del análisis y dibuja anotaciones
+        
+        Dueña del estado del análisis (ver infer()); no usa el grafo, el
+        scheduler, la ROI ni el extrapolador.
+        
+        Args:
+            frame: Frame original (BGR) sobre el que se ejecutó infer()
+            results: Resultados devueltos por infer()
+            inference_ms: Tiempo de inferencia (para la métrica de latencia)
+        
+        Returns:
+            np.ndarray: Frame procesado con anotaciones visuales
+        """
+        start_time = time.time()
+        self.frame_count += 1
         
         # Trabajar con resolución original para visualización
-        image_rgb.flags.writeable = True
         image = frame.copy()
+        h, w = image.shape[:2]
         
-        if results.pose_landmarks:
-            self.landmarks_detected = True
-            h, w = image.shape[:2]
-            landmarks = results.pose_landmarks.landmark
-            
-            # Detectar orientación frontal
-            is_frontal, confidence = self.detect_frontal_orientation(landmarks)
-            self.orientation_frontal = is_frontal
-            
+        # Estado del análisis (orientación, ángulos, ROM, asimetría)
+        points = self._analyze(results, w, h)
+        
+        if self.landmarks_detected:
             # Dibujar skeleton solo si está habilitado
             if self.show_skeleton:
                 mp_drawing.draw_landmarks(
@@ -257,12 +380,11 @@ class ShoulderFrontalAnalyzer:
                     landmark_drawing_spec=mp_drawing_styles.get_default_pose_landmarks_style()
                 )
             
-            if is_frontal:
-                # Procesar vista frontal (abducción bilateral)
-                self._process_frontal_view(image, landmarks, w, h, confidence)
+            if points is not None:
+                # Dibujar vista frontal (abducción bilateral)
+                self._draw_frontal_view(image, points, self.confidence, w, h)
             else:
                 # No es vista frontal
-                self.posture_valid = False
                 cv2.putText(
                     image, 
                     "Colocate de FRENTE a la camara", 
@@ -274,8 +396,6 @@ class ShoulderFrontalAnalyzer:
                     cv2.LINE_4
                 )
         else:
-            self.landmarks_detected = False
-            self.posture_valid = False
             cv2.putText(
                 image, 
                 "No se detecta persona", 
@@ -288,7 +408,66 @@ class ShoulderFrontalAnalyzer:
             )
         
         # Calcular métricas de rendimiento
-        processing_time = (time.time() - start_time) * 1000
+        fps, processing_time = self._record_frame_metrics(start_time, inference_ms)
+        
+        # Mostrar métricas
+        self._draw_performance_metrics(image, fps, processing_time)
+        
+        return image
+    
+    def process_landmarks_only(
+        self, 
+        frame: np.ndarray, 
+        results=None, 
+        inference_ms: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Modo SOLO DATOS: actualiza el análisis sin tocar la imagen
+        
+        Mismo estado que render() (ángulos, ROM, asimetría, postura, FPS)
+        pero sin copiar el frame ni dibujar: el navegador dibuja skeleton y
+        HUD con el payload devuelto.
+        
+        Args:
+            frame: Frame original (BGR); solo se usa su tamaño si ya hay results
+            results: Resultados de infer() (None = ejecutar infer() aquí)
+            inference_ms: Tiempo de inferencia si results ya viene calculado
+        
+        Returns:
+            dict: get_current_data() + frame, timestamp, width, height,
+                extrapolated, landmarks ([[x, y, visibility], ...] normalizados)
+                y points (hombros, caderas, codos y muñecas en píxeles)
+        """
+        if results is None:
+            inference_start = time.time()
+            results = self.infer(frame)
+            inference_ms = (time.time() - inference_start) * 1000
+        
+        start_time = time.time()
+        self.frame_count += 1
+        
+        h, w = frame.shape[:2]
+        points = self._analyze(results, w, h)
+        
+        self._record_frame_metrics(start_time, inference_ms)
+        
+        return build_payload(
+            self.get_current_data(), 
+            results, 
+            frame.shape, 
+            self.frame_count, 
+            start_time, 
+            points
+        )
+    
+    def _record_frame_metrics(self, start_time: float, inference_ms: float) -> Tuple[float, float]:
+        """
+        Registra latencia y FPS del frame
+        
+        Returns:
+            tuple: (fps instantáneo, latencia total en ms)
+        """
+        processing_time = inference_ms + (time.time() - start_time) * 1000
         self.processing_times.append(processing_time)
         
         current_time = time.time()
@@ -296,39 +475,59 @@ class ShoulderFrontalAnalyzer:
         self.fps_history.append(fps)
         self.last_time = current_time
         
-        # Mostrar métricas
-        self._draw_performance_metrics(image, fps, processing_time)
+        return fps, processing_time
+    
+    def _analyze(self, results, w: int, h: int) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Actualiza el estado del análisis a partir de los landmarks (sin dibujar)
         
-        return image
+        Args:
+            results: Resultados de infer()
+            w: Ancho del frame
+            h: Alto del frame
+        
+        Returns:
+            dict: Puntos clave en píxeles, o None si no se detecta persona o
+                no está de frente (ver landmarks_detected / orientation_frontal)
+        """
+        # El ROM máximo solo se actualiza con landmarks medidos (no extrapolados)
+        self._measured_frame = not getattr(results, 'extrapolated', False)
+        
+        landmark_frame = LandmarkFrame.from_results(results)
+        if landmark_frame is None:
+            self.landmarks_detected = False
+            self.posture_valid = False
+            self.angle_filters.reset()  # No suavizar a través de la pérdida
+            return None
+        
+        self.landmarks_detected = True
+        
+        # Detectar orientación frontal
+        is_frontal, confidence = self.detect_frontal_orientation(landmark_frame)
+        self.orientation_frontal = is_frontal
+        self.confidence = confidence
+        
+        if not is_frontal:
+            self.posture_valid = False
+            return None
+        
+        return self._measure_frontal_view(landmark_frame, w, h, confidence)
     
-    def _process_frontal_view(
+    def _measure_frontal_view(
         self, 
-        image: np.ndarray, 
-        landmarks, 
+        landmark_frame: LandmarkFrame, 
         w: int, 
         h: int, 
         confidence: float
-    ):
-        """Procesa vista frontal - Análisis de abducción bilateral"""
-        # Obtener landmarks de ambos lados
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP]
-        left_elbow = landmarks[mp_pose.PoseLandmark.LEFT_ELBOW]
-        right_elbow = landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW]
-        left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST]
-        right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST]
-        
-        # Convertir a coordenadas 2D
-        left_shoulder_2d = self.get_landmarks_2d(left_shoulder, w, h)
-        right_shoulder_2d = self.get_landmarks_2d(right_shoulder, w, h)
-        left_hip_2d = self.get_landmarks_2d(left_hip, w, h)
-        right_hip_2d = self.get_landmarks_2d(right_hip, w, h)
-        left_elbow_2d = self.get_landmarks_2d(left_elbow, w, h)
-        right_elbow_2d = self.get_landmarks_2d(right_elbow, w, h)
-        left_wrist_2d = self.get_landmarks_2d(left_wrist, w, h)
-        right_wrist_2d = self.get_landmarks_2d(right_wrist, w, h)
+    ) -> Dict[str, Tuple[int, int]]:
+        """Mide la vista frontal - Ángulos de abducción bilateral, ROM y asimetría"""
+        # Landmarks de ambos lados en píxeles (una proyección vectorizada)
+        (
+            left_shoulder_2d, right_shoulder_2d,
+            left_hip_2d, right_hip_2d,
+            left_elbow_2d, right_elbow_2d,
+            left_wrist_2d, right_wrist_2d
+        ) = landmark_frame.points_2d(FRONTAL_LANDMARKS, w, h)
         
         # Calcular ángulos de abducción para ambos lados
         left_angle = self.calculate_abduction_angle(
@@ -338,15 +537,25 @@ class ShoulderFrontalAnalyzer:
             right_shoulder_2d, right_hip_2d, right_elbow_2d
         )
         
+        # Suavizado temporal por canal (sin filtro configurado = ángulo crudo)
+        now = time.time()
+        left_angle = self.angle_filters.apply('left_angle', left_angle, now)
+        right_angle = self.angle_filters.apply('right_angle', right_angle, now)
+        
         # Actualizar estadísticas
         self.left_angle = left_angle
         self.right_angle = right_angle
         
-        if left_angle > self.left_max_rom:
+        if self._measured_frame and left_angle > self.left_max_rom:
             self.left_max_rom = left_angle
-        if right_angle > self.right_max_rom:
+        if self._measured_frame and right_angle > self.right_max_rom:
             self.right_max_rom = right_angle
         
+        # Repeticiones solo con landmarks medidos (no extrapolados)
+        if self._measured_frame:
+            self.rep_counters['left'].update(left_angle, now)
+            self.rep_counters['right'].update(right_angle, now)
+        
         # Calcular asimetría
         self.asymmetry = abs(left_angle - right_angle)
         
@@ -358,6 +567,36 @@ class ShoulderFrontalAnalyzer:
             self.asymmetry < 40  # Diferencia razonable
         )
         
+        if self._measured_frame:
+            self.angle_stats['left'].update(left_angle, now, valid=self.posture_valid)
+            self.angle_stats['right'].update(right_angle, now, valid=self.posture_valid)
+        
+        return {
+            'left_shoulder': left_shoulder_2d,
+            'right_shoulder': right_shoulder_2d,
+            'left_hip': left_hip_2d,
+            'right_hip': right_hip_2d,
+            'left_elbow': left_elbow_2d,
+            'right_elbow': right_elbow_2d,
+            'left_wrist': left_wrist_2d,
+            'right_wrist': right_wrist_2d
+        }
+    
+    def _draw_frontal_view(
+        self, 
+        image: np.ndarray, 
+        points: Dict[str, Tuple[int, int]], 
+        confidence: float, 
+        w: int, 
+        h: int
+    ):
+        """Dibuja la vista frontal (puntos, brazos, ángulos, panel y barras)"""
+        left_shoulder_2d, right_shoulder_2d = points['left_shoulder'], points['right_shoulder']
+        left_hip_2d, right_hip_2d = points['left_hip'], points['right_hip']
+        left_elbow_2d, right_elbow_2d = points['left_elbow'], points['right_elbow']
+        left_wrist_2d, right_wrist_2d = points['left_wrist'], points['right_wrist']
+        left_angle, right_angle = self.left_angle, self.right_angle
+        
         # Dibujar puntos clave (LADO IZQUIERDO en perspectiva del usuario)
         cv2.circle(image, left_shoulder_2d, 8, self.color_cache['cyan'], -1, cv2.LINE_4)
         cv2.circle(image, left_hip_2d, 8, self.color_cache['magenta'], -1, cv2.LINE_4)
@@ -419,73 +658,61 @@ class ShoulderFrontalAnalyzer:
         h: int
     ):
         """Dibuja el panel de información en la imagen"""
-        # Panel superior con información
+        # Panel superior con información (sprite cacheado con el título)
         panel_height = 180
-        overlay = image.copy()
-        cv2.rectangle(overlay, (0, 0), (w, panel_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, image, 0.4, 0, image)
-        
-        # Título
-        cv2.putText(
+        self.overlay.draw_panel(
             image, 
-            "ABDUCCION BILATERAL DE HOMBROS (FRONTAL)", 
-            (20, 35),
-            cv2.FONT_HERSHEY_SIMPLEX, 
-            0.7, 
-            self.color_cache['white'], 
-            2, 
-            cv2.LINE_4
+            'info', 
+            (0, 0), 
+            (w, panel_height), 
+            (0, 0, 0), 
+            0.6,
+            static_texts=[
+                ("ABDUCCION BILATERAL DE HOMBROS (FRONTAL)", (20, 35), 0.7, self.color_cache['white'], 2)
+            ]
         )
         
         # Ángulos actuales
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Izquierdo: {self.left_angle:.1f}deg | Derecho: {self.right_angle:.1f}deg", 
             (20, 70),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             self.color_cache['cyan'], 
-            2, 
-            cv2.LINE_4
+            2
         )
         
         # ROM máximo de cada lado
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"ROM Max: Izq {self.left_max_rom:.1f}deg | Der {self.right_max_rom:.1f}deg", 
             (20, 100),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             self.color_cache['green'], 
-            2, 
-            cv2.LINE_4
+            2
         )
         
         # Asimetría
         asymmetry_color = self.color_cache['green'] if self.asymmetry < 15 else self.color_cache['orange']
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Asimetria: {self.asymmetry:.1f}deg", 
             (20, 130),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             asymmetry_color, 
-            2, 
-            cv2.LINE_4
+            2
         )
         
         # Estado de postura
         posture_text = "Postura correcta" if self.posture_valid else "Ajusta postura"
         posture_color = self.color_cache['green'] if self.posture_valid else self.color_cache['orange']
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             posture_text, 
             (20, 160),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             posture_color, 
-            2, 
-            cv2.LINE_4
+            2
         )
     
     def _draw_rom_bars(self, image: np.ndarray, w: int, h: int):
@@ -568,38 +795,33 @@ class ShoulderFrontalAnalyzer:
         panel_x = w - 200
         panel_y = h - 100
         
-        # Fondo semitransparente
-        overlay = image.copy()
-        cv2.rectangle(
-            overlay, 
+        # Fondo semitransparente (solo dentro de la caja)
+        self.overlay.draw_panel(
+            image, 
+            'performance', 
             (panel_x - 10, panel_y), 
             (w - 10, h - 10), 
             self.color_cache['gray'], 
-            -1
+            0.7
         )
-        cv2.addWeighted(overlay, 0.7, image, 0.3, 0, image)
         
         # Métricas
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"FPS: {current_fps:.1f}", 
             (panel_x, panel_y + 25),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.5, 
             self.color_cache['green'], 
-            1, 
-            cv2.LINE_4
+            1
         )
         
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Latencia: {current_processing_time:.1f}ms", 
             (panel_x, panel_y + 50),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.4, 
             self.color_cache['yellow'], 
-            1, 
-            cv2.LINE_4
+            1
         )
     
     def get_current_data(self) -> Dict[str, Any]:
@@ -617,19 +839,36 @@ class ShoulderFrontalAnalyzer:
                 - landmarks_detected: Si se detectaron landmarks (bool)
                 - orientation_frontal: Si está en vista frontal (bool)
                 - fps: FPS actual (float)
+                - inference_fps: Inferencias de MediaPipe por segundo (float)
+                - inference_mode: 'every_frame', 'fixed_rate' o 'budget'
+                - repetitions: Repeticiones bilaterales (máximo entre lados)
+                - left_repetitions / right_repetitions: Por lado (int)
+                - last_rep: Última repetición de cualquier lado (channel = lado)
+                  o None; el desglose completo sale de get_repetition_summary()
+                - stats: {'left'/'right': p5, p95, robust_rom y quality_score}
+                  en enteros (ChannelStats.live_summary); el detalle sale de
+                  get_stats_summary()
         """
         avg_fps = sum(self.fps_history) / len(self.fps_history) if self.fps_history else 0
+        left_counter, right_counter = self.rep_counters['left'], self.rep_counters['right']
         
         return {
             'left_angle': round(self.left_angle, 2),
             'right_angle': round(self.right_angle, 2),
             'left_max_rom': round(self.left_max_rom, 2),
             'right_max_rom': round(self.right_max_rom, 2),
+            'repetitions': max(left_counter.count, right_counter.count),
+            'left_repetitions': left_counter.count,
+            'right_repetitions': right_counter.count,
+            'last_rep': self._last_rep(),
+            'stats': {side: stats.live_summary() for side, stats in self.angle_stats.items()},
             'asymmetry': round(self.asymmetry, 2),
             'posture_valid': self.posture_valid,
             'landmarks_detected': self.landmarks_detected,
             'orientation_frontal': self.orientation_frontal,
             'fps': round(avg_fps, 1),
+            'inference_fps': round(self.inference_scheduler.effective_fps, 1),
+            'inference_mode': self.inference_scheduler.mode,
             'frame_count': self.frame_count
         }
     
@@ -650,6 +889,39 @@ class ShoulderFrontalAnalyzer:
         self.posture_valid = False
         self.landmarks_detected = False
         self.orientation_frontal = False
+        self.angle_filters.reset()
+        for counter in self.rep_counters.values():
+            counter.reset()
+        for stats in self.angle_stats.values():
+            stats.reset()
+    
+    def _last_rep(self) -> Optional[Dict[str, Any]]:
+        """Repetición contada más recientemente entre ambos lados"""
+        last_reps = [counter.reps[-1] for counter in self.rep_counters.values() if counter.reps]
+        if not last_reps:
+            return None
+        return dict(max(last_reps, key=lambda rep: rep['end']))
+    
+    def get_repetition_summary(self) -> Dict[str, Any]:
+        """
+        Desglose por repetición de ambos lados listo para persistir
+        (ver summarize_repetitions)
+        
+        Returns:
+            dict: repetitions, max_angle, min_angle, rom_value, median_rom y reps
+        """
+        return summarize_repetitions(list(self.rep_counters.values()))
+    
+    def get_stats_summary(self) -> Dict[str, Any]:
+        """
+        Valores de sesión listos para persistir: el lado con mayor ROM
+        robusto (ver summarize_session_stats)
+        
+        Returns:
+            dict: max_angle, min_angle y rom_value por percentiles,
+                quality_score y channels
+        """
+        return summarize_session_stats(list(self.angle_stats.values()))
     
     def cleanup(self):
         """
@@ -19,13 +19,38 @@ import numpy as np
 import mediapipe as mp
 import time
 from collections import deque
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Callable
+
+from app.core.inference_scheduler import InferenceScheduler, LandmarkExtrapolator
+from app.core.roi_tracker import PoseROITracker
+from app.core.overlay_compositor import OverlayCompositor
+from app.core.landmark_payload import build_payload
+from app.core.landmark_frame import LandmarkFrame, PoseResults, landmark_indices, X, VISIBILITY
+from app.core.angle_filters import AngleFilterBank
+from app.core.repetition_counter import RepetitionCounter, summarize_repetitions
+from app.core.session_stats import ChannelStats, summarize_session_stats
+from app.core.angle_engine import signed_vertical_angle
 
 # Inicializar MediaPipe Pose
 mp_pose = mp.solutions.pose
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
 
+# Landmarks de la vista de perfil por lado: hombro, cadera, codo, muñeca
+PROFILE_LANDMARKS = {
+    'left': landmark_indices(
+        mp_pose.PoseLandmark.LEFT_SHOULDER, mp_pose.PoseLandmark.LEFT_HIP,
+        mp_pose.PoseLandmark.LEFT_ELBOW, mp_pose.PoseLandmark.LEFT_WRIST
+    ),
+    'right': landmark_indices(
+        mp_pose.PoseLandmark.RIGHT_SHOULDER, mp_pose.PoseLandmark.RIGHT_HIP,
+        mp_pose.PoseLandmark.RIGHT_ELBOW, mp_pose.PoseLandmark.RIGHT_WRIST
+    )
+}
+SIDE_LANDMARKS = landmark_indices(
+    mp_pose.PoseLandmark.LEFT_SHOULDER, mp_pose.PoseLandmark.RIGHT_SHOULDER, mp_pose.PoseLandmark.NOSE
+)
+
 
 class ShoulderProfileAnalyzer:
     """
@@ -42,13 +67,24 @@ class ShoulderProfileAnalyzer:
         # En loop de video stream:
         processed_frame = analyzer.process_frame(frame)
         current_data = analyzer.get_current_data()
+        
+        # Modo solo datos (el navegador dibuja skeleton y HUD):
+        payload = analyzer.process_landmarks_only(frame)
     """
     
     def __init__(
         self, 
         processing_width: int = 640, 
         processing_height: int = 480,
-        show_skeleton: bool = False
+        show_skeleton: bool = False,
+        inference_fps: Optional[float] = None,
+        inference_budget: Optional[float] = None,
+        roi_tracking: bool = False,
+        pose_factory: Optional[Callable[..., Any]] = None,
+        angle_filters: Optional[Dict[str, Any]] = None,
+        smooth_landmarks: bool = True,
+        repetition_options: Optional[Dict[str, Any]] = None,
+        stats_options: Optional[Dict[str, Any]] = None
     ):
         """
         Inicializa el analizador para vista de PERFIL
@@ -57,15 +93,41 @@ class ShoulderProfileAnalyzer:
             processing_width: Ancho para procesamiento de MediaPipe
             processing_height: Alto para procesamiento de MediaPipe
             show_skeleton: Si mostrar el skeleton completo de MediaPipe
+            inference_fps: Inferencias de MediaPipe por segundo (None = cada frame);
+                los frames intermedios usan landmarks extrapolados
+            inference_budget: Alternativa a inference_fps: fracción (0-1] del
+                tiempo dedicada a inferencia
+            roi_tracking: Recortar alrededor de la última pose (con la proporción
+                de procesamiento) en vez de redimensionar el frame completo
+            pose_factory: Constructor del grafo con la interfaz de mp_pose.Pose
+                (ej: PoseWorkerPool.create_pose para inferir en otro proceso);
+                None = MediaPipe en este proceso
+            angle_filters: Filtro temporal por canal de ángulo (ver
+                AngleFilterBank); None = ángulos sin filtrar
+            smooth_landmarks: Suavizado de landmarks de MediaPipe (con un
+                filtro 'one_euro' en los ángulos se puede desactivar)
+            repetition_options: Parámetros de RepetitionCounter (min_amplitude,
+                return_ratio, min_duration, ...); None = valores por defecto
+            stats_options: Parámetros de ChannelStats (low_percentile,
+                high_percentile, bands, max_gap); None = valores por defecto
         """
-        self.pose = mp_pose.Pose(
+        self.pose = (pose_factory or mp_pose.Pose)(
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5,
             model_complexity=0,  # Lite model (2x más rápido, error adicional: ±0.8°)
             enable_segmentation=False,  # Desactivar segmentación para mayor velocidad
-            smooth_landmarks=True  # Suavizado de landmarks para mejor estabilidad
+            smooth_landmarks=smooth_landmarks  # Suavizado de landmarks para mejor estabilidad
         )
         
+        # Filtros temporales de los ángulos (un canal por ángulo medido)
+        self.angle_filters = AngleFilterBank(angle_filters)
+        
+        # Repeticiones sobre |ángulo| filtrado (flexión o extensión)
+        self.rep_counter = RepetitionCounter('angle', **(repetition_options or {}))
+        
+        # Estadísticas de sesión del mismo |ángulo| (percentiles, bandas)
+        self.angle_stats = ChannelStats('angle', **(stats_options or {}))
+        
         # Resolución de procesamiento
         self.processing_width = processing_width
         self.processing_height = processing_height
@@ -86,6 +148,22 @@ class ShoulderProfileAnalyzer:
         self.processing_times = deque(maxlen=30)
         self.last_time = time.time()
         
+        # Inferencia desacoplada del display
+        self.inference_scheduler = InferenceScheduler(
+            target_fps=inference_fps,
+            time_budget=inference_budget
+        )
+        self.landmark_extrapolator = LandmarkExtrapolator()
+        self._measured_frame = True  # False si el frame usa landmarks extrapolados
+        
+        # Región de interés para la entrada de MediaPipe
+        self.roi_tracker = None
+        if roi_tracking:
+            self.roi_tracker = PoseROITracker(processing_size=(processing_width, processing_height))
+        
+        # Compositor del HUD (paneles y textos pre-renderizados)
+        self.overlay = OverlayCompositor()
+        
         # Caché de colores
         self.color_cache = {
             'white': (255, 255, 255),
@@ -128,36 +206,16 @@ class ShoulderProfileAnalyzer:
         Returns:
             float: Ángulo en grados (positivo=flexión, negativo=extensión)
         """
-        vertical_down_vector = np.array([0, 1])
-        arm_vector = np.array([elbow[0] - shoulder[0], elbow[1] - shoulder[1]])
-        
-        arm_norm = np.linalg.norm(arm_vector)
-        if arm_norm == 0:
-            return 0.0
-        
-        arm_vector_normalized = arm_vector / arm_norm
-        
-        # Calcular ángulo
-        dot_product = np.dot(vertical_down_vector, arm_vector_normalized)
-        dot_product = np.clip(dot_product, -1.0, 1.0)
-        angle_magnitude = np.degrees(np.arccos(dot_product))
-        
-        # Determinar dirección (producto cruz simplificado)
-        cross_product = -arm_vector[0]
-        
-        if side == 'left':
-            angle = angle_magnitude if cross_product > 0 else -angle_magnitude
-        else:
-            angle = angle_magnitude if cross_product < 0 else -angle_magnitude
-        
-        return float(angle)
+        # Eje vertical hacia abajo (0, 1) vs hombro → codo; el signo sale del
+        # producto cruz simplificado (misma aritmética que signed_vertical_angles)
+        return signed_vertical_angle(shoulder, elbow, side)
     
     def detect_side(self, landmarks) -> Tuple[str, float, str]:
         """
         Detecta qué lado del cuerpo está visible (vista de perfil)
         
         Args:
-            landmarks: Lista de landmarks de MediaPipe
+            landmarks: LandmarkFrame del frame (o lista de landmarks de MediaPipe)
         
         Returns:
             tuple: (lado, confianza, orientación)
@@ -165,24 +223,22 @@ class ShoulderProfileAnalyzer:
                 - confianza: float (0-1)
                 - orientación: str descripción de la orientación
         """
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        nose = landmarks[mp_pose.PoseLandmark.NOSE]
+        left_shoulder, right_shoulder, nose = LandmarkFrame.coerce(landmarks).rows(SIDE_LANDMARKS)
         
         # Método: Solo visibilidad
-        left_visibility = left_shoulder.visibility
-        right_visibility = right_shoulder.visibility
+        left_visibility = left_shoulder[VISIBILITY]
+        right_visibility = right_shoulder[VISIBILITY]
         
-        shoulder_center_x = (left_shoulder.x + right_shoulder.x) / 2
+        shoulder_center_x = (left_shoulder[X] + right_shoulder[X]) / 2
         
         if left_visibility > right_visibility:
             side = 'left'
             confidence = left_visibility
-            orientation = "mirando izquierda" if nose.x < shoulder_center_x else "mirando derecha"
+            orientation = "mirando izquierda" if nose[X] < shoulder_center_x else "mirando derecha"
         else:
             side = 'right'
             confidence = right_visibility
-            orientation = "mirando derecha" if nose.x > shoulder_center_x else "mirando izquierda"
+            orientation = "mirando derecha" if nose[X] > shoulder_center_x else "mirando izquierda"
         
         return side, float(confidence), orientation
     
@@ -214,6 +270,9 @@ class ShoulderProfileAnalyzer:
         
         MÉTODO PRINCIPAL - Llamar en cada frame del video stream
         
+        Equivale a render(frame, infer(frame)). El pipeline de streaming
+        llama a ambas etapas por separado para solaparlas en hilos distintos.
+        
         Args:
             frame: Frame de OpenCV (BGR numpy array)
         
@@ -221,14 +280,49 @@ class ShoulderProfileAnalyzer:
             np.ndarray: Frame procesado con anotaciones visuales
         """
         start_time = time.time()
-        self.frame_count += 1
+        results = self.infer(frame)
+        inference_ms = (time.time() - start_time) * 1000
         
-        # Guardar dimensiones originales
-        original_h, original_w = frame.shape[:2]
+        return self.render(frame, results, inference_ms)
+    
+    def infer(self, frame: np.ndarray):
+        """
+        Etapa de INFERENCIA: ejecuta MediaPipe Pose sobre el frame
+        
+        Estado que pertenece a esta etapa (solo lo modifica infer()): el grafo
+        (self.pose), inference_scheduler, roi_tracker y landmark_extrapolator.
+        No toca el estado del análisis (ángulos, ROM, filtros, repeticiones,
+        estadísticas), que es de render() / process_landmarks_only(); por eso
+        puede ejecutarse en un hilo en paralelo con render() del frame anterior.
+        El único cruce es get_current_data() leyendo effective_fps del
+        scheduler, protegido por su lock. Dos infer() a la vez sobre el mismo
+        analyzer NO son seguros.
+        
+        Args:
+            frame: Frame de OpenCV (BGR numpy array)
+        
+        Con inferencia desacoplada, solo los frames elegidos por el scheduler
+        pasan por MediaPipe; el resto recibe landmarks extrapolados.
+        
+        Returns:
+            PoseResults: landmark_frame (33, 4) con los landmarks del frame
+                (results.pose_landmarks sigue disponible para dibujar)
+        """
+        now = time.time()
+        decoupled = self.inference_scheduler.mode != 'every_frame'
+        
+        if decoupled and not self.inference_scheduler.should_infer(now):
+            return self.landmark_extrapolator.predict(now)
+        
+        # Recortar a la región de la persona (misma proporción que el procesamiento)
+        source = frame
+        roi = None
+        if self.roi_tracker is not None:
+            source, roi = self.roi_tracker.crop(frame)
         
         # Reducir resolución para procesamiento
         small_frame = cv2.resize(
-            frame, 
+            source, 
             (self.processing_width, self.processing_height), 
             interpolation=cv2.INTER_LINEAR
         )
@@ -237,24 +331,51 @@ class ShoulderProfileAnalyzer:
         image_rgb = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
         image_rgb.flags.writeable = False
         
-        # Procesar con MediaPipe
-        results = self.pose.process(image_rgb)
+        # Procesar con MediaPipe (landmarks copiados una vez a un array)
+        results = PoseResults.from_mediapipe(self.pose.process(image_rgb))
+        
+        # Landmarks de la ROI → coordenadas del frame completo
+        if roi is not None:
+            results = self.roi_tracker.map_results(results, roi, frame.shape)
+        
+        self.inference_scheduler.record_inference(time.time() - now, now)
+        
+        if decoupled:
+            self.landmark_extrapolator.update(results, now)
+        
+        return results
+    
+    def render(
+        self, 
+        frame: np.ndarray, 
+        results, 
+        inference_ms: float = 0.0
+    ) -> np.ndarray:
+        """
+        Etapa de RENDER: actualiza el estado del análisis y dibuja anotaciones
+        
+        Dueña del estado del análisis (ver infer()); no usa el grafo, el
+        scheduler, la ROI ni el extrapolador.
+        
+        Args:
+            frame: Frame original (BGR) sobre el que se ejecutó infer()
+            results: Resultados devueltos por infer()
+            inference_ms: Tiempo de inferencia (para la métrica de latencia)
+        
+        Returns:
+            np.ndarray: Frame procesado con anotaciones visuales
+        """
+        start_time = time.time()
+        self.frame_count += 1
         
         # Trabajar con resolución original para visualización
-        image_rgb.flags.writeable = True
         image = frame.copy()
+        h, w = image.shape[:2]
         
-        if results.pose_landmarks:
-            self.landmarks_detected = True
-            h, w = image.shape[:2]
-            landmarks = results.pose_landmarks.landmark
-            
-            # Detectar lado visible
-            side, confidence, orientation = self.detect_side(landmarks)
-            self.side = "HOMBRO IZQUIERDO" if side == 'left' else "HOMBRO DERECHO"
-            self.orientation = orientation
-            self.confidence = confidence
-            
+        # Estado del análisis (lado, ángulo, ROM, postura)
+        points = self._analyze(results, w, h)
+        
+        if points is not None:
             # Dibujar skeleton solo si está habilitado
             if self.show_skeleton:
                 mp_drawing.draw_landmarks(
@@ -264,11 +385,9 @@ class ShoulderProfileAnalyzer:
                     landmark_drawing_spec=mp_drawing_styles.get_default_pose_landmarks_style()
                 )
             
-            # Procesar vista de perfil
-            self._process_profile_view(image, landmarks, w, h, side, orientation, confidence)
+            # Dibujar vista de perfil
+            self._draw_profile_view(image, points, self.orientation, self.confidence, w, h)
         else:
-            self.landmarks_detected = False
-            self.posture_valid = False
             cv2.putText(
                 image, 
                 "No se detecta persona", 
@@ -281,7 +400,66 @@ class ShoulderProfileAnalyzer:
             )
         
         # Calcular métricas de rendimiento
-        processing_time = (time.time() - start_time) * 1000
+        fps, processing_time = self._record_frame_metrics(start_time, inference_ms)
+        
+        # Mostrar métricas (opcional, puede deshabilitarse)
+        self._draw_performance_metrics(image, fps, processing_time)
+        
+        return image
+    
+    def process_landmarks_only(
+        self, 
+        frame: np.ndarray, 
+        results=None, 
+        inference_ms: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Modo SOLO DATOS: actualiza el análisis sin tocar la imagen
+        
+        Mismo estado que render() (ángulo, ROM, lado, postura, FPS) pero sin
+        copiar el frame ni dibujar: el navegador dibuja skeleton y HUD con
+        el payload devuelto.
+        
+        Args:
+            frame: Frame original (BGR); solo se usa su tamaño si ya hay results
+            results: Resultados de infer() (None = ejecutar infer() aquí)
+            inference_ms: Tiempo de inferencia si results ya viene calculado
+        
+        Returns:
+            dict: get_current_data() + frame, timestamp, width, height,
+                extrapolated, landmarks ([[x, y, visibility], ...] normalizados)
+                y points (hombro, cadera, codo, muñeca en píxeles)
+        """
+        if results is None:
+            inference_start = time.time()
+            results = self.infer(frame)
+            inference_ms = (time.time() - inference_start) * 1000
+        
+        start_time = time.time()
+        self.frame_count += 1
+        
+        h, w = frame.shape[:2]
+        points = self._analyze(results, w, h)
+        
+        self._record_frame_metrics(start_time, inference_ms)
+        
+        return build_payload(
+            self.get_current_data(), 
+            results, 
+            frame.shape, 
+            self.frame_count, 
+            start_time, 
+            points
+        )
+    
+    def _record_frame_metrics(self, start_time: float, inference_ms: float) -> Tuple[float, float]:
+        """
+        Registra latencia y FPS del frame
+        
+        Returns:
+            tuple: (fps instantáneo, latencia total en ms)
+        """
+        processing_time = inference_ms + (time.time() - start_time) * 1000
         self.processing_times.append(processing_time)
         
         current_time = time.time()
@@ -289,53 +467,99 @@ class ShoulderProfileAnalyzer:
         self.fps_history.append(fps)
         self.last_time = current_time
         
-        # Mostrar métricas (opcional, puede deshabilitarse)
-        self._draw_performance_metrics(image, fps, processing_time)
+        return fps, processing_time
+    
+    def _analyze(self, results, w: int, h: int) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Actualiza el estado del análisis a partir de los landmarks (sin dibujar)
         
-        return image
+        Args:
+            results: Resultados de infer()
+            w: Ancho del frame
+            h: Alto del frame
+        
+        Returns:
+            dict: Puntos clave en píxeles, o None si no se detecta persona
+        """
+        # El ROM máximo solo se actualiza con landmarks medidos (no extrapolados)
+        self._measured_frame = not getattr(results, 'extrapolated', False)
+        
+        landmark_frame = LandmarkFrame.from_results(results)
+        if landmark_frame is None:
+            self.landmarks_detected = False
+            self.posture_valid = False
+            self.angle_filters.reset()  # No suavizar a través de la pérdida
+            return None
+        
+        self.landmarks_detected = True
+        
+        # Detectar lado visible
+        side, confidence, orientation = self.detect_side(landmark_frame)
+        self.side = "HOMBRO IZQUIERDO" if side == 'left' else "HOMBRO DERECHO"
+        self.orientation = orientation
+        self.confidence = confidence
+        
+        return self._measure_profile_view(landmark_frame, w, h, side, confidence)
     
-    def _process_profile_view(
+    def _measure_profile_view(
         self, 
-        image: np.ndarray, 
-        landmarks, 
+        landmark_frame: LandmarkFrame, 
         w: int, 
         h: int, 
         side: str, 
-        orientation: str, 
         confidence: float
-    ):
-        """Procesa vista de perfil - Análisis de extensión/flexión"""
-        # Seleccionar landmarks según el lado detectado
-        if side == 'left':
-            shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-            hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP]
-            elbow = landmarks[mp_pose.PoseLandmark.LEFT_ELBOW]
-            wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST]
-        else:
-            shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-            hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP]
-            elbow = landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW]
-            wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST]
-        
-        # Obtener coordenadas 2D
-        shoulder_2d = self.get_landmarks_2d(shoulder, w, h)
-        hip_2d = self.get_landmarks_2d(hip, w, h)
-        elbow_2d = self.get_landmarks_2d(elbow, w, h)
-        wrist_2d = self.get_landmarks_2d(wrist, w, h)
+    ) -> Dict[str, Tuple[int, int]]:
+        """Mide la vista de perfil - Ángulo de extensión/flexión y ROM"""
+        # Landmarks del lado detectado en píxeles (una proyección vectorizada)
+        shoulder_2d, hip_2d, elbow_2d, wrist_2d = landmark_frame.points_2d(PROFILE_LANDMARKS[side], w, h)
         
         # Calcular ángulo de extensión/flexión
         angle = self.calculate_extension_angle(shoulder_2d, elbow_2d, side)
         
+        # Suavizado temporal (un canal por lado: un cambio de lado no se suaviza)
+        now = time.time()
+        angle = self.angle_filters.apply(f'{side}_angle', angle, now)
+        
         # Actualizar estadísticas
         self.current_angle = angle
         
         abs_angle = abs(angle)
-        if abs_angle > self.max_angle:
+        if self._measured_frame and abs_angle > self.max_angle:
             self.max_angle = abs_angle
         
+        # Repeticiones solo con landmarks medidos (no extrapolados)
+        if self._measured_frame:
+            self.rep_counter.update(abs_angle, now)
+        
         # Validar postura (simplificado - mejorar según necesidades)
         self.posture_valid = confidence > 0.6 and abs_angle < 200  # Ángulo razonable
         
+        if self._measured_frame:
+            self.angle_stats.update(abs_angle, now, valid=self.posture_valid)
+        
+        return {
+            'shoulder': shoulder_2d,
+            'hip': hip_2d,
+            'elbow': elbow_2d,
+            'wrist': wrist_2d
+        }
+    
+    def _draw_profile_view(
+        self, 
+        image: np.ndarray, 
+        points: Dict[str, Tuple[int, int]], 
+        orientation: str, 
+        confidence: float, 
+        w: int, 
+        h: int
+    ):
+        """Dibuja la vista de perfil (puntos, referencias, ángulo y panel)"""
+        shoulder_2d = points['shoulder']
+        hip_2d = points['hip']
+        elbow_2d = points['elbow']
+        wrist_2d = points['wrist']
+        angle = self.current_angle
+        
         # Dibujar puntos clave
         cv2.circle(image, shoulder_2d, 8, self.color_cache['yellow'], -1, cv2.LINE_4)
         cv2.circle(image, hip_2d, 8, self.color_cache['magenta'], -1, cv2.LINE_4)
@@ -391,73 +615,61 @@ class ShoulderProfileAnalyzer:
         h: int
     ):
         """Dibuja el panel de información en la imagen"""
-        # Panel superior con información
+        # Panel superior con información (sprite cacheado con el título)
         panel_height = 180
-        overlay = image.copy()
-        cv2.rectangle(overlay, (0, 0), (w, panel_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, image, 0.4, 0, image)
-        
-        # Título
-        cv2.putText(
+        self.overlay.draw_panel(
             image, 
-            "FLEXION/EXTENSION DE HOMBRO (PERFIL)", 
-            (20, 35),
-            cv2.FONT_HERSHEY_SIMPLEX, 
-            0.7, 
-            self.color_cache['white'], 
-            2, 
-            cv2.LINE_4
+            'info', 
+            (0, 0), 
+            (w, panel_height), 
+            (0, 0, 0), 
+            0.6,
+            static_texts=[
+                ("FLEXION/EXTENSION DE HOMBRO (PERFIL)", (20, 35), 0.7, self.color_cache['white'], 2)
+            ]
         )
         
         # Lado detectado
         color_side = self.color_cache['green'] if confidence > 0.7 else self.color_cache['orange']
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Lado: {self.side}", 
             (20, 70),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             color_side, 
-            2, 
-            cv2.LINE_4
+            2
         )
         
         # Orientación
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Orientacion: {orientation}", 
             (20, 100),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.5, 
             self.color_cache['white'], 
-            1, 
-            cv2.LINE_4
+            1
         )
         
         # Ángulo actual
         angle_color = self._get_angle_color(self.current_angle)
         direction_text = "FLEX" if self.current_angle > 0 else "EXT" if self.current_angle < 0 else ""
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Angulo: {abs(self.current_angle):.1f}deg {direction_text}", 
             (20, 130),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             angle_color, 
-            2, 
-            cv2.LINE_4
+            2
         )
         
         # ROM Máximo
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"ROM Max: {self.max_angle:.1f}deg", 
             (20, 160),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.6, 
             self.color_cache['green'], 
-            2, 
-            cv2.LINE_4
+            2
         )
     
     def _draw_performance_metrics(
@@ -474,38 +686,33 @@ class ShoulderProfileAnalyzer:
         panel_x = w - 200
         panel_y = 10
         
-        # Fondo semitransparente
-        overlay = image.copy()
-        cv2.rectangle(
-            overlay, 
+        # Fondo semitransparente (solo dentro de la caja)
+        self.overlay.draw_panel(
+            image, 
+            'performance', 
             (panel_x - 10, panel_y), 
             (w - 10, panel_y + 80), 
             self.color_cache['gray'], 
-            -1
+            0.7
         )
-        cv2.addWeighted(overlay, 0.7, image, 0.3, 0, image)
         
         # Métricas
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"FPS: {current_fps:.1f}", 
             (panel_x, panel_y + 25),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.5, 
             self.color_cache['green'], 
-            1, 
-            cv2.LINE_4
+            1
         )
         
-        cv2.putText(
+        self.overlay.draw_text(
             image, 
             f"Latencia: {current_processing_time:.1f}ms", 
             (panel_x, panel_y + 50),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.4, 
             self.color_cache['yellow'], 
-            1, 
-            cv2.LINE_4
+            1
         )
     
     def _get_angle_color(self, angle: float) -> Tuple[int, int, int]:
@@ -537,18 +744,33 @@ class ShoulderProfileAnalyzer:
                 - posture_valid: Si la postura es válida (bool)
                 - landmarks_detected: Si se detectaron landmarks (bool)
                 - fps: FPS actual (float)
+                - inference_fps: Inferencias de MediaPipe por segundo (float)
+                - inference_mode: 'every_frame', 'fixed_rate' o 'budget'
+                - repetitions: Repeticiones contadas (int)
+                - rep_phase: 'valley' (reposo) o 'rising' (repetición en curso)
+                - last_rep: Última repetición (peak, trough, rom, duration) o
+                  None; el desglose completo sale de get_repetition_summary()
+                - stats: {'angle': p5, p95, robust_rom y quality_score} en
+                  enteros (ChannelStats.live_summary); el detalle sale de
+                  get_stats_summary()
         """
         avg_fps = sum(self.fps_history) / len(self.fps_history) if self.fps_history else 0
         
         return {
             'angle': round(self.current_angle, 2),
             'max_rom': round(self.max_angle, 2),
+            'repetitions': self.rep_counter.count,
+            'rep_phase': self.rep_counter.phase,
+            'last_rep': self.rep_counter.get_state()['last_rep'],
+            'stats': {'angle': self.angle_stats.live_summary()},
             'side': self.side,
             'orientation': self.orientation,
             'confidence': round(self.confidence, 2),
             'posture_valid': self.posture_valid,
             'landmarks_detected': self.landmarks_detected,
             'fps': round(avg_fps, 1),
+            'inference_fps': round(self.inference_scheduler.effective_fps, 1),
+            'inference_mode': self.inference_scheduler.mode,
             'frame_count': self.frame_count
         }
     
@@ -565,6 +787,28 @@ class ShoulderProfileAnalyzer:
         self.frame_count = 0
         self.posture_valid = False
         self.landmarks_detected = False
+        self.angle_filters.reset()
+        self.rep_counter.reset()
+        self.angle_stats.reset()
+    
+    def get_repetition_summary(self) -> Dict[str, Any]:
+        """
+        Desglose por repetición listo para persistir (ver summarize_repetitions)
+        
+        Returns:
+            dict: repetitions, max_angle, min_angle, rom_value, median_rom y reps
+        """
+        return summarize_repetitions([self.rep_counter])
+    
+    def get_stats_summary(self) -> Dict[str, Any]:
+        """
+        Valores de sesión listos para persistir (ver summarize_session_stats)
+        
+        Returns:
+            dict: max_angle, min_angle y rom_value por percentiles,
+                quality_score y channels
+        """
+        return summarize_session_stats([self.angle_stats])
     
     def cleanup(self):
         """
@@ -32,6 +32,7 @@ sys.path.insert(0, str(BASE_DIR))
 # Imports locales
 from app.config import get_config, create_directories
 from database.database_manager import get_db_manager
+from app.core.analyzer_warmup import analyzer_warmup
 
 
 # ============================================================================
@@ -146,6 +147,7 @@ def create_app(config_name='development'):
         try:
             db_healthy = db_manager.test_connection() if db_manager else False
             db_info = db_manager.get_database_info() if db_healthy else {}
+            warmup = analyzer_warmup.get_status()
             
             return jsonify({
                 'status': 'healthy' if db_healthy else 'unhealthy',
@@ -155,6 +157,10 @@ def create_app(config_name='development'):
                     'connected': db_healthy,
                     'info': db_info
                 },
+                'mediapipe': {
+                    'ready': warmup['ready'],
+                    'progress': warmup['progress']
+                },
                 'timestamp': datetime.utcnow().isoformat()
             }), 200 if db_healthy else 503
             
@@ -165,6 +171,12 @@ def create_app(config_name='development'):
                 'timestamp': datetime.utcnow().isoformat()
             }), 500
     
+    # ========================================================================
+    # 11. WARM-UP DE MEDIAPIPE (segundo plano)
+    # ========================================================================
+    
+    start_warmup(app)
+    
     # ========================================================================
     # FINALIZACIÓN
     # ========================================================================
@@ -226,6 +238,32 @@ def setup_logging(app):
     app.logger.info("📝 Sistema de logging configurado")
 
 
+# ============================================================================
+# WARM-UP DE ANALYZERS
+# ============================================================================
+
+def start_warmup(app):
+    """
+    Pre-calienta los analyzers de ANALYZER_WARMUP_TYPES en un hilo
+    
+    Con el reloader de Werkzeug, create_app() corre también en el proceso
+    vigilante (sin WERKZEUG_RUN_MAIN): ahí no se carga MediaPipe.
+    Progreso en /api/system/readiness.
+    """
+    if not app.config.get('ANALYZER_WARMUP_ENABLED', False):
+        return
+    
+    if app.debug and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        app.logger.info("🔥 Warm-up omitido en el proceso del reloader")
+        return
+    
+    try:
+        from app.routes.api import start_analyzer_warmup
+        start_analyzer_warmup(app.config)
+    except Exception as e:
+        app.logger.warning(f"⚠️  No se pudo iniciar el warm-up de analyzers: {e}")
+
+
 # ============================================================================
 # REGISTRO DE BLUEPRINTS
 # ============================================================================
@@ -257,6 +295,10 @@ def register_blueprints(app):
         app.register_blueprint(api_bp, url_prefix='/api')
         app.logger.info("✅ Blueprint 'api' registrado")
         
+        # Límites del pool de analyzers por sesión (ANALYZER_POOL_*)
+        from app.core.analyzer_pool import analyzer_pool
+        analyzer_pool.configure_from(app.config)
+        
     except Exception as e:
         app.logger.warning(f"⚠️  No se pudo registrar blueprint 'api': {e}")
 
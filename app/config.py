@@ -134,10 +134,63 @@ class Config:
     # Complejidad del modelo (0=Lite, 1=Full, 2=Heavy)
     MEDIAPIPE_MODEL_COMPLEXITY = 1  # CPU optimizado
     
+    # Inferencia desacoplada del display: MediaPipe corre a esta tasa y los
+    # frames intermedios se dibujan con landmarks extrapolados
+    # 'auto' = processing_fps de MediaPipeConfig (5 Railway / 10 local)
+    # None = MediaPipe en cada frame
+    MEDIAPIPE_INFERENCE_FPS = 'auto'
+    
+    # Alternativa a la tasa fija: fracción máxima del tiempo (0-1] dedicada
+    # a inferencia (tiene prioridad sobre MEDIAPIPE_INFERENCE_FPS)
+    MEDIAPIPE_INFERENCE_BUDGET = None
+    
+    # Recortar la entrada de MediaPipe alrededor de la persona (conserva la
+    # proporción; vuelve a frame completo si se pierde el tracking)
+    MEDIAPIPE_ROI_TRACKING = True
+    
+    # Procesos dedicados a la inferencia de pose (frames por memoria
+    # compartida; escala con los núcleos cuando hay varias cámaras activas)
+    # 0 = MediaPipe dentro del proceso de Flask
+    MEDIAPIPE_WORKER_PROCESSES = 0
+    
+    # Suavizado temporal de landmarks dentro de MediaPipe; con un filtro
+    # 'one_euro' en ANGLE_FILTERS se puede desactivar sin temblor en el ángulo
+    MEDIAPIPE_SMOOTH_LANDMARKS = True
+    
+    # Filtro temporal por canal de ángulo de los analyzers ('left_angle',
+    # 'right_angle'; 'default' = resto): 'none', 'median', 'ema', 'one_euro'
+    # o dict {'type': ..., parámetros} (ver app/core/angle_filters.py)
+    # Ej: {'default': {'type': 'one_euro', 'min_cutoff': 1.0, 'beta': 0.05}}
+    # None = ángulos sin filtrar
+    ANGLE_FILTERS = None
+    
+    # Contador de repeticiones de los analyzers (app/core/repetition_counter.py):
+    # una repetición empieza al subir min_amplitude grados sobre el valle y se
+    # cuenta al volver return_ratio del recorrido; None = valores por defecto
+    REPETITION_COUNTER = {
+        'min_amplitude': 20.0,
+        'return_ratio': 0.7,
+        'min_duration': 0.4,
+        'max_duration': 30.0
+    }
+    
+    # Estadísticas de sesión de los analyzers (app/core/session_stats.py):
+    # el ROM persistido es percentil alto - percentil bajo (no el pico de un
+    # frame) y se reporta el tiempo en cada banda de ángulo (límites en grados)
+    # None = valores por defecto
+    SESSION_STATS = {
+        'low_percentile': 5.0,
+        'high_percentile': 95.0,
+        'bands': (30.0, 60.0, 90.0, 120.0, 150.0)
+    }
+    
     # ========================================================================
     # CONFIGURACIÓN DE CÁMARA
     # ========================================================================
     
+    # Índice de la cámara del análisis en vivo
+    CAMERA_INDEX = 0
+    
     # Resolución de cámara por defecto
     CAMERA_WIDTH = 1280
     CAMERA_HEIGHT = 720
@@ -145,6 +198,108 @@ class Config:
     # FPS objetivo
     CAMERA_FPS = 30
     
+    # Resolución/FPS por dispositivo cuando las estaciones usan cámaras
+    # distintas (índice → {'width', 'height', 'fps', 'mjpg', 'source'}); la estación elige su
+    # cámara con ?camera=<índice> en la página de análisis
+    CAMERA_DEVICE_SETTINGS = {}
+    
+    # Hilo lector dedicado por cámara (entrega siempre el frame más reciente
+    # y descarta los viejos en vez de acumular latencia en el buffer del driver)
+    CAMERA_THREADED_CAPTURE = True
+    
+    # Segundos que una cámara liberada queda abierta y configurada: volver a
+    # entrar al análisis (misma resolución/FPS) no reabre el dispositivo
+    # (0 = cerrar al liberar)
+    CAMERA_KEEP_WARM_SECONDS = 120
+    
+    # Espera máxima a que la auto-exposición se estabilice al abrir en frío
+    CAMERA_SETTLE_TIMEOUT = 2.0
+    
+    # Captura MJPG: el driver entrega JPEG comprimido (evita el YUYV crudo a
+    # pocos FPS por USB 2.0) y el frame se decodifica reducido por
+    # CAMERA_MJPG_DECODE_SCALE (1280x720 / 2 = 640x360 para MediaPipe) salvo
+    # que el stream anotado necesite la resolución completa.
+    # También se puede activar por cámara con 'mjpg' en CAMERA_DEVICE_SETTINGS
+    CAMERA_MJPG = False
+    CAMERA_MJPG_DECODE_SCALE = 2
+    
+    # Fuente de frames del análisis en vivo (hardware/frame_sources.py):
+    # 'camera' (USB), 'synthetic' o 'video:<ruta>' (ej: un MP4 de
+    # app/static/videos/exercises/ en loop) para probar y medir sin cámara.
+    # También por cámara con 'source' en CAMERA_DEVICE_SETTINGS
+    CAMERA_SOURCE = os.environ.get('CAMERA_SOURCE', 'camera')
+    
+    # Video/sintético a sus FPS nominales (False = lo más rápido posible)
+    CAMERA_SOURCE_REALTIME = True
+    
+    # ========================================================================
+    # CONFIGURACIÓN DE STREAMING (MJPEG)
+    # ========================================================================
+    
+    # Pipeline captura → inferencia → render → encode en hilos separados
+    # (False = las 4 etapas en secuencia dentro del generador)
+    STREAM_PIPELINE_ENABLED = True
+    
+    # Capacidad de cada cola entre etapas (política drop-oldest)
+    STREAM_QUEUE_SIZE = 2
+    
+    # Calidad JPEG inicial del stream (0-100)
+    STREAM_JPEG_QUALITY = 70
+    
+    # Calidad adaptativa según el backpressure del cliente más lento
+    # (baja calidad → escala → FPS al congestionarse; recupera en orden inverso)
+    STREAM_ADAPTIVE_QUALITY = True
+    STREAM_JPEG_QUALITY_RANGE = (40, 85)
+    STREAM_SCALE_RANGE = (0.5, 1.0)
+    STREAM_FPS_RANGE = (8, 30)
+    
+    # Frames en cola por espectador del broadcast (un cliente lento se salta
+    # frames en vez de frenar al productor)
+    STREAM_SUBSCRIBER_QUEUE_SIZE = 2
+    
+    # Modo de render del stream:
+    # - 'annotated': el servidor dibuja skeleton/HUD y envía el JPEG anotado
+    # - 'data': el servidor solo analiza; envía landmarks/ángulos por frame
+    #   (/api/analysis/landmarks_feed) y el navegador dibuja el overlay
+    # (se puede forzar por request con /api/video_feed?mode=data)
+    STREAM_RENDER_MODE = 'annotated'
+    
+    # Video en modo 'data': 'low' = frames crudos a baja calidad/escala/FPS,
+    # 'none' = sin video (solo un keep-alive mínimo para detectar desconexión)
+    STREAM_DATA_VIDEO = 'low'
+    STREAM_DATA_JPEG_QUALITY = 40
+    STREAM_DATA_SCALE = 0.5
+    STREAM_DATA_FPS = 15
+    
+    # Push del estado del análisis por SSE (/api/analysis/events) en lugar
+    # del polling de /api/analysis/current_data (que queda como fallback)
+    STATE_PUSH_ENABLED = True
+    STATE_PUSH_MAX_RATE = 10      # Eventos por segundo como máximo (coalescing)
+    STATE_PUSH_REFRESH = 2.0      # Reenvío si solo cambian fps/frame_count
+    STATE_PUSH_KEEPALIVE = 15.0   # Comentario keep-alive sin eventos
+    
+    # Grabación del video procesado entre /analysis/start y /analysis/stop
+    # (evidencia clínica → ROMSession.video_path). Se codifica en un hilo
+    # aparte; si no da abasto se descartan frames en vez de frenar el stream
+    SESSION_RECORDING_ENABLED = True
+    SESSION_RECORDING_DIR = str(INSTANCE_DIR / 'recordings')
+    SESSION_RECORDING_FPS = 15
+    SESSION_RECORDING_SEGMENT_SECONDS = 60   # Un crash pierde como mucho un segmento
+    SESSION_RECORDING_QUEUE_SIZE = 64        # Frames en espera del encoder
+    SESSION_RECORDING_FOURCC = 'mp4v'
+    
+    # Pool de analyzers: un analyzer por sesión de navegador; los ociosos se
+    # reutilizan y los menos usados se cierran al alcanzar cualquier límite
+    ANALYZER_POOL_MAX_INSTANCES = 4       # Grafos de MediaPipe residentes
+    ANALYZER_POOL_MAX_MEMORY_MB = 1024    # Memoria estimada (None = sin límite)
+    ANALYZER_POOL_LEASE_TTL = 1800        # Lease sin uso → abandonado (segundos)
+    
+    # Crear estos analyzers en segundo plano al arrancar (frame de prueba
+    # incluido) para que el primer video_feed no espere ~25s a MediaPipe
+    # (progreso en /api/system/readiness)
+    ANALYZER_WARMUP_ENABLED = True
+    ANALYZER_WARMUP_TYPES = ['shoulder_profile', 'shoulder_frontal']
+    
     # ========================================================================
     # CONFIGURACIÓN DE ESP32 (Control de altura de cámara)
     # ========================================================================
@@ -310,6 +465,12 @@ class TestingConfig(Config):
     
     # Login sin restricciones
     MAX_LOGIN_ATTEMPTS = 999
+    
+    # Sin cargar MediaPipe al crear la app
+    ANALYZER_WARMUP_ENABLED = False
+    
+    # Sin escribir videos en instance/ desde los tests
+    SESSION_RECORDING_ENABLED = False
 
 
 # ============================================================================
@@ -0,0 +1,450 @@
+"""
+🧠 ANALYZER POOL - ANALYZERS ARRENDADOS POR SESIÓN
+==================================================
+Pool de analyzers (grafos de MediaPipe) con leases por sesión de usuario
+
+PROBLEMA:
+api.py guardaba un único current_analyzer global y un cache por TIPO de
+ejercicio: dos estaciones con el mismo ejercicio compartían el ROM, un
+/analysis/reset de una borraba el de la otra, y los analyzers cacheados
+nunca se cerraban (cada grafo de MediaPipe queda en memoria para siempre).
+
+SOLUCIÓN:
+- Cada sesión de usuario (lease) tiene su propio analyzer
+- Al liberar un lease el analyzer queda OCIOSO: el siguiente que pida ese
+  tipo lo reutiliza tras reset() (sin los ~25s de inicialización)
+- Límites de instancias y de memoria: al alcanzarlos se cierran (cleanup())
+  primero los ociosos y luego los leases abandonados (sin uso durante
+  lease_ttl), siempre el menos usado recientemente (LRU)
+- Métricas: hits, reutilizados, creados (misses), desalojos, residentes
+- Pre-calentamiento: warm() crea analyzers ociosos al arrancar; un acquire()
+  que llega durante el warm-up de su tipo espera ese analyzer en vez de
+  crear otro
+
+Uso:
+    analyzer_pool.warm('shoulder_profile', factory)  # Hilo de arranque
+    analyzer = analyzer_pool.acquire(lease_id, 'shoulder_profile', factory)
+    analyzer = analyzer_pool.get(lease_id)      # None si no tiene lease
+    analyzer_pool.release(lease_id)             # Queda ocioso para reutilizar
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Callable, Hashable, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def _process_rss_mb() -> Optional[float]:
+    """Memoria residente del proceso en MB (None si no se puede medir)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class PooledAnalyzer:
+    """Instancia residente del pool (arrendada u ociosa)"""
+    
+    def __init__(self, analyzer, analyzer_type: str, memory_mb: float):
+        self.analyzer = analyzer
+        self.analyzer_type = analyzer_type
+        self.memory_mb = memory_mb
+        self.lease_id: Optional[Hashable] = None
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.uses = 0
+    
+    @property
+    def is_leased(self) -> bool:
+        return self.lease_id is not None
+    
+    def touch(self):
+        self.last_used = time.time()
+
+
+class AnalyzerPool:
+    """
+    Analyzers por sesión con reutilización y desalojo LRU
+    
+    Todas las instancias residentes viven en un OrderedDict ordenado por
+    último uso (la primera es la menos usada recientemente).
+    """
+    
+    def __init__(
+        self,
+        max_instances: int = 4,
+        max_memory_mb: Optional[float] = None,
+        lease_ttl: float = 1800.0,
+        default_instance_mb: float = 150.0
+    ):
+        """
+        Args:
+            max_instances: Analyzers residentes como máximo (arrendados + ociosos)
+            max_memory_mb: Memoria estimada máxima de los analyzers (None = sin límite)
+            lease_ttl: Segundos sin uso tras los cuales un lease se considera
+                abandonado y su analyzer puede desalojarse
+            default_instance_mb: Estimación por analyzer si no se puede medir RSS
+        """
+        self._lock = threading.Condition()
+        self._instances: 'OrderedDict[int, PooledAnalyzer]' = OrderedDict()
+        self._leases: Dict[Hashable, PooledAnalyzer] = {}
+        self._creating = 0
+        self._warming: Dict[str, int] = {}
+        
+        self.default_instance_mb = default_instance_mb
+        self.configure(max_instances, max_memory_mb, lease_ttl)
+        
+        self.hits = 0
+        self.reuses = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self.warmed = 0
+    
+    def configure(self, max_instances: int, max_memory_mb: Optional[float] = None, lease_ttl: float = 1800.0):
+        """Ajusta los límites (los residentes de más se desalojan en el próximo miss)"""
+        if max_instances < 1:
+            raise ValueError("max_instances debe ser >= 1")
+        
+        self.max_instances = max_instances
+        self.max_memory_mb = max_memory_mb
+        self.lease_ttl = lease_ttl
+    
+    def configure_from(self, config):
+        """Límites ANALYZER_POOL_* de la configuración de Flask"""
+        self.configure(
+            max_instances=config.get('ANALYZER_POOL_MAX_INSTANCES', 4),
+            max_memory_mb=config.get('ANALYZER_POOL_MAX_MEMORY_MB'),
+            lease_ttl=config.get('ANALYZER_POOL_LEASE_TTL', 1800.0)
+        )
+    
+    # ------------------------------------------------------------------
+    # LEASES
+    # ------------------------------------------------------------------
+    
+    def acquire(self, lease_id: Hashable, analyzer_type: str, factory: Callable[[], Any]):
+        """
+        Analyzer de la sesión para un tipo de ejercicio
+        
+        1. La sesión ya tiene un analyzer de ese tipo → se devuelve (hit)
+        2. Hay uno ocioso de ese tipo → reset() y se arrienda (reutilizado);
+           si ese tipo se está pre-calentando, se espera a que termine
+        3. Si no → se crea con factory() (miss), desalojando por LRU si hace falta
+        
+        Si la sesión tenía un analyzer de otro tipo, ese queda ocioso.
+        
+        Args:
+            lease_id: Identificador de la sesión de usuario
+            analyzer_type: Tipo de analyzer ('shoulder_profile', ...)
+            factory: Crea un analyzer nuevo (solo se llama en un miss)
+        
+        Returns:
+            Analyzer arrendado a la sesión
+        
+        Raises:
+            RuntimeError: Si el pool está lleno de analyzers en uso
+        """
+        with self._lock:
+            entry = self._leases.get(lease_id)
+            
+            if entry is not None and entry.analyzer_type == analyzer_type:
+                self.hits += 1
+                self._use(entry)
+                return entry.analyzer
+            
+            if entry is not None:
+                self._release_locked(lease_id)
+            
+            entry = self._find_idle(analyzer_type)
+            while entry is None and self._warming.get(analyzer_type):
+                self._lock.wait()
+                entry = self._find_idle(analyzer_type)
+            
+            if entry is not None:
+                self.reuses += 1
+                entry.lease_id = lease_id
+                self._leases[lease_id] = entry
+                self._use(entry)
+                reused = entry
+            else:
+                reused = None
+                self.misses += 1
+                evicted = self._make_room(self._estimate_mb(analyzer_type))
+                self._creating += 1
+        
+        if reused is not None:
+            logger.info(f"♻️ Reutilizando analyzer ocioso '{analyzer_type}' para lease '{lease_id}'")
+            reused.analyzer.reset()
+            return reused.analyzer
+        
+        self._close(evicted)
+        
+        logger.info(f"🔧 Creando NUEVO analyzer '{analyzer_type}' para lease '{lease_id}' (~25s)")
+        entry = self._build(analyzer_type, factory)
+        
+        with self._lock:
+            # Otra petición de la misma sesión pudo ganar la carrera
+            previous = self._leases.get(lease_id)
+            if previous is not None:
+                self._release_locked(lease_id)
+            
+            entry.lease_id = lease_id
+            self._instances[id(entry)] = entry
+            self._leases[lease_id] = entry
+            self._use(entry)
+        
+        logger.info(f"✅ Analyzer '{analyzer_type}' listo ({entry.memory_mb:.0f} MB estimados)")
+        return entry.analyzer
+    
+    def warm(self, analyzer_type: str, factory: Callable[[], Any]) -> bool:
+        """
+        Crea un analyzer OCIOSO de ese tipo (si no hay ya uno)
+        
+        Mientras se crea, los acquire() del mismo tipo lo esperan.
+        
+        Args:
+            analyzer_type: Tipo de analyzer
+            factory: Crea el analyzer (puede incluir un frame de prueba)
+        
+        Returns:
+            bool: True si se creó, False si ya había uno ocioso (o en camino)
+        
+        Raises:
+            RuntimeError: Si el pool está lleno de analyzers en uso
+        """
+        with self._lock:
+            if self._find_idle(analyzer_type) is not None or self._warming.get(analyzer_type):
+                return False
+            
+            evicted = self._make_room(self._estimate_mb(analyzer_type), count_miss=False)
+            self._creating += 1
+            self._warming[analyzer_type] = self._warming.get(analyzer_type, 0) + 1
+        
+        self._close(evicted)
+        
+        entry = None
+        try:
+            entry = self._build(analyzer_type, factory)
+        finally:
+            # Publicar el ocioso y dejar de marcar el tipo en el mismo paso
+            with self._lock:
+                if entry is not None:
+                    self._instances[id(entry)] = entry
+                    self.warmed += 1
+                
+                self._warming[analyzer_type] -= 1
+                if not self._warming[analyzer_type]:
+                    del self._warming[analyzer_type]
+                self._lock.notify_all()
+        
+        return True
+    
+    def get(self, lease_id: Hashable):
+        """Analyzer arrendado a la sesión (None si no tiene); renueva el lease"""
+        with self._lock:
+            entry = self._leases.get(lease_id)
+            if entry is None:
+                return None
+            
+            entry.touch()
+            self._instances.move_to_end(id(entry))
+            return entry.analyzer
+    
+    def release(self, lease_id: Hashable, analyzer=None) -> bool:
+        """
+        Libera el lease: el analyzer queda ocioso para reutilizarse
+        
+        Args:
+            lease_id: Identificador de la sesión
+            analyzer: Si se indica, solo se libera si el lease sigue siendo
+                de ese analyzer (un productor viejo no libera el lease que
+                otro ya volvió a arrendar con otro tipo de ejercicio)
+        
+        Returns:
+            bool: True si se liberó un analyzer
+        """
+        with self._lock:
+            entry = self._leases.get(lease_id)
+            if entry is None or (analyzer is not None and entry.analyzer is not analyzer):
+                return False
+            return self._release_locked(lease_id)
+    
+    def clear(self):
+        """Cierra todos los analyzers (ej: al apagar el servidor)"""
+        with self._lock:
+            entries = list(self._instances.values())
+            self._instances.clear()
+            self._leases.clear()
+        
+        self._close(entries)
+    
+    # ------------------------------------------------------------------
+    # INTERNOS (con self._lock tomado)
+    # ------------------------------------------------------------------
+    
+    def _build(self, analyzer_type: str, factory: Callable[[], Any]) -> PooledAnalyzer:
+        """Crea el analyzer fuera del lock (MediaPipe tarda varios segundos)"""
+        rss_before = _process_rss_mb()
+        
+        try:
+            analyzer = factory()
+        finally:
+            with self._lock:
+                self._creating -= 1
+        
+        rss_after = _process_rss_mb()
+        memory_mb = self.default_instance_mb
+        if rss_before is not None and rss_after is not None and rss_after > rss_before:
+            memory_mb = rss_after - rss_before
+        
+        return PooledAnalyzer(analyzer, analyzer_type, memory_mb)
+    
+    def _use(self, entry: PooledAnalyzer):
+        entry.uses += 1
+        entry.touch()
+        self._instances.move_to_end(id(entry))
+    
+    def _release_locked(self, lease_id: Hashable) -> bool:
+        entry = self._leases.pop(lease_id, None)
+        if entry is None:
+            return False
+        
+        entry.lease_id = None
+        entry.touch()
+        return True
+    
+    def _find_idle(self, analyzer_type: str) -> Optional[PooledAnalyzer]:
+        """Ocioso más reciente del tipo pedido (el grafo más "caliente")"""
+        for entry in reversed(self._instances.values()):
+            if not entry.is_leased and entry.analyzer_type == analyzer_type:
+                return entry
+        return None
+    
+    def _estimate_mb(self, analyzer_type: str) -> float:
+        """Memoria esperada de un analyzer nuevo (promedio medido de su tipo)"""
+        sizes = [e.memory_mb for e in self._instances.values() if e.analyzer_type == analyzer_type]
+        return sum(sizes) / len(sizes) if sizes else self.default_instance_mb
+    
+    def _resident_mb(self) -> float:
+        return sum(entry.memory_mb for entry in self._instances.values())
+    
+    def _is_evictable(self, entry: PooledAnalyzer, now: float) -> bool:
+        return not entry.is_leased or now - entry.last_used >= self.lease_ttl
+    
+    def _over_limit(self, extra_mb: float) -> bool:
+        if len(self._instances) + self._creating + 1 > self.max_instances:
+            return True
+        if self.max_memory_mb is not None and self._instances:
+            return self._resident_mb() + extra_mb > self.max_memory_mb
+        return False
+    
+    def _make_room(self, extra_mb: float, count_miss: bool = True) -> List[PooledAnalyzer]:
+        """
+        Desaloja por LRU hasta que entre un analyzer nuevo
+        
+        Returns:
+            list: Entradas desalojadas (se cierran fuera del lock)
+        
+        Raises:
+            RuntimeError: Si todos los residentes están en uso (no se desaloja nada)
+        """
+        evicted = []
+        now = time.time()
+        
+        # Primero los ociosos, luego los leases abandonados
+        candidates = sorted(
+            (e for e in self._instances.values() if self._is_evictable(e, now)),
+            key=lambda e: (e.is_leased, e.last_used)
+        )
+        
+        in_use = len(self._instances) - len(candidates) + self._creating
+        if in_use + 1 > self.max_instances:
+            if count_miss:
+                self.misses -= 1
+            self.rejections += 1
+            raise RuntimeError(
+                f"Sin analyzers disponibles: {in_use} en uso "
+                f"(máximo {self.max_instances}). Intenta en unos minutos."
+            )
+        
+        for entry in candidates:
+            if not self._over_limit(extra_mb):
+                break
+            
+            del self._instances[id(entry)]
+            if entry.is_leased:
+                self._leases.pop(entry.lease_id, None)
+                logger.warning(f"Lease abandonado '{entry.lease_id}' desalojado ({entry.analyzer_type})")
+            
+            self.evictions += 1
+            evicted.append(entry)
+        
+        if self._over_limit(extra_mb):
+            logger.warning(
+                f"Límite de memoria del pool superado ({self._resident_mb():.0f} MB "
+                f"+ {extra_mb:.0f} MB > {self.max_memory_mb} MB): analyzers en uso"
+            )
+        
+        return evicted
+    
+    @staticmethod
+    def _close(entries: List[PooledAnalyzer]):
+        """Libera los grafos de MediaPipe de los analyzers desalojados"""
+        for entry in entries:
+            cleanup = getattr(entry.analyzer, 'cleanup', None)
+            try:
+                if cleanup is not None:
+                    cleanup()
+                logger.info(f"🗑️ Analyzer '{entry.analyzer_type}' cerrado ({entry.memory_mb:.0f} MB)")
+            except Exception as e:
+                logger.error(f"Error al cerrar analyzer '{entry.analyzer_type}': {e}")
+    
+    # ------------------------------------------------------------------
+    # MÉTRICAS
+    # ------------------------------------------------------------------
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            requests = self.hits + self.reuses + self.misses
+            by_type: Dict[str, Dict[str, int]] = {}
+            
+            for entry in self._instances.values():
+                counts = by_type.setdefault(entry.analyzer_type, {'leased': 0, 'idle': 0})
+                counts['leased' if entry.is_leased else 'idle'] += 1
+            
+            return {
+                'resident': len(self._instances),
+                'leased': len(self._leases),
+                'idle': len(self._instances) - len(self._leases),
+                'creating': self._creating,
+                'warming': dict(self._warming),
+                'by_type': by_type,
+                'resident_mb': round(self._resident_mb(), 1),
+                'max_instances': self.max_instances,
+                'max_memory_mb': self.max_memory_mb,
+                'hits': self.hits,
+                'reuses': self.reuses,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.reuses) / requests, 3) if requests else 0.0,
+                'evictions': self.evictions,
+                'rejections': self.rejections,
+                'warmed': self.warmed,
+                'oldest_idle_s': round(max(
+                    (now - e.last_used for e in self._instances.values() if not e.is_leased),
+                    default=0.0
+                ), 1)
+            }
+
+
+# Instancia global (los límites se ajustan con configure() al crear la app)
+analyzer_pool = AnalyzerPool()
@@ -0,0 +1,154 @@
+"""
+🔥 ANALYZER WARM-UP - MEDIAPIPE LISTO ANTES DEL PRIMER USUARIO
+==============================================================
+Pre-calentamiento de analyzers en segundo plano al arrancar la app
+
+PROBLEMA:
+Construir un analyzer (grafo de MediaPipe + intérprete TFLite) tarda ~25s
+y ocurría dentro del primer /api/video_feed: el primer usuario esperaba
+con el stream congelado.
+
+SOLUCIÓN:
+- create_app() lanza un hilo que crea un analyzer por tipo configurado
+  (ANALYZER_WARMUP_TYPES) y lo deja OCIOSO en analyzer_pool
+- Cada analyzer procesa un frame negro: la primera llamada a process()
+  es la que termina de inicializar el intérprete TFLite
+- video_feed obtiene el analyzer ya caliente con acquire() (o espera al
+  warm-up en curso de su tipo en vez de crear otro)
+- El progreso se consulta en /api/system/readiness
+
+Uso:
+    analyzer_warmup.start({'shoulder_profile': factory}, analyzer_pool)
+    analyzer_warmup.get_status()  # {'ready': False, 'analyzers': {...}}
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import time
+import logging
+import threading
+from typing import Optional, Callable, Dict, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def run_dummy_frame(analyzer):
+    """
+    Pasa un frame negro por el grafo de MediaPipe del analyzer
+    
+    Usa pose.process() directamente (no infer()) para no alterar el
+    scheduler, el extrapolador ni el ROI del análisis.
+    """
+    pose = getattr(analyzer, 'pose', None)
+    if pose is None:
+        return
+    
+    width = getattr(analyzer, 'processing_width', 640)
+    height = getattr(analyzer, 'processing_height', 480)
+    pose.process(np.zeros((height, width, 3), dtype=np.uint8))
+
+
+class AnalyzerWarmup:
+    """Estado y ejecución del pre-calentamiento (un hilo, tipos en secuencia)"""
+    
+    # Estados por tipo de analyzer
+    PENDING = 'pending'
+    WARMING = 'warming'
+    READY = 'ready'
+    FAILED = 'failed'
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._analyzers: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self, factories: Dict[str, Callable[[], Any]], pool) -> bool:
+        """
+        Lanza el warm-up en un hilo daemon
+        
+        Args:
+            factories: Tipo de analyzer → función que lo construye
+            pool: AnalyzerPool donde quedan los analyzers ociosos
+        
+        Returns:
+            bool: False si ya hay un warm-up en curso
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            
+            self._analyzers = {
+                analyzer_type: {'status': self.PENDING, 'seconds': None, 'error': None}
+                for analyzer_type in factories
+            }
+            self.started_at = time.time()
+            self.finished_at = None
+            
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(factories, pool),
+                name='analyzer-warmup',
+                daemon=True
+            )
+            self._thread.start()
+        
+        logger.info(f"🔥 Warm-up de analyzers iniciado: {', '.join(factories)}")
+        return True
+    
+    def _run(self, factories: Dict[str, Callable[[], Any]], pool):
+        for analyzer_type, factory in factories.items():
+            self._set(analyzer_type, status=self.WARMING)
+            started = time.time()
+            
+            def build(factory=factory):
+                analyzer = factory()
+                run_dummy_frame(analyzer)
+                return analyzer
+            
+            try:
+                pool.warm(analyzer_type, build)
+                seconds = round(time.time() - started, 2)
+                self._set(analyzer_type, status=self.READY, seconds=seconds)
+                logger.info(f"✅ Analyzer '{analyzer_type}' pre-calentado en {seconds}s")
+            except Exception as e:
+                self._set(analyzer_type, status=self.FAILED, error=str(e))
+                logger.error(f"❌ Warm-up de '{analyzer_type}' falló: {e}")
+        
+        self.finished_at = time.time()
+    
+    def _set(self, analyzer_type: str, **fields):
+        with self._lock:
+            self._analyzers[analyzer_type].update(fields)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Progreso del warm-up
+        
+        'ready' es True cuando todos los tipos terminaron (listos o fallidos:
+        un tipo fallido se construye bajo demanda como antes).
+        """
+        with self._lock:
+            analyzers = {name: dict(state) for name, state in self._analyzers.items()}
+        
+        done = [s for s in analyzers.values() if s['status'] in (self.READY, self.FAILED)]
+        
+        return {
+            'enabled': self.started_at is not None,
+            'ready': len(done) == len(analyzers),
+            'progress': f"{len(done)}/{len(analyzers)}",
+            'elapsed': round((self.finished_at or time.time()) - self.started_at, 2) if self.started_at else 0.0,
+            'analyzers': analyzers
+        }
+
+
+# Instancia global (un warm-up por proceso)
+analyzer_warmup = AnalyzerWarmup()
@@ -0,0 +1,341 @@
+"""
+📐 ANGLE ENGINE - ÁNGULOS ARTICULARES VECTORIZADOS
+==================================================
+Ángulos de 3 puntos, contra referencia y con signo para todas las
+articulaciones y todos los frames en una sola llamada
+
+PROBLEMA:
+calculate_angle_biomechanical, calculate_extension_angle y
+calculate_abduction_angle creaban np.array nuevos y llamaban a np.dot /
+np.linalg.norm por cada triplete: en el régimen escalar de NumPy casi todo
+el costo es overhead de llamada, e inviable para re-analizar miles de frames
+offline. Además np.dot pasa por BLAS (que puede usar FMA) y la referencia
+fija usaba math.acos, así que un cálculo por lotes no reproducía sus
+resultados bit a bit.
+
+SOLUCIÓN:
+- Una sola aritmética para escalar y lotes: productos y sumas elemento a
+  elemento en float64 en orden fijo (x, y, z), np.sqrt y np.arccos
+- Funciones por lotes (*_angles) sobre arrays (N, 2|3) con broadcasting
+- Funciones escalares (*_angle) con exactamente las mismas operaciones en
+  floats de Python; los analyzers las usan por frame
+- compute_joint_angles(): todas las articulaciones de una tabla
+  (JOINT_ANGLES) sobre (N, 33, 2|3) agrupadas por tipo de ángulo
+- Con coordenadas en píxeles enteras (las de los analyzers) los productos
+  son exactos: 3 puntos y extensión dan lo mismo que la versión np.dot
+
+Uso:
+    pixels = to_pixels(landmark_arrays, w, h)        # (N, 33, 2), como points_2d
+    angles = compute_joint_angles(pixels)            # {'left_elbow_flexion': (N,), ...}
+    angle = three_point_angle(shoulder, elbow, wrist)
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import math
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import mediapipe as mp
+
+_PL = mp.solutions.pose.PoseLandmark
+
+# Tipos de ángulo de JointAngle
+THREE_POINT = 'three_point'          # Vértice en el punto central
+SEGMENT = 'segment'                  # Segmento móvil vs segmento de referencia (abducción)
+SIGNED_VERTICAL = 'signed_vertical'  # Segmento vs vertical hacia abajo, con signo (flexión/extensión)
+FIXED_REFERENCE = 'fixed_reference'  # Segmento vs vector fijo, goniométrico (180° - ángulo)
+
+VERTICAL_DOWN = (0.0, 1.0)
+
+
+# ----------------------------------------------------------------------
+# ARITMÉTICA COMPARTIDA (lotes)
+# ----------------------------------------------------------------------
+
+def _as_points(points) -> np.ndarray:
+    return np.asarray(points, dtype=np.float64)
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Producto punto por el último eje, en orden fijo (sin BLAS ni FMA)"""
+    result = a[..., 0] * b[..., 0]
+    for axis in range(1, a.shape[-1]):
+        result = result + a[..., axis] * b[..., axis]
+    return result
+
+
+def _arccos_degrees(cos_angle: np.ndarray) -> np.ndarray:
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+
+def three_point_angles(point1, point2, point3) -> np.ndarray:
+    """
+    Ángulo en point2 entre point1 y point3 (= calculate_angle_biomechanical)
+    
+    Args:
+        point1, point2, point3: (..., 2|3) con broadcasting (ej: (N, 2))
+    
+    Returns:
+        np.ndarray: (...,) grados [0, 180]; 0 si algún segmento mide 0
+    """
+    vertex = _as_points(point2)
+    vector1 = _as_points(point1) - vertex
+    vector2 = _as_points(point3) - vertex
+    
+    magnitudes = np.sqrt(_dot(vector1, vector1)) * np.sqrt(_dot(vector2, vector2))
+    degenerate = magnitudes == 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        angles = _arccos_degrees(_dot(vector1, vector2) / magnitudes)
+    
+    return np.where(degenerate, 0.0, angles)
+
+
+def segment_angles(origin, end, reference) -> np.ndarray:
+    """
+    Ángulo entre el segmento origin → end y un vector de referencia
+    (= calculate_abduction_angle con reference = cadera - hombro)
+    
+    Args:
+        origin, end: (..., 2|3)
+        reference: (..., 2|3) por frame o (2|3,) fijo
+    
+    Returns:
+        np.ndarray: (...,) grados [0, 180]; 0 si algún vector mide 0
+    """
+    reference = _as_points(reference)
+    segment = _as_points(end) - _as_points(origin)
+    
+    reference_norm = np.sqrt(_dot(reference, reference))
+    segment_norm = np.sqrt(_dot(segment, segment))
+    degenerate = (reference_norm == 0) | (segment_norm == 0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_angle = _dot(reference / reference_norm[..., None], segment / segment_norm[..., None])
+        angles = _arccos_degrees(cos_angle)
+    
+    return np.where(degenerate, 0.0, angles)
+
+
+def signed_vertical_angles(origin, end, side: Union[str, Sequence[str]]) -> np.ndarray:
+    """
+    Flexión (+) / extensión (-) del segmento origin → end respecto a la
+    vertical hacia abajo (= calculate_extension_angle)
+    
+    Args:
+        origin, end: (..., 2) en coordenadas de imagen (y hacia abajo)
+        side: 'left' / 'right', o uno por frame
+    
+    Returns:
+        np.ndarray: (...,) grados [-180, 180]; 0 si el segmento mide 0
+    """
+    segment = _as_points(end) - _as_points(origin)
+    dx, dy = segment[..., 0], segment[..., 1]
+    
+    norm = np.sqrt(dx * dx + dy * dy)
+    degenerate = norm == 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # (0, 1) · (segmento / |segmento|) = dy / |segmento|
+        magnitude = _arccos_degrees(dy / norm)
+    
+    # Producto cruz simplificado: -dx; su signo de flexión depende del lado
+    cross = -dx
+    is_left = np.asarray(side) == 'left'
+    positive = np.where(is_left, cross > 0, cross < 0)
+    
+    return np.where(degenerate, 0.0, np.where(positive, magnitude, -magnitude))
+
+
+def fixed_reference_angles(segment, reference) -> np.ndarray:
+    """
+    Ángulo goniométrico del segmento contra un vector fijo: 180° - ángulo
+    entre ambos (= FixedSpatialReferences.calculate_angle_with_fixed_reference)
+    
+    Args:
+        segment: (..., 2) vector del segmento (ej: codo - hombro)
+        reference: (2,) vector fijo (ej: (0, -1) vertical hacia arriba)
+    
+    Returns:
+        np.ndarray: (...,) grados [0, 180]; 0 si algún vector mide 0
+    """
+    segment = _as_points(segment)
+    reference = _as_points(reference)
+    
+    segment_magnitude = np.sqrt(_dot(segment, segment))
+    reference_magnitude = np.sqrt(_dot(reference, reference))
+    degenerate = (segment_magnitude == 0) | (reference_magnitude == 0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        angles = 180 - _arccos_degrees(_dot(segment, reference) / (segment_magnitude * reference_magnitude))
+    
+    return np.where(degenerate, 0.0, angles)
+
+
+# ----------------------------------------------------------------------
+# MISMAS OPERACIONES PARA UN SOLO FRAME (floats de Python)
+# ----------------------------------------------------------------------
+
+def _dot_scalar(a, b) -> float:
+    result = a[0] * b[0]
+    for axis in range(1, len(a)):
+        result = result + a[axis] * b[axis]
+    return result
+
+
+def _arccos_degrees_scalar(cos_angle: float) -> float:
+    # np.arccos (no math.acos): mismo resultado que el ufunc sobre arrays
+    return float(np.degrees(np.arccos(max(-1.0, min(1.0, cos_angle)))))
+
+
+def three_point_angle(point1, point2, point3) -> float:
+    """Un frame de three_point_angles()"""
+    vector1 = [float(a) - float(b) for a, b in zip(point1, point2)]
+    vector2 = [float(a) - float(b) for a, b in zip(point3, point2)]
+    
+    magnitudes = math.sqrt(_dot_scalar(vector1, vector1)) * math.sqrt(_dot_scalar(vector2, vector2))
+    if magnitudes == 0:
+        return 0.0
+    
+    return _arccos_degrees_scalar(_dot_scalar(vector1, vector2) / magnitudes)
+
+
+def segment_angle(origin, end, reference) -> float:
+    """Un frame de segment_angles()"""
+    reference = [float(value) for value in reference]
+    segment = [float(a) - float(b) for a, b in zip(end, origin)]
+    
+    reference_norm = math.sqrt(_dot_scalar(reference, reference))
+    segment_norm = math.sqrt(_dot_scalar(segment, segment))
+    if reference_norm == 0 or segment_norm == 0:
+        return 0.0
+    
+    cos_angle = _dot_scalar(
+        [value / reference_norm for value in reference],
+        [value / segment_norm for value in segment]
+    )
+    return _arccos_degrees_scalar(cos_angle)
+
+
+def signed_vertical_angle(origin, end, side: str) -> float:
+    """Un frame de signed_vertical_angles()"""
+    dx = float(end[0]) - float(origin[0])
+    dy = float(end[1]) - float(origin[1])
+    
+    norm = math.sqrt(dx * dx + dy * dy)
+    if norm == 0:
+        return 0.0
+    
+    magnitude = _arccos_degrees_scalar(dy / norm)
+    cross = -dx
+    positive = cross > 0 if side == 'left' else cross < 0
+    
+    return magnitude if positive else -magnitude
+
+
+def fixed_reference_angle(segment, reference) -> float:
+    """Un frame de fixed_reference_angles()"""
+    segment = [float(value) for value in segment]
+    reference = [float(value) for value in reference]
+    
+    segment_magnitude = math.sqrt(_dot_scalar(segment, segment))
+    reference_magnitude = math.sqrt(_dot_scalar(reference, reference))
+    if segment_magnitude == 0 or reference_magnitude == 0:
+        return 0.0
+    
+    cos_angle = _dot_scalar(segment, reference) / (segment_magnitude * reference_magnitude)
+    return 180 - _arccos_degrees_scalar(cos_angle)
+
+
+# ----------------------------------------------------------------------
+# TODAS LAS ARTICULACIONES, TODOS LOS FRAMES
+# ----------------------------------------------------------------------
+
+class JointAngle(NamedTuple):
+    """
+    Definición de un ángulo articular sobre índices de landmarks
+    
+    landmarks según kind:
+        THREE_POINT:     (punto1, vértice, punto3)
+        SEGMENT:         (origen, extremo, extremo de la referencia)
+        SIGNED_VERTICAL: (origen, extremo) + side
+        FIXED_REFERENCE: (origen, extremo) + reference
+    """
+    name: str
+    kind: str
+    landmarks: Tuple[int, ...]
+    side: Optional[str] = None
+    reference: Optional[Tuple[float, float]] = None
+
+
+JOINT_ANGLES: Tuple[JointAngle, ...] = (
+    # Hombro: flexión/extensión (vista de perfil) y abducción (vista frontal)
+    JointAngle('left_shoulder_flexion', SIGNED_VERTICAL, (_PL.LEFT_SHOULDER, _PL.LEFT_ELBOW), side='left'),
+    JointAngle('right_shoulder_flexion', SIGNED_VERTICAL, (_PL.RIGHT_SHOULDER, _PL.RIGHT_ELBOW), side='right'),
+    JointAngle('left_shoulder_abduction', SEGMENT, (_PL.LEFT_SHOULDER, _PL.LEFT_ELBOW, _PL.LEFT_HIP)),
+    JointAngle('right_shoulder_abduction', SEGMENT, (_PL.RIGHT_SHOULDER, _PL.RIGHT_ELBOW, _PL.RIGHT_HIP)),
+    # Articulaciones de 3 puntos
+    JointAngle('left_elbow_flexion', THREE_POINT, (_PL.LEFT_SHOULDER, _PL.LEFT_ELBOW, _PL.LEFT_WRIST)),
+    JointAngle('right_elbow_flexion', THREE_POINT, (_PL.RIGHT_SHOULDER, _PL.RIGHT_ELBOW, _PL.RIGHT_WRIST)),
+    JointAngle('left_hip_flexion', THREE_POINT, (_PL.LEFT_SHOULDER, _PL.LEFT_HIP, _PL.LEFT_KNEE)),
+    JointAngle('right_hip_flexion', THREE_POINT, (_PL.RIGHT_SHOULDER, _PL.RIGHT_HIP, _PL.RIGHT_KNEE)),
+    JointAngle('left_knee_flexion', THREE_POINT, (_PL.LEFT_HIP, _PL.LEFT_KNEE, _PL.LEFT_ANKLE)),
+    JointAngle('right_knee_flexion', THREE_POINT, (_PL.RIGHT_HIP, _PL.RIGHT_KNEE, _PL.RIGHT_ANKLE)),
+    JointAngle('left_ankle', THREE_POINT, (_PL.LEFT_KNEE, _PL.LEFT_ANKLE, _PL.LEFT_FOOT_INDEX)),
+    JointAngle('right_ankle', THREE_POINT, (_PL.RIGHT_KNEE, _PL.RIGHT_ANKLE, _PL.RIGHT_FOOT_INDEX)),
+)
+
+
+def to_pixels(landmarks, width: int, height: int) -> np.ndarray:
+    """
+    Landmarks normalizados (..., 33, 4) → píxeles (..., 33, 2) int64,
+    truncados igual que LandmarkFrame.points_2d (int(x * width))
+    """
+    landmarks = np.asarray(landmarks)
+    return (landmarks[..., :2].astype(np.float64) * (width, height)).astype(np.int64)
+
+
+def compute_joint_angles(points, joints: Sequence[JointAngle] = JOINT_ANGLES) -> Dict[str, np.ndarray]:
+    """
+    Ángulos de todas las articulaciones para todos los frames
+    
+    Las articulaciones del mismo tipo se calculan juntas: una llamada
+    vectorizada sobre (N, articulaciones, D) por tipo.
+    
+    Args:
+        points: (N, 33, 2|3) por frame (ej: to_pixels(...)) o (33, 2|3)
+        joints: Definiciones (por defecto JOINT_ANGLES)
+    
+    Returns:
+        dict: {nombre: (N,) grados} (escalares de forma () si points es un frame)
+    """
+    points = _as_points(points)
+    results: Dict[str, np.ndarray] = {}
+    
+    for kind in (THREE_POINT, SEGMENT, SIGNED_VERTICAL, FIXED_REFERENCE):
+        group = [joint for joint in joints if joint.kind == kind]
+        if not group:
+            continue
+        
+        # (N, articulaciones, landmarks del tipo, D)
+        indices = np.array([[int(index) for index in joint.landmarks] for joint in group], dtype=np.intp)
+        selected = points[..., indices, :]
+        
+        if kind == THREE_POINT:
+            angles = three_point_angles(selected[..., 0, :], selected[..., 1, :], selected[..., 2, :])
+        elif kind == SEGMENT:
+            origin = selected[..., 0, :]
+            angles = segment_angles(origin, selected[..., 1, :], selected[..., 2, :] - origin)
+        elif kind == SIGNED_VERTICAL:
+            sides = [joint.side for joint in group]
+            angles = signed_vertical_angles(selected[..., 0, :2], selected[..., 1, :2], sides)
+        else:
+            references = np.array([joint.reference for joint in group], dtype=np.float64)
+            angles = fixed_reference_angles(selected[..., 1, :2] - selected[..., 0, :2], references)
+        
+        for column, joint in enumerate(group):
+            results[joint.name] = angles[..., column]
+    
+    return {joint.name: results[joint.name] for joint in joints}
@@ -0,0 +1,274 @@
+"""
+🎚️ ANGLE FILTERS - FILTROS TEMPORALES DE ÁNGULOS EN STREAMING
+==============================================================
+Filtros con estado por canal (un ángulo = un canal), O(1) u O(ventana)
+por muestra y sin reconstruir estructuras en cada frame
+
+PROBLEMA:
+apply_temporal_filter agregaba a un deque(maxlen=5), lo convertía a lista
+y llamaba a np.median por cada ángulo de cada frame, con ventana y tipo de
+filtro fijos en el código.
+
+SOLUCIÓN:
+- RollingMedianFilter: ventana ordenada (bisect) + buffer circular
+  preasignado; da exactamente la mediana de np.median sobre la ventana
+- ExponentialMovingAverage: un estado, O(1)
+- OneEuroFilter: paso bajo con frecuencia de corte adaptativa a la
+  velocidad (poco jitter en reposo, poco retraso en movimiento); permite
+  bajar el suavizado de landmarks de MediaPipe (smooth_landmarks=False)
+  sin temblor en el ángulo
+- AngleFilterBank: un filtro por canal elegido por configuración
+  (ANGLE_FILTERS), creado la primera vez que se usa el canal
+
+Configuración (por canal, o 'default' para el resto):
+    {'default': 'median',
+     'left_angle': {'type': 'one_euro', 'min_cutoff': 1.0, 'beta': 0.05}}
+
+Uso:
+    filters = AngleFilterBank(config)
+    smoothed = filters.apply('left_angle', raw_angle, timestamp)
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Any, Dict, Optional, Union
+
+FilterSpec = Union[None, str, Dict[str, Any]]
+
+
+class AngleFilter:
+    """Filtro de un canal: filter(valor, timestamp) → valor suavizado"""
+    
+    name = 'none'
+    
+    def filter(self, value: float, timestamp: Optional[float] = None) -> float:
+        return value
+    
+    def reset(self):
+        """Olvida el historial (ej: se perdió a la persona)"""
+    
+    def __call__(self, value: float, timestamp: Optional[float] = None) -> float:
+        return self.filter(value, timestamp)
+
+
+class PassthroughFilter(AngleFilter):
+    """Sin filtrado (el ángulo crudo)"""
+
+
+class RollingMedianFilter(AngleFilter):
+    """
+    Mediana móvil sobre las últimas `window` muestras
+    
+    Mientras haya menos de `min_samples` muestras devuelve el valor
+    original (mismo comportamiento que el deque + np.median previo).
+    """
+    
+    name = 'median'
+    
+    def __init__(self, window: int = 5, min_samples: int = 3):
+        if window < 1:
+            raise ValueError("window debe ser >= 1")
+        self.window = window
+        self.min_samples = max(1, min(min_samples, window))
+        self._ring = [0.0] * window   # Orden de llegada (buffer circular)
+        self._sorted = []             # Mismas muestras, ordenadas
+        self._next = 0
+    
+    def filter(self, value: float, timestamp: Optional[float] = None) -> float:
+        sorted_window = self._sorted
+        
+        # Con la ventana llena sale la muestra más vieja
+        if len(sorted_window) == self.window:
+            del sorted_window[bisect_left(sorted_window, self._ring[self._next])]
+        
+        self._ring[self._next] = value
+        self._next = (self._next + 1) % self.window
+        insort(sorted_window, value)
+        
+        count = len(sorted_window)
+        if count < self.min_samples:
+            return value
+        
+        middle = count // 2
+        if count % 2:
+            return float(sorted_window[middle])
+        return (sorted_window[middle - 1] + sorted_window[middle]) / 2
+    
+    def reset(self):
+        self._sorted.clear()
+        self._next = 0
+
+
+class ExponentialMovingAverage(AngleFilter):
+    """y = y + alpha * (x - y); alpha=1 no filtra"""
+    
+    name = 'ema'
+    
+    def __init__(self, alpha: float = 0.5):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha debe estar en (0, 1]")
+        self.alpha = alpha
+        self._value: Optional[float] = None
+    
+    def filter(self, value: float, timestamp: Optional[float] = None) -> float:
+        if self._value is None:
+            self._value = float(value)
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+    
+    def reset(self):
+        self._value = None
+
+
+class OneEuroFilter(AngleFilter):
+    """
+    Filtro One-Euro (Casiez et al., 2012): paso bajo exponencial cuya
+    frecuencia de corte crece con la velocidad de la señal
+        
+        cutoff = min_cutoff + beta * |velocidad filtrada|
+    
+    Args (unidades de la señal: grados y segundos):
+        min_cutoff: Corte en reposo (Hz); menor = menos jitter
+        beta: Cuánto sube el corte con la velocidad; mayor = menos retraso
+        d_cutoff: Corte del filtro de la derivada (Hz)
+        frequency: Frecuencia de muestreo si no se pasan timestamps (Hz)
+    """
+    
+    name = 'one_euro'
+    
+    def __init__(
+        self,
+        min_cutoff: float = 1.0,
+        beta: float = 0.05,
+        d_cutoff: float = 1.0,
+        frequency: float = 30.0
+    ):
+        if min_cutoff <= 0 or d_cutoff <= 0 or frequency <= 0:
+            raise ValueError("min_cutoff, d_cutoff y frequency deben ser > 0")
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.frequency = frequency
+        self._value: Optional[float] = None
+        self._derivative = 0.0
+        self._timestamp: Optional[float] = None
+    
+    @staticmethod
+    def _alpha(cutoff: float, period: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / period)
+    
+    def filter(self, value: float, timestamp: Optional[float] = None) -> float:
+        if self._value is None:
+            self._value = float(value)
+            self._timestamp = timestamp
+            return self._value
+        
+        # Período real entre muestras si hay timestamps crecientes
+        period = 1.0 / self.frequency
+        if timestamp is not None and self._timestamp is not None and timestamp > self._timestamp:
+            period = timestamp - self._timestamp
+        self._timestamp = timestamp
+        
+        derivative = (value - self._value) / period
+        self._derivative += self._alpha(self.d_cutoff, period) * (derivative - self._derivative)
+        
+        cutoff = self.min_cutoff + self.beta * abs(self._derivative)
+        self._value += self._alpha(cutoff, period) * (value - self._value)
+        return self._value
+    
+    def reset(self):
+        self._value = None
+        self._derivative = 0.0
+        self._timestamp = None
+
+
+# Tipos disponibles en ANGLE_FILTERS
+FILTER_TYPES = {
+    PassthroughFilter.name: PassthroughFilter,
+    RollingMedianFilter.name: RollingMedianFilter,
+    ExponentialMovingAverage.name: ExponentialMovingAverage,
+    OneEuroFilter.name: OneEuroFilter,
+}
+
+
+def create_filter(spec: FilterSpec) -> AngleFilter:
+    """
+    Filtro nuevo a partir de su especificación
+    
+    Args:
+        spec: None / 'none', nombre del tipo ('median', 'ema', 'one_euro')
+            o dict {'type': ..., **parámetros}
+    
+    Raises:
+        ValueError: Tipo desconocido o parámetros inválidos
+    """
+    if spec is None:
+        return PassthroughFilter()
+    
+    if isinstance(spec, str):
+        filter_type, params = spec, {}
+    else:
+        params = dict(spec)
+        filter_type = params.pop('type', 'none')
+    
+    filter_class = FILTER_TYPES.get(filter_type)
+    if filter_class is None:
+        raise ValueError(f"Filtro de ángulo desconocido: '{filter_type}' (disponibles: {', '.join(FILTER_TYPES)})")
+    
+    try:
+        return filter_class(**params)
+    except TypeError as e:
+        raise ValueError(f"Parámetros inválidos para el filtro '{filter_type}': {e}") from e
+
+
+class AngleFilterBank:
+    """
+    Un filtro por canal de ángulo, según la configuración
+    
+    Los canales sin entrada propia usan 'default' (o el default del
+    constructor si la configuración no lo define).
+    """
+    
+    def __init__(self, config: Optional[Dict[str, FilterSpec]] = None, default: FilterSpec = None):
+        """
+        Args:
+            config: {canal: spec} (ver create_filter); None = default para todos
+            default: Spec de los canales no configurados
+        """
+        self.config = dict(config or {})
+        self.default = self.config.pop('default', default)
+        self._filters: Dict[str, AngleFilter] = {}
+        
+        # Validar al construir (no con el primer frame del stream)
+        for spec in (self.default, *self.config.values()):
+            create_filter(spec)
+    
+    def get(self, channel: str) -> AngleFilter:
+        """Filtro del canal (se crea la primera vez)"""
+        angle_filter = self._filters.get(channel)
+        if angle_filter is None:
+            angle_filter = create_filter(self.config.get(channel, self.default))
+            self._filters[channel] = angle_filter
+        return angle_filter
+    
+    def apply(self, channel: str, value: float, timestamp: Optional[float] = None) -> float:
+        """Filtra una muestra del canal"""
+        return self.get(channel).filter(value, timestamp)
+    
+    def reset(self, channel: Optional[str] = None):
+        """Reinicia un canal o todos"""
+        if channel is not None:
+            if channel in self._filters:
+                self._filters[channel].reset()
+            return
+        for angle_filter in self._filters.values():
+            angle_filter.reset()
+    
+    def describe(self) -> Dict[str, str]:
+        """{canal: tipo de filtro} de los canales usados"""
+        return {channel: angle_filter.name for channel, angle_filter in self._filters.items()}
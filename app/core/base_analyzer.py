@@ -2,10 +2,13 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import math
+import time
 from abc import ABC, abstractmethod
-from collections import deque
-from PIL import Image, ImageDraw, ImageFont
 from .mediapipe_config import MediaPipeConfig
+from .landmark_frame import LandmarkFrame
+from .angle_engine import three_point_angle
+from .angle_filters import AngleFilterBank
+from .text_renderer import get_text_renderer
 
 class BaseJointAnalyzer(ABC):
     """
@@ -14,7 +17,16 @@ class BaseJointAnalyzer(ABC):
     ✅ CONSERVA todas las funciones que funcionan perfecto
     """
     
-    def __init__(self, joint_name):
+    # Filtro por defecto: mediana de 5 (devuelve el valor crudo con < 3 muestras)
+    DEFAULT_ANGLE_FILTER = {'type': 'median', 'window': 5, 'min_samples': 3}
+    
+    def __init__(self, joint_name, angle_filters=None):
+        """
+        Args:
+            joint_name: Nombre de la articulación
+            angle_filters: Filtro por canal de ángulo (ver AngleFilterBank);
+                None = DEFAULT_ANGLE_FILTER para todos
+        """
         self.joint_name = joint_name
         
         # � CONFIGURACIÓN OPTIMIZADA DE MEDIAPIPE
@@ -31,71 +43,45 @@ class BaseJointAnalyzer(ABC):
         print(f"🎯 Modelo complexity: {self.config['model_complexity']}")
         print(f"🎯 Detection confidence: {self.config['min_detection_confidence']}")
         
-        # 🔄 TU SISTEMA DE FILTROS (PERFECTO - NO CAMBIAR)
-        self.angle_filters = {}
+        # 🔄 FILTROS TEMPORALES (un filtro con estado por canal)
+        self.angle_filters = AngleFilterBank(angle_filters, default=self.DEFAULT_ANGLE_FILTER)
     
     # ✅ TU FUNCIÓN EXACTA - MATEMÁTICA CORRECTA
     def calculate_angle_biomechanical(self, point1, point2, point3):
         """
         Cálculo biomecánico correcto
         MIGRADO EXACTO desde test_elbow_upper_body.py
-        """
-        vector1 = np.array(point1) - np.array(point2)
-        vector2 = np.array(point3) - np.array(point2)
-        
-        dot_product = np.dot(vector1, vector2)
-        magnitude1 = np.linalg.norm(vector1)
-        magnitude2 = np.linalg.norm(vector2)
         
-        if magnitude1 * magnitude2 == 0:
-            return 0
-        
-        cos_angle = dot_product / (magnitude1 * magnitude2)
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
-        angle = np.arccos(cos_angle)
-        return np.degrees(angle)
+        Misma aritmética que angle_engine.three_point_angles (por lotes)
+        """
+        return three_point_angle(point1, point2, point3)
     
     # ✅ TU FILTRO EXACTO - FUNCIONA PERFECTO
     def apply_temporal_filter(self, new_angle, filter_name):
         """
         Filtro temporal para suavizar ángulos
         MIGRADO EXACTO desde test_elbow_upper_body.py
-        """
-        if filter_name not in self.angle_filters:
-            self.angle_filters[filter_name] = deque(maxlen=5)
-        
-        filter_queue = self.angle_filters[filter_name]
-        filter_queue.append(new_angle)
         
-        if len(filter_queue) < 3:
-            return new_angle  # Devuelve original si no hay suficientes datos
-        
-        # Filtro mediana simple - elimina valores extremos
-        return np.median(list(filter_queue))
+        El filtro de cada canal sale de angle_filters (por defecto la misma
+        mediana de 5 que antes, sin reconstruir la ventana en cada frame)
+        """
+        return self.angle_filters.apply(filter_name, new_angle, time.time())
     
     # ✅ TU FUNCIÓN PILLOW EXACTA - SÍMBOLOS UNICODE PERFECTOS
     def add_text_with_pillow(self, frame, text, position, font_size=20, color=(255, 255, 255)):
-        """🎨 Agregar texto con PIL (símbolos Unicode correctos)"""
+        """
+        🎨 Agregar texto Unicode (símbolos como ° correctos)
+        
+        Usa el atlas de glifos de text_renderer: mezcla solo el rectángulo
+        del texto, sin convertir ni copiar el frame completo y sin cargar la
+        fuente en cada llamada. Dibuja SOBRE el frame recibido y devuelve ese
+        mismo array (igual que el fallback de OpenCV); el llamador puede
+        seguir reasignando el resultado como con la versión de PIL.
+        El color se interpreta como RGB (igual que el fill de Pillow).
+        """
         
         try:
-            from PIL import Image, ImageDraw, ImageFont
-            import numpy as np
-            
-            # Convertir a PIL
-            pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            draw = ImageDraw.Draw(pil_image)
-            
-            # Fuente
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
-            
-            # Dibujar texto
-            draw.text(position, text, font=font, fill=color)
-            
-            # Convertir de vuelta
-            return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+            return get_text_renderer().draw(frame, text, position, font_size, tuple(color)[::-1])
             
         except Exception as e:
             # Fallback a OpenCV si PIL falla
@@ -142,19 +128,17 @@ class BaseJointAnalyzer(ABC):
         """
         Verifica que los puntos necesarios estén visibles
         MIGRADO EXACTO desde test_elbow_upper_body.py
+        
+        landmarks: LandmarkFrame (o lista de landmarks de MediaPipe)
         """
         if required_points is None:
             required_points = self.get_required_landmarks()
         
-        for point_idx in required_points:
-            if landmarks[point_idx].visibility < 0.3:
-                return False
-        return True
+        return LandmarkFrame.coerce(landmarks).all_visible(required_points, 0.3)
     
     # ⏰ MÉTODO PARA GENERAR TIMESTAMP
     def get_timestamp(self):
         """⏰ Genera timestamp para el análisis"""
-        import time
         if not hasattr(self, '_start_time'):
             self._start_time = time.time()
         return time.time() - self._start_time
@@ -0,0 +1,498 @@
+"""
+📦 BATCH ANALYSIS - ANÁLISIS OFFLINE DE VIDEOS GRABADOS
+========================================================
+Motor de análisis por lotes: corre los analyzers existentes sobre videos
+ya grabados, sin stream ni overlay, un video por proceso worker.
+
+FLUJO:
+- Cada worker abre su video con VideoFileSource (sin loop, sin ritmo de
+  tiempo real) y llama analyzer.process_landmarks_only() frame a frame
+- Por frame se guarda la serie de ángulos (más confianza, lado, postura)
+- Por video se arma el resumen de sesión: ángulo máx/mín y ROM robustos
+  (P5/P95 del analyzer, como /analysis/stop), quality_score, repeticiones,
+  lado predominante, confianza media, frames con detección, FPS de proceso
+- El proceso padre junta resultados, reporta progreso y escribe CSV/Parquet
+  (y opcionalmente rom_session/angle_measurement)
+
+Uso:
+    from app.core.batch_analysis import run_batch
+    summaries, frames = run_batch(['video1.mp4'], 'shoulder_profile', workers=4)
+
+CLI: scripts/batch_analyze.py
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import csv
+import time
+import queue
+import logging
+import threading
+import multiprocessing
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+# Extensiones de video aceptadas al recibir un directorio
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Cada cuántos frames un worker reporta progreso al proceso padre
+PROGRESS_EVERY = 30
+
+# Por tipo de analyzer: series de ángulos y valores de rom_session
+BATCH_ANALYZERS = {
+    'shoulder_profile': {
+        'angle_fields': ('angle',),
+        'segment': 'shoulder',
+        'exercise_type': 'flexion',
+        'camera_view': 'lateral'
+    },
+    'shoulder_frontal': {
+        'angle_fields': ('left_angle', 'right_angle'),
+        'segment': 'shoulder',
+        'exercise_type': 'abduction',
+        'camera_view': 'frontal'
+    }
+}
+
+# Campos de get_stats_summary() que van al resumen y a rom_session
+SESSION_STATS_FIELDS = ('max_angle', 'min_angle', 'rom_value', 'quality_score')
+
+# Lado del analyzer (texto del HUD) → valor de rom_session.side
+SIDE_VALUES = {
+    'HOMBRO IZQUIERDO': 'left',
+    'HOMBRO DERECHO': 'right'
+}
+
+
+def _analyzer_class(analyzer_type: str):
+    from app.analyzers import ShoulderProfileAnalyzer, ShoulderFrontalAnalyzer
+    
+    return {
+        'shoulder_profile': ShoulderProfileAnalyzer,
+        'shoulder_frontal': ShoulderFrontalAnalyzer
+    }[analyzer_type]
+
+
+def find_videos(inputs: List[str]) -> List[Path]:
+    """
+    Expande directorios y globs a la lista ordenada de videos
+    
+    Args:
+        inputs: Rutas de archivos, directorios o patrones glob
+    """
+    videos = []
+    
+    for item in inputs:
+        path = Path(item)
+        
+        if path.is_dir():
+            videos.extend(p for p in path.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+        elif path.is_file():
+            videos.append(path)
+        else:
+            # Patrón glob (relativo al directorio actual o absoluto)
+            anchor = Path(path.anchor) if path.is_absolute() else Path('.')
+            pattern = str(path.relative_to(anchor)) if path.is_absolute() else item
+            videos.extend(p for p in anchor.glob(pattern) if p.suffix.lower() in VIDEO_EXTENSIONS)
+    
+    return sorted(set(p.resolve() for p in videos))
+
+
+def _frame_confidence(data: Dict[str, Any], payload: Dict[str, Any]) -> Optional[float]:
+    """Confianza del analyzer, o visibilidad media de los landmarks si no la reporta"""
+    if 'confidence' in data:
+        return float(data['confidence'])
+    
+    landmarks = payload.get('landmarks') or []
+    if not landmarks:
+        return None
+    return round(sum(lm[2] for lm in landmarks) / len(landmarks), 3)
+
+
+def summarize(video: str, analyzer_type: str, rows: List[Dict[str, Any]], final_state: Dict[str, Any],
+              fps: float, elapsed: float, stats: Optional[Dict[str, Any]] = None,
+              repetitions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Resumen de sesión de un video a partir de su serie por frame
+    
+    Los ángulos se toman en valor absoluto (igual que max_rom en vivo) y solo
+    de frames con landmarks detectados.
+    
+    Args:
+        stats: analyzer.get_stats_summary(); si está, max_angle / min_angle /
+            rom_value son los robustos (P5/P95) y se agrega quality_score,
+            igual que lo que persiste /analysis/stop. Sin él, los extremos
+            crudos de la serie.
+        repetitions: analyzer.get_repetition_summary() (conteo de repeticiones)
+    """
+    spec = BATCH_ANALYZERS[analyzer_type]
+    detected = [row for row in rows if row['landmarks_detected']]
+    
+    summary = {
+        'video': video,
+        'analyzer': analyzer_type,
+        'frames': len(rows),
+        'frames_detected': len(detected),
+        'detection_rate': round(len(detected) / len(rows), 3) if rows else 0.0,
+        'duration': round(len(rows) / fps, 2) if fps else None,
+        'processing_fps': round(len(rows) / elapsed, 1) if elapsed > 0 else None
+    }
+    
+    # Máximo, mínimo y rango por serie de ángulos
+    all_values = []
+    for field in spec['angle_fields']:
+        values = [abs(row[field]) for row in detected if row.get(field) is not None]
+        all_values.extend(values)
+        summary[f'{field}_max'] = round(max(values), 2) if values else None
+        summary[f'{field}_min'] = round(min(values), 2) if values else None
+    
+    if stats is not None:
+        for field in SESSION_STATS_FIELDS:
+            summary[field] = stats[field]
+    else:
+        summary['max_angle'] = round(max(all_values), 2) if all_values else None
+        summary['min_angle'] = round(min(all_values), 2) if all_values else None
+        summary['rom_value'] = (
+            round(summary['max_angle'] - summary['min_angle'], 2) if all_values else None
+        )
+        summary['quality_score'] = None
+    summary['repetitions'] = repetitions['repetitions'] if repetitions is not None else None
+    
+    # ROM según el propio analyzer (solo frames medidos, como en vivo)
+    for key in ('max_rom', 'left_max_rom', 'right_max_rom', 'asymmetry'):
+        if key in final_state:
+            summary[key] = final_state[key]
+    
+    # Lado predominante
+    sides = Counter(row['side'] for row in detected if row.get('side'))
+    if len(spec['angle_fields']) > 1:
+        summary['side'] = 'bilateral'
+    elif sides:
+        summary['side'] = SIDE_VALUES.get(sides.most_common(1)[0][0])
+    else:
+        summary['side'] = None
+    
+    confidences = [row['confidence'] for row in detected if row.get('confidence') is not None]
+    summary['mean_confidence'] = round(sum(confidences) / len(confidences), 3) if confidences else None
+    summary['error'] = None
+    
+    return summary
+
+
+def analyze_video(
+    video: str,
+    analyzer_type: str,
+    progress_queue=None
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Analiza un video completo (se ejecuta dentro de un worker)
+    
+    Args:
+        video: Ruta del video
+        analyzer_type: Clave de BATCH_ANALYZERS
+        progress_queue: Cola donde se publica (video, frames procesados)
+    
+    Returns:
+        tuple: (resumen de sesión, filas por frame)
+    """
+    import cv2
+    from hardware.frame_sources import VideoFileSource
+    
+    # Un hilo de OpenCV por worker: el paralelismo lo da el pool
+    cv2.setNumThreads(1)
+    
+    spec = BATCH_ANALYZERS[analyzer_type]
+    source = VideoFileSource(video, loop=False, realtime=False)
+    if not source.isOpened():
+        raise RuntimeError(f"No se pudo abrir el video {video}")
+    
+    analyzer = _analyzer_class(analyzer_type)(
+        processing_width=640,
+        processing_height=480,
+        show_skeleton=False
+    )
+    
+    rows = []
+    started = time.time()
+    
+    try:
+        while True:
+            ret, frame = source.read()
+            if not ret:
+                break
+            
+            # Solo datos: sin copiar el frame ni dibujar overlay
+            payload = analyzer.process_landmarks_only(frame)
+            data = analyzer.get_current_data()
+            frame_number = len(rows)
+            
+            row = {
+                'video': video,
+                'frame': frame_number,
+                'timestamp': round(frame_number / source.fps, 3),
+                'landmarks_detected': bool(data['landmarks_detected']),
+                'posture_valid': bool(data['posture_valid']),
+                'confidence': _frame_confidence(data, payload)
+            }
+            for field in spec['angle_fields']:
+                row[field] = data[field] if data['landmarks_detected'] else None
+            if 'side' in data:
+                row['side'] = data['side'] if data['landmarks_detected'] else None
+            rows.append(row)
+            
+            if progress_queue is not None and len(rows) % PROGRESS_EVERY == 0:
+                progress_queue.put((video, len(rows)))
+        
+        final_state = analyzer.get_current_data()
+        stats = analyzer.get_stats_summary() if hasattr(analyzer, 'get_stats_summary') else None
+        repetitions = (
+            analyzer.get_repetition_summary() if hasattr(analyzer, 'get_repetition_summary') else None
+        )
+    finally:
+        analyzer.cleanup()
+        source.release()
+    
+    if progress_queue is not None:
+        progress_queue.put((video, len(rows)))
+    
+    summary = summarize(
+        video, analyzer_type, rows, final_state, source.fps, time.time() - started,
+        stats=stats, repetitions=repetitions
+    )
+    return summary, rows
+
+
+class BatchProgress:
+    """Agrega el progreso de los workers y lo reporta periódicamente"""
+    
+    def __init__(self, total_videos: int, report: Callable[[str], None] = print, interval: float = 2.0):
+        self.total_videos = total_videos
+        self.report = report
+        self.interval = interval
+        self.frames_by_video: Dict[str, int] = {}
+        self.videos_done = 0
+        self.started = time.time()
+        self._last_report = 0.0
+    
+    @property
+    def frames(self) -> int:
+        return sum(self.frames_by_video.values())
+    
+    @property
+    def fps(self) -> float:
+        elapsed = time.time() - self.started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+    
+    def update(self, video: str, frames: int):
+        self.frames_by_video[video] = frames
+        
+        if time.time() - self._last_report >= self.interval:
+            self._last_report = time.time()
+            self.report(
+                f"⏳ {self.videos_done}/{self.total_videos} videos | "
+                f"{self.frames} frames | {self.fps:.1f} frames/s"
+            )
+    
+    def video_done(self, summary: Dict[str, Any]):
+        self.videos_done += 1
+        
+        if summary.get('error'):
+            self.report(f"❌ [{self.videos_done}/{self.total_videos}] {Path(summary['video']).name}: {summary['error']}")
+            return
+        
+        self.report(
+            f"✅ [{self.videos_done}/{self.total_videos}] {Path(summary['video']).name}: "
+            f"{summary['frames']} frames, ROM {summary['rom_value']}°, "
+            f"lado {summary['side']}, {summary['processing_fps']} frames/s"
+        )
+
+
+def _drain(progress_queue, progress: BatchProgress, stop_event: threading.Event):
+    """Hilo del proceso padre: consume los reportes de progreso de los workers"""
+    while not stop_event.is_set():
+        try:
+            video, frames = progress_queue.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        except (EOFError, OSError):
+            break
+        progress.update(video, frames)
+
+
+def run_batch(
+    videos: List[Path],
+    analyzer_type: str,
+    workers: int = 1,
+    on_result: Optional[Callable[[Dict[str, Any], List[Dict[str, Any]]], None]] = None,
+    report: Callable[[str], None] = print
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Analiza varios videos en un pool de procesos (un video por worker)
+    
+    Args:
+        videos: Videos a analizar
+        analyzer_type: Clave de BATCH_ANALYZERS
+        workers: Procesos worker (1 = en este proceso, sin pool)
+        on_result: Callback (resumen, filas) al terminar cada video (en el
+            proceso padre; ej: guardar en la base de datos)
+        report: Función para los mensajes de progreso
+    
+    Returns:
+        tuple: (resúmenes en el orden de videos, filas por frame de todos)
+    """
+    if analyzer_type not in BATCH_ANALYZERS:
+        raise ValueError(f"Analyzer desconocido: {analyzer_type} (usar {', '.join(BATCH_ANALYZERS)})")
+    
+    progress = BatchProgress(len(videos), report=report)
+    results: Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]] = {}
+    
+    def collect(video: str, outcome):
+        summary, rows = outcome
+        results[video] = (summary, rows)
+        progress.video_done(summary)
+        if on_result is not None and not summary.get('error'):
+            on_result(summary, rows)
+    
+    def failed(video: str, error: Exception):
+        return {'video': video, 'analyzer': analyzer_type, 'frames': 0, 'error': str(error)}, []
+    
+    if workers <= 1 or len(videos) <= 1:
+        local_queue = queue.Queue()
+        for video in map(str, videos):
+            try:
+                outcome = analyze_video(video, analyzer_type, local_queue)
+            except Exception as e:
+                outcome = failed(video, e)
+            
+            while not local_queue.empty():
+                progress.update(*local_queue.get())
+            collect(video, outcome)
+    else:
+        # spawn: MediaPipe/TFLite no son seguros tras fork con hilos activos
+        context = multiprocessing.get_context('spawn')
+        manager = context.Manager()
+        progress_queue = manager.Queue()
+        stop_event = threading.Event()
+        drainer = threading.Thread(target=_drain, args=(progress_queue, progress, stop_event), daemon=True)
+        drainer.start()
+        
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(videos)), mp_context=context) as pool:
+                futures = {
+                    pool.submit(analyze_video, str(video), analyzer_type, progress_queue): str(video)
+                    for video in videos
+                }
+                
+                for future in as_completed(futures):
+                    video = futures[future]
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = failed(video, e)
+                    collect(video, outcome)
+        finally:
+            stop_event.set()
+            drainer.join(timeout=1.0)
+            manager.shutdown()
+    
+    report(
+        f"🏁 {len(videos)} videos, {progress.frames} frames en "
+        f"{time.time() - progress.started:.1f}s ({progress.fps:.1f} frames/s)"
+    )
+    
+    summaries = [results[str(video)][0] for video in videos]
+    frames = [row for video in videos for row in results[str(video)][1]]
+    return summaries, frames
+
+
+def write_table(rows: List[Dict[str, Any]], path: Path, fmt: str = 'csv'):
+    """
+    Escribe filas como CSV (módulo csv) o Parquet (requiere pandas + pyarrow)
+    
+    Raises:
+        RuntimeError: Si se pide Parquet sin pandas/pyarrow instalados
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Columnas en orden de aparición (las filas de errores tienen menos)
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    
+    if fmt == 'parquet':
+        try:
+            import pandas as pd
+        except ImportError:
+            raise RuntimeError("Parquet requiere pandas y pyarrow (pip install pandas pyarrow)")
+        
+        pd.DataFrame(rows, columns=columns).to_parquet(path, index=False)
+        return
+    
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def save_to_database(db_manager, summary: Dict[str, Any], rows: List[Dict[str, Any]],
+                     subject_id: int, user_id: int) -> int:
+    """
+    Guarda un video analizado como rom_session + sus angle_measurement
+    
+    Sesión y mediciones van en una sola transacción: un video queda
+    guardado completo o no queda.
+    
+    Returns:
+        int: ID de la sesión creada
+    """
+    from database.database_manager import ROMSession, AngleMeasurement
+    
+    spec = BATCH_ANALYZERS[summary['analyzer']]
+    
+    # Un ángulo por frame con detección (frontal: el lado de mayor ángulo)
+    measurements = []
+    for row in rows:
+        values = [abs(row[field]) for field in spec['angle_fields'] if row.get(field) is not None]
+        if not row['landmarks_detected'] or not values:
+            continue
+        
+        measurements.append({
+            'timestamp': row['timestamp'],
+            'frame_number': row['frame'],
+            'angle_value': min(max(values), 360.0),
+            'confidence': row['confidence']
+        })
+    
+    with db_manager.get_session() as session:
+        rom_session = ROMSession(
+            subject_id=subject_id,
+            user_id=user_id,
+            segment=spec['segment'],
+            exercise_type=spec['exercise_type'],
+            camera_view=spec['camera_view'],
+            side=summary['side'],
+            max_angle=summary['max_angle'],
+            min_angle=summary['min_angle'],
+            rom_value=summary['rom_value'],
+            quality_score=summary['quality_score'],
+            repetitions=summary['repetitions'] or 0,
+            duration=summary['duration'],
+            video_path=summary['video'],
+            notes=(
+                f"Análisis por lotes ({summary['analyzer']}, "
+                f"{summary['frames_detected']}/{summary['frames']} frames con detección)"
+            )
+        )
+        session.add(rom_session)
+        session.flush()
+        session_id = rom_session.id
+        
+        session.bulk_insert_mappings(
+            AngleMeasurement,
+            [dict(measurement, session_id=session_id) for measurement in measurements]
+        )
+    
+    return session_id
@@ -1,18 +1,80 @@
 import cv2
+import os
 import time
 import json
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List, Optional, Tuple
 
+# 💾 Caché de descubrimiento (en instance/, junto a logs y exports)
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent.parent / 'instance' / 'camera_cache.json'
+CACHE_VERSION = 1
+
+# 🐧 Linux: nombre y puerto USB de cada /dev/videoN (índice de OpenCV = N)
+V4L_SYSFS_DIR = Path('/sys/class/video4linux')
+
+
+def _device_identity(camera_id: int) -> str:
+    """
+    🪪 Identidad estable de un dispositivo de video
+    
+    En Linux: nombre del driver + ruta del puerto USB (sysfs), así una
+    cámara desenchufada y reemplazada por otra en el mismo índice cambia de
+    identidad. En otros sistemas OpenCV no expone nada sin abrir el
+    dispositivo: la identidad es solo el índice.
+    """
+    sys_dir = V4L_SYSFS_DIR / f'video{camera_id}'
+    
+    try:
+        name = (sys_dir / 'name').read_text().strip()
+        port = os.path.realpath(sys_dir / 'device')
+        return f"{name}@{port}"
+    except OSError:
+        return f"index:{camera_id}"
+
+
+def _devices_fingerprint() -> Optional[List[str]]:
+    """
+    🔌 Huella de los dispositivos conectados (detecta hot-plug)
+    
+    Returns:
+        Lista ordenada de identidades, o None si el sistema no permite
+        enumerarlos sin abrirlos (la caché se invalida entonces por antigüedad)
+    """
+    if not V4L_SYSFS_DIR.is_dir():
+        return None
+    
+    return sorted(
+        _device_identity(int(entry.name[len('video'):]))
+        for entry in V4L_SYSFS_DIR.iterdir()
+        if entry.name.startswith('video') and entry.name[len('video'):].isdigit()
+    )
+
+
 class SmartCameraManager:
     """
     🧠 GESTOR INTELIGENTE DE CÁMARAS
     🔍 Detecta automáticamente la mejor cámara disponible
     📱 Funciona con Camo, DroidCam, OBS, webcams normales
+    ⚡ Prueba los índices EN PARALELO y guarda el resultado en disco
+       (instance/camera_cache.json): los arranques siguientes y
+       get_best_camera() responden desde la caché sin abrir cámaras
     """
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None, cache_max_age: float = 7 * 24 * 3600):
+        """
+        Args:
+            cache_path: Archivo JSON de la caché (None = instance/camera_cache.json)
+            cache_max_age: Segundos de validez de la caché; en Linux también se
+                invalida al conectar/desconectar cámaras (hot-plug)
+        """
         self.detected_cameras = {}
         self.camera_cache = {}
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.cache_max_age = cache_max_age
+        self._fingerprint: Optional[List[str]] = None
+        self._scan_lock = threading.Lock()
         
         # 🎯 ORDEN DE PREFERENCIA (mejor primero)
         self.camera_priorities = {
@@ -50,20 +112,72 @@ class SmartCameraManager:
             }
         }
     
-    def scan_all_cameras(self, max_cameras: int = 4, timeout_per_camera: float = 1.0) -> Dict:
+    def scan_all_cameras(
+        self,
+        max_cameras: int = 4,
+        timeout_per_camera: float = 1.0,
+        use_cache: bool = True,
+        force_rescan: bool = False,
+        scan_timeout: float = 10.0
+    ) -> Dict:
         """
         🔍 ESCANEA TODAS las cámaras disponibles
         📊 Clasifica por calidad, tipo y rendimiento
+        ⚡ Un hilo por índice: el escaneo tarda lo que la cámara más lenta
+        💾 Con use_cache, responde desde la caché en disco si sigue vigente
+        
+        Args:
+            max_cameras: Índices a probar (0..max_cameras-1)
+            timeout_per_camera: Segundos máximos para abrir y configurar cada una
+            use_cache: Leer/escribir la caché en disco
+            force_rescan: Ignorar la caché y volver a probar (botón "re-escanear")
+            scan_timeout: Segundos máximos del escaneo completo; las cámaras
+                que no respondan se dan por no disponibles y la caché no se guarda
         """
+        with self._scan_lock:
+            if use_cache and not force_rescan and self._load_cache(max_cameras):
+                print(f"💾 Cámaras desde caché: {len(self.detected_cameras)} detectadas "
+                      f"(re-escanear con force_rescan=True)")
+                return self.detected_cameras
+            
+            return self._scan(max_cameras, timeout_per_camera, use_cache, scan_timeout)
+    
+    def rescan(self, max_cameras: int = 4, timeout_per_camera: float = 1.0) -> Dict:
+        """🔄 Re-escaneo explícito: invalida la caché y prueba todas las cámaras"""
+        self.invalidate_cache()
+        return self.scan_all_cameras(max_cameras, timeout_per_camera, force_rescan=True)
+    
+    def _scan(self, max_cameras: int, timeout_per_camera: float, use_cache: bool, scan_timeout: float) -> Dict:
+        """🔬 Prueba los índices en paralelo (llamar con _scan_lock tomado)"""
         print("🔍 Iniciando escaneo inteligente de cámaras...")
         print("=" * 60)
         
+        started = time.time()
+        fingerprint = _devices_fingerprint()
         detected = {}
         
-        for camera_id in range(max_cameras):
-            print(f"📷 Probando cámara {camera_id}...", end=" ", flush=True)
+        executor = ThreadPoolExecutor(max_workers=max(max_cameras, 1), thread_name_prefix='camera-probe')
+        futures = {
+            camera_id: executor.submit(self._test_camera, camera_id, timeout_per_camera)
+            for camera_id in range(max_cameras)
+        }
+        _done, pending = wait(futures.values(), timeout=scan_timeout)
+        
+        # No esperar a probes colgados (drivers que no responden)
+        executor.shutdown(wait=False)
+        
+        for camera_id, future in futures.items():
+            print(f"📷 Cámara {camera_id}:", end=" ")
+            
+            if future in pending:
+                print(f"⏱️ Sin respuesta en {scan_timeout:.0f}s")
+                continue
             
-            camera_info = self._test_camera(camera_id, timeout_per_camera)
+            try:
+                camera_info = future.result()
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                continue
             
             if camera_info:
                 detected[camera_id] = camera_info
@@ -79,13 +193,102 @@ class SmartCameraManager:
                 print("❌ No disponible")
         
         self.detected_cameras = detected
+        self._fingerprint = fingerprint
         
         print("=" * 60)
-        print(f"✅ Escaneo completado: {len(detected)} cámaras detectadas")
+        print(f"✅ Escaneo completado: {len(detected)} cámaras detectadas en {time.time() - started:.1f}s")
+        
+        # Un escaneo incompleto no se guarda (los probes colgados se reintentan)
+        if use_cache and not pending:
+            self._save_cache(max_cameras, fingerprint)
         
         return detected
     
-    def _test_camera(self, camera_id: int, timeout: float) -> Optional[Dict]:
+    # ------------------------------------------------------------------
+    # 💾 CACHÉ EN DISCO
+    # ------------------------------------------------------------------
+    
+    def _save_cache(self, max_cameras: int, fingerprint: Optional[List[str]]):
+        """💾 Guarda el resultado del escaneo, indexado por identidad de dispositivo"""
+        self.camera_cache = {
+            "version": CACHE_VERSION,
+            "created": time.time(),
+            "max_cameras": max_cameras,
+            "fingerprint": fingerprint,
+            "cameras": {
+                _device_identity(camera_id): info
+                for camera_id, info in self.detected_cameras.items()
+            }
+        }
+        
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self.camera_cache, indent=2, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché de cámaras: {e}")
+    
+    def _load_cache(self, max_cameras: Optional[int] = None) -> bool:
+        """
+        📂 Carga la caché si sigue vigente
+        
+        Se descarta si: es de otra versión, es más vieja que cache_max_age,
+        escaneó menos índices de los pedidos, cambió la huella de dispositivos
+        (hot-plug) o alguna cámara ya no tiene la misma identidad en su índice.
+        
+        Returns:
+            bool: True si detected_cameras quedó cargado desde la caché
+        """
+        try:
+            cache = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+        
+        if cache.get("version") != CACHE_VERSION:
+            return False
+        
+        if time.time() - cache.get("created", 0) > self.cache_max_age:
+            return False
+        
+        if max_cameras is not None and cache.get("max_cameras", 0) < max_cameras:
+            return False
+        
+        fingerprint = _devices_fingerprint()
+        if fingerprint != cache.get("fingerprint"):
+            print("🔌 Cambió el conjunto de cámaras conectadas - caché invalidada")
+            return False
+        
+        detected = {}
+        for identity, info in cache.get("cameras", {}).items():
+            if _device_identity(info["id"]) != identity:
+                return False
+            if max_cameras is None or info["id"] < max_cameras:
+                detected[info["id"]] = info
+        
+        self.camera_cache = cache
+        self.detected_cameras = detected
+        self._fingerprint = fingerprint
+        return True
+    
+    def is_cache_stale(self) -> bool:
+        """🔌 True si las cámaras detectadas ya no corresponden a las conectadas"""
+        return self._fingerprint != _devices_fingerprint()
+    
+    def invalidate_cache(self):
+        """🗑️ Borra la caché en disco y en memoria"""
+        self.camera_cache = {}
+        self.detected_cameras = {}
+        self._fingerprint = None
+        
+        try:
+            self.cache_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ No se pudo borrar la caché de cámaras: {e}")
+    
+    def _test_camera(self, camera_id: int, timeout: float = 1.0) -> Optional[Dict]:
         """🔬 Prueba una cámara específica y extrae información"""
         
         cap = None
@@ -168,6 +371,11 @@ class SmartCameraManager:
             if "obsensor_uvc_stream_channel" not in str(e):
                 print(f"Error desconocido: {e}")
             return None
+        
+        finally:
+            # Liberar SIEMPRE el dispositivo (si no, queda tomado hasta el GC)
+            if cap:
+                cap.release()
     
     def _classify_camera(self, camera_id: int, width: int, height: int, fps: int, backend: str) -> Dict:
         """🏷️ Clasifica una cámara según sus características"""
@@ -280,8 +488,14 @@ class SmartCameraManager:
         """
         🎯 SELECCIONA automáticamente la mejor cámara disponible
         📊 Basado en calidad, tipo y recomendaciones
+        ⚡ Sin escaneo previo en este proceso, responde desde la caché en disco
         """
         
+        # Sin escaneo en memoria o con cámaras (des)conectadas: recargar la caché
+        if not self.detected_cameras or self.is_cache_stale():
+            if not self._load_cache():
+                self.detected_cameras = {}
+        
         if not self.detected_cameras:
             print("⚠️ No hay cámaras escaneadas. Ejecuta scan_all_cameras() primero.")
             return None
@@ -449,6 +663,8 @@ def auto_setup_camera_with_fallback() -> int:
     """
     🎯 SETUP AUTOMÁTICO CON FALLBACK INTELIGENTE
     ✅ Prueba cámaras hasta encontrar una que funcione realmente
+    ⚡ El escaneo sale de la caché y las verificaciones corren en paralelo
+       (se elige la primera que funcione en orden de calidad)
     """
     
     print("🚀 CONFIGURACIÓN AUTOMÁTICA DE CÁMARA CON FALLBACK")
@@ -477,6 +693,14 @@ def auto_setup_camera_with_fallback() -> int:
     print(f"\n🔄 PROBANDO CÁMARAS EN ORDEN DE CALIDAD:")
     print("=" * 40)
     
+    # ✅ VERIFICACIÓN EN TIEMPO REAL de todas a la vez
+    executor = ThreadPoolExecutor(max_workers=len(sorted_cameras), thread_name_prefix='camera-verify')
+    verifications = {
+        camera["id"]: executor.submit(manager.verify_camera_works_realtime, camera["id"])
+        for camera in sorted_cameras
+    }
+    executor.shutdown(wait=False)
+    
     for i, camera in enumerate(sorted_cameras):
         camera_id = camera["id"]
         
@@ -484,8 +708,7 @@ def auto_setup_camera_with_fallback() -> int:
         print(f"   📐 {camera['resolution']} @ {camera['fps']}fps")
         print(f"   🔍 Verificando funcionamiento real...", end=" ", flush=True)
         
-        # ✅ VERIFICACIÓN EN TIEMPO REAL
-        if manager.verify_camera_works_realtime(camera_id):
+        if verifications[camera_id].result():
             print("✅ ¡FUNCIONA!")
             
             print(f"\n🎯 CÁMARA SELECCIONADA:")
@@ -506,6 +729,10 @@ def auto_setup_camera_with_fallback() -> int:
         else:
             print("❌ No funciona (negro/congelado)")
             print(f"   💡 Saltando a siguiente opción...")
+            
+            # La caché prometía una cámara que ya no funciona: el próximo
+            # arranque vuelve a escanear
+            manager.invalidate_cache()
     
     # 😞 Si ninguna cámara funciona
     print("\n❌ NINGUNA CÁMARA FUNCIONA CORRECTAMENTE")
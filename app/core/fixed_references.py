@@ -12,6 +12,9 @@ import math
 import numpy as np
 import cv2
 
+from .landmark_frame import LandmarkFrame, X, Y
+from .angle_engine import fixed_reference_angle
+
 class FixedSpatialReferences:
     """
     📐 SISTEMA DE REFERENCIAS FIJAS
@@ -25,6 +28,21 @@ class FixedSpatialReferences:
         self.HORIZONTAL_REFERENCE = {"x": 1, "y": 0}     # Vector horizontal derecha
         self.GRAVITY_LINE = {"angle": 90}                # Línea de gravedad (90°)
         
+    def segment_vector(self, landmarks, start_index, end_index):
+        """
+        📏 Vector del segmento start → end en coordenadas normalizadas
+        
+        Args:
+            landmarks: LandmarkFrame (o lista de landmarks de MediaPipe)
+            start_index: Landmark proximal (ej: 11 = hombro izquierdo)
+            end_index: Landmark distal (ej: 13 = codo izquierdo)
+        
+        Returns:
+            dict: {"x": dx, "y": dy} para calculate_angle_with_fixed_reference
+        """
+        start, end = LandmarkFrame.coerce(landmarks).rows((start_index, end_index))
+        return {"x": end[X] - start[X], "y": end[Y] - start[Y]}
+    
     def get_fixed_reference_vector(self, orientation, exercise_type):
         """🎯 Obtener vector de referencia fijo según orientación y ejercicio"""
         
@@ -64,32 +82,15 @@ class FixedSpatialReferences:
         fixed_ref = self.get_fixed_reference_vector(orientation, exercise_type)
         
         # 📐 Calcular ángulo entre vectores
-        # Fórmula: cos(θ) = (A·B) / (|A|*|B|)
-        
-        # Producto punto
-        dot_product = (segment_vector["x"] * fixed_ref["x"] + 
-                      segment_vector["y"] * fixed_ref["y"])
-        
-        # Magnitudes
-        segment_magnitude = math.sqrt(segment_vector["x"]**2 + segment_vector["y"]**2)
-        ref_magnitude = math.sqrt(fixed_ref["x"]**2 + fixed_ref["y"]**2)
-        
-        if segment_magnitude == 0 or ref_magnitude == 0:
-            return 0
-        
-        # Ángulo en radianes
-        cos_angle = dot_product / (segment_magnitude * ref_magnitude)
-        cos_angle = max(-1, min(1, cos_angle))  # Clamp para evitar errores numéricos
-        
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        
-        # 🔄 INVERTIR para estándar goniométrico
+        # Fórmula: cos(θ) = (A·B) / (|A|*|B|), 0 si algún vector mide 0
+        # 🔄 INVERTIDO para estándar goniométrico
         # arccos da: 0° (paralelo arriba) → 180° (paralelo abajo)
         # Goniometría quiere: 0° (abajo) → 180° (arriba)
-        angle_deg = 180 - angle_deg
-        
-        return angle_deg
+        # (misma aritmética que angle_engine.fixed_reference_angles)
+        return fixed_reference_angle(
+            (segment_vector["x"], segment_vector["y"]),
+            (fixed_ref["x"], fixed_ref["y"])
+        )
     
     def draw_fixed_reference_lines(self, frame, orientation, exercise_type, center_point):
         """
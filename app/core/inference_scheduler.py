@@ -0,0 +1,237 @@
+"""
+⏱️ INFERENCE SCHEDULER - INFERENCIA DESACOPLADA DEL DISPLAY
+============================================================
+Ejecuta MediaPipe a una tasa menor que la cámara sin bajar los FPS del stream
+
+PROBLEMA:
+MediaPipeConfig.get_optimized_settings() define 'processing_fps' (5 en
+Railway, 10 local) pero cada frame pasaba igual por pose.process().
+
+SOLUCIÓN:
+- InferenceScheduler decide en qué frames corre MediaPipe:
+    * Tasa fija: processing_fps inferencias por segundo
+    * Presupuesto de tiempo: fracción máxima del tiempo de pared dedicada a
+      inferencia (si una inferencia tarda 40ms con presupuesto 0.5, la
+      siguiente se permite 80ms después)
+- LandmarkExtrapolator predice los landmarks entre inferencias a partir de
+  la velocidad de las dos últimas detecciones (extrapolación lineal acotada)
+- El stream sigue a los FPS de la cámara y el CPU de MediaPipe baja
+  proporcionalmente
+
+Uso:
+    scheduler = InferenceScheduler.from_mediapipe_config()
+    extrapolator = LandmarkExtrapolator()
+    
+    if scheduler.should_infer():
+        results = pose.process(image_rgb)
+        scheduler.record_inference(duration)
+        extrapolator.update(results)
+    else:
+        results = extrapolator.predict()
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import time
+import threading
+import numpy as np
+from collections import deque
+from typing import Optional, Dict, Any
+
+from .mediapipe_config import MediaPipeConfig
+from .landmark_frame import LandmarkFrame, PoseResults
+
+
+class InferenceScheduler:
+    """
+    Decide qué frames pasan por MediaPipe (tasa fija o presupuesto de tiempo)
+    
+    Lo actualiza solo la etapa de inferencia; effective_fps y get_stats()
+    se leen desde otros hilos (render, polling), por eso las ventanas de
+    tiempos se copian bajo un lock.
+    """
+    
+    def __init__(
+        self,
+        target_fps: Optional[float] = None,
+        time_budget: Optional[float] = None
+    ):
+        """
+        Args:
+            target_fps: Inferencias por segundo (None = sin límite por tasa)
+            time_budget: Fracción (0-1] del tiempo dedicada a inferencia
+                (alternativa a target_fps; tiene prioridad si se indica)
+        """
+        if time_budget is not None and not 0 < time_budget <= 1:
+            raise ValueError("time_budget debe estar en (0, 1]")
+        
+        self.target_fps = target_fps
+        self.time_budget = time_budget
+        
+        self._lock = threading.Lock()
+        self._next_inference = 0.0
+        self._inference_times = deque(maxlen=30)
+        self._durations = deque(maxlen=30)
+        self.inferences = 0
+        self.skipped = 0
+    
+    @classmethod
+    def from_mediapipe_config(
+        cls,
+        target_fps: Optional[float] = None,
+        time_budget: Optional[float] = None
+    ) -> 'InferenceScheduler':
+        """
+        Crea el scheduler usando 'processing_fps' de MediaPipeConfig
+        (5 en Railway, 10 local) salvo que se indique otra tasa o presupuesto
+        """
+        if target_fps is None and time_budget is None:
+            target_fps = MediaPipeConfig.get_optimized_settings()['processing_fps']
+        
+        return cls(target_fps=target_fps, time_budget=time_budget)
+    
+    @property
+    def mode(self) -> str:
+        if self.time_budget is not None:
+            return 'budget'
+        if self.target_fps:
+            return 'fixed_rate'
+        return 'every_frame'
+    
+    def should_infer(self, now: Optional[float] = None) -> bool:
+        """
+        Returns:
+            bool: True si este frame debe pasar por MediaPipe
+        """
+        now = now or time.time()
+        
+        if now >= self._next_inference:
+            return True
+        
+        self.skipped += 1
+        return False
+    
+    def record_inference(self, duration: float, started: Optional[float] = None):
+        """
+        Registra una inferencia y programa la siguiente
+        
+        Args:
+            duration: Segundos que tardó pose.process()
+            started: Momento en que empezó la inferencia
+        """
+        started = started or (time.time() - duration)
+        
+        with self._lock:
+            self.inferences += 1
+            self._inference_times.append(started)
+            self._durations.append(duration)
+        
+        if self.time_budget is not None:
+            # Con presupuesto b, cada inferencia "paga" duration / b de tiempo
+            self._next_inference = started + duration / self.time_budget
+        elif self.target_fps:
+            self._next_inference = started + 1.0 / self.target_fps
+        else:
+            self._next_inference = 0.0
+    
+    @property
+    def effective_fps(self) -> float:
+        """Inferencias por segundo medidas (ventana de las últimas 30)"""
+        with self._lock:
+            times = list(self._inference_times)
+        
+        if len(times) < 2:
+            return 0.0
+        
+        # Incluir el tiempo transcurrido desde la última (si se detuvo, cae a 0)
+        span = max(times[-1] - times[0], time.time() - times[0])
+        return (len(times) - 1) / span if span > 0 else 0.0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            durations = list(self._durations)
+        avg_ms = sum(durations) / len(durations) * 1000 if durations else 0.0
+        
+        return {
+            'mode': self.mode,
+            'target_fps': self.target_fps,
+            'time_budget': self.time_budget,
+            'effective_fps': round(self.effective_fps, 1),
+            'avg_inference_ms': round(avg_ms, 2),
+            'inferences': self.inferences,
+            'skipped': self.skipped
+        }
+
+
+class ExtrapolatedResults(PoseResults):
+    """
+    Resultado con la misma forma que el de pose.process() a partir de
+    landmarks predichos (results.pose_landmarks solo se arma si se pide)
+    """
+    
+    extrapolated = True
+
+
+class LandmarkExtrapolator:
+    """Predice landmarks entre inferencias con la velocidad reciente"""
+    
+    def __init__(self, max_horizon: float = 0.25, damping: float = 0.8):
+        """
+        Args:
+            max_horizon: Segundos máximos de extrapolación (después se congela)
+            damping: Factor (0-1) aplicado a la velocidad para evitar sobrepasos
+        """
+        self.max_horizon = max_horizon
+        self.damping = damping
+        
+        self._previous: Optional[np.ndarray] = None
+        self._previous_ts = 0.0
+        self._last: Optional[np.ndarray] = None
+        self._last_ts = 0.0
+    
+    def reset(self):
+        self._previous = None
+        self._last = None
+    
+    def update(self, results, timestamp: Optional[float] = None):
+        """
+        Registra una detección real de MediaPipe
+        
+        Args:
+            results: Resultado de pose.process()
+            timestamp: Momento del frame inferido
+        """
+        timestamp = timestamp or time.time()
+        
+        landmark_frame = LandmarkFrame.from_results(results)
+        if landmark_frame is None:
+            self.reset()
+            return
+        
+        array = landmark_frame.array
+        
+        self._previous, self._previous_ts = self._last, self._last_ts
+        self._last, self._last_ts = array, timestamp
+    
+    def predict(self, timestamp: Optional[float] = None) -> ExtrapolatedResults:
+        """
+        Landmarks estimados para el instante indicado
+        
+        Returns:
+            ExtrapolatedResults: landmark_frame=None si no hay detección previa
+        """
+        if self._last is None:
+            return ExtrapolatedResults(None)
+        
+        timestamp = timestamp or time.time()
+        predicted = self._last
+        
+        if self._previous is not None and self._last_ts > self._previous_ts:
+            velocity = (self._last[:, :3] - self._previous[:, :3]) / (self._last_ts - self._previous_ts)
+            horizon = min(max(timestamp - self._last_ts, 0.0), self.max_horizon)
+            
+            predicted = self._last.copy()
+            predicted[:, :3] += velocity * (horizon * self.damping)
+        
+        return ExtrapolatedResults(LandmarkFrame(predicted))
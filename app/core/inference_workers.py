@@ -0,0 +1,536 @@
+"""
+🧵 INFERENCE WORKERS - MEDIAPIPE EN PROCESOS SEPARADOS
+======================================================
+Pool de procesos de inferencia de pose con frames en memoria compartida
+
+PROBLEMA:
+MediaPipe corre en el hilo del worker de Flask: con varias estaciones de
+cámara en un mismo servidor, todas las inferencias compiten dentro de un
+solo proceso (GIL + un intérprete TFLite por analyzer en el mismo proceso).
+
+SOLUCIÓN:
+- N procesos worker (spawn), cada uno dueño de los grafos Pose de los
+  streams que tiene asignados (un grafo por stream: smooth_landmarks
+  guarda estado entre frames y no puede mezclarse entre cámaras)
+- Cada stream tiene un ring buffer en multiprocessing.shared_memory con
+  `slots` ranuras [frame RGB | landmarks (33, 4) float32]: el frame se
+  copia a la ranura y por la cola solo viaja un mensaje de pocos bytes
+- El worker escribe los landmarks en la ranura y responde (seq, detectado)
+- Una ranura con un pedido sin respuesta (timeout) no se reutiliza hasta
+  que llega la respuesta tardía: un worker atrasado nunca lee ni escribe
+  la ranura de un frame nuevo
+- Los streams se asignan al worker con menos streams: con varias cámaras
+  activas las inferencias corren en paralelo en distintos núcleos
+
+TRANSPARENTE PARA LOS ANALYZERS:
+RemotePose tiene la interfaz de mp.solutions.pose.Pose (process/close) y
+devuelve un PoseResults con el LandmarkFrame copiado de la ranura
+(results.pose_landmarks se arma solo si se pide). Los analyzers lo reciben
+con pose_factory=pool.create_pose.
+
+Uso:
+    pool = get_inference_pool(num_workers=4)
+    pose = pool.create_pose(model_complexity=0, smooth_landmarks=True)
+    results = pose.process(image_rgb)  # Igual que mp_pose.Pose
+    pose.close()
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import itertools
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional, Callable, Tuple, Dict, Any
+
+import numpy as np
+
+from .landmark_frame import LandmarkFrame, PoseResults
+
+logger = logging.getLogger(__name__)
+
+# Landmarks de MediaPipe Pose: (x, y, z, visibility) por punto
+LANDMARK_COUNT = 33
+LANDMARK_FIELDS = 4
+RESULT_BYTES = LANDMARK_COUNT * LANDMARK_FIELDS * 4  # float32
+
+# Alineación de cada región dentro de la ranura
+_ALIGNMENT = 64
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _default_graph_factory(**options):
+    """Grafo de MediaPipe Pose (se importa dentro del worker)"""
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(**options)
+
+
+class RingLayout:
+    """Disposición de las ranuras [frame | landmarks] de un ring buffer"""
+    
+    def __init__(self, max_frame_shape: Tuple[int, int, int], slots: int):
+        self.max_frame_shape = tuple(max_frame_shape)
+        self.slots = slots
+        self.frame_bytes = _aligned(int(np.prod(max_frame_shape)))
+        self.slot_bytes = self.frame_bytes + _aligned(RESULT_BYTES)
+    
+    @property
+    def total_bytes(self) -> int:
+        return self.slot_bytes * self.slots
+    
+    def frame_view(self, buffer, slot: int, shape: Tuple[int, ...]) -> np.ndarray:
+        return np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=slot * self.slot_bytes)
+    
+    def result_view(self, buffer, slot: int) -> np.ndarray:
+        return np.ndarray(
+            (LANDMARK_COUNT, LANDMARK_FIELDS),
+            dtype=np.float32,
+            buffer=buffer,
+            offset=slot * self.slot_bytes + self.frame_bytes
+        )
+
+
+# ============================================================================
+# PROCESO WORKER
+# ============================================================================
+
+def _worker_main(worker_id: int, requests, responses, graph_factory):
+    """
+    Loop del proceso worker
+    
+    Mensajes:
+        ('open', stream_id, shm_name, max_frame_shape, slots, options)
+        ('infer', stream_id, seq, slot, shape)
+        ('close', stream_id)
+        ('stop',)
+    
+    Respuestas:
+        ('opened', worker_id, stream_id, error)
+        ('result', worker_id, stream_id, seq, detected, inference_ms)
+    """
+    graph_factory = graph_factory or _default_graph_factory
+    streams: Dict[Any, tuple] = {}
+    
+    while True:
+        message = requests.get()
+        op = message[0]
+        
+        if op == 'stop':
+            break
+        
+        if op == 'open':
+            _, stream_id, shm_name, max_frame_shape, slots, options = message
+            try:
+                shm = shared_memory.SharedMemory(name=shm_name)
+                graph = graph_factory(**options)
+                streams[stream_id] = (graph, shm, RingLayout(max_frame_shape, slots))
+                responses.put(('opened', worker_id, stream_id, None))
+            except Exception as e:
+                responses.put(('opened', worker_id, stream_id, str(e)))
+        
+        elif op == 'infer':
+            _, stream_id, seq, slot, shape = message
+            graph, shm, layout = streams.get(stream_id, (None, None, None))
+            
+            started = time.perf_counter()
+            try:
+                results = graph.process(layout.frame_view(shm.buf, slot, shape)) if graph else None
+            except Exception as e:
+                logger.error(f"Worker {worker_id}: error en inferencia del stream {stream_id}: {e}")
+                results = None
+            
+            landmark_frame = LandmarkFrame.from_results(results)
+            detected = landmark_frame is not None
+            if detected:
+                layout.result_view(shm.buf, slot)[:] = landmark_frame.array
+            
+            inference_ms = (time.perf_counter() - started) * 1000
+            responses.put(('result', worker_id, stream_id, seq, detected, inference_ms))
+        
+        elif op == 'close':
+            graph, shm, _ = streams.pop(message[1], (None, None, None))
+            if graph is not None:
+                graph.close()
+                shm.close()
+    
+    for graph, shm, _ in streams.values():
+        graph.close()
+        shm.close()
+
+
+# ============================================================================
+# LADO DEL SERVIDOR
+# ============================================================================
+
+class RemoteResults(PoseResults):
+    """Resultado con la misma forma que el de pose.process() (landmarks del worker)"""
+
+
+class RemotePose:
+    """
+    Reemplazo de mp.solutions.pose.Pose que infiere en un worker del pool
+    
+    process() copia el frame a la siguiente ranura libre del ring buffer,
+    envía un mensaje corto al worker y espera sus landmarks (el hilo que
+    espera libera el GIL: otros streams siguen trabajando).
+    
+    Tras un timeout el worker puede seguir leyendo el frame o escribiendo
+    los landmarks de esa ranura: queda ocupada (en _pending) hasta que
+    llega su respuesta tardía.
+    """
+    
+    def __init__(self, pool: 'PoseWorkerPool', worker_id: int, stream_id: int):
+        self._pool = pool
+        self.worker_id = worker_id
+        self.stream_id = stream_id
+        
+        layout = pool.layout
+        self._layout = layout
+        self._shm = shared_memory.SharedMemory(create=True, size=layout.total_bytes)
+        self._responses: 'queue.Queue[tuple]' = queue.Queue()
+        self._seq = 0
+        self._pending: Dict[int, int] = {}  # seq enviado sin respuesta → ranura
+        self._next_slot = 0
+        self._closed = False
+        
+        self.timeouts = 0
+        self.last_inference_ms = 0.0
+    
+    @property
+    def shm_name(self) -> str:
+        return self._shm.name
+    
+    def process(self, image: np.ndarray) -> RemoteResults:
+        """
+        Inferencia de pose (misma firma que mp_pose.Pose.process)
+        
+        Args:
+            image: Frame RGB uint8 (H, W, 3) no mayor que max_frame_shape
+        
+        Returns:
+            RemoteResults: landmark_frame=None si no hay detección, si el
+                worker no respondió a tiempo o si todas las ranuras siguen
+                ocupadas por pedidos sin respuesta
+        """
+        if self._closed:
+            raise RuntimeError("RemotePose cerrado")
+        
+        if image.dtype != np.uint8 or image.nbytes > self._layout.frame_bytes:
+            raise ValueError(
+                f"Frame {image.shape} {image.dtype} no entra en la ranura "
+                f"(máximo {self._layout.max_frame_shape} uint8)"
+            )
+        
+        deadline = time.time() + self._pool.timeout
+        
+        # Ranura sin pedidos en vuelo (liberar las de respuestas tardías)
+        self._collect_late_replies()
+        slot = self._free_slot()
+        while slot is None:
+            if self._wait_reply(deadline) is None:
+                self.timeouts += 1
+                logger.warning(f"Worker {self.worker_id}: ranuras ocupadas en stream {self.stream_id}")
+                return RemoteResults(None)
+            slot = self._free_slot()
+        
+        self._seq += 1
+        seq = self._seq
+        self._pending[seq] = slot
+        
+        np.copyto(self._layout.frame_view(self._shm.buf, slot, image.shape), image)
+        self._pool._send(self.worker_id, ('infer', self.stream_id, seq, slot, image.shape))
+        
+        while True:
+            reply = self._wait_reply(deadline)
+            if reply is None:
+                # La ranura sigue en _pending hasta la respuesta tardía
+                self.timeouts += 1
+                logger.warning(f"Worker {self.worker_id} sin respuesta para stream {self.stream_id}")
+                return RemoteResults(None)
+            
+            # Respuestas tardías de frames anteriores: solo liberan su ranura
+            reply_seq, detected, inference_ms = reply
+            if reply_seq == seq:
+                break
+        
+        self.last_inference_ms = inference_ms
+        
+        if not detected:
+            return RemoteResults(None)
+        
+        return RemoteResults(LandmarkFrame(self._layout.result_view(self._shm.buf, slot).copy()))
+    
+    def _free_slot(self) -> Optional[int]:
+        """Siguiente ranura (round-robin) sin pedido en vuelo, o None"""
+        busy = set(self._pending.values())
+        slots = self._layout.slots
+        
+        for offset in range(slots):
+            slot = (self._next_slot + offset) % slots
+            if slot not in busy:
+                self._next_slot = slot + 1
+                return slot
+        return None
+    
+    def _wait_reply(self, deadline: float) -> Optional[tuple]:
+        """Siguiente respuesta (libera su ranura), o None al vencer el plazo"""
+        try:
+            reply = self._responses.get(timeout=max(deadline - time.time(), 0.0))
+        except queue.Empty:
+            return None
+        
+        self._pending.pop(reply[0], None)
+        return reply
+    
+    def _collect_late_replies(self):
+        """Libera sin esperar las ranuras cuyas respuestas tardías ya llegaron"""
+        while self._pending:
+            try:
+                reply = self._responses.get_nowait()
+            except queue.Empty:
+                return
+            self._pending.pop(reply[0], None)
+    
+    def close(self):
+        """Cierra el grafo en el worker y libera la memoria compartida"""
+        if self._closed:
+            return
+        
+        self._closed = True
+        self._pool._release(self)
+        
+        self._shm.close()
+        self._shm.unlink()
+
+
+class PoseWorkerPool:
+    """Procesos de inferencia + despacho de respuestas a cada stream"""
+    
+    def __init__(
+        self,
+        num_workers: Optional[int] = None,
+        max_frame_shape: Tuple[int, int, int] = (480, 640, 3),
+        slots: int = 2,
+        timeout: float = 5.0,
+        open_timeout: float = 60.0,
+        graph_factory: Optional[Callable[..., Any]] = None
+    ):
+        """
+        Args:
+            num_workers: Procesos de inferencia (None = núcleos disponibles)
+            max_frame_shape: Frame RGB más grande que se enviará (alto, ancho, 3)
+            slots: Ranuras del ring buffer de cada stream
+            timeout: Segundos máximos de espera por una inferencia
+            open_timeout: Segundos máximos para crear un grafo en el worker
+            graph_factory: Crea el grafo en el worker a partir de las opciones
+                de create_pose() (picklable; None = mp.solutions.pose.Pose)
+        """
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.layout = RingLayout(max_frame_shape, slots)
+        self.timeout = timeout
+        self.open_timeout = open_timeout
+        self.graph_factory = graph_factory
+        
+        self._lock = threading.Lock()
+        self._stream_ids = itertools.count(1)
+        self._streams: Dict[int, RemotePose] = {}
+        self._pending_opens: Dict[int, 'queue.Queue[Optional[str]]'] = {}
+        self._workers = []
+        self._requests = []
+        self._responses = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._running = False
+        
+        self.requests_sent = 0
+        self.inferences = 0
+        self.total_inference_ms = 0.0
+    
+    @property
+    def is_running(self) -> bool:
+        return self._running
+    
+    def start(self):
+        """Lanza los procesos worker (spawn: sin heredar hilos ni grafos del servidor)"""
+        with self._lock:
+            if self._running:
+                return
+            
+            context = multiprocessing.get_context('spawn')
+            self._responses = context.Queue()
+            
+            for worker_id in range(self.num_workers):
+                requests = context.Queue()
+                process = context.Process(
+                    target=_worker_main,
+                    args=(worker_id, requests, self._responses, self.graph_factory),
+                    name=f'pose-worker-{worker_id}',
+                    daemon=True
+                )
+                process.start()
+                self._requests.append(requests)
+                self._workers.append(process)
+            
+            self._running = True
+            self._dispatcher = threading.Thread(target=self._dispatch, name='pose-dispatcher', daemon=True)
+            self._dispatcher.start()
+        
+        logger.info(f"🧵 Pool de inferencia iniciado: {self.num_workers} procesos")
+    
+    def stop(self):
+        """Detiene los workers y libera los ring buffers abiertos"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            streams = list(self._streams.values())
+        
+        for pose in streams:
+            pose.close()
+        
+        for requests in self._requests:
+            requests.put(('stop',))
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        
+        # Despertar al dispatcher
+        self._responses.put(('stop',))
+        self._dispatcher.join(timeout=5)
+        
+        self._workers.clear()
+        self._requests.clear()
+        logger.info("🧵 Pool de inferencia detenido")
+    
+    def create_pose(self, **options) -> RemotePose:
+        """
+        Grafo Pose en el worker menos cargado (bloquea hasta que esté listo)
+        
+        Args:
+            **options: Argumentos de mp_pose.Pose (model_complexity, ...)
+        
+        Returns:
+            RemotePose listo para process()
+        
+        Raises:
+            RuntimeError: Si el worker no pudo crear el grafo
+        """
+        self.start()
+        
+        with self._lock:
+            load = [0] * self.num_workers
+            for pose in self._streams.values():
+                load[pose.worker_id] += 1
+            worker_id = load.index(min(load))
+            
+            pose = RemotePose(self, worker_id, next(self._stream_ids))
+            self._streams[pose.stream_id] = pose
+            opened: 'queue.Queue[Optional[str]]' = queue.Queue()
+            self._pending_opens[pose.stream_id] = opened
+        
+        layout = self.layout
+        self._send(worker_id, ('open', pose.stream_id, pose.shm_name, layout.max_frame_shape, layout.slots, options))
+        
+        try:
+            error = opened.get(timeout=self.open_timeout)
+        except queue.Empty:
+            error = f"sin respuesta en {self.open_timeout}s"
+        finally:
+            with self._lock:
+                self._pending_opens.pop(pose.stream_id, None)
+        
+        if error is not None:
+            pose.close()
+            raise RuntimeError(f"Worker {worker_id} no pudo crear el grafo Pose: {error}")
+        
+        return pose
+    
+    def _send(self, worker_id: int, message: tuple):
+        self.requests_sent += 1
+        self._requests[worker_id].put(message)
+    
+    def _release(self, pose: RemotePose):
+        with self._lock:
+            self._streams.pop(pose.stream_id, None)
+            running = self._running or bool(self._workers)
+        
+        if running:
+            self._send(pose.worker_id, ('close', pose.stream_id))
+    
+    def _dispatch(self):
+        """Reparte las respuestas de los workers a cada RemotePose"""
+        while True:
+            message = self._responses.get()
+            kind = message[0]
+            
+            if kind == 'stop':
+                break
+            
+            if kind == 'opened':
+                _, _, stream_id, error = message
+                with self._lock:
+                    opened = self._pending_opens.get(stream_id)
+                if opened is not None:
+                    opened.put(error)
+            
+            elif kind == 'result':
+                _, _, stream_id, seq, detected, inference_ms = message
+                self.inferences += 1
+                self.total_inference_ms += inference_ms
+                
+                with self._lock:
+                    pose = self._streams.get(stream_id)
+                if pose is not None:
+                    pose._responses.put((seq, detected, inference_ms))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_worker = [0] * self.num_workers
+            for pose in self._streams.values():
+                per_worker[pose.worker_id] += 1
+            timeouts = sum(pose.timeouts for pose in self._streams.values())
+        
+        return {
+            'running': self._running,
+            'workers': self.num_workers,
+            'alive': sum(1 for process in self._workers if process.is_alive()),
+            'streams_per_worker': per_worker,
+            'inferences': self.inferences,
+            'avg_inference_ms': round(self.total_inference_ms / self.inferences, 2) if self.inferences else 0.0,
+            'timeouts': timeouts,
+            'slot_bytes': self.layout.slot_bytes
+        }
+
+
+# ============================================================================
+# INSTANCIA GLOBAL
+# ============================================================================
+
+_inference_pool: Optional[PoseWorkerPool] = None
+_inference_pool_lock = threading.Lock()
+
+
+def get_inference_pool(num_workers: Optional[int] = None, **options) -> PoseWorkerPool:
+    """
+    Pool de inferencia del proceso (se crea en la primera llamada)
+    
+    Args:
+        num_workers: Procesos de inferencia (solo en la primera llamada)
+        **options: max_frame_shape, slots, timeout (solo en la primera llamada)
+    """
+    global _inference_pool
+    
+    with _inference_pool_lock:
+        if _inference_pool is None:
+            _inference_pool = PoseWorkerPool(num_workers, **options)
+            atexit.register(_inference_pool.stop)
+        return _inference_pool
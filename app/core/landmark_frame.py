@@ -0,0 +1,258 @@
+"""
+🦴 LANDMARK FRAME - LANDMARKS DE UN FRAME EN UN ARRAY CONTIGUO
+===============================================================
+Los 33 landmarks de MediaPipe Pose como un único array (33, 4) float32
+[x, y, z, visibility], copiado UNA vez por frame
+
+PROBLEMA:
+Cada analyzer leía results.pose_landmarks.landmark[i].x/.y/.z/.visibility
+atributo por atributo (objetos protobuf): detect_side, get_landmarks_2d
+(8 llamadas por frame en la vista frontal), la validación de visibilidad y
+el detector de orientación repetían decenas de accesos Python por frame.
+Los resultados extrapolados y los de los workers de inferencia, que ya son
+arrays, se convertían de vuelta a protobuf solo para volver a leerlos.
+
+SOLUCIÓN:
+- LandmarkFrame: array (33, 4) float32 C-contiguo con vistas xy / z /
+  visibility y proyección a píxeles con una sola multiplicación vectorizada
+- PoseResults: resultado con la forma del de pose.process() que lleva el
+  LandmarkFrame; el NormalizedLandmarkList (results.pose_landmarks) solo se
+  construye si alguien lo pide (ej: mp_drawing.draw_landmarks)
+- La copia lee el mensaje serializado (SerializeToString, en C) con una
+  vista con strides sobre los 4 floats de cada landmark, en vez de 132
+  accesos a atributos; si el formato no es el esperado se usa el acceso
+  por atributos
+- Los valores del array son los mismos float32 del protobuf: leerlos con
+  tolist() da exactamente los mismos floats que lm.x, y la proyección a
+  píxeles se hace en float64 y trunca igual que int(lm.x * w)
+
+Uso:
+    results = PoseResults.from_mediapipe(pose.process(image_rgb))
+    frame = LandmarkFrame.from_results(results)      # None si no hay persona
+    pixels = frame.pixels(w, h)                      # (33, 2) int32
+    shoulder_2d = tuple(pixels[LEFT_SHOULDER].tolist())
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+# Landmarks de MediaPipe Pose y columnas del array
+NUM_LANDMARKS = 33
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+
+# Formato serializado de cada NormalizedLandmark dentro de la lista:
+#   0x0a <largo> | 0x0d x:f32 | 0x15 y:f32 | 0x1d z:f32 | 0x25 visibility:f32 [| 0x2d presence:f32]
+# (campo 1 repetido con 4 o 5 campos fixed32, en orden de número de campo)
+_RECORD_HEADER = 0x0a
+_FIELD_TAGS = (0x0d, 0x15, 0x1d, 0x25)
+_RECORD_SIZES = (2 + 4 * 5, 2 + 5 * 5)  # Sin / con presence
+
+
+@lru_cache(maxsize=8)
+def _record_markers(stride: int, count: int) -> Tuple[Tuple[int, bytes], ...]:
+    """(offset, bytes esperados en data[offset::stride]) de cabecera, largo y tags"""
+    markers = [(0, bytes([_RECORD_HEADER]) * count), (1, bytes([stride - 2]) * count)]
+    markers += [(2 + 5 * i, bytes([tag]) * count) for i, tag in enumerate(_FIELD_TAGS)]
+    return tuple(markers)
+
+
+def _parse_serialized(landmark_list) -> Optional[np.ndarray]:
+    """
+    (N, 4) float32 desde el mensaje serializado, o None si el formato no
+    es el esperado (campos faltantes, extensiones, etc.)
+    """
+    count = len(landmark_list.landmark)
+    data = landmark_list.SerializeToString()
+    stride = len(data) // count if count else 0
+    
+    if stride not in _RECORD_SIZES or stride * count != len(data):
+        return None
+    
+    # Cabecera y tags de todos los registros (slices de bytes, en C)
+    for offset, expected in _record_markers(stride, count):
+        if data[offset::stride] != expected:
+            return None
+    
+    values = np.ndarray((count, 4), dtype='<f4', buffer=data, offset=3, strides=(stride, 5))
+    return values.astype(np.float32)
+
+
+class LandmarkFrame:
+    """Landmarks normalizados de un frame: array (33, 4) float32 [x, y, z, visibility]"""
+    
+    __slots__ = ('array',)
+    
+    def __init__(self, array: np.ndarray):
+        """
+        Args:
+            array: (33, 4) [x, y, z, visibility] (se convierte a float32
+                C-contiguo solo si hace falta)
+        """
+        if array.dtype != np.float32 or not array.flags.c_contiguous:
+            array = np.ascontiguousarray(array, dtype=np.float32)
+        self.array = array
+    
+    @classmethod
+    def from_landmark_list(cls, landmark_list) -> Optional['LandmarkFrame']:
+        """
+        NormalizedLandmarkList (results.pose_landmarks) → LandmarkFrame
+        
+        Returns:
+            LandmarkFrame, o None si no hay landmarks
+        """
+        if not landmark_list:
+            return None
+        
+        array = _parse_serialized(landmark_list)
+        if array is None:
+            array = np.array(
+                [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmark_list.landmark],
+                dtype=np.float32
+            )
+        
+        return cls(array)
+    
+    @classmethod
+    def from_results(cls, results) -> Optional['LandmarkFrame']:
+        """
+        LandmarkFrame de un resultado de infer() o de pose.process()
+        
+        PoseResults ya lo trae (sin copia); un resultado crudo de MediaPipe
+        se convierte aquí.
+        
+        Returns:
+            LandmarkFrame, o None si no se detectó persona
+        """
+        if results is None:
+            return None
+        if isinstance(results, PoseResults):
+            return results.landmark_frame
+        return cls.from_landmark_list(results.pose_landmarks)
+    
+    @classmethod
+    def coerce(cls, landmarks) -> 'LandmarkFrame':
+        """
+        Acepta un LandmarkFrame, un array (33, 4), un NormalizedLandmarkList
+        o su lista results.pose_landmarks.landmark (API previa de los módulos
+        que recibían landmarks protobuf)
+        """
+        if isinstance(landmarks, LandmarkFrame):
+            return landmarks
+        if isinstance(landmarks, np.ndarray):
+            return cls(landmarks)
+        if hasattr(landmarks, 'landmark'):
+            return cls.from_landmark_list(landmarks)
+        
+        return cls(np.array(
+            [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks],
+            dtype=np.float32
+        ))
+    
+    def __len__(self) -> int:
+        return len(self.array)
+    
+    @property
+    def xy(self) -> np.ndarray:
+        """Vista (33, 2) de las coordenadas normalizadas"""
+        return self.array[:, :2]
+    
+    @property
+    def z(self) -> np.ndarray:
+        return self.array[:, Z]
+    
+    @property
+    def visibility(self) -> np.ndarray:
+        return self.array[:, VISIBILITY]
+    
+    def pixels(self, width: int, height: int) -> np.ndarray:
+        """
+        Proyección de los 33 puntos a píxeles del frame
+        
+        Returns:
+            np.ndarray: (33, 2) int32, truncado como int(lm.x * width)
+        """
+        return (self.array[:, :2].astype(np.float64) * (width, height)).astype(np.int32)
+    
+    def points_2d(self, indices: Sequence[int], width: int, height: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Puntos en píxeles como tuplas (x, y) de int, listas para cv2
+        
+        Args:
+            indices: Índices de los landmarks (lista o array; ver landmark_indices())
+        """
+        # Para pocos puntos, tolist() + int() es más barato que operar el array
+        return tuple([(int(x * width), int(y * height)) for x, y, _z, _v in self.array[_index(indices)].tolist()])
+    
+    def rows(self, indices: Sequence[int]) -> list:
+        """[[x, y, z, visibility], ...] de los landmarks pedidos como floats de Python"""
+        return self.array[_index(indices)].tolist()
+    
+    def all_visible(self, indices: Sequence[int], threshold: float) -> bool:
+        """True si todos los landmarks tienen visibility >= threshold"""
+        return all(value >= threshold for value in self.visibility[_index(indices)].tolist())
+    
+    def to_landmark_list(self):
+        """LandmarkFrame → NormalizedLandmarkList (para mp_drawing y código heredado)"""
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        
+        for x, y, z, visibility in self.array.tolist():
+            landmark = landmark_list.landmark.add()
+            landmark.x = x
+            landmark.y = y
+            landmark.z = z
+            landmark.visibility = visibility
+        
+        return landmark_list
+
+
+def landmark_indices(*landmarks) -> np.ndarray:
+    """Índices fijos (ej: mp_pose.PoseLandmark.*) como array listo para indexar"""
+    return np.array([int(landmark) for landmark in landmarks], dtype=np.intp)
+
+
+def _index(indices):
+    # Una tupla indexaría varias dimensiones; las listas de IntEnum son lentas
+    return indices if isinstance(indices, np.ndarray) else np.array([int(i) for i in indices], dtype=np.intp)
+
+
+class PoseResults:
+    """
+    Resultado con la forma del de pose.process() respaldado por un LandmarkFrame
+    
+    results.pose_landmarks sigue disponible (se construye al pedirlo) para
+    el código que espera el protobuf.
+    """
+    
+    extrapolated = False
+    
+    def __init__(self, landmark_frame: Optional[LandmarkFrame]):
+        self.landmark_frame = landmark_frame
+        self._landmark_list = None
+    
+    @classmethod
+    def from_mediapipe(cls, results) -> 'PoseResults':
+        """Envuelve el resultado de mp_pose.Pose.process() (copia los landmarks una vez)"""
+        if isinstance(results, PoseResults):
+            return results
+        
+        wrapped = cls(LandmarkFrame.from_landmark_list(results.pose_landmarks))
+        wrapped._landmark_list = results.pose_landmarks
+        return wrapped
+    
+    @property
+    def pose_landmarks(self):
+        if self.landmark_frame is None:
+            return None
+        if self._landmark_list is None:
+            self._landmark_list = self.landmark_frame.to_landmark_list()
+        return self._landmark_list
+    
+    def invalidate_landmark_list(self):
+        """Descarta el protobuf cacheado tras modificar landmark_frame in-place"""
+        self._landmark_list = None
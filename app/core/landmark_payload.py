@@ -0,0 +1,83 @@
+"""
+📦 LANDMARK PAYLOAD - DATOS COMPACTOS POR FRAME
+===============================================
+Serialización de landmarks y puntos clave para el modo "solo datos"
+
+En modo solo datos el servidor no dibuja nada: envía por frame los 33
+landmarks normalizados, los puntos clave del ejercicio y el estado del
+análisis (ángulo, lado, ROM), y el navegador dibuja skeleton y HUD.
+
+Formato:
+    {
+        "frame": 120, "timestamp": 1729070000.12, "width": 1280, "height": 720,
+        "extrapolated": false,
+        "landmarks": [[x, y, visibility], ...],   # 33 puntos normalizados (0-1)
+        "points": {"shoulder": [x, y], ...},      # Píxeles del frame
+        "angle": 45.2, "max_rom": 90.1, "side": "HOMBRO DERECHO", ...
+    }
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+from typing import Optional, Dict, List, Tuple
+
+from .landmark_frame import LandmarkFrame
+
+# Decimales de las coordenadas normalizadas (~0.1 px en 1280x720)
+LANDMARK_PRECISION = 4
+
+
+def pack_landmarks(landmark_frame: Optional[LandmarkFrame], precision: int = LANDMARK_PRECISION) -> List[List[float]]:
+    """
+    Landmarks del frame → [[x, y, visibility], ...]
+    
+    Args:
+        landmark_frame: LandmarkFrame del resultado (o None)
+        precision: Decimales de redondeo
+    
+    Returns:
+        list: Lista vacía si no hay detección
+    """
+    if landmark_frame is None:
+        return []
+    
+    return [
+        [round(x, precision), round(y, precision), round(visibility, 2)]
+        for x, y, _z, visibility in landmark_frame.array.tolist()
+    ]
+
+
+def build_payload(
+    data: Dict,
+    results,
+    frame_shape: Tuple[int, ...],
+    frame_count: int,
+    timestamp: float,
+    points: Optional[Dict[str, Tuple[int, int]]] = None
+) -> Dict:
+    """
+    Arma el payload de un frame a partir de get_current_data()
+    
+    Args:
+        data: Estado del analyzer (get_current_data())
+        results: Resultado de infer()
+        frame_shape: Shape del frame analizado
+        frame_count: Número de frame
+        timestamp: Momento del análisis
+        points: Puntos clave en píxeles (ej: {'shoulder': (x, y)})
+    """
+    h, w = frame_shape[:2]
+    
+    payload = dict(data)
+    payload.update({
+        'frame': frame_count,
+        'timestamp': round(timestamp, 3),
+        'width': w,
+        'height': h,
+        'extrapolated': bool(getattr(results, 'extrapolated', False)),
+        'landmarks': pack_landmarks(LandmarkFrame.from_results(results)),
+        'points': {name: [int(p[0]), int(p[1])] for name, p in (points or {}).items()}
+    })
+    
+    return payload
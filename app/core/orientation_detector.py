@@ -3,6 +3,12 @@
 import numpy as np
 import math
 
+from .landmark_frame import LandmarkFrame, landmark_indices, X, Y
+
+# Hombros y caderas (únicos landmarks que usan las métricas de orientación)
+_TORSO_IDS = (11, 12, 23, 24)
+_TORSO_INDICES = landmark_indices(*_TORSO_IDS)
+
 class AdaptiveOrientationDetector:
     """
     🧠 DETECTOR DE ORIENTACIÓN CORPORAL
@@ -32,8 +38,12 @@ class AdaptiveOrientationDetector:
         """
         🧠 DETECCIÓN BASADA EN ESTRUCTURA CORPORAL ESTABLE
         🚫 IGNORA movimientos de brazos
+        
+        landmarks: LandmarkFrame (o lista de landmarks de MediaPipe)
         """
         try:
+            landmarks = LandmarkFrame.coerce(landmarks)
+            
             # 🔍 Evaluar landmarks ESTABLES disponibles
             available_sets = self._evaluate_stable_landmarks(landmarks)
             
@@ -66,6 +76,8 @@ class AdaptiveOrientationDetector:
         """
         🔍 EVALÚA solo landmarks ESTABLES (no brazos)
         """
+        # Una sola lectura del array para todos los conjuntos
+        visibility = LandmarkFrame.coerce(landmarks).visibility.tolist()
         available_sets = {}
         
         for set_name, landmark_ids in self.orientation_landmarks.items():
@@ -73,9 +85,9 @@ class AdaptiveOrientationDetector:
             total_visibility = 0
             
             for landmark_id in landmark_ids:
-                if landmark_id < len(landmarks) and landmarks[landmark_id].visibility > 0.6:
+                if landmark_id < len(visibility) and visibility[landmark_id] > 0.6:
                     visible_landmarks.append(landmark_id)
-                    total_visibility += landmarks[landmark_id].visibility
+                    total_visibility += visibility[landmark_id]
             
             coverage = len(visible_landmarks) / len(landmark_ids)
             avg_visibility = total_visibility / len(visible_landmarks) if visible_landmarks else 0
@@ -116,10 +128,13 @@ class AdaptiveOrientationDetector:
         metrics = {}
         landmark_ids = landmark_set["landmarks"]
         
+        # Filas [x, y, z, visibility] de torso y caderas como floats de Python
+        landmarks = dict(zip(_TORSO_IDS, LandmarkFrame.coerce(landmarks).rows(_TORSO_INDICES)))
+        
         # 🎯 PRIORIDAD 1: CADERAS (más estable)
         if 23 in landmark_ids and 24 in landmark_ids:
             l_hip, r_hip = landmarks[23], landmarks[24]
-            hip_width = abs(l_hip.x - r_hip.x)
+            hip_width = abs(l_hip[X] - r_hip[X])
             
             # 🆕 LÓGICA SIMPLE Y DIRECTA
             if hip_width > 0.18:      # Muy separadas = FRONTAL claro
@@ -141,8 +156,8 @@ class AdaptiveOrientationDetector:
         # 🎯 PRIORIDAD 2: HOMBROS (si caderas no disponibles)
         elif 11 in landmark_ids and 12 in landmark_ids:
             l_shoulder, r_shoulder = landmarks[11], landmarks[12]
-            shoulder_width = abs(l_shoulder.x - r_shoulder.x)
-            shoulder_height_diff = abs(l_shoulder.y - r_shoulder.y)
+            shoulder_width = abs(l_shoulder[X] - r_shoulder[X])
+            shoulder_height_diff = abs(l_shoulder[Y] - r_shoulder[Y])
             
             # ⚠️ RECHAZAR si hay movimiento de brazos obvio
             if shoulder_height_diff > 0.08:  # Hombros muy desnivelados
@@ -172,7 +187,7 @@ class AdaptiveOrientationDetector:
         # 🎯 FALLBACK: Un solo hombro
         elif 11 in landmark_ids or 12 in landmark_ids:
             visible_shoulder = landmarks[11] if 11 in landmark_ids else landmarks[12]
-            centrality = abs(visible_shoulder.x - 0.5)
+            centrality = abs(visible_shoulder[X] - 0.5)
             
             if centrality < 0.15:      # Muy centrado = SAGITAL
                 combined_ratio = 0.9
@@ -0,0 +1,270 @@
+"""
+🖼️ OVERLAY COMPOSITOR - HUD CON SPRITES PRE-RENDERIZADOS
+=========================================================
+Paneles semitransparentes y textos del HUD sin copiar el frame completo
+
+PROBLEMA:
+_draw_info_panel y _draw_performance_metrics hacían image.copy() del frame
+1280x720 completo y cv2.addWeighted sobre TODA la imagen solo para oscurecer
+una franja de 180px y una caja en una esquina: dos copias y dos blends de
+frame completo por frame, solo para el HUD.
+
+SOLUCIÓN:
+- Cada panel (fondo + etiquetas estáticas) se pre-renderiza UNA vez como
+  sprite BGRA y se mezcla solo dentro de su ROI
+- Los textos dinámicos se rasterizan a una máscara cacheada por contenido:
+  solo se vuelve a rasterizar cuando el valor cambia
+- Los píxeles de texto se guardan como índices dispersos + cobertura, así
+  el costo por frame es un addWeighted del ROI más unos miles de píxeles
+- Mismo resultado que el dibujo original (±1 por redondeo en los bordes
+  antialiasing del texto)
+
+Uso:
+    compositor = OverlayCompositor()
+    
+    compositor.draw_panel(
+        image, 'info', (0, 0), (w, 180), (0, 0, 0), alpha=0.6,
+        static_texts=[("TITULO", (20, 35), 0.7, (255, 255, 255), 2)]
+    )
+    compositor.draw_text(image, f"ROM Max: {rom:.1f}deg", (20, 160), 0.6, (0, 255, 0), 2)
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Tuple, Sequence, Dict, Any
+
+Point = Tuple[int, int]
+Color = Tuple[int, int, int]
+
+# (texto, origen absoluto, escala, color, grosor)
+StaticText = Tuple[str, Point, float, Color, int]
+
+
+class _PanelSprite:
+    """
+    Sprite BGRA de un panel: fondo con alpha uniforme + etiquetas
+    
+    El fondo se mezcla con un addWeighted del ROI; los píxeles de etiquetas
+    (alpha distinto al del fondo) se corrigen por separado con índices
+    dispersos: out = img * (1 - A) + color_premultiplicado.
+    """
+    
+    __slots__ = ('bgra', 'bgr', 'alpha', 'text_ys', 'text_xs', 'text_premult', 'text_inverse')
+    
+    def __init__(self, bgra: np.ndarray, alpha: float, coverage: np.ndarray, text_bgr: np.ndarray):
+        self.bgra = bgra
+        self.bgr = np.ascontiguousarray(bgra[:, :, :3])
+        self.alpha = alpha
+        
+        self.text_ys, self.text_xs = np.nonzero(coverage)
+        c = coverage[self.text_ys, self.text_xs].astype(np.float32)[:, None] / 255.0
+        text = text_bgr[self.text_ys, self.text_xs].astype(np.float32)
+        background = self.bgr[self.text_ys, self.text_xs].astype(np.float32)
+        
+        # Etiqueta sobre el fondo semitransparente, precalculada
+        self.text_premult = text * c + background * alpha * (1 - c)
+        self.text_inverse = (1 - alpha) * (1 - c)
+
+
+class _TextSprite:
+    """Cobertura (0-255) de un texto en índices dispersos y su desplazamiento"""
+    
+    __slots__ = ('ys', 'xs', 'coverage', 'height', 'width', 'dx', 'dy')
+    
+    def __init__(self, coverage: np.ndarray, dx: int, dy: int):
+        self.height, self.width = coverage.shape
+        self.ys, self.xs = np.nonzero(coverage)
+        self.coverage = coverage[self.ys, self.xs].astype(np.float32)[:, None] / 255.0
+        self.dx = dx
+        self.dy = dy
+
+
+class OverlayCompositor:
+    """Compositor del HUD de los analyzers (paneles + textos cacheados)"""
+    
+    def __init__(self, font: int = cv2.FONT_HERSHEY_SIMPLEX, max_text_sprites: int = 256):
+        """
+        Args:
+            font: Fuente Hershey de OpenCV
+            max_text_sprites: Máximo de textos rasterizados en caché (LRU)
+        """
+        self.font = font
+        self.max_text_sprites = max_text_sprites
+        
+        self._panels: Dict[tuple, _PanelSprite] = {}
+        self._texts: 'OrderedDict[tuple, _TextSprite]' = OrderedDict()
+        
+        self.panel_renders = 0
+        self.text_renders = 0
+        self.text_hits = 0
+    
+    # ------------------------------------------------------------------
+    # PANELES
+    # ------------------------------------------------------------------
+    
+    def draw_panel(
+        self,
+        image: np.ndarray,
+        key: str,
+        top_left: Point,
+        bottom_right: Point,
+        color: Color,
+        alpha: float,
+        static_texts: Sequence[StaticText] = ()
+    ):
+        """
+        Mezcla un panel semitransparente solo dentro de su rectángulo
+        
+        Equivale a cv2.rectangle(overlay, top_left, bottom_right, color, -1)
+        + cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0, image) + los
+        cv2.putText de static_texts, sin tocar el resto del frame.
+        
+        Args:
+            image: Frame BGR (se modifica in-place)
+            key: Nombre del panel (para la caché)
+            top_left: Esquina superior izquierda (inclusive)
+            bottom_right: Esquina inferior derecha (inclusive)
+            color: Color BGR del fondo
+            alpha: Opacidad del fondo (0-1)
+            static_texts: Etiquetas que no cambian entre frames
+        """
+        h, w = image.shape[:2]
+        x0, y0 = max(top_left[0], 0), max(top_left[1], 0)
+        x1, y1 = min(bottom_right[0], w - 1), min(bottom_right[1], h - 1)
+        
+        if x1 < x0 or y1 < y0:
+            return
+        
+        cache_key = (key, x0, y0, x1, y1, color, alpha, tuple(static_texts))
+        sprite = self._panels.get(cache_key)
+        
+        if sprite is None:
+            # Descartar versiones anteriores del mismo panel (ej: cambio de resolución)
+            for old_key in [k for k in self._panels if k[0] == key]:
+                del self._panels[old_key]
+            
+            sprite = self._render_panel((x0, y0), (x1, y1), color, alpha, static_texts)
+            self._panels[cache_key] = sprite
+        
+        roi = image[y0:y1 + 1, x0:x1 + 1]
+        
+        # Valores originales bajo las etiquetas (antes de oscurecer el fondo)
+        under_text = roi[sprite.text_ys, sprite.text_xs].astype(np.float32)
+        
+        cv2.addWeighted(sprite.bgr, sprite.alpha, roi, 1 - sprite.alpha, 0, dst=roi)
+        
+        if len(sprite.text_ys):
+            blended = under_text * sprite.text_inverse + sprite.text_premult
+            roi[sprite.text_ys, sprite.text_xs] = np.clip(blended + 0.5, 0, 255).astype(np.uint8)
+    
+    def _render_panel(
+        self,
+        top_left: Point,
+        bottom_right: Point,
+        color: Color,
+        alpha: float,
+        static_texts: Sequence[StaticText]
+    ) -> _PanelSprite:
+        """Rasteriza el sprite BGRA del panel (una sola vez)"""
+        x0, y0 = top_left
+        width, height = bottom_right[0] - x0 + 1, bottom_right[1] - y0 + 1
+        
+        # Cobertura y color de las etiquetas estáticas
+        coverage = np.zeros((height, width), dtype=np.uint8)
+        text_bgr = np.zeros((height, width, 3), dtype=np.uint8)
+        
+        for text, org, scale, text_color, thickness in static_texts:
+            label = np.zeros((height, width), dtype=np.uint8)
+            cv2.putText(label, text, (org[0] - x0, org[1] - y0), self.font, scale, 255, thickness, cv2.LINE_4)
+            
+            drawn = label > 0
+            text_bgr[drawn] = text_color
+            coverage = np.maximum(coverage, label)
+        
+        # Sprite BGRA de referencia (alpha efectivo de fondo + etiquetas)
+        c = coverage.astype(np.float32) / 255.0
+        effective_alpha = 1 - (1 - alpha) * (1 - c)
+        
+        bgra = np.empty((height, width, 4), dtype=np.uint8)
+        bgra[:, :, :3] = color
+        bgra[:, :, 3] = np.round(effective_alpha * 255).astype(np.uint8)
+        
+        self.panel_renders += 1
+        return _PanelSprite(bgra, alpha, coverage, text_bgr)
+    
+    # ------------------------------------------------------------------
+    # TEXTOS DINÁMICOS
+    # ------------------------------------------------------------------
+    
+    def draw_text(
+        self,
+        image: np.ndarray,
+        text: str,
+        org: Point,
+        font_scale: float,
+        color: Color,
+        thickness: int = 1
+    ):
+        """
+        Equivalente a cv2.putText(..., cv2.LINE_4) con la cobertura cacheada
+        
+        Args:
+            image: Frame BGR (se modifica in-place)
+            text: Texto a dibujar
+            org: Origen (esquina inferior izquierda de la línea base)
+            font_scale: Escala de la fuente
+            color: Color BGR
+            thickness: Grosor del trazo
+        """
+        sprite = self._get_text_sprite(text, font_scale, thickness)
+        
+        h, w = image.shape[:2]
+        x, y = org[0] + sprite.dx, org[1] + sprite.dy
+        
+        ys, xs, coverage = sprite.ys + y, sprite.xs + x, sprite.coverage
+        
+        # Recortar a los bordes del frame (solo si el texto se sale)
+        if x < 0 or y < 0 or x + sprite.width > w or y + sprite.height > h:
+            inside = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+            ys, xs, coverage = ys[inside], xs[inside], coverage[inside]
+        
+        under = image[ys, xs].astype(np.float32)
+        blended = under * (1 - coverage) + np.asarray(color, dtype=np.float32) * coverage
+        image[ys, xs] = np.clip(blended + 0.5, 0, 255).astype(np.uint8)
+    
+    def _get_text_sprite(self, text: str, font_scale: float, thickness: int) -> _TextSprite:
+        key = (text, font_scale, thickness)
+        sprite = self._texts.get(key)
+        
+        if sprite is not None:
+            self._texts.move_to_end(key)
+            self.text_hits += 1
+            return sprite
+        
+        (text_w, text_h), baseline = cv2.getTextSize(text, self.font, font_scale, thickness)
+        pad = thickness + 2
+        
+        canvas = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad), dtype=np.uint8)
+        cv2.putText(canvas, text, (pad, pad + text_h), self.font, font_scale, 255, thickness, cv2.LINE_4)
+        
+        sprite = _TextSprite(canvas, -pad, -(pad + text_h))
+        self._texts[key] = sprite
+        self.text_renders += 1
+        
+        if len(self._texts) > self.max_text_sprites:
+            self._texts.popitem(last=False)
+        
+        return sprite
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'panels_cached': len(self._panels),
+            'panel_renders': self.panel_renders,
+            'texts_cached': len(self._texts),
+            'text_renders': self.text_renders,
+            'text_hits': self.text_hits
+        }
@@ -0,0 +1,239 @@
+"""
+🔁 REPETITION COUNTER - REPETICIONES Y ROM POR REPETICIÓN EN STREAMING
+======================================================================
+Detecta repeticiones sobre la señal de ángulo (ya filtrada) frame a frame,
+en tiempo constante, con picos/valles e histéresis
+
+PROBLEMA:
+ROMSession.repetitions guardaba lo que mandara el cliente (0 por defecto) y
+los analyzers solo seguían max_angle: un único pico espurio inflaba el ROM
+reportado.
+
+SOLUCIÓN:
+Máquina de estados sobre el ángulo (reposo = ángulo bajo):
+- VALLE: sigue el mínimo; cuando el ángulo sube min_amplitude grados sobre
+  él, ese mínimo es el inicio (trough) de una repetición → SUBIDA
+- SUBIDA: sigue el máximo (peak); la repetición se cuenta cuando el ángulo
+  vuelve return_ratio del recorrido hacia el trough (histéresis: oscilar
+  cerca del pico no cuenta ni corta la repetición) → VALLE
+- Una mediana corta previa (prefilter) quita picos de 1-2 frames antes de
+  buscar picos/valles, aunque el canal no tenga filtro configurado
+- Se descartan repeticiones de duración fuera de [min_duration,
+  max_duration]
+- Un hueco sin mediciones mayor a max_gap abandona la repetición en curso
+- El valle final (end_trough) de la última repetición se sigue refinando
+  hasta que empieza la siguiente
+
+Cada repetición guarda peak, trough, ROM (peak - trough) y duración (del
+valle inicial hasta que se cuenta, al volver return_ratio del recorrido);
+summarize_repetitions() deja listo lo que se persiste en ROMSession (repetitions,
+max_angle, min_angle, rom_value) a partir de repeticiones válidas.
+
+Uso:
+    counter = RepetitionCounter(min_amplitude=20)
+    counter.update(angle, timestamp)       # cada frame medido
+    counter.count, counter.reps
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .angle_filters import FilterSpec, create_filter
+
+# Fases de la máquina de estados
+VALLEY = 'valley'
+RISING = 'rising'
+
+
+class RepetitionCounter:
+    """
+    Contador de repeticiones de un canal de ángulo (O(1) por frame)
+    """
+    
+    # Mediana de 5 desde la primera muestra: un pico de 1-2 frames no llega
+    # a la detección de picos
+    DEFAULT_PREFILTER = {'type': 'median', 'window': 5, 'min_samples': 1}
+    
+    def __init__(
+        self,
+        channel: str = 'angle',
+        min_amplitude: float = 20.0,
+        return_ratio: float = 0.7,
+        min_duration: float = 0.4,
+        max_duration: float = 30.0,
+        max_gap: float = 1.0,
+        prefilter: FilterSpec = None
+    ):
+        """
+        Args:
+            channel: Nombre del canal (ej: 'left', 'right'); va en cada repetición
+            min_amplitude: Subida mínima sobre el valle para iniciar (grados)
+            return_ratio: Fracción del recorrido peak → trough que debe volver
+                para contar la repetición (0-1]
+            min_duration: Duración mínima de una repetición (s)
+            max_duration: Duración máxima de una repetición (s)
+            max_gap: Hueco máximo sin mediciones dentro de una repetición (s)
+            prefilter: Filtro previo (ver create_filter); None = DEFAULT_PREFILTER,
+                'none' = sin filtro
+        """
+        if min_amplitude <= 0:
+            raise ValueError("min_amplitude debe ser > 0")
+        if not 0 < return_ratio <= 1:
+            raise ValueError("return_ratio debe estar en (0, 1]")
+        
+        self.channel = channel
+        self.min_amplitude = min_amplitude
+        self.return_ratio = return_ratio
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.max_gap = max_gap
+        self._prefilter = create_filter(self.DEFAULT_PREFILTER if prefilter is None else prefilter)
+        
+        self.reps: List[Dict[str, Any]] = []
+        self.rejected = 0
+        self._origin: Optional[float] = None
+        self._restart()
+    
+    def _restart(self):
+        """Vuelve a buscar un valle (conserva las repeticiones contadas)"""
+        self._prefilter.reset()
+        self.phase = VALLEY
+        self._last_time: Optional[float] = None
+        self._extreme: Optional[float] = None   # Mínimo (VALLE) o máximo (SUBIDA)
+        self._extreme_time = 0.0
+        self._trough: Optional[float] = None
+        self._trough_time = 0.0
+        self._open_rep: Optional[Dict[str, Any]] = None  # Última rep, valle final sin cerrar
+    
+    @property
+    def count(self) -> int:
+        return len(self.reps)
+    
+    def reset(self):
+        """Descarta todas las repeticiones (nueva sesión de medición)"""
+        self.reps = []
+        self.rejected = 0
+        self._origin = None
+        self._restart()
+    
+    def update(self, angle: float, timestamp: float) -> Optional[Dict[str, Any]]:
+        """
+        Procesa una muestra del ángulo
+        
+        Args:
+            angle: Ángulo filtrado (grados; mayor = más lejos del reposo)
+            timestamp: Tiempo de la muestra (s)
+        
+        Returns:
+            dict: La repetición recién contada, o None
+        """
+        if self._origin is None:
+            self._origin = timestamp
+        if self._last_time is not None and timestamp - self._last_time > self.max_gap:
+            self._restart()
+        self._last_time = timestamp
+        angle = self._prefilter.filter(angle, timestamp)
+        
+        if self._extreme is None:
+            self._extreme, self._extreme_time = angle, timestamp
+            return None
+        
+        if self.phase == VALLEY:
+            if angle < self._extreme:
+                self._extreme, self._extreme_time = angle, timestamp
+                if self._open_rep is not None:
+                    # El valle final de la última repetición sigue bajando
+                    self._open_rep['end_trough'] = round(angle, 2)
+            elif angle >= self._extreme + self.min_amplitude:
+                # Subida confirmada: el mínimo es el inicio de una repetición
+                self._open_rep = None
+                self._trough, self._trough_time = self._extreme, self._extreme_time
+                self._extreme, self._extreme_time = angle, timestamp
+                self.phase = RISING
+            return None
+        
+        # SUBIDA
+        if angle > self._extreme:
+            self._extreme, self._extreme_time = angle, timestamp
+            return None
+        
+        excursion = self._extreme - self._trough
+        if angle > self._extreme - self.return_ratio * excursion:
+            return None
+        
+        # Volvió return_ratio del recorrido: repetición completa
+        rep = self._close_rep(timestamp)
+        self.phase = VALLEY
+        self._extreme, self._extreme_time = angle, timestamp
+        return rep
+    
+    def _close_rep(self, timestamp: float) -> Optional[Dict[str, Any]]:
+        duration = timestamp - self._trough_time
+        if not self.min_duration <= duration <= self.max_duration:
+            self.rejected += 1
+            self._open_rep = None
+            return None
+        
+        rep = {
+            'index': len(self.reps) + 1,
+            'channel': self.channel,
+            'peak': round(self._extreme, 2),
+            'trough': round(self._trough, 2),
+            'rom': round(self._extreme - self._trough, 2),
+            'start': self._relative(self._trough_time),
+            'peak_time': self._relative(self._extreme_time),
+            'end': self._relative(timestamp),
+            'end_trough': None,
+            'duration': round(duration, 2)
+        }
+        self.reps.append(rep)
+        self._open_rep = rep
+        return rep
+    
+    def _relative(self, timestamp: float) -> float:
+        return round(timestamp - self._origin, 2)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Estado en vivo (para get_current_data)"""
+        last = self.reps[-1] if self.reps else None
+        return {
+            'count': self.count,
+            'phase': self.phase,
+            'last_rep': dict(last) if last else None
+        }
+
+
+def summarize_repetitions(counters: List[RepetitionCounter]) -> Dict[str, Any]:
+    """
+    Desglose por repetición listo para persistir en ROMSession
+    
+    Con varios canales (ej: abducción bilateral) repetitions es el máximo
+    entre canales: ambos brazos a la vez cuentan como una repetición.
+    Los ángulos salen solo de repeticiones válidas (no de picos sueltos).
+    
+    Returns:
+        dict: repetitions, max_angle, min_angle, rom_value, median_rom,
+            rejected y reps (lista de todas las repeticiones, por inicio)
+    """
+    reps = sorted((rep for counter in counters for rep in counter.reps), key=lambda rep: rep['start'])
+    summary = {
+        'repetitions': max((counter.count for counter in counters), default=0),
+        'max_angle': None,
+        'min_angle': None,
+        'rom_value': None,
+        'median_rom': None,
+        'rejected': sum(counter.rejected for counter in counters),
+        'reps': [dict(rep) for rep in reps]
+    }
+    
+    if reps:
+        roms = sorted(rep['rom'] for rep in reps)
+        middle = len(roms) // 2
+        summary['max_angle'] = max(rep['peak'] for rep in reps)
+        summary['min_angle'] = min(rep['trough'] for rep in reps)
+        summary['rom_value'] = round(summary['max_angle'] - summary['min_angle'], 2)
+        summary['median_rom'] = roms[middle] if len(roms) % 2 else round((roms[middle - 1] + roms[middle]) / 2, 2)
+    
+    return summary
@@ -0,0 +1,260 @@
+"""
+🎯 ROI TRACKER - REGIÓN DE INTERÉS PARA MEDIAPIPE
+==================================================
+Recorta alrededor de la persona antes de pose.process()
+
+PROBLEMA:
+Los analyzers redimensionaban el frame completo 1280x720 a 640x480 antes de
+MediaPipe: la mayor parte de la imagen es fondo y la persona queda aplastada
+(16:9 → 4:3 sin respetar la proporción).
+
+SOLUCIÓN:
+- La ROI siempre tiene la proporción de la resolución de procesamiento, así
+  que el resize posterior NO deforma a la persona
+- Se ubica alrededor del bounding box de la última pose + margen; las zonas
+  fuera del frame se rellenan en negro (letterbox)
+- Sin pose (o al perderla) se usa la ROI de frame completo con letterbox
+- ROI "pegajosa": solo se mueve cuando la pose se acerca al borde o queda
+  muy chica dentro de ella, para no romper el tracking temporal de MediaPipe
+- Los landmarks se devuelven en coordenadas normalizadas del frame completo,
+  así que el resto del analyzer no cambia
+
+Uso:
+    tracker = PoseROITracker(processing_size=(640, 480))
+    
+    crop, roi = tracker.crop(frame)
+    results = pose.process(cv2.resize(crop, (640, 480)))
+    results = tracker.map_results(results, roi, frame.shape)  # landmarks → frame completo
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple, Dict, Any
+
+from .landmark_frame import LandmarkFrame, PoseResults, X, Y, Z, VISIBILITY
+
+# ROI en píxeles del frame completo: (x, y, ancho, alto); puede salirse del frame
+ROI = Tuple[int, int, int, int]
+
+
+class PoseROITracker:
+    """Seguimiento de la región de la persona para recortar la entrada de MediaPipe"""
+    
+    def __init__(
+        self,
+        processing_size: Tuple[int, int] = (640, 480),
+        margin: float = 0.25,
+        min_size: float = 0.35,
+        edge_margin: float = 0.05,
+        shrink_ratio: float = 0.5,
+        visibility_threshold: float = 0.5,
+        max_lost_frames: int = 2
+    ):
+        """
+        Args:
+            processing_size: (ancho, alto) de entrada a MediaPipe (define la proporción)
+            margin: Margen alrededor del bounding box (fracción de su tamaño)
+            min_size: Alto mínimo de la ROI (fracción del alto del frame)
+            edge_margin: Si la pose queda a menos de esta fracción del borde
+                de la ROI, se recalcula
+            shrink_ratio: Si el área del bbox cae por debajo de esta fracción
+                del área que tenía al fijar la ROI, se recalcula (persona se alejó)
+            visibility_threshold: Visibilidad mínima para usar un landmark
+            max_lost_frames: Frames sin detección antes de volver a frame completo
+        """
+        self.aspect = processing_size[0] / processing_size[1]
+        self.margin = margin
+        self.min_size = min_size
+        self.edge_margin = edge_margin
+        self.shrink_ratio = shrink_ratio
+        self.visibility_threshold = visibility_threshold
+        self.max_lost_frames = max_lost_frames
+        
+        self.roi: Optional[ROI] = None
+        self._roi_box_area = 0.0  # Área del bbox cuando se fijó la ROI
+        self._frame_size: Optional[Tuple[int, int]] = None  # (ancho, alto) de la ROI actual
+        self._lost_frames = 0
+        
+        self.tracked_frames = 0
+        self.full_frame_searches = 0
+        self.roi_updates = 0
+    
+    # ------------------------------------------------------------------
+    # RECORTE
+    # ------------------------------------------------------------------
+    
+    def full_frame_roi(self, frame_width: int, frame_height: int) -> ROI:
+        """ROI mínima con la proporción de procesamiento que contiene el frame"""
+        if frame_width / frame_height > self.aspect:
+            roi_w, roi_h = frame_width, int(round(frame_width / self.aspect))
+        else:
+            roi_w, roi_h = int(round(frame_height * self.aspect)), frame_height
+        
+        return ((frame_width - roi_w) // 2, (frame_height - roi_h) // 2, roi_w, roi_h)
+    
+    def crop(self, frame: np.ndarray) -> Tuple[np.ndarray, ROI]:
+        """
+        Recorta la ROI actual (o el frame completo con letterbox)
+        
+        Args:
+            frame: Frame BGR completo
+        
+        Returns:
+            tuple: (imagen recortada con proporción de procesamiento, roi usada)
+        """
+        h, w = frame.shape[:2]
+        
+        # El frame cambió de tamaño (ej: captura MJPG decodificada a otra
+        # escala): llevar la ROI a la nueva resolución
+        if self.roi is not None and self._frame_size != (w, h):
+            self._rescale(w, h)
+        self._frame_size = (w, h)
+        
+        if self.roi is None:
+            roi = self.full_frame_roi(w, h)
+            self.full_frame_searches += 1
+        else:
+            roi = self.roi
+            self.tracked_frames += 1
+        
+        x, y, roi_w, roi_h = roi
+        
+        # Parte de la ROI dentro del frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + roi_w, w), min(y + roi_h, h)
+        cropped = frame[y0:y1, x0:x1]
+        
+        # Rellenar en negro lo que cae fuera del frame
+        pad_top, pad_left = y0 - y, x0 - x
+        pad_bottom, pad_right = (y + roi_h) - y1, (x + roi_w) - x1
+        
+        if pad_top or pad_left or pad_bottom or pad_right:
+            cropped = cv2.copyMakeBorder(
+                cropped, pad_top, pad_bottom, pad_left, pad_right,
+                cv2.BORDER_CONSTANT, value=(0, 0, 0)
+            )
+        
+        return cropped, roi
+    
+    # ------------------------------------------------------------------
+    # MAPEO Y ACTUALIZACIÓN
+    # ------------------------------------------------------------------
+    
+    def map_results(self, results, roi: ROI, frame_shape: Tuple[int, ...]):
+        """
+        Convierte los landmarks de la ROI a coordenadas del frame completo
+        y actualiza el seguimiento
+        
+        Args:
+            results: Resultado de pose.process() (o PoseResults) sobre el recorte
+            roi: ROI usada en crop()
+            frame_shape: Shape del frame completo
+        
+        Returns:
+            PoseResults con landmarks normalizados al frame completo
+        """
+        h, w = frame_shape[:2]
+        x, y, roi_w, roi_h = roi
+        
+        results = PoseResults.from_mediapipe(results)
+        landmark_frame = results.landmark_frame
+        
+        if landmark_frame is None:
+            self._lost_frames += 1
+            if self._lost_frames >= self.max_lost_frames:
+                self.roi = None
+            return results
+        
+        self._lost_frames = 0
+        
+        scale_x, scale_y = roi_w / w, roi_h / h
+        offset_x, offset_y = x / w, y / h
+        
+        # En float64 y redondeado a float32 al asignar (igual que el protobuf)
+        array = landmark_frame.array
+        array[:, X] = offset_x + array[:, X].astype(np.float64) * scale_x
+        array[:, Y] = offset_y + array[:, Y].astype(np.float64) * scale_y
+        array[:, Z] = array[:, Z].astype(np.float64) * scale_x
+        results.invalidate_landmark_list()
+        
+        self._update_roi(landmark_frame, w, h)
+        return results
+    
+    def _update_roi(self, landmark_frame: LandmarkFrame, frame_width: int, frame_height: int):
+        """Recalcula la ROI si la pose se acerca al borde o quedó muy chica"""
+        array = landmark_frame.array
+        visible = array[:, VISIBILITY].astype(np.float64) >= self.visibility_threshold
+        points = (array[visible, :2].astype(np.float64) * (frame_width, frame_height)).astype(np.float32)
+        
+        if len(points) < 4:
+            return
+        
+        bx0, by0 = points.min(axis=0)
+        bx1, by1 = points.max(axis=0)
+        
+        if self.roi is not None and not self._needs_update(bx0, by0, bx1, by1):
+            return
+        
+        # Bounding box + margen
+        box_w, box_h = bx1 - bx0, by1 - by0
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        roi_w = box_w * (1 + 2 * self.margin)
+        roi_h = max(box_h * (1 + 2 * self.margin), frame_height * self.min_size)
+        
+        # Ajustar a la proporción de procesamiento (crecer, nunca recortar)
+        if roi_w / roi_h > self.aspect:
+            roi_h = roi_w / self.aspect
+        else:
+            roi_w = roi_h * self.aspect
+        
+        full = self.full_frame_roi(frame_width, frame_height)
+        if roi_w >= full[2]:
+            # La persona ocupa todo el frame: no hay nada que recortar
+            self.roi = full
+        else:
+            self.roi = (
+                int(round(cx - roi_w / 2)),
+                int(round(cy - roi_h / 2)),
+                int(round(roi_w)),
+                int(round(roi_h))
+            )
+        
+        self._roi_box_area = box_w * box_h
+        self.roi_updates += 1
+    
+    def _needs_update(self, bx0: float, by0: float, bx1: float, by1: float) -> bool:
+        x, y, roi_w, roi_h = self.roi
+        edge_x, edge_y = roi_w * self.edge_margin, roi_h * self.edge_margin
+        
+        near_edge = (
+            bx0 < x + edge_x or by0 < y + edge_y or
+            bx1 > x + roi_w - edge_x or by1 > y + roi_h - edge_y
+        )
+        too_small = (bx1 - bx0) * (by1 - by0) < self.shrink_ratio * self._roi_box_area
+        
+        return near_edge or too_small
+    
+    def _rescale(self, frame_width: int, frame_height: int):
+        """Escala la ROI (en píxeles) a un frame de otro tamaño"""
+        old_w, old_h = self._frame_size
+        fx, fy = frame_width / old_w, frame_height / old_h
+        x, y, roi_w, roi_h = self.roi
+        
+        self.roi = (int(round(x * fx)), int(round(y * fy)), int(round(roi_w * fx)), int(round(roi_h * fy)))
+        self._roi_box_area *= fx * fy
+    
+    def reset(self):
+        """Vuelve a búsqueda en frame completo"""
+        self.roi = None
+        self._lost_frames = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'roi': list(self.roi) if self.roi else None,
+            'tracked_frames': self.tracked_frames,
+            'full_frame_searches': self.full_frame_searches,
+            'roi_updates': self.roi_updates
+        }
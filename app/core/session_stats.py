@@ -0,0 +1,363 @@
+"""
+📊 SESSION STATS - ESTADÍSTICAS DE SESIÓN EN STREAMING POR CANAL
+================================================================
+Mínimo, máximo, media, varianza, percentiles aproximados y tiempo en cada
+banda de ángulo, con memoria fija sin importar la duración de la sesión
+
+PROBLEMA:
+Los analyzers solo guardaban max_angle / left_max_rom / right_max_rom: un
+único frame ruidoso definía el ROM, y min_angle, rom_value y quality_score
+de ROMSession no tenían fuente en el servidor. Guardar todos los ángulos
+para calcular percentiles al final crece sin límite con la sesión.
+
+SOLUCIÓN:
+- RunningStats: min, max, media y varianza con Welford (O(1), estable)
+- P2Quantile: percentil aproximado con el algoritmo P² (Jain & Chlamtac,
+  1985): 5 marcadores, O(1) por muestra; exacto con menos de 5 muestras
+- RangeBands: segundos en cada banda de ángulo (el tiempo entre dos
+  muestras se asigna a la banda de la primera; huecos > max_gap no cuentan)
+- ChannelStats: todo lo anterior para un canal, más el % de muestras con
+  postura válida (quality_score)
+- summarize_session_stats(): ROM robusto (percentil alto - percentil bajo)
+  listo para persistir en ROMSession
+
+Uso:
+    stats = ChannelStats('angle')
+    stats.update(angle, timestamp, valid=posture_valid)   # cada frame medido
+    stats.summary()      # {'min', 'max', 'mean', 'std', 'p5', 'p95', 'bands', ...}
+    stats.live_summary() # {'p5', 'p95', 'robust_rom', 'quality_score'} enteros
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import math
+from bisect import bisect_right, insort
+from typing import Any, Dict, List, Optional, Sequence
+
+# Límites de las bandas de ángulo por defecto (grados)
+DEFAULT_BANDS = (30.0, 60.0, 90.0, 120.0, 150.0)
+
+
+class RunningStats:
+    """Mínimo, máximo, media y varianza en una pasada (Welford)"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.mean = 0.0
+        self._m2 = 0.0   # Suma de cuadrados de las diferencias a la media
+    
+    def add(self, value: float):
+        self.count += 1
+        if self.count == 1:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+    
+    @property
+    def variance(self) -> float:
+        """Varianza muestral (0 con menos de 2 muestras)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Percentil aproximado con el algoritmo P² (memoria fija de 5 marcadores)
+    
+    Con menos de 5 muestras devuelve el percentil exacto (interpolación
+    lineal, como np.percentile).
+    """
+    
+    def __init__(self, percentile: float):
+        """
+        Args:
+            percentile: Percentil a estimar (0-100, exclusivo)
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile debe estar en (0, 100)")
+        self.percentile = percentile
+        p = percentile / 100.0
+        self._increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+        self.reset()
+    
+    def reset(self):
+        p = self.percentile / 100.0
+        self.count = 0
+        self._heights: List[float] = []   # Alturas de los marcadores (ordenadas)
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+    
+    def add(self, value: float):
+        self.count += 1
+        heights = self._heights
+        
+        if self.count <= 5:
+            insort(heights, value)
+            return
+        
+        # Celda de la muestra (ajustando los extremos)
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect_right(heights, value) - 1
+        
+        positions, desired = self._positions, self._desired
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            desired[i] += self._increments[i]
+        
+        # Ajustar los marcadores intermedios hacia su posición deseada
+        for i in (1, 2, 3):
+            offset = desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+    
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+    
+    def _linear(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+    
+    @property
+    def value(self) -> Optional[float]:
+        """Estimación actual (None sin muestras)"""
+        if self.count == 0:
+            return None
+        if self.count > 5:
+            return self._heights[2]
+        
+        heights = self._heights
+        rank = (self.percentile / 100.0) * (len(heights) - 1)
+        lower = int(rank)
+        upper = min(lower + 1, len(heights) - 1)
+        return heights[lower] + (heights[upper] - heights[lower]) * (rank - lower)
+
+
+class RangeBands:
+    """Segundos acumulados en cada banda de valores"""
+    
+    def __init__(self, edges: Sequence[float] = DEFAULT_BANDS, max_gap: float = 1.0):
+        """
+        Args:
+            edges: Límites crecientes; N límites = N + 1 bandas
+            max_gap: Tiempo máximo entre muestras que se acumula (s)
+        """
+        self.edges = tuple(float(edge) for edge in edges)
+        if any(a >= b for a, b in zip(self.edges, self.edges[1:])):
+            raise ValueError("edges debe ser estrictamente creciente")
+        self.max_gap = max_gap
+        self.labels = self._labels(self.edges)
+        self.reset()
+    
+    @staticmethod
+    def _labels(edges) -> List[str]:
+        if not edges:
+            return ['all']
+        labels = [f'<{edges[0]:g}']
+        labels += [f'{low:g}-{high:g}' for low, high in zip(edges, edges[1:])]
+        labels.append(f'>={edges[-1]:g}')
+        return labels
+    
+    def reset(self):
+        self.seconds = [0.0] * len(self.labels)
+        self._band: Optional[int] = None
+        self._timestamp: Optional[float] = None
+    
+    def add(self, value: float, timestamp: float):
+        if self._band is not None:
+            elapsed = timestamp - self._timestamp
+            if 0 < elapsed <= self.max_gap:
+                self.seconds[self._band] += elapsed
+        self._band = bisect_right(self.edges, value)
+        self._timestamp = timestamp
+    
+    def describe(self) -> List[Dict[str, Any]]:
+        """[{'range', 'seconds', 'fraction'}, ...] en orden de banda"""
+        total = sum(self.seconds)
+        return [
+            {
+                'range': label,
+                'seconds': round(seconds, 2),
+                'fraction': round(seconds / total, 3) if total else 0.0
+            }
+            for label, seconds in zip(self.labels, self.seconds)
+        ]
+
+
+class ChannelStats:
+    """
+    Estadísticas de sesión de un canal de ángulo (memoria fija, O(1) por muestra)
+    """
+    
+    def __init__(
+        self,
+        channel: str = 'angle',
+        low_percentile: float = 5.0,
+        high_percentile: float = 95.0,
+        bands: Sequence[float] = DEFAULT_BANDS,
+        max_gap: float = 1.0
+    ):
+        """
+        Args:
+            channel: Nombre del canal (ej: 'left', 'right')
+            low_percentile / high_percentile: Percentiles del ROM robusto
+            bands: Límites de las bandas de ángulo (grados)
+            max_gap: Hueco máximo entre muestras que suma tiempo en banda (s)
+        """
+        if low_percentile >= high_percentile:
+            raise ValueError("low_percentile debe ser menor que high_percentile")
+        
+        self.channel = channel
+        self.running = RunningStats()
+        self.low = P2Quantile(low_percentile)
+        self.high = P2Quantile(high_percentile)
+        self.bands = RangeBands(bands, max_gap)
+        self.valid_count = 0
+    
+    @property
+    def count(self) -> int:
+        return self.running.count
+    
+    def reset(self):
+        """Descarta todo (nueva sesión de medición)"""
+        self.running.reset()
+        self.low.reset()
+        self.high.reset()
+        self.bands.reset()
+        self.valid_count = 0
+    
+    def update(self, value: float, timestamp: float, valid: bool = True):
+        """
+        Agrega una muestra del ángulo
+        
+        Args:
+            value: Ángulo filtrado (grados)
+            timestamp: Tiempo de la muestra (s)
+            valid: Si la postura era válida (para quality_score)
+        """
+        self.running.add(value)
+        self.low.add(value)
+        self.high.add(value)
+        self.bands.add(value, timestamp)
+        if valid:
+            self.valid_count += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: samples, min, max, mean, std, p<low>, p<high>, robust_rom,
+                quality_score (% de muestras con postura válida) y bands
+                (None en los valores si no hay muestras)
+        """
+        running = self.running
+        low, high = self.low.value, self.high.value
+        
+        return {
+            'channel': self.channel,
+            'samples': running.count,
+            'min': _round(running.min),
+            'max': _round(running.max),
+            'mean': _round(running.mean) if running.count else None,
+            'std': _round(running.std) if running.count else None,
+            f'p{self.low.percentile:g}': _round(low),
+            f'p{self.high.percentile:g}': _round(high),
+            'robust_rom': _round(max(0.0, high - low)) if running.count else None,
+            'quality_score': round(100.0 * self.valid_count / running.count, 1) if running.count else None,
+            'bands': self.bands.describe()
+        }
+    
+    def live_summary(self) -> Dict[str, Any]:
+        """
+        Subconjunto para los datos en vivo (get_current_data)
+        
+        Solo ROM robusto, percentiles y quality_score, en grados / % enteros:
+        no cambia con cada muestra, así el feed de estado emite solo cuando
+        cambia lo que se muestra. samples, media, desvío y bandas quedan
+        para summary() (get_stats_summary / /analysis/stop).
+        
+        Returns:
+            dict: p<low>, p<high>, robust_rom y quality_score (None sin muestras)
+        """
+        running = self.running
+        low, high = self.low.value, self.high.value
+        
+        return {
+            f'p{self.low.percentile:g}': _round_live(low),
+            f'p{self.high.percentile:g}': _round_live(high),
+            'robust_rom': _round_live(max(0.0, high - low)) if running.count else None,
+            'quality_score': _round_live(100.0 * self.valid_count / running.count) if running.count else None
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def _round_live(value: Optional[float]) -> Optional[int]:
+    return None if value is None else int(round(value))
+
+
+def summarize_session_stats(channels: List[ChannelStats]) -> Dict[str, Any]:
+    """
+    Valores de ROMSession a partir de las estadísticas de los canales
+    
+    max_angle / min_angle son los percentiles alto / bajo (no el pico de un
+    frame) del canal con mayor ROM robusto; con varios canales (ej:
+    abducción bilateral) se reporta el lado que más se movió.
+    
+    Returns:
+        dict: max_angle, min_angle, rom_value, quality_score (0-100; None
+            sin muestras) y channels ({canal: summary()})
+    """
+    summaries = {stats.channel: stats.summary() for stats in channels}
+    result = {
+        'max_angle': None,
+        'min_angle': None,
+        'rom_value': None,
+        'quality_score': None,
+        'channels': summaries
+    }
+    
+    measured = [stats for stats in channels if stats.count]
+    if not measured:
+        return result
+    
+    best = max(measured, key=lambda stats: stats.high.value - stats.low.value)
+    result['max_angle'] = _round(best.high.value)
+    result['min_angle'] = _round(best.low.value)
+    result['rom_value'] = _round(max(0.0, best.high.value - best.low.value))
+    result['quality_score'] = round(
+        100.0 * sum(stats.valid_count for stats in measured) / sum(stats.count for stats in measured), 1
+    )
+    return result
@@ -0,0 +1,287 @@
+"""
+🔤 TEXT RENDERER - ATLAS DE GLIFOS PARA TEXTO UNICODE
+=====================================================
+Dibuja etiquetas como "45°" directamente sobre el frame NumPy
+
+PROBLEMA:
+add_text_with_pillow convertía el frame COMPLETO BGR→RGB→PIL→NumPy→BGR y
+llamaba a ImageFont.truetype("arial.ttf") en cada etiqueta. Con un arco por
+articulación eso son varias copias y conversiones de color del frame
+1280x720 por frame, solo para dibujar 3 o 4 caracteres.
+
+SOLUCIÓN:
+- Fuentes cacheadas por tamaño (truetype se resuelve UNA vez)
+- Atlas de glifos pre-rasterizados por tamaño: dígitos, signo de grado,
+  puntuación, ASCII y caracteres acentuados del español (áéíóúñü¿¡...)
+- Caracteres fuera del atlas se rasterizan la primera vez que aparecen
+- El texto se compone como máscara de cobertura y se mezcla solo dentro de
+  su rectángulo del frame BGR: sin conversión de espacio de color ni copias
+  del frame completo
+
+Uso:
+    renderer = get_text_renderer()
+    renderer.draw(frame, "45°", (120, 80), font_size=16, color=(255, 255, 255))
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import string
+import threading
+import logging
+import numpy as np
+from typing import Optional, Sequence, Tuple, Dict, Any
+
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+Point = Tuple[int, int]
+Color = Tuple[int, int, int]
+
+# Fuentes probadas en orden (Windows, Linux, macOS); si ninguna existe se
+# usa la fuente por defecto de Pillow
+DEFAULT_FONT_CANDIDATES = (
+    "arial.ttf",
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial.ttf",
+)
+
+# Caracteres pre-rasterizados al crear el atlas de un tamaño
+DEFAULT_CHARSET = (
+    string.digits + string.ascii_letters + string.punctuation + " "
+    + "°±·" + "áéíóúÁÉÍÓÚñÑüÜ¿¡"
+)
+
+
+class _Glyph:
+    """Cobertura (0-255) de un carácter y su posición respecto al cursor"""
+    
+    __slots__ = ('coverage', 'left', 'top', 'advance')
+    
+    def __init__(self, coverage: np.ndarray, left: int, top: int, advance: float):
+        self.coverage = coverage
+        self.left = left
+        self.top = top
+        self.advance = advance
+
+
+class GlyphAtlas:
+    """Glifos de UNA fuente y tamaño, rasterizados una sola vez"""
+    
+    def __init__(self, font, charset: Sequence[str] = DEFAULT_CHARSET):
+        """
+        Args:
+            font: Fuente de Pillow (ImageFont)
+            charset: Caracteres a pre-rasterizar
+        """
+        self.font = font
+        self._glyphs: Dict[str, _Glyph] = {}
+        self._lock = threading.Lock()
+        
+        self.lazy_glyphs = 0
+        
+        for char in charset:
+            self._glyphs[char] = self._rasterize(char)
+    
+    def _rasterize(self, char: str) -> _Glyph:
+        # Misma referencia que draw.text(position, ...): esquina superior
+        # izquierda de la línea (ancla 'la')
+        left, top, right, bottom = self.font.getbbox(char, anchor='la')
+        advance = self.font.getlength(char)
+        width, height = right - left, bottom - top
+        
+        if width <= 0 or height <= 0:
+            return _Glyph(np.zeros((0, 0), dtype=np.uint8), 0, 0, advance)
+        
+        canvas = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(canvas).text((-left, -top), char, font=self.font, fill=255, anchor='la')
+        
+        return _Glyph(np.asarray(canvas, dtype=np.uint8), left, top, advance)
+    
+    def glyph(self, char: str) -> _Glyph:
+        """Glifo del carácter (se rasteriza y cachea si no estaba en el atlas)"""
+        glyph = self._glyphs.get(char)
+        
+        if glyph is None:
+            with self._lock:
+                glyph = self._glyphs.get(char)
+                if glyph is None:
+                    glyph = self._glyphs[char] = self._rasterize(char)
+                    self.lazy_glyphs += 1
+        
+        return glyph
+    
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+
+class TextRenderer:
+    """Texto Unicode sobre frames BGR usando atlas de glifos cacheados"""
+    
+    def __init__(
+        self,
+        font_candidates: Sequence[str] = DEFAULT_FONT_CANDIDATES,
+        charset: Sequence[str] = DEFAULT_CHARSET
+    ):
+        """
+        Args:
+            font_candidates: Rutas/nombres de fuentes TrueType a probar en orden
+            charset: Caracteres pre-rasterizados por tamaño
+        """
+        self.font_candidates = tuple(font_candidates)
+        self.charset = charset
+        
+        self._fonts: Dict[int, Any] = {}
+        self._atlases: Dict[int, GlyphAtlas] = {}
+        self._lock = threading.Lock()
+        self._font_path: Optional[str] = None
+        
+        self.texts_drawn = 0
+    
+    # ------------------------------------------------------------------
+    # FUENTES Y ATLAS
+    # ------------------------------------------------------------------
+    
+    def get_font(self, font_size: int):
+        """Fuente TrueType del tamaño indicado (resuelta una sola vez)"""
+        font = self._fonts.get(font_size)
+        if font is not None:
+            return font
+        
+        for candidate in self.font_candidates:
+            try:
+                font = ImageFont.truetype(candidate, font_size)
+                self._font_path = candidate
+                break
+            except (OSError, ValueError):
+                continue
+        
+        if font is None:
+            try:
+                font = ImageFont.load_default(font_size)  # Pillow >= 10.1
+            except TypeError:
+                font = ImageFont.load_default()
+            self._font_path = 'default'
+            logger.debug("🔤 Sin fuente TrueType disponible, usando la de Pillow")
+        
+        self._fonts[font_size] = font
+        return font
+    
+    def get_atlas(self, font_size: int) -> GlyphAtlas:
+        """Atlas de glifos del tamaño indicado (se crea en el primer uso)"""
+        atlas = self._atlases.get(font_size)
+        
+        if atlas is None:
+            with self._lock:
+                atlas = self._atlases.get(font_size)
+                if atlas is None:
+                    atlas = self._atlases[font_size] = GlyphAtlas(self.get_font(font_size), self.charset)
+        
+        return atlas
+    
+    # ------------------------------------------------------------------
+    # DIBUJO
+    # ------------------------------------------------------------------
+    
+    def render_mask(self, text: str, font_size: int) -> Tuple[np.ndarray, int, int]:
+        """
+        Compone la cobertura de una línea de texto
+        
+        Returns:
+            tuple: (máscara uint8, desplazamiento x, desplazamiento y) respecto
+                a la posición de draw.text
+        """
+        atlas = self.get_atlas(font_size)
+        glyphs = []
+        cursor = 0.0
+        
+        for char in text:
+            glyph = atlas.glyph(char)
+            if glyph.coverage.size:
+                glyphs.append((int(round(cursor)) + glyph.left, glyph.top, glyph.coverage))
+            cursor += glyph.advance
+        
+        if not glyphs:
+            return np.zeros((0, 0), dtype=np.uint8), 0, 0
+        
+        x0 = min(x for x, _, _ in glyphs)
+        y0 = min(y for _, y, _ in glyphs)
+        x1 = max(x + c.shape[1] for x, _, c in glyphs)
+        y1 = max(y + c.shape[0] for _, y, c in glyphs)
+        
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for x, y, coverage in glyphs:
+            region = mask[y - y0:y - y0 + coverage.shape[0], x - x0:x - x0 + coverage.shape[1]]
+            np.maximum(region, coverage, out=region)
+        
+        return mask, x0, y0
+    
+    def draw(
+        self,
+        frame: np.ndarray,
+        text: str,
+        position: Point,
+        font_size: int = 20,
+        color: Color = (255, 255, 255)
+    ) -> np.ndarray:
+        """
+        Dibuja el texto in-place mezclando solo su rectángulo del frame
+        
+        Args:
+            frame: Frame BGR (se modifica in-place)
+            text: Texto Unicode (ej: "45°")
+            position: Esquina superior izquierda, como en ImageDraw.text
+            font_size: Tamaño de la fuente en píxeles
+            color: Color BGR
+        
+        Returns:
+            np.ndarray: El mismo frame
+        """
+        mask, dx, dy = self.render_mask(text, font_size)
+        if not mask.size:
+            return frame
+        
+        h, w = frame.shape[:2]
+        x, y = int(position[0]) + dx, int(position[1]) + dy
+        
+        # Recortar el rectángulo del texto a los bordes del frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + mask.shape[1], w), min(y + mask.shape[0], h)
+        if x1 <= x0 or y1 <= y0:
+            return frame
+        
+        coverage = mask[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.float32)[:, :, None] / 255.0
+        roi = frame[y0:y1, x0:x1]
+        
+        blended = roi * (1 - coverage) + np.asarray(color, dtype=np.float32) * coverage
+        roi[:] = (blended + 0.5).astype(np.uint8)
+        
+        self.texts_drawn += 1
+        return frame
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'font': self._font_path,
+            'sizes': sorted(self._atlases),
+            'glyphs': {size: len(atlas) for size, atlas in self._atlases.items()},
+            'lazy_glyphs': sum(atlas.lazy_glyphs for atlas in self._atlases.values()),
+            'texts_drawn': self.texts_drawn
+        }
+
+
+_renderer: Optional[TextRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_text_renderer() -> TextRenderer:
+    """Renderer compartido por todos los analyzers (fuentes y atlas únicos)"""
+    global _renderer
+    
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = TextRenderer()
+    
+    return _renderer
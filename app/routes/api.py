@@ -9,9 +9,15 @@ ENDPOINTS:
 - /api/subjects: CRUD de sujetos
 - /api/rom-session: Crear/actualizar sesión ROM
 - /api/video_feed: Stream MJPEG de video procesado (NUEVO)
-- /api/analysis/start: Iniciar análisis (NUEVO)
-- /api/analysis/stop: Detener análisis (NUEVO)
+- /api/analysis/start: Iniciar análisis y la grabación de la sesión (NUEVO)
+- /api/analysis/stop: Detener análisis; guarda el video en ROMSession.video_path (NUEVO)
 - /api/analysis/current_data: Obtener datos actuales (NUEVO)
+- /api/analysis/landmarks_feed: Landmarks y ángulos por frame (modo solo datos)
+- /api/analysis/events: Push SSE del estado del análisis (reemplaza el polling)
+- /api/analysis/pool: Métricas del pool de analyzers por sesión
+- /api/system/readiness: Progreso del warm-up de MediaPipe al arrancar
+- /api/stream/<camera_index>/watch: Observar stream en modo solo lectura
+- /api/stream/status: Canales de broadcast activos, espectadores y cámaras
 
 Autor: BIOTRACK Team
 Fecha: 2025-11-14
@@ -20,11 +26,21 @@ Fecha: 2025-11-14
 from flask import (
     Blueprint, jsonify, request, session, current_app, Response
 )
+from werkzeug.utils import secure_filename
 from app.routes.auth import login_required
 import cv2
 import numpy as np
 import logging
 import time
+from datetime import datetime
+from pathlib import Path
+
+from app.core.analyzer_pool import analyzer_pool
+from app.core.analyzer_warmup import analyzer_warmup
+from app.streaming import (
+    StreamPipeline, AdaptiveQualityController, broadcast_hub, get_landmark_feed, state_feed,
+    session_recorders
+)
 
 # Crear blueprint
 api_bp = Blueprint('api', __name__)
@@ -32,41 +48,100 @@ api_bp = Blueprint('api', __name__)
 # Logger para uso fuera del contexto de Flask
 logger = logging.getLogger(__name__)
 
+# Campos de ROMSession que salen de get_stats_summary() del analyzer
+SESSION_STATS_FIELDS = ('max_angle', 'min_angle', 'rom_value', 'quality_score')
+
 # ============================================================================
-# CACHE GLOBAL DE ANALYZERS
+# ANALYZERS POR SESIÓN
 # ============================================================================
-# Diccionario para cachear analyzers por tipo (evita re-inicialización de 25s)
-_ANALYZER_CACHE = {}
+# Cada sesión de usuario arrienda su propio analyzer de analyzer_pool (ver
+# app/core/analyzer_pool.py): los analyzers ociosos se reutilizan tras
+# reset() (evita la re-inicialización de 25s) y los menos usados se cierran
+# al alcanzar ANALYZER_POOL_MAX_INSTANCES / ANALYZER_POOL_MAX_MEMORY_MB.
+
+# Pipelines de streaming activos por cámara (métricas por etapa en current_data)
+_pipelines = {}
 
-# Variable global para el analyzer actual (compartida entre requests)
-current_analyzer = None
+# Resumen final (datos, repeticiones, estadísticas) de cada lease cuyo
+# productor terminó: /analysis/stop lo usa si el stream se cortó antes
+_final_results = {}
 
-def get_cached_analyzer(analyzer_type: str, analyzer_class):
+def _lease_id():
     """
-    Obtiene analyzer cacheado o crea uno nuevo
+    Identificador del lease de analyzer de la estación de esta sesión
     
-    Primera llamada: Inicializa MediaPipe (~25 segundos)
-    Siguientes llamadas: Reutiliza analyzer cacheado (0 segundos)
+    El analyzer pertenece al canal de la cámara (lo arrienda su productor y
+    lo libera al terminar), así que el lease es usuario + cámara: dos
+    pestañas del mismo usuario en la misma cámara comparten canal y
+    analyzer; dos estaciones (cámaras) tienen el suyo.
+    """
+    user_id = session.get('user_id')
+    if user_id is None:
+        return None
+    return f"{user_id}@camera{_camera_index()}"
+
+
+def _analysis_summary(analyzer) -> dict:
+    """final_data, repetitions y stats del analyzer (lo que persiste /analysis/stop)"""
+    return {
+        'final_data': analyzer.get_current_data(),
+        'repetitions': (
+            analyzer.get_repetition_summary() if hasattr(analyzer, 'get_repetition_summary') else None
+        ),
+        'stats': analyzer.get_stats_summary() if hasattr(analyzer, 'get_stats_summary') else None
+    }
+
+
+def _analyzer_classes() -> dict:
+    """Mapa tipo de ejercicio → clase de analyzer"""
+    from app.analyzers import ShoulderProfileAnalyzer, ShoulderFrontalAnalyzer
+    
+    return {
+        'shoulder_profile': ShoulderProfileAnalyzer,
+        'shoulder_frontal': ShoulderFrontalAnalyzer,
+        # Agregar más analyzers aquí en el futuro
+    }
+
+
+def _analyzer_factory(analyzer_class, **options):
+    """Constructor diferido del analyzer (solo se ejecuta si el pool no tiene uno ocioso)"""
+    def create():
+        return analyzer_class(
+            processing_width=640,
+            processing_height=480,
+            show_skeleton=False,
+            **options
+        )
+    return create
+
+
+def start_analyzer_warmup(config) -> bool:
+    """
+    Pre-calienta en segundo plano los analyzers de ANALYZER_WARMUP_TYPES
+    
+    Llamado desde create_app(): cada tipo queda ocioso en analyzer_pool con
+    las mismas opciones de inferencia que usará video_feed.
     
     Args:
-        analyzer_type: Tipo de analyzer ('shoulder_profile', 'shoulder_frontal', etc.)
-        analyzer_class: Clase del analyzer a instanciar
+        config: app.config
     
     Returns:
-        Analyzer inicializado y listo para usar
+        bool: True si se lanzó el hilo de warm-up
     """
-    if analyzer_type not in _ANALYZER_CACHE:
-        logger.info(f"🔧 Creando NUEVO analyzer '{analyzer_type}' - Primera inicialización (~25s)")
-        _ANALYZER_CACHE[analyzer_type] = analyzer_class(
-            processing_width=640,
-            processing_height=480,
-            show_skeleton=False
-        )
-        logger.info(f"✅ Analyzer '{analyzer_type}' listo y cacheado")
-    else:
-        logger.info(f"⚡ Reutilizando analyzer cacheado '{analyzer_type}' (0s)")
+    classes = _analyzer_classes()
+    options = _inference_options(config)
+    
+    factories = {}
+    for analyzer_type in config.get('ANALYZER_WARMUP_TYPES', []):
+        if analyzer_type not in classes:
+            logger.warning(f"Warm-up: analyzer '{analyzer_type}' no implementado, se omite")
+            continue
+        factories[analyzer_type] = _analyzer_factory(classes[analyzer_type], **options)
+    
+    if not factories:
+        return False
     
-    return _ANALYZER_CACHE[analyzer_type]
+    return analyzer_warmup.start(factories, analyzer_pool)
 
 
 # ============================================================================
@@ -155,11 +230,15 @@ def create_rom_session():
             "exercise_type": str,
             "camera_view": str,
             "side": str,
-            "max_angle": float,
-            "min_angle": float,
-            "rom_value": float,
-            "quality_score": float,
-            "notes": str
+            "max_angle": float, (opcionales; por defecto los
+            "min_angle": float,  percentiles del último
+            "rom_value": float,  /analysis/stop de esta sesión)
+            "repetitions": int  (opcional; por defecto las contadas en el
+                                 último /analysis/stop de esta sesión),
+            "quality_score": float  (ídem: % de frames con postura válida),
+            "notes": str,
+            "video_path": str   (opcional; por defecto la última grabación
+                                 de /analysis/stop de esta sesión)
         }
     
     Returns:
@@ -181,6 +260,13 @@ def create_rom_session():
                     'error': f'Campo requerido: {field}'
                 }), 400
         
+        # Lo medido en el último /analysis/stop completa lo que no mande el cliente
+        measured = session.pop('session_stats', None) or {}
+        angles = {
+            field: data[field] if data.get(field) is not None else measured.get(field)
+            for field in SESSION_STATS_FIELDS
+        }
+        
         # Crear sesión
         rom_session = db_manager.create_rom_session(
             subject_id=data['subject_id'],
@@ -189,13 +275,17 @@ def create_rom_session():
             exercise_type=data['exercise_type'],
             camera_view=data.get('camera_view'),
             side=data.get('side'),
-            max_angle=data.get('max_angle'),
-            min_angle=data.get('min_angle'),
-            rom_value=data.get('rom_value'),
-            repetitions=data.get('repetitions', 0),
+            max_angle=angles['max_angle'],
+            min_angle=angles['min_angle'],
+            rom_value=angles['rom_value'],
+            repetitions=(
+                data['repetitions'] if data.get('repetitions') is not None
+                else session.pop('repetition_count', 0)
+            ),
             duration=data.get('duration'),
-            quality_score=data.get('quality_score'),
-            notes=data.get('notes')
+            quality_score=angles['quality_score'],
+            notes=data.get('notes'),
+            video_path=data.get('video_path') or session.pop('recording_path', None)
         )
         
         # Log de actividad
@@ -253,6 +343,28 @@ def system_info():
         }), 500
 
 
+@api_bp.route('/system/readiness', methods=['GET'])
+def system_readiness():
+    """
+    Progreso del warm-up de MediaPipe (no requiere auth)
+    
+    200 cuando todos los analyzers de ANALYZER_WARMUP_TYPES terminaron de
+    inicializarse (o el warm-up está deshabilitado), 503 mientras tanto.
+    
+    Returns:
+        JSON con estado por tipo de analyzer y del pool
+    """
+    status = analyzer_warmup.get_status()
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            **status,
+            'pool': analyzer_pool.get_stats()
+        }
+    }), 200 if status['ready'] else 503
+
+
 # ============================================================================
 # VIDEO STREAMING Y ANÁLISIS EN VIVO (NUEVO)
 # ============================================================================
@@ -266,20 +378,103 @@ def video_feed():
     Este endpoint genera un stream continuo de frames procesados
     por el analyzer correspondiente al ejercicio activo.
     
+    Query params:
+        mode: 'annotated' (por defecto, STREAM_RENDER_MODE) o 'data'
+            (frames crudos de baja calidad o ninguno; landmarks y ángulos
+            por /api/analysis/landmarks_feed)
+    
     Returns:
         Response: Stream MJPEG multipart
     """
     from hardware.camera_manager import camera_manager
-    from app.analyzers import ShoulderProfileAnalyzer, ShoulderFrontalAnalyzer
     
     # ⚠️ CRÍTICO: Capturar valores de session ANTES del generador
     # (el generador se ejecuta fuera del request context)
     analyzer_type = session.get('analyzer_type')
     user_id = session.get('user_id')
+    lease_id = _lease_id()
+    camera_index = _camera_index()
+    camera_settings = _camera_settings(current_app.config, camera_index)
+    threaded_capture = current_app.config.get('CAMERA_THREADED_CAPTURE', False)
+    keep_warm = current_app.config.get('CAMERA_KEEP_WARM_SECONDS', 0)
+    settle_timeout = current_app.config.get('CAMERA_SETTLE_TIMEOUT', 0.0)
+    decode_scale = current_app.config.get('CAMERA_MJPG_DECODE_SCALE', 1)
+    pipeline_enabled = current_app.config.get('STREAM_PIPELINE_ENABLED', True)
+    queue_size = current_app.config.get('STREAM_QUEUE_SIZE', 2)
+    jpeg_quality = current_app.config.get('STREAM_JPEG_QUALITY', 70)
+    subscriber_queue_size = current_app.config.get('STREAM_SUBSCRIBER_QUEUE_SIZE', 2)
+    analyzer_options = _inference_options(current_app.config)
+    data_video = current_app.config.get('STREAM_DATA_VIDEO', 'low')
     
-    def generate_frames():
-        global current_analyzer
+    render_mode = request.args.get('mode') or current_app.config.get('STREAM_RENDER_MODE', 'annotated')
+    if render_mode not in StreamPipeline.RENDER_MODES:
+        render_mode = 'annotated'
+    
+    # Controlador de calidad del canal (lo comparten encoder y clientes)
+    quality_controller = _quality_controller(current_app.config, render_mode)
+    
+    def produce_frames(analyzer_class):
+        """Productor del canal: cámara → pipeline → bytes JPEG (una vez por frame)"""
+        landmark_feed = get_landmark_feed(camera_index)
+        
+        # El analyzer es del canal, no de la petición que lo creó: se arrienda
+        # aquí y se libera cuando ningún hilo del pipeline lo usa
+        # (reutiliza uno ocioso si existe)
+        analyzer = analyzer_pool.acquire(
+            lease_id,
+            analyzer_type,
+            _analyzer_factory(analyzer_class, **analyzer_options)
+        )
+        stopped = True
         
+        try:
+            # Adquirir cámara (context manager automático)
+            with camera_manager.acquire_camera(
+                user_id=user_id,
+                camera_index=camera_index,
+                threaded=threaded_capture,
+                keep_warm=keep_warm,
+                settle_timeout=settle_timeout,
+                **camera_settings
+            ) as cap:
+                logger.info(f"Cámara {camera_index} adquirida por '{user_id}' - Iniciando stream")
+                
+                # Etapas captura → inferencia → render → encode
+                pipeline = _pipelines[camera_index] = StreamPipeline(
+                    cap,
+                    analyzer,
+                    jpeg_quality=jpeg_quality,
+                    queue_size=queue_size,
+                    threaded=pipeline_enabled,
+                    error_frame_factory=_create_error_frame,
+                    quality_controller=quality_controller,
+                    render_mode=render_mode,
+                    payload_sink=landmark_feed.publish,
+                    data_video=data_video,
+                    on_rendered=state_feed.notify,
+                    reduced_decode_scale=decode_scale,
+                    frame_sink=lambda image: session_recorders.offer(camera_index, image)
+                )
+                
+                try:
+                    yield from pipeline.frames()
+                finally:
+                    stopped = pipeline.stop()
+                    landmark_feed.clear()
+                    if _pipelines.get(camera_index) is pipeline:
+                        del _pipelines[camera_index]
+        
+        finally:
+            if stopped:
+                # Resumen para /analysis/stop y el analyzer queda ocioso en el pool
+                if analyzer_pool.get(lease_id) is analyzer:
+                    _final_results[lease_id] = _analysis_summary(analyzer)
+                analyzer_pool.release(lease_id, analyzer)
+            else:
+                # Una etapa sigue usándolo: no se reutiliza (se desaloja por lease_ttl)
+                logger.warning(f"Analyzer del lease '{lease_id}' no liberado: el pipeline no terminó")
+    
+    def generate_frames():
         if not analyzer_type or not user_id:
             # Frame de error
             error_frame = _create_error_frame("No hay ejercicio activo. Selecciona un ejercicio primero.")
@@ -287,107 +482,35 @@ def video_feed():
                    b'Content-Type: image/jpeg\r\n\r\n' + error_frame + b'\r\n')
             return
         
-        # Mapa de analyzers
-        analyzer_classes = {
-            'shoulder_profile': ShoulderProfileAnalyzer,
-            'shoulder_frontal': ShoulderFrontalAnalyzer,
-            # Agregar más analyzers aquí en el futuro
-        }
-        
         # Inicializar analyzer si no existe o es diferente
-        analyzer_class = analyzer_classes.get(analyzer_type)
+        analyzer_class = _analyzer_classes().get(analyzer_type)
         if not analyzer_class:
             error_frame = _create_error_frame(f"Analyzer '{analyzer_type}' no implementado aún")
             yield (b'--frame\r\n'
                    b'Content-Type: image/jpeg\r\n\r\n' + error_frame + b'\r\n')
             return
         
-        # Obtener analyzer cacheado (reutiliza si ya existe)
-        current_analyzer = get_cached_analyzer(analyzer_type, analyzer_class)
-        
-        # Adquirir cámara (context manager automático)
         try:
-            with camera_manager.acquire_camera(user_id=user_id, width=1280, height=720) as cap:
-                logger.info(f"Cámara adquirida por '{user_id}' - Iniciando stream")
-                
-                frame_count = 0
-                mediapipe_ready = False
-                
-                while True:
-                    ret, frame = cap.read()
-                    
-                    if not ret:
-                        logger.warning("No se pudo leer frame de la cámara")
-                        break
-                    
-                    frame_count += 1
-                    
-                    # Verificar si MediaPipe está listo
-                    if not mediapipe_ready:
-                        # Chequear si el pose model ya se inicializó
-                        mediapipe_ready = hasattr(current_analyzer, 'pose') and current_analyzer.pose is not None
-                        
-                        if not mediapipe_ready:
-                            # MediaPipe AÚN inicializando - Mostrar frame CRUDO (sin procesar)
-                            # Esto da feedback visual inmediato al usuario (ve su cámara en ~2s)
-                            if frame_count % 30 == 0:  # Log cada 30 frames (~1 segundo)
-                                logger.debug(f"⏳ MediaPipe inicializando... Frame {frame_count}")
-                            
-                            # Frame crudo con overlay de "Cargando..."
-                            raw_frame = frame.copy()
-                            cv2.putText(
-                                raw_frame,
-                                "Inicializando MediaPipe...",
-                                (50, 50),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                0.8,
-                                (0, 255, 255),  # Amarillo
-                                2
-                            )
-                            cv2.putText(
-                                raw_frame,
-                                "El skeleton aparecera en unos segundos",
-                                (50, 90),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                0.6,
-                                (255, 255, 255),  # Blanco
-                                1
-                            )
-                            
-                            processed_frame = raw_frame
-                        else:
-                            # MediaPipe LISTO - Primera vez que procesamos
-                            logger.info(f"✅ MediaPipe listo! Iniciando procesamiento con skeleton")
-                            processed_frame = current_analyzer.process_frame(frame)
-                    else:
-                        # MediaPipe ya estaba listo - Procesamiento normal
-                        try:
-                            processed_frame = current_analyzer.process_frame(frame)
-                        except Exception as e:
-                            logger.error(f"Error al procesar frame: {e}")
-                            processed_frame = _create_error_frame(f"Error en procesamiento: {str(e)}")
-                    
-                    # Codificar frame como JPEG
-                    try:
-                        ret_encode, buffer = cv2.imencode(
-                            '.jpg', 
-                            processed_frame, 
-                            [cv2.IMWRITE_JPEG_QUALITY, 70]  # 70% calidad (optimizado para velocidad)
-                        )
-                        
-                        if not ret_encode:
-                            logger.error("Error al codificar frame")
-                            continue
-                        
-                        frame_bytes = buffer.tobytes()
-                        
-                        # Yield del frame en formato MJPEG
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                    
-                    except Exception as e:
-                        logger.error(f"Error al codificar/enviar frame: {e}")
-                        continue
+            # Suscribirse como dueño (crea el canal y su productor si no existe;
+            # una segunda pestaña se une al canal y a su analyzer)
+            subscriber = broadcast_hub.subscribe(
+                camera_index,
+                client_id=user_id,
+                role='owner',
+                producer=lambda: produce_frames(analyzer_class),
+                producer_key=f"{analyzer_type}:{render_mode}",
+                queue_size=subscriber_queue_size,
+                error_frame_factory=_create_error_frame,
+                quality_controller=quality_controller
+            )
+            
+            try:
+                for frame_bytes in subscriber.frames():
+                    # Yield del frame en formato MJPEG
+                    yield (b'--frame\r\n'
+                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+            finally:
+                broadcast_hub.unsubscribe(subscriber)
         
         except GeneratorExit:
             # Usuario cerró el navegador/tab
@@ -408,7 +531,7 @@ def video_feed():
                    b'Content-Type: image/jpeg\r\n\r\n' + error_frame + b'\r\n')
         
         finally:
-            # Cleanup siempre se ejecuta
+            # El analyzer lo libera el productor del canal al terminar
             logger.info(f"Finalizando stream para usuario '{user_id}'")
     
     return Response(
@@ -417,6 +540,104 @@ def video_feed():
     )
 
 
+@api_bp.route('/stream/<int:camera_index>/watch')
+@login_required
+def watch_stream(camera_index):
+    """
+    Stream MJPEG en modo observador (solo lectura)
+    
+    Se une al canal ya activo de la cámara: recibe los mismos frames JPEG
+    que el dueño sin ejecutar de nuevo MediaPipe ni el encode.
+    
+    Args:
+        camera_index: Índice de la cámara a observar
+    
+    Returns:
+        Response: Stream MJPEG multipart
+    """
+    user_id = session.get('user_id')
+    subscriber_queue_size = current_app.config.get('STREAM_SUBSCRIBER_QUEUE_SIZE', 2)
+    
+    def generate_frames():
+        try:
+            subscriber = broadcast_hub.subscribe(
+                camera_index,
+                client_id=user_id,
+                role='observer',
+                queue_size=subscriber_queue_size
+            )
+            
+            try:
+                for frame_bytes in subscriber.frames():
+                    yield (b'--frame\r\n'
+                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+            finally:
+                broadcast_hub.unsubscribe(subscriber)
+        
+        except GeneratorExit:
+            logger.info(f"Observador '{user_id}' cerró el stream (GeneratorExit)")
+        
+        except RuntimeError as e:
+            # No hay transmisión activa en esa cámara
+            error_frame = _create_error_frame(str(e))
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + error_frame + b'\r\n')
+    
+    return Response(
+        generate_frames(),
+        mimetype='multipart/x-mixed-replace; boundary=frame'
+    )
+
+
+@api_bp.route('/analysis/landmarks_feed')
+@login_required
+def landmarks_feed():
+    """
+    Landmarks, puntos clave y estado del análisis por frame (modo solo datos)
+    
+    Stream NDJSON: una línea JSON por frame analizado (ver
+    app/core/landmark_payload.py) y líneas vacías como keep-alive. El
+    navegador dibuja skeleton y HUD sobre el video crudo de
+    /api/video_feed?mode=data.
+    
+    Returns:
+        Response: Stream application/x-ndjson
+    """
+    user_id = session.get('user_id')
+    landmark_feed = get_landmark_feed(_camera_index())
+    
+    def generate_payloads():
+        try:
+            yield from landmark_feed.stream()
+        except GeneratorExit:
+            logger.info(f"Feed de landmarks cerrado por '{user_id}' (GeneratorExit)")
+    
+    return Response(
+        generate_payloads(),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@api_bp.route('/stream/status', methods=['GET'])
+@login_required
+def stream_status():
+    """
+    Canales de broadcast activos (dueño, espectadores, frames publicados)
+    y estado de cada cámara (dueño del lease, resolución, FPS)
+    
+    Returns:
+        JSON con estado del hub y de las cámaras
+    """
+    from hardware.camera_manager import camera_manager
+    
+    return jsonify({
+        'success': True,
+        'data': broadcast_hub.get_stats(),
+        'cameras': camera_manager.get_status()
+    }), 200
+
+
 @api_bp.route('/analysis/start', methods=['POST'])
 @login_required
 def start_analysis():
@@ -432,6 +653,11 @@ def start_analysis():
     Returns:
         JSON con estado
     """
+    # Observadores de un broadcast activo no modifican el análisis
+    denied = _reject_observer()
+    if denied:
+        return denied
+    
     try:
         data = request.get_json() or {}
         
@@ -447,6 +673,9 @@ def start_analysis():
         # Guardar en sesión
         session['analysis_active'] = True
         session['analysis_start_time'] = time.time()
+        _final_results.pop(_lease_id(), None)
+        
+        recording = _start_recording(current_app.config, segment_type, exercise_key)
         
         current_app.logger.info(
             f"Análisis iniciado: {segment_type}/{exercise_key} "
@@ -457,7 +686,8 @@ def start_analysis():
             'success': True,
             'message': 'Análisis iniciado correctamente',
             'segment_type': segment_type,
-            'exercise_key': exercise_key
+            'exercise_key': exercise_key,
+            'recording': recording
         }), 200
     
     except Exception as e:
@@ -474,21 +704,101 @@ def stop_analysis():
     """
     Detiene la sesión de análisis actual
     
+    Cierra la grabación de la sesión y devuelve el desglose por repetición
+    y las estadísticas de sesión. Con rom_session_id el directorio del
+    video, las repeticiones contadas y los ángulos por percentiles se
+    guardan en esa ROMSession (video_path, repetitions, max_angle,
+    min_angle, rom_value, quality_score); si no, quedan en la sesión del
+    navegador para el próximo POST /api/rom-session.
+    
+    Body JSON (opcional):
+        {
+            "rom_session_id": 12
+        }
+    
+    La ROMSession debe poder editarla el usuario (ver
+    _rom_session_access_error); si no, responde 404/403 sin detener nada.
+    
+    Si el stream ya terminó se usa el resumen que dejó su productor al
+    liberar el analyzer. Si no hay ninguno (stop antes de que el stream
+    arrendara el analyzer, o un segundo stop) responde 200 como antes, con
+    final_data vacío y repetitions/stats en None: no se guarda ningún
+    ángulo y el cliente puede volver a su estado inicial.
+    
     Returns:
-        JSON con estado y datos finales
+        JSON con estado, datos finales, resumen de la grabación (video_path,
+        segmentos, frames escritos y descartados) y 'repetitions' (conteo,
+        max_angle/min_angle/rom_value de repeticiones válidas y reps con
+        peak, trough, rom y duration de cada una) y 'stats' (ROM robusto
+        por percentiles, quality_score y por canal min/max/media/desvío y
+        segundos en cada banda de ángulo)
     """
-    global current_analyzer
+    # Observadores de un broadcast activo no modifican el análisis
+    denied = _reject_observer()
+    if denied:
+        return denied
+    
+    # La ROMSession destino se valida antes de detener o escribir nada
+    data = request.get_json(silent=True) or {}
+    rom_session_id = data.get('rom_session_id')
+    db_manager = current_app.config.get('DB_MANAGER')
+    if rom_session_id and db_manager:
+        denied = _rom_session_access_error(db_manager, rom_session_id)
+        if denied:
+            return denied
     
     try:
-        # Obtener datos finales del analyzer
-        final_data = {}
-        if current_analyzer:
-            final_data = current_analyzer.get_current_data()
+        # Datos finales del analyzer de esta estación (o del stream ya cerrado)
+        lease_id = _lease_id()
+        analyzer = analyzer_pool.get(lease_id)
+        summary = _final_results.pop(lease_id, None)
+        if analyzer is not None:
+            summary = _analysis_summary(analyzer)
         
         # Limpiar sesión
         session['analysis_active'] = False
         session.pop('analysis_start_time', None)
         
+        recording = session_recorders.stop(_camera_index())
+        
+        if summary is None:
+            current_app.logger.warning(
+                f"Análisis detenido sin resultados para '{lease_id}' "
+                f"(no hubo stream de video en esta estación o ya se detuvo)"
+            )
+            summary = {'final_data': {}, 'repetitions': None, 'stats': None}
+        
+        final_data = summary['final_data']
+        repetitions = summary['repetitions']
+        stats = summary['stats']
+        video_path = recording['video_path'] if recording else None
+        
+        # Lo que el análisis sabe de la ROMSession (el resto lo manda el cliente)
+        updates = {}
+        if video_path:
+            updates['video_path'] = video_path
+        if repetitions is not None:
+            updates['repetitions'] = repetitions['repetitions']
+        
+        measured = {}
+        if stats is not None:
+            measured = {
+                field: stats[field] for field in SESSION_STATS_FIELDS
+                if stats[field] is not None
+            }
+            updates.update(measured)
+        
+        if updates:
+            if rom_session_id and db_manager:
+                db_manager.update_rom_session(rom_session_id, **updates)
+            else:
+                if video_path:
+                    session['recording_path'] = video_path
+                if repetitions is not None:
+                    session['repetition_count'] = repetitions['repetitions']
+                if measured:
+                    session['session_stats'] = measured
+        
         current_app.logger.info(
             f"Análisis detenido por usuario {session.get('user_id')} | "
             f"ROM final: {final_data.get('max_rom', 'N/A')}"
@@ -497,7 +807,10 @@ def stop_analysis():
         return jsonify({
             'success': True,
             'message': 'Análisis detenido correctamente',
-            'final_data': final_data
+            'final_data': final_data,
+            'recording': recording,
+            'repetitions': repetitions,
+            'stats': stats
         }), 200
     
     except Exception as e:
@@ -517,12 +830,14 @@ def get_current_data():
     Polling endpoint - el frontend puede llamar cada 100-200ms
     
     Returns:
-        JSON con datos actuales del analyzer
+        JSON con datos actuales del analyzer y métricas del stream
+        ('stream': ocupación por etapa y 'quality' con calidad/escala/FPS
+        actuales y throughput medido por cliente)
     """
-    global current_analyzer
-    
     try:
-        if current_analyzer is None:
+        analyzer = analyzer_pool.get(_lease_id())
+        
+        if analyzer is None:
             return jsonify({
                 'success': False,
                 'error': 'No hay analyzer activo',
@@ -530,12 +845,14 @@ def get_current_data():
             }), 200  # No es error 500, solo no hay datos
         
         # Obtener datos del analyzer
-        data = current_analyzer.get_current_data()
+        data = analyzer.get_current_data()
+        pipeline = _pipelines.get(_camera_index())
         
         return jsonify({
             'success': True,
             'data': data,
-            'timestamp': request.timestamp
+            'stream': pipeline.get_stats() if pipeline else None,
+            'timestamp': time.time()
         }), 200
     
     except Exception as e:
@@ -547,6 +864,50 @@ def get_current_data():
         }), 500
 
 
+@api_bp.route('/analysis/events')
+@login_required
+def analysis_events():
+    """
+    Push del estado del análisis por Server-Sent Events
+    
+    Emite los mismos campos que /api/analysis/current_data (evento 'state')
+    solo cuando cambian, a lo sumo STATE_PUSH_MAX_RATE veces por segundo
+    (los cambios intermedios se coalescen). Una sola conexión reemplaza al
+    polling cada 100-200ms, que sigue disponible como fallback.
+    
+    Returns:
+        Response: Stream text/event-stream (404 si el push está deshabilitado)
+    """
+    if not current_app.config.get('STATE_PUSH_ENABLED', True):
+        return jsonify({
+            'success': False,
+            'error': 'Push de estado deshabilitado (usar /api/analysis/current_data)'
+        }), 404
+    
+    user_id = session.get('user_id')
+    lease_id = _lease_id()
+    max_rate = current_app.config.get('STATE_PUSH_MAX_RATE', 10)
+    refresh = current_app.config.get('STATE_PUSH_REFRESH', 2.0)
+    keepalive = current_app.config.get('STATE_PUSH_KEEPALIVE', 15.0)
+    
+    def generate_events():
+        try:
+            yield from state_feed.stream(
+                lambda: _current_state(lease_id),
+                max_rate=max_rate,
+                refresh=refresh,
+                keepalive=keepalive
+            )
+        except GeneratorExit:
+            logger.info(f"Push de estado cerrado por '{user_id}' (GeneratorExit)")
+    
+    return Response(
+        generate_events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @api_bp.route('/analysis/reset', methods=['POST'])
 @login_required
 def reset_analysis():
@@ -557,17 +918,23 @@ def reset_analysis():
     Returns:
         JSON con estado
     """
-    global current_analyzer
+    # Observadores de un broadcast activo no modifican el análisis
+    denied = _reject_observer()
+    if denied:
+        return denied
     
     try:
-        if current_analyzer is None:
+        analyzer = analyzer_pool.get(_lease_id())
+        
+        if analyzer is None:
             return jsonify({
                 'success': False,
                 'error': 'No hay analyzer activo'
             }), 400
         
-        # Resetear analyzer
-        current_analyzer.reset()
+        # Resetear solo el analyzer de esta sesión
+        analyzer.reset()
+        state_feed.notify()
         
         current_app.logger.info(f"Analyzer reseteado por usuario {session.get('user_id')}")
         
@@ -584,10 +951,217 @@ def reset_analysis():
         }), 500
 
 
+@api_bp.route('/analysis/pool', methods=['GET'])
+@login_required
+def analyzer_pool_status():
+    """
+    Métricas del pool de analyzers (residentes, leases, hits/misses, desalojos)
+    
+    Returns:
+        JSON con estado del pool
+    """
+    return jsonify({
+        'success': True,
+        'data': analyzer_pool.get_stats()
+    }), 200
+
+
 # ============================================================================
 # FUNCIONES AUXILIARES
 # ============================================================================
 
+def _inference_options(config) -> dict:
+    """
+    Opciones de inferencia y filtrado para el constructor del analyzer
+    
+    Args:
+        config: current_app.config
+    
+    Returns:
+        dict: inference_fps, inference_budget, roi_tracking, smooth_landmarks,
+            angle_filters, repetition_options, stats_options y pose_factory
+            (grafo en el pool de procesos si MEDIAPIPE_WORKER_PROCESSES > 0)
+    """
+    inference_fps = config.get('MEDIAPIPE_INFERENCE_FPS')
+    
+    if inference_fps == 'auto':
+        from app.core.mediapipe_config import MediaPipeConfig
+        inference_fps = MediaPipeConfig.get_optimized_settings()['processing_fps']
+    
+    options = {
+        'inference_fps': inference_fps,
+        'inference_budget': config.get('MEDIAPIPE_INFERENCE_BUDGET'),
+        'roi_tracking': config.get('MEDIAPIPE_ROI_TRACKING', False),
+        'smooth_landmarks': config.get('MEDIAPIPE_SMOOTH_LANDMARKS', True),
+        'angle_filters': config.get('ANGLE_FILTERS'),
+        'repetition_options': config.get('REPETITION_COUNTER'),
+        'stats_options': config.get('SESSION_STATS')
+    }
+    
+    worker_processes = config.get('MEDIAPIPE_WORKER_PROCESSES', 0)
+    if worker_processes:
+        from app.core.inference_workers import get_inference_pool
+        options['pose_factory'] = get_inference_pool(worker_processes).create_pose
+    
+    return options
+
+
+def _camera_index() -> int:
+    """Cámara de la estación de esta sesión (?camera= en la página de análisis)"""
+    return session.get('camera_index', current_app.config.get('CAMERA_INDEX', 0))
+
+
+def _camera_settings(config, camera_index: int) -> dict:
+    """
+    Resolución, FPS, modo MJPG y fuente de una cámara (CAMERA_DEVICE_SETTINGS o los globales)
+    
+    Returns:
+        dict: width, height, fps, mjpg, source y source_realtime para acquire_camera()
+    """
+    settings = {
+        'width': config.get('CAMERA_WIDTH', 1280),
+        'height': config.get('CAMERA_HEIGHT', 720),
+        'fps': config.get('CAMERA_FPS'),
+        'mjpg': config.get('CAMERA_MJPG', False),
+        'source': config.get('CAMERA_SOURCE', 'camera'),
+        'source_realtime': config.get('CAMERA_SOURCE_REALTIME', True)
+    }
+    settings.update(config.get('CAMERA_DEVICE_SETTINGS', {}).get(camera_index, {}))
+    return settings
+
+
+def _start_recording(config, segment_type: str, exercise_key: str):
+    """
+    Inicia la grabación del stream de la cámara de esta sesión
+    
+    Returns:
+        dict: Directorio y FPS de la grabación, o None si está desactivada
+    """
+    if not config.get('SESSION_RECORDING_ENABLED', False):
+        return None
+    
+    session.pop('recording_path', None)
+    
+    # segment_type/exercise_key vienen del cliente: solo como nombre de archivo
+    name = secure_filename(
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+        f"user{session.get('user_id')}_{segment_type}_{exercise_key}"
+    )
+    directory = Path(config['SESSION_RECORDING_DIR']) / name
+    
+    recorder = session_recorders.start(
+        _camera_index(),
+        str(directory),
+        fps=config.get('SESSION_RECORDING_FPS', 15),
+        segment_seconds=config.get('SESSION_RECORDING_SEGMENT_SECONDS', 60),
+        queue_size=config.get('SESSION_RECORDING_QUEUE_SIZE', 64),
+        fourcc=config.get('SESSION_RECORDING_FOURCC', 'mp4v'),
+        owner=_lease_id()
+    )
+    return {'directory': str(directory), 'fps': recorder.fps}
+
+
+def _current_state(lease_id):
+    """Estado del analyzer de la sesión para el push SSE (None si no tiene)"""
+    analyzer = analyzer_pool.get(lease_id) if lease_id else None
+    if analyzer is None:
+        return None
+    return analyzer.get_current_data()
+
+
+def _quality_controller(config, render_mode: str):
+    """
+    Controlador de calidad/escala/FPS del encoder según el modo de render
+    
+    En modo 'data' el video es solo referencia: calidad, escala y FPS bajos
+    (STREAM_DATA_*), fijos o adaptativos hacia abajo si STREAM_ADAPTIVE_QUALITY.
+    
+    Args:
+        config: current_app.config
+        render_mode: 'annotated' o 'data'
+    
+    Returns:
+        AdaptiveQualityController o None (calidad fija STREAM_JPEG_QUALITY)
+    """
+    adaptive = config.get('STREAM_ADAPTIVE_QUALITY', False)
+    
+    if render_mode != 'data':
+        return AdaptiveQualityController.from_config(config) if adaptive else None
+    
+    quality = config.get('STREAM_DATA_JPEG_QUALITY', 40)
+    scale = config.get('STREAM_DATA_SCALE', 0.5)
+    fps = config.get('STREAM_DATA_FPS', 15)
+    
+    if not adaptive:
+        return AdaptiveQualityController(
+            quality_range=(quality, quality),
+            scale_range=(scale, scale),
+            fps_range=(fps, fps)
+        )
+    
+    return AdaptiveQualityController(
+        quality_range=(min(config.get('STREAM_JPEG_QUALITY_RANGE', (40, 85))[0], quality), quality),
+        scale_range=(min(config.get('STREAM_SCALE_RANGE', (0.5, 1.0))[0], scale), scale),
+        fps_range=(min(config.get('STREAM_FPS_RANGE', (8, 30))[0], fps), fps)
+    )
+
+
+def _reject_observer():
+    """
+    Bloquea acciones de escritura de usuarios que solo observan el broadcast
+    
+    Mientras la cámara transmite, solo su dueño puede iniciar, detener o
+    reiniciar el análisis.
+    
+    Returns:
+        Respuesta 403 si el usuario es observador, None si puede continuar
+    """
+    channel = broadcast_hub.get_channel(_camera_index())
+    
+    if channel is not None and channel.is_active and channel.owner_id != session.get('user_id'):
+        return jsonify({
+            'success': False,
+            'error': f"Modo observador: la sesión pertenece a '{channel.owner_id}'"
+        }), 403
+    
+    return None
+
+
+def _rom_session_access_error(db_manager, rom_session_id):
+    """
+    Verifica que el usuario actual pueda modificar una ROMSession
+    (ver DatabaseManager.can_edit_rom_session)
+    
+    Args:
+        db_manager: DatabaseManager de la app
+        rom_session_id: ID recibido del cliente
+    
+    Returns:
+        Respuesta 400/404/403 si no puede, None si puede continuar
+    """
+    try:
+        rom_session_id = int(rom_session_id)
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'rom_session_id inválido'
+        }), 400
+    
+    allowed = db_manager.can_edit_rom_session(rom_session_id, session.get('user_id'))
+    if allowed is None:
+        return jsonify({
+            'success': False,
+            'error': 'Sesión ROM no encontrada'
+        }), 404
+    if allowed:
+        return None
+    
+    return jsonify({
+        'success': False,
+        'error': 'No tienes permisos para modificar esta sesión ROM'
+    }), 403
+
+
 def _create_error_frame(message: str) -> bytes:
     """
     Crea un frame de error con mensaje
@@ -367,8 +367,14 @@ def live_analysis(segment_type, exercise_key):
     - /segments/ankle/exercises/dorsiflexion
     """
     
+    # Cámara de la estación (?camera=1 para la segunda cámara USB, etc.)
+    camera_index = request.args.get('camera', type=int)
+    if camera_index is not None and camera_index >= 0:
+        session['camera_index'] = camera_index
+    camera_index = session.get('camera_index', current_app.config.get('CAMERA_INDEX', 0))
+    
     # Verificar disponibilidad de cámara ANTES de renderizar
-    available, message = check_camera_availability()
+    available, message = check_camera_availability(camera_index)
     if not available:
         flash(message, 'warning')
         return redirect(url_for('main.segment_exercises', segment_type=segment_type))
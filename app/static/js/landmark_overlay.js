@@ -0,0 +1,294 @@
+/**
+ * 🦴 LANDMARK OVERLAY - Skeleton y HUD dibujados en el navegador
+ * ===============================================================
+ * Modo "solo datos" del análisis en vivo
+ *
+ * RESPONSABILIDADES:
+ * - Leer el stream NDJSON de /api/analysis/landmarks_feed (un payload por frame)
+ * - Dibujar en un <canvas> el frame crudo (si el servidor lo envía),
+ *   el skeleton de MediaPipe, los puntos clave, el ángulo y el panel de datos
+ * - Entregar cada payload al controller (métricas y gráfico)
+ *
+ * El servidor no dibuja nada en este modo: solo envía landmarks normalizados,
+ * puntos clave en píxeles y el estado del analyzer (ver landmark_payload.py).
+ *
+ * Autor: BIOTRACK Team
+ * Fecha: 2026-10-16
+ */
+
+// Conexiones del skeleton (mp.solutions.pose.POSE_CONNECTIONS)
+const POSE_CONNECTIONS = [
+    [0, 1], [0, 4], [1, 2], [2, 3], [3, 7], [4, 5], [5, 6], [6, 8], [9, 10],
+    [11, 12], [11, 13], [11, 23], [12, 14], [12, 24], [13, 15], [14, 16],
+    [15, 17], [15, 19], [15, 21], [16, 18], [16, 20], [16, 22], [17, 19],
+    [18, 20], [23, 24], [23, 25], [24, 26], [25, 27], [26, 28], [27, 29],
+    [27, 31], [28, 30], [28, 32], [29, 31], [30, 32]
+];
+
+// Mismos colores que el overlay del servidor (BGR → CSS)
+const OVERLAY_COLORS = {
+    white: '#ffffff',
+    yellow: '#ffff00',
+    orange: '#ffa500',
+    magenta: '#ff00ff',
+    green: '#00ff00',
+    cyan: '#00ffff',
+    blue: '#0000ff',
+    red: '#ff0000',
+    purple: '#800080'
+};
+
+class LandmarkOverlay {
+    /**
+     * @param {HTMLImageElement} videoElement - <img> del stream MJPEG (frames crudos)
+     * @param {Object} options - { feedUrl, showVideo, minVisibility, onPayload }
+     */
+    constructor(videoElement, options = {}) {
+        this.video = videoElement;
+        this.feedUrl = options.feedUrl || '/api/analysis/landmarks_feed';
+        this.showVideo = options.showVideo !== false;
+        this.minVisibility = options.minVisibility || 0.5;
+        this.onPayload = options.onPayload || null;
+        
+        this.lastPayload = null;
+        this.payloadCount = 0;
+        this.abortController = null;
+        this.pendingFrame = false;
+        
+        // Canvas en el lugar del <img>: el video (si hay) se dibuja dentro
+        this.canvas = document.createElement('canvas');
+        this.canvas.id = 'overlayCanvas';
+        this.canvas.className = this.video.className;
+        this.canvas.width = 1280;
+        this.canvas.height = 720;
+        this.ctx = this.canvas.getContext('2d');
+        
+        this.video.parentElement.insertBefore(this.canvas, this.video);
+        
+        // El <img> sigue conectado (mantiene vivo el stream) pero oculto
+        this.video.style.display = 'none';
+    }
+    
+    /**
+     * Conecta al feed NDJSON y procesa payloads hasta stop()
+     */
+    async start() {
+        this.abortController = new AbortController();
+        
+        try {
+            const response = await fetch(this.feedUrl, { signal: this.abortController.signal });
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            
+            console.log('[LandmarkOverlay] Feed de landmarks conectado');
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                
+                buffer += decoder.decode(value, { stream: true });
+                
+                // Solo interesa la ÚLTIMA línea completa (las anteriores ya son viejas)
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                
+                for (let i = lines.length - 1; i >= 0; i--) {
+                    if (lines[i].trim()) {
+                        this.handlePayload(JSON.parse(lines[i]));
+                        break;
+                    }
+                }
+            }
+        } catch (error) {
+            if (error.name !== 'AbortError') {
+                console.error('[LandmarkOverlay] Error en el feed:', error);
+                // Reintentar en 2s (ej: reinicio del servidor)
+                setTimeout(() => this.start(), 2000);
+            }
+        }
+    }
+    
+    stop() {
+        if (this.abortController) {
+            this.abortController.abort();
+            this.abortController = null;
+        }
+    }
+    
+    handlePayload(payload) {
+        this.lastPayload = payload;
+        this.payloadCount++;
+        
+        if (this.onPayload && !payload.loading) {
+            this.onPayload(payload);
+        }
+        
+        // Un dibujo por refresco de pantalla como máximo
+        if (!this.pendingFrame) {
+            this.pendingFrame = true;
+            requestAnimationFrame(() => {
+                this.pendingFrame = false;
+                this.draw(this.lastPayload);
+            });
+        }
+    }
+    
+    // ------------------------------------------------------------------
+    // DIBUJO
+    // ------------------------------------------------------------------
+    
+    draw(payload) {
+        const ctx = this.ctx;
+        
+        if (payload.width && (this.canvas.width !== payload.width || this.canvas.height !== payload.height)) {
+            this.canvas.width = payload.width;
+            this.canvas.height = payload.height;
+        }
+        
+        const w = this.canvas.width;
+        const h = this.canvas.height;
+        
+        // Fondo: frame crudo del servidor o negro (modo sin video)
+        if (this.showVideo && this.video.complete && this.video.naturalWidth > 8) {
+            ctx.drawImage(this.video, 0, 0, w, h);
+        } else {
+            ctx.fillStyle = '#111';
+            ctx.fillRect(0, 0, w, h);
+        }
+        
+        if (payload.loading) {
+            this.drawText('Inicializando MediaPipe...', 50, 50, 24, OVERLAY_COLORS.yellow);
+            return;
+        }
+        
+        if (!payload.landmarks_detected) {
+            this.drawText('No se detecta persona', 50, 50, 28, OVERLAY_COLORS.red);
+            return;
+        }
+        
+        this.drawSkeleton(payload.landmarks, w, h);
+        
+        if (payload.left_angle !== undefined) {
+            this.drawFrontal(payload);
+        } else {
+            this.drawProfile(payload);
+        }
+    }
+    
+    drawSkeleton(landmarks, w, h) {
+        const ctx = this.ctx;
+        const visible = (lm) => lm && lm[2] >= this.minVisibility;
+        
+        ctx.strokeStyle = 'rgba(255, 255, 255, 0.6)';
+        ctx.lineWidth = 2;
+        ctx.beginPath();
+        
+        for (const [a, b] of POSE_CONNECTIONS) {
+            if (visible(landmarks[a]) && visible(landmarks[b])) {
+                ctx.moveTo(landmarks[a][0] * w, landmarks[a][1] * h);
+                ctx.lineTo(landmarks[b][0] * w, landmarks[b][1] * h);
+            }
+        }
+        ctx.stroke();
+    }
+    
+    drawProfile(payload) {
+        const p = payload.points;
+        if (!p.shoulder) return;
+        
+        // Referencia vertical fija y brazo
+        this.drawLine([p.shoulder[0], p.shoulder[1] - 150], [p.shoulder[0], p.shoulder[1] + 150], OVERLAY_COLORS.green, 3);
+        this.drawLine(p.shoulder, p.elbow, OVERLAY_COLORS.blue, 3);
+        this.drawLine(p.elbow, p.wrist, OVERLAY_COLORS.blue, 2);
+        
+        this.drawPoint(p.shoulder, OVERLAY_COLORS.yellow);
+        this.drawPoint(p.hip, OVERLAY_COLORS.magenta);
+        this.drawPoint(p.elbow, OVERLAY_COLORS.cyan);
+        
+        const direction = payload.angle > 0 ? 'FLEX' : payload.angle < 0 ? 'EXT' : '';
+        this.drawText(`${Math.abs(payload.angle).toFixed(1)}°`, p.shoulder[0] - 40, p.shoulder[1] - 20, 32, OVERLAY_COLORS.yellow);
+        if (direction) {
+            this.drawText(direction, p.shoulder[0] - 30, p.shoulder[1] + 10, 14,
+                payload.angle > 0 ? OVERLAY_COLORS.green : OVERLAY_COLORS.orange);
+        }
+        
+        this.drawPanel([
+            ['FLEXION/EXTENSION DE HOMBRO (PERFIL)', OVERLAY_COLORS.white, 20],
+            [`Lado: ${payload.side}`, payload.confidence > 0.7 ? OVERLAY_COLORS.green : OVERLAY_COLORS.orange, 18],
+            [`Orientacion: ${payload.orientation}`, OVERLAY_COLORS.white, 15],
+            [`Angulo: ${Math.abs(payload.angle).toFixed(1)}° ${direction}`, OVERLAY_COLORS.yellow, 18],
+            [`ROM Max: ${payload.max_rom.toFixed(1)}°`, OVERLAY_COLORS.green, 18]
+        ]);
+    }
+    
+    drawFrontal(payload) {
+        const p = payload.points;
+        
+        if (!p.left_shoulder) {
+            this.drawText('Colocate de FRENTE a la camara', 50, 50, 28, OVERLAY_COLORS.orange);
+            return;
+        }
+        
+        for (const side of ['left', 'right']) {
+            const armColor = side === 'left' ? OVERLAY_COLORS.blue : OVERLAY_COLORS.purple;
+            this.drawLine(p[`${side}_shoulder`], p[`${side}_hip`], OVERLAY_COLORS.green, 2);
+            this.drawLine(p[`${side}_shoulder`], p[`${side}_elbow`], armColor, 3);
+            this.drawLine(p[`${side}_elbow`], p[`${side}_wrist`], armColor, 2);
+            
+            this.drawPoint(p[`${side}_shoulder`], OVERLAY_COLORS.cyan);
+            this.drawPoint(p[`${side}_hip`], OVERLAY_COLORS.magenta);
+            this.drawPoint(p[`${side}_elbow`], OVERLAY_COLORS.yellow);
+        }
+        
+        this.drawText(`${payload.left_angle.toFixed(1)}°`, p.left_shoulder[0] - 60, p.left_shoulder[1] - 20, 22, OVERLAY_COLORS.cyan);
+        this.drawText(`${payload.right_angle.toFixed(1)}°`, p.right_shoulder[0] + 20, p.right_shoulder[1] - 20, 22, OVERLAY_COLORS.purple);
+        
+        this.drawPanel([
+            ['ABDUCCION BILATERAL DE HOMBROS (FRONTAL)', OVERLAY_COLORS.white, 20],
+            [`Izquierdo: ${payload.left_angle.toFixed(1)}° | Derecho: ${payload.right_angle.toFixed(1)}°`, OVERLAY_COLORS.cyan, 18],
+            [`ROM Max: Izq ${payload.left_max_rom.toFixed(1)}° | Der ${payload.right_max_rom.toFixed(1)}°`, OVERLAY_COLORS.green, 18],
+            [`Asimetria: ${payload.asymmetry.toFixed(1)}°`, payload.asymmetry < 15 ? OVERLAY_COLORS.green : OVERLAY_COLORS.orange, 18]
+        ]);
+    }
+    
+    drawPanel(lines) {
+        const ctx = this.ctx;
+        
+        ctx.fillStyle = 'rgba(0, 0, 0, 0.6)';
+        ctx.fillRect(0, 0, this.canvas.width, 180);
+        
+        lines.forEach(([text, color, size], i) => {
+            this.drawText(text, 20, 35 + i * 32, size, color);
+        });
+    }
+    
+    drawLine(a, b, color, width) {
+        if (!a || !b) return;
+        
+        const ctx = this.ctx;
+        ctx.strokeStyle = color;
+        ctx.lineWidth = width;
+        ctx.beginPath();
+        ctx.moveTo(a[0], a[1]);
+        ctx.lineTo(b[0], b[1]);
+        ctx.stroke();
+    }
+    
+    drawPoint(point, color) {
+        if (!point) return;
+        
+        const ctx = this.ctx;
+        ctx.fillStyle = color;
+        ctx.beginPath();
+        ctx.arc(point[0], point[1], 8, 0, 2 * Math.PI);
+        ctx.fill();
+    }
+    
+    drawText(text, x, y, size, color) {
+        const ctx = this.ctx;
+        ctx.font = `bold ${size}px sans-serif`;
+        ctx.fillStyle = color;
+        ctx.fillText(text, x, y);
+    }
+}
@@ -4,7 +4,8 @@
  * Controla la interfaz de análisis en tiempo real
  * 
  * RESPONSABILIDADES:
- * - Polling de datos del analyzer cada 200ms
+ * - Datos del analyzer por push SSE (polling cada 200ms como fallback)
+ * - Modo solo datos: skeleton y HUD dibujados en el navegador (landmark_overlay.js)
  * - Actualización de métricas en UI
  * - Control de sesión (start, stop, reset)
  * - Gráfico de ROM en tiempo real
@@ -19,10 +20,16 @@ class LiveAnalysisController {
         this.config = config;
         this.isActive = false;
         this.pollingInterval = null;
+        this.eventSource = null;
         this.romChart = null;
         this.dataPoints = [];
         this.maxDataPoints = 50; // Últimos 50 puntos en el gráfico
         
+        // 'annotated' (servidor dibuja) o 'data' (navegador dibuja)
+        this.renderMode = config.render_mode || 'annotated';
+        this.landmarkOverlay = null;
+        this.lastUIUpdate = 0;
+        
         // Inicializar
         this.init();
     }
@@ -42,6 +49,11 @@ class LiveAnalysisController {
         // Event listeners
         this.setupEventListeners();
         
+        // Modo solo datos: el servidor envía landmarks y el navegador dibuja
+        if (this.renderMode === 'data') {
+            this.initDataMode();
+        }
+        
         // Ocultar overlay cuando el video stream empiece a funcionar (3 segundos)
         setTimeout(() => {
             const overlay = document.getElementById('loadingOverlay');
@@ -70,6 +82,35 @@ class LiveAnalysisController {
         });
     }
     
+    /**
+     * Modo solo datos: canvas con skeleton/HUD alimentado por el feed NDJSON
+     */
+    initDataMode() {
+        const videoElement = document.getElementById('videoFeed');
+        
+        this.landmarkOverlay = new LandmarkOverlay(videoElement, {
+            showVideo: this.config.data_video !== 'none',
+            onPayload: (payload) => this.handleLandmarkPayload(payload)
+        });
+        this.landmarkOverlay.start();
+        
+        console.log('[LiveAnalysis] Modo solo datos activo (overlay en el navegador)');
+    }
+    
+    /**
+     * Payload por frame del feed: actualiza métricas y gráfico cada 200ms
+     * (el feed reemplaza al polling en modo solo datos)
+     */
+    handleLandmarkPayload(payload) {
+        if (!this.isActive) return;
+        
+        const now = performance.now();
+        if (now - this.lastUIUpdate < 200) return;
+        
+        this.lastUIUpdate = now;
+        this.updateUI(payload);
+    }
+    
     /**
      * Inicializa el gráfico de ROM con Chart.js
      */
@@ -211,6 +252,20 @@ class LiveAnalysisController {
                     this.showResults(data.final_data);
                 }
                 
+                if (data.repetitions) {
+                    console.log(
+                        `[LiveAnalysis] Repeticiones: ${data.repetitions.repetitions}`,
+                        data.repetitions.reps
+                    );
+                }
+                
+                if (data.recording) {
+                    console.log(
+                        `[LiveAnalysis] Grabación: ${data.recording.video_path} ` +
+                        `(${data.recording.frames_written} frames, ${data.recording.frames_dropped} descartados)`
+                    );
+                }
+                
                 console.log('[LiveAnalysis] Análisis detenido exitosamente');
             } else {
                 throw new Error(data.error || 'Error al detener análisis');
@@ -261,9 +316,51 @@ class LiveAnalysisController {
     }
     
     /**
-     * Inicia el polling de datos cada 200ms
+     * Inicia la recepción de datos: push SSE si está disponible, si no polling
      */
     startDataPolling() {
+        // En modo solo datos las métricas llegan con cada payload del feed
+        if (this.landmarkOverlay) {
+            return;
+        }
+        
+        if (this.config.state_push && window.EventSource) {
+            this.startStatePush();
+        } else {
+            this.startPolling();
+        }
+    }
+    
+    /**
+     * Push del estado por Server-Sent Events (solo llegan cambios)
+     */
+    startStatePush() {
+        console.log('[LiveAnalysis] Conectando push de estado (SSE)...');
+        
+        this.eventSource = new EventSource('/api/analysis/events');
+        
+        this.eventSource.addEventListener('state', (event) => {
+            if (!this.isActive) return;
+            this.updateUI(JSON.parse(event.data));
+        });
+        
+        this.eventSource.onerror = () => {
+            // El navegador reintenta solo; si la conexión quedó cerrada
+            // (404, proxy sin soporte SSE) volver al polling
+            if (this.eventSource && this.eventSource.readyState === EventSource.CLOSED) {
+                console.warn('[LiveAnalysis] Push SSE no disponible - usando polling');
+                this.eventSource = null;
+                if (this.isActive) {
+                    this.startPolling();
+                }
+            }
+        };
+    }
+    
+    /**
+     * Polling de datos cada 200ms (fallback)
+     */
+    startPolling() {
         console.log('[LiveAnalysis] Iniciando polling de datos...');
         
         this.pollingInterval = setInterval(async () => {
@@ -289,6 +386,12 @@ class LiveAnalysisController {
      * Detiene el polling de datos
      */
     stopDataPolling() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+            console.log('[LiveAnalysis] Push de estado cerrado');
+        }
+        
         if (this.pollingInterval) {
             clearInterval(this.pollingInterval);
             this.pollingInterval = null;
@@ -666,7 +769,8 @@ function toggleFullscreen() {
     }
     
     const fullscreenContainer = document.getElementById('fullscreenVideoContainer');
-    const videoElement = document.getElementById('videoFeed');
+    // En modo solo datos se muestra el canvas del overlay en lugar del <img>
+    const videoElement = document.getElementById('overlayCanvas') || document.getElementById('videoFeed');
     
     isFullscreenMode = !isFullscreenMode;
     
@@ -0,0 +1,30 @@
+"""
+📡 STREAMING MODULE - MOTOR DE STREAMING EN VIVO
+=================================================
+Módulo con la infraestructura del stream MJPEG de análisis en vivo
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+from .pipeline import StreamPipeline
+from .broadcast_hub import BroadcastHub, broadcast_hub
+from .adaptive_quality import AdaptiveQualityController
+from .landmark_feed import LandmarkFeed, landmark_feed, get_landmark_feed
+from .state_feed import StateFeed, state_feed
+from .session_recorder import SessionRecorder, SessionRecorderRegistry, session_recorders
+
+__all__ = [
+    'StreamPipeline',
+    'BroadcastHub',
+    'broadcast_hub',
+    'AdaptiveQualityController',
+    'LandmarkFeed',
+    'landmark_feed',
+    'get_landmark_feed',
+    'StateFeed',
+    'state_feed',
+    'SessionRecorder',
+    'SessionRecorderRegistry',
+    'session_recorders',
+]
@@ -0,0 +1,292 @@
+"""
+🎚️ ADAPTIVE QUALITY - CALIDAD DEL STREAM SEGÚN LA RED DEL CLIENTE
+==================================================================
+Controlador de calidad JPEG / escala / FPS guiado por backpressure
+
+PROBLEMA:
+El encoder usaba siempre calidad 70 a 1280x720. En el Wi-Fi de la clínica
+eso satura el enlace y el navegador se queda segundos atrás.
+
+SOLUCIÓN:
+- Cada entrega a un cliente reporta bytes y cuánto tiempo quedó bloqueada
+  la escritura al socket (tiempo entre yield y la reanudación del generador)
+- Por ventana se calcula la fracción del tiempo que cada cliente pasa
+  bloqueado; el controlador reacciona al cliente MÁS LENTO
+- Congestión → baja primero la calidad JPEG, luego la escala y por último
+  los FPS. Red holgada sostenida → recupera en orden inverso
+- Todo dentro de los rangos configurados (STREAM_*_RANGE)
+
+Uso:
+    controller = AdaptiveQualityController(quality_range=(40, 85))
+    
+    # Encoder
+    if controller.should_emit():
+        quality, scale = controller.quality, controller.scale
+    
+    # Consumidor HTTP
+    controller.record_delivery(client_id, len(jpeg), write_seconds)
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from typing import Optional, Tuple, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class _ClientMeter:
+    """Muestras de entrega de un cliente: (timestamp, bytes, segundos bloqueado)"""
+    
+    def __init__(self, maxlen: int = 240):
+        self.samples = deque(maxlen=maxlen)
+    
+    def add(self, timestamp: float, nbytes: int, write_seconds: float):
+        self.samples.append((timestamp, nbytes, write_seconds))
+    
+    def snapshot(self, now: float, window: float) -> Dict[str, float]:
+        """
+        Returns:
+            dict: fps consumidos, kbps, write_ms promedio y blocked (0-1)
+        """
+        recent = [s for s in self.samples if now - s[0] <= window]
+        
+        if not recent:
+            return {'fps': 0.0, 'kbps': 0.0, 'write_ms': 0.0, 'blocked': 0.0}
+        
+        total_bytes = sum(s[1] for s in recent)
+        total_write = sum(s[2] for s in recent)
+        
+        return {
+            'fps': round(len(recent) / window, 1),
+            'kbps': round(total_bytes * 8 / 1000 / window, 1),
+            'write_ms': round(total_write / len(recent) * 1000, 2),
+            'blocked': round(min(total_write / window, 1.0), 3)
+        }
+
+
+class AdaptiveQualityController:
+    """
+    Ajusta calidad JPEG, escala de salida y FPS según la presión de los clientes
+    """
+    
+    def __init__(
+        self,
+        quality_range: Tuple[int, int] = (40, 85),
+        scale_range: Tuple[float, float] = (0.5, 1.0),
+        fps_range: Tuple[int, int] = (8, 30),
+        initial_quality: Optional[int] = None,
+        quality_step: int = 10,
+        scale_step: float = 0.125,
+        fps_step: int = 5,
+        window: float = 2.0,
+        adjust_interval: float = 1.0,
+        high_pressure: float = 0.6,
+        low_pressure: float = 0.25,
+        upgrade_windows: int = 3
+    ):
+        """
+        Args:
+            quality_range: (mín, máx) calidad JPEG
+            scale_range: (mín, máx) escala de salida respecto al frame procesado
+            fps_range: (mín, máx) FPS de salida
+            initial_quality: Calidad inicial (None = máximo del rango)
+            quality_step: Paso de calidad por ajuste
+            scale_step: Paso de escala por ajuste
+            fps_step: Paso de FPS por ajuste
+            window: Ventana (segundos) de medición por cliente
+            adjust_interval: Segundos mínimos entre ajustes
+            high_pressure: Fracción bloqueada a partir de la cual se degrada
+            low_pressure: Fracción bloqueada bajo la cual se puede mejorar
+            upgrade_windows: Ajustes holgados consecutivos antes de mejorar
+        """
+        self.quality_range = quality_range
+        self.scale_range = scale_range
+        self.fps_range = fps_range
+        self.quality_step = quality_step
+        self.scale_step = scale_step
+        self.fps_step = fps_step
+        self.window = window
+        self.adjust_interval = adjust_interval
+        self.high_pressure = high_pressure
+        self.low_pressure = low_pressure
+        self.upgrade_windows = upgrade_windows
+        
+        start_quality = quality_range[1] if initial_quality is None else initial_quality
+        self.quality = int(min(max(start_quality, quality_range[0]), quality_range[1]))
+        self.scale = float(scale_range[1])
+        self.fps = int(fps_range[1])
+        
+        self._clients: Dict[Any, _ClientMeter] = {}
+        self._lock = threading.Lock()
+        self._last_adjust = time.time()
+        self._last_emit = 0.0
+        self._calm_windows = 0
+        
+        self.frames_skipped = 0
+        self.adjustments = 0
+        self.last_action = None
+    
+    @classmethod
+    def from_config(cls, config) -> 'AdaptiveQualityController':
+        """
+        Crea el controlador desde la configuración de Flask
+        
+        Args:
+            config: current_app.config (o dict equivalente)
+        """
+        return cls(
+            quality_range=tuple(config.get('STREAM_JPEG_QUALITY_RANGE', (40, 85))),
+            scale_range=tuple(config.get('STREAM_SCALE_RANGE', (0.5, 1.0))),
+            fps_range=tuple(config.get('STREAM_FPS_RANGE', (8, 30))),
+            initial_quality=config.get('STREAM_JPEG_QUALITY', 70)
+        )
+    
+    # ------------------------------------------------------------------
+    # LADO DEL ENCODER
+    # ------------------------------------------------------------------
+    
+    def should_emit(self, now: Optional[float] = None) -> bool:
+        """
+        Limitador de FPS de salida
+        
+        Returns:
+            bool: True si toca emitir un frame (False = saltarlo sin codificar)
+        """
+        now = now or time.time()
+        
+        # Tolerancia del 10% para no perder frames por jitter de captura
+        if now - self._last_emit < 0.9 / self.fps:
+            self.frames_skipped += 1
+            return False
+        
+        self._last_emit = now
+        return True
+    
+    # ------------------------------------------------------------------
+    # LADO DEL CLIENTE
+    # ------------------------------------------------------------------
+    
+    def record_delivery(self, client_id, nbytes: int, write_seconds: float):
+        """
+        Registra la entrega de un frame a un cliente
+        
+        Args:
+            client_id: Identificador del cliente/suscriptor
+            nbytes: Tamaño del frame entregado
+            write_seconds: Tiempo que la escritura quedó bloqueada
+        """
+        now = time.time()
+        
+        with self._lock:
+            meter = self._clients.get(client_id)
+            if meter is None:
+                meter = self._clients[client_id] = _ClientMeter()
+            meter.add(now, nbytes, write_seconds)
+            
+            if now - self._last_adjust >= self.adjust_interval:
+                self._last_adjust = now
+                self._adjust(now)
+    
+    def forget_client(self, client_id):
+        """Elimina las métricas de un cliente desconectado"""
+        with self._lock:
+            self._clients.pop(client_id, None)
+    
+    # ------------------------------------------------------------------
+    # CONTROL
+    # ------------------------------------------------------------------
+    
+    def _worst_pressure(self, now: float) -> float:
+        if not self._clients:
+            return 0.0
+        return max(meter.snapshot(now, self.window)['blocked'] for meter in self._clients.values())
+    
+    def _adjust(self, now: float):
+        """Un paso de control según el cliente más lento (con lock tomado)"""
+        pressure = self._worst_pressure(now)
+        
+        if pressure >= self.high_pressure:
+            self._calm_windows = 0
+            self._step_down(pressure)
+        elif pressure <= self.low_pressure:
+            self._calm_windows += 1
+            if self._calm_windows >= self.upgrade_windows:
+                self._calm_windows = 0
+                self._step_up(pressure)
+        else:
+            self._calm_windows = 0
+    
+    def _step_down(self, pressure: float):
+        """Degrada: calidad → escala → FPS"""
+        if self.quality > self.quality_range[0]:
+            self.quality = max(self.quality - self.quality_step, self.quality_range[0])
+            action = f"quality↓ {self.quality}"
+        elif self.scale > self.scale_range[0]:
+            self.scale = max(round(self.scale - self.scale_step, 3), self.scale_range[0])
+            action = f"scale↓ {self.scale}"
+        elif self.fps > self.fps_range[0]:
+            self.fps = max(self.fps - self.fps_step, self.fps_range[0])
+            action = f"fps↓ {self.fps}"
+        else:
+            return
+        
+        self._record_action(action, pressure)
+    
+    def _step_up(self, pressure: float):
+        """Mejora en orden inverso: FPS → escala → calidad"""
+        if self.fps < self.fps_range[1]:
+            self.fps = min(self.fps + self.fps_step, self.fps_range[1])
+            action = f"fps↑ {self.fps}"
+        elif self.scale < self.scale_range[1]:
+            self.scale = min(round(self.scale + self.scale_step, 3), self.scale_range[1])
+            action = f"scale↑ {self.scale}"
+        elif self.quality < self.quality_range[1]:
+            self.quality = min(self.quality + self.quality_step, self.quality_range[1])
+            action = f"quality↑ {self.quality}"
+        else:
+            return
+        
+        self._record_action(action, pressure)
+    
+    def _record_action(self, action: str, pressure: float):
+        self.adjustments += 1
+        self.last_action = action
+        logger.debug(f"🎚️ Calidad adaptativa: {action} (bloqueo {pressure:.0%})")
+    
+    # ------------------------------------------------------------------
+    # MÉTRICAS
+    # ------------------------------------------------------------------
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: quality, scale, fps actuales, rangos, ajustes y métricas
+                por cliente (fps consumidos, kbps, write_ms, blocked)
+        """
+        now = time.time()
+        
+        with self._lock:
+            clients = {
+                str(client_id): meter.snapshot(now, self.window)
+                for client_id, meter in self._clients.items()
+            }
+        
+        return {
+            'quality': self.quality,
+            'scale': self.scale,
+            'fps': self.fps,
+            'ranges': {
+                'quality': list(self.quality_range),
+                'scale': list(self.scale_range),
+                'fps': list(self.fps_range)
+            },
+            'adjustments': self.adjustments,
+            'last_action': self.last_action,
+            'frames_skipped': self.frames_skipped,
+            'clients': clients
+        }
@@ -0,0 +1,460 @@
+"""
+📺 BROADCAST HUB - UN PRODUCTOR, MÚLTIPLES ESPECTADORES
+========================================================
+Difusión del stream procesado de una cámara a varios clientes
+
+PROBLEMA:
+CameraManager solo permite un usuario por cámara, así que un instructor no
+podía ver la sesión en vivo de un estudiante desde otro navegador (y si se
+permitiera, MediaPipe + cv2.imencode se ejecutarían una vez por cliente).
+
+SOLUCIÓN:
+- Un canal por índice de cámara con UN productor (analyzer + encode JPEG)
+- Cada frame se codifica UNA sola vez y los mismos bytes se publican a
+  todos los suscriptores
+- Cola acotada por cliente (drop-oldest): un cliente lento se salta frames
+  en vez de frenar al productor o a los demás clientes
+- Roles: 'owner' (dueño de la cámara, controla el análisis) y
+  'observer' (solo lectura, se une a un canal ya activo)
+- El productor se detiene al irse el último suscriptor
+
+Uso:
+    subscriber = broadcast_hub.subscribe(
+        camera_index=0,
+        client_id=user_id,
+        role='owner',
+        producer=lambda: pipeline_frames(),  # Generador de bytes JPEG
+        producer_key='shoulder_profile'
+    )
+    
+    try:
+        for jpeg_bytes in subscriber.frames():
+            yield ...
+    finally:
+        broadcast_hub.unsubscribe(subscriber)
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import time
+import threading
+import logging
+import itertools
+from typing import Optional, Callable, Iterator, Dict, Any
+
+from .pipeline import DropOldestQueue
+
+logger = logging.getLogger(__name__)
+
+# Marcador de fin de canal (viaja por las colas de los suscriptores)
+_END = object()
+
+ROLE_OWNER = 'owner'
+ROLE_OBSERVER = 'observer'
+
+
+class Subscriber:
+    """Cliente suscrito a un canal (cola propia de frames JPEG)"""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, channel: 'BroadcastChannel', client_id: str, role: str, queue_size: int = 2):
+        """
+        Args:
+            channel: Canal al que pertenece
+            client_id: Identificador del cliente (usuario)
+            role: 'owner' u 'observer'
+            queue_size: Capacidad de la cola del cliente
+        """
+        self.id = next(self._ids)
+        self.channel = channel
+        self.client_id = client_id
+        self.role = role
+        self.connected_at = time.time()
+        self.delivered = 0
+        self.bytes_delivered = 0
+        self._queue = DropOldestQueue(queue_size)
+        self._closed = False
+    
+    @property
+    def skipped(self) -> int:
+        """Frames descartados porque el cliente no los consumió a tiempo"""
+        return self._queue.dropped
+    
+    def push(self, item):
+        self._queue.put(item)
+    
+    def close(self):
+        self._closed = True
+        self._queue.put(_END)
+    
+    def frames(self, timeout: float = 1.0) -> Iterator[bytes]:
+        """
+        Generador de frames JPEG para este cliente
+        
+        Termina cuando el canal se cierra. El tiempo entre el yield y la
+        reanudación es lo que tardó el servidor en escribir el frame al
+        socket: se reporta al controlador de calidad del canal.
+        """
+        quality_controller = self.channel.quality_controller
+        
+        while True:
+            item = self._queue.get(timeout=timeout)
+            
+            if item is None:
+                if self._closed:
+                    break
+                continue
+            
+            if item is _END:
+                break
+            
+            write_started = time.time()
+            yield item
+            
+            self.delivered += 1
+            self.bytes_delivered += len(item)
+            
+            if quality_controller is not None:
+                quality_controller.record_delivery(self.id, len(item), time.time() - write_started)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'client_id': self.client_id,
+            'role': self.role,
+            'delivered': self.delivered,
+            'skipped': self.skipped,
+            'bytes_delivered': self.bytes_delivered,
+            'connected_seconds': round(time.time() - self.connected_at, 1)
+        }
+
+
+class BroadcastChannel:
+    """Canal de una cámara: un hilo productor que publica a N suscriptores"""
+    
+    def __init__(
+        self,
+        camera_index: int,
+        owner_id: str,
+        producer: Callable[[], Iterator[bytes]],
+        producer_key: Optional[str] = None,
+        queue_size: int = 2,
+        error_frame_factory: Optional[Callable[[str], bytes]] = None,
+        quality_controller=None,
+        on_close: Optional[Callable[['BroadcastChannel'], None]] = None
+    ):
+        """
+        Args:
+            camera_index: Índice de la cámara
+            owner_id: Usuario dueño de la cámara
+            producer: Función que devuelve un generador de bytes JPEG
+            producer_key: Identifica la configuración del productor (ej: tipo de analyzer)
+            queue_size: Capacidad de la cola de cada suscriptor
+            error_frame_factory: Función mensaje → JPEG para errores del productor
+            quality_controller: AdaptiveQualityController compartido con el
+                encoder del productor (recibe el backpressure de los clientes)
+            on_close: Callback al terminar el productor
+        """
+        self.camera_index = camera_index
+        self.owner_id = owner_id
+        self.producer_key = producer_key
+        self.queue_size = queue_size
+        self.quality_controller = quality_controller
+        self.error = None
+        
+        self._producer = producer
+        self._error_frame_factory = error_frame_factory
+        self._on_close = on_close
+        self._subscribers: Dict[int, Subscriber] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._last_frame: Optional[bytes] = None
+        
+        self.started_at = time.time()
+        self.frames_published = 0
+        self.bytes_published = 0
+    
+    # ------------------------------------------------------------------
+    # CICLO DE VIDA
+    # ------------------------------------------------------------------
+    
+    def start(self) -> 'BroadcastChannel':
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"Broadcast-camera-{self.camera_index}",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"📺 Canal de cámara {self.camera_index} iniciado (owner: '{self.owner_id}')")
+        return self
+    
+    def stop(self):
+        """Pide al productor que termine (efectivo en el siguiente frame)"""
+        self._running = False
+    
+    def join(self, timeout: float = 3.0):
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+    
+    @property
+    def is_active(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        """Hilo productor: itera el generador y publica cada frame una vez"""
+        frames = None
+        
+        try:
+            frames = self._producer()
+            
+            for jpeg_bytes in frames:
+                if not self._running:
+                    break
+                self._publish(jpeg_bytes)
+        
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Error en productor de cámara {self.camera_index}: {e}")
+            
+            if self._error_frame_factory is not None:
+                self._publish(self._error_frame_factory(str(e)))
+        
+        finally:
+            # Cerrar el generador libera la cámara (finally del productor)
+            if frames is not None and hasattr(frames, 'close'):
+                frames.close()
+            
+            self._running = False
+            
+            with self._lock:
+                subscribers = list(self._subscribers.values())
+            for subscriber in subscribers:
+                subscriber.close()
+            
+            if self._on_close is not None:
+                self._on_close(self)
+            
+            logger.info(
+                f"📺 Canal de cámara {self.camera_index} cerrado "
+                f"({self.frames_published} frames publicados)"
+            )
+    
+    def _publish(self, jpeg_bytes: bytes):
+        """Entrega los MISMOS bytes a todas las colas de suscriptores"""
+        self._last_frame = jpeg_bytes
+        self.frames_published += 1
+        self.bytes_published += len(jpeg_bytes)
+        
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        
+        for subscriber in subscribers:
+            subscriber.push(jpeg_bytes)
+    
+    # ------------------------------------------------------------------
+    # SUSCRIPTORES
+    # ------------------------------------------------------------------
+    
+    def add_subscriber(self, client_id: str, role: str) -> Subscriber:
+        subscriber = Subscriber(self, client_id, role, self.queue_size)
+        
+        # Entregar de inmediato el último frame (el cliente no ve pantalla negra)
+        if self._last_frame is not None:
+            subscriber.push(self._last_frame)
+        
+        with self._lock:
+            self._subscribers[subscriber.id] = subscriber
+        
+        return subscriber
+    
+    def remove_subscriber(self, subscriber: Subscriber) -> int:
+        """
+        Returns:
+            int: Suscriptores restantes
+        """
+        if self.quality_controller is not None:
+            self.quality_controller.forget_client(subscriber.id)
+        
+        with self._lock:
+            self._subscribers.pop(subscriber.id, None)
+            return len(self._subscribers)
+    
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = [s.get_stats() for s in self._subscribers.values()]
+        
+        delivered = sum(s['delivered'] for s in subscribers)
+        
+        return {
+            'camera_index': self.camera_index,
+            'owner_id': self.owner_id,
+            'producer_key': self.producer_key,
+            'active': self.is_active,
+            'error': self.error,
+            'frames_published': self.frames_published,
+            'bytes_published': self.bytes_published,
+            'frames_delivered': delivered,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'quality': self.quality_controller.get_stats() if self.quality_controller else None,
+            'subscribers': subscribers
+        }
+
+
+class BroadcastHub:
+    """Registro de canales por índice de cámara"""
+    
+    def __init__(self, queue_size: int = 2):
+        """
+        Args:
+            queue_size: Capacidad por defecto de la cola de cada suscriptor
+        """
+        self.queue_size = queue_size
+        self._channels: Dict[int, BroadcastChannel] = {}
+        self._lock = threading.Lock()
+    
+    def subscribe(
+        self,
+        camera_index: int,
+        client_id: str,
+        role: str = ROLE_OWNER,
+        producer: Optional[Callable[[], Iterator[bytes]]] = None,
+        producer_key: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        error_frame_factory: Optional[Callable[[str], bytes]] = None,
+        quality_controller=None
+    ) -> Subscriber:
+        """
+        Suscribe un cliente al canal de una cámara
+        
+        - owner: crea el canal si no existe (requiere producer). Si el canal
+          existe con otro producer_key (otro ejercicio) se reinicia.
+        - observer: solo puede unirse a un canal ya activo.
+        
+        Args:
+            camera_index: Índice de la cámara
+            client_id: Identificador del cliente (usuario)
+            role: 'owner' u 'observer'
+            producer: Función que devuelve un generador de bytes JPEG
+            producer_key: Identifica la configuración del productor
+            queue_size: Capacidad de la cola del cliente (None = por defecto)
+            error_frame_factory: Función mensaje → JPEG para errores del productor
+            quality_controller: Controlador de calidad del canal (solo al crearlo)
+        
+        Returns:
+            Subscriber: Cliente suscrito
+        
+        Raises:
+            RuntimeError: Si la cámara pertenece a otro usuario o no hay
+                canal activo para un observer
+        """
+        if role not in (ROLE_OWNER, ROLE_OBSERVER):
+            raise ValueError(f"Rol inválido: '{role}'")
+        
+        # Canal terminando o con otro ejercicio: retirarlo y esperar fuera del
+        # lock a que su productor libere la cámara
+        stale = None
+        with self._lock:
+            channel = self._channels.get(camera_index)
+            
+            if channel is not None and channel.is_active and role == ROLE_OWNER:
+                if channel.owner_id != client_id:
+                    raise RuntimeError(
+                        f"Cámara en uso por '{channel.owner_id}'. "
+                        f"Puedes observar la sesión en modo solo lectura."
+                    )
+                
+                if producer_key is not None and channel.producer_key != producer_key:
+                    logger.info(f"📺 Reiniciando canal de cámara {camera_index} ({channel.producer_key} → {producer_key})")
+                    channel.stop()
+            
+            if channel is not None and not channel.is_active:
+                self._channels.pop(camera_index, None)
+                stale = channel
+        
+        if stale is not None:
+            stale.join()
+        
+        with self._lock:
+            channel = self._channels.get(camera_index)
+            
+            if channel is None:
+                if role == ROLE_OBSERVER:
+                    raise RuntimeError(f"No hay transmisión activa en la cámara {camera_index}")
+                
+                if producer is None:
+                    raise ValueError("Se requiere producer para crear un canal")
+                
+                channel = BroadcastChannel(
+                    camera_index,
+                    owner_id=client_id,
+                    producer=producer,
+                    producer_key=producer_key,
+                    queue_size=queue_size or self.queue_size,
+                    error_frame_factory=error_frame_factory,
+                    quality_controller=quality_controller,
+                    on_close=self._on_channel_closed
+                )
+                self._channels[camera_index] = channel
+                subscriber = channel.add_subscriber(client_id, role)
+                channel.start()
+            
+            elif role == ROLE_OWNER and channel.owner_id != client_id:
+                raise RuntimeError(
+                    f"Cámara en uso por '{channel.owner_id}'. "
+                    f"Puedes observar la sesión en modo solo lectura."
+                )
+            
+            else:
+                subscriber = channel.add_subscriber(client_id, role)
+        
+        logger.info(
+            f"📺 '{client_id}' suscrito a cámara {camera_index} como {role} "
+            f"({channel.subscriber_count} clientes)"
+        )
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber):
+        """Retira un cliente; el productor se detiene si era el último"""
+        channel = subscriber.channel
+        remaining = channel.remove_subscriber(subscriber)
+        
+        logger.info(
+            f"📺 '{subscriber.client_id}' salió de cámara {channel.camera_index} "
+            f"({remaining} clientes restantes)"
+        )
+        
+        if remaining == 0:
+            channel.stop()
+    
+    def _on_channel_closed(self, channel: BroadcastChannel):
+        with self._lock:
+            if self._channels.get(channel.camera_index) is channel:
+                self._channels.pop(channel.camera_index, None)
+    
+    def get_channel(self, camera_index: int) -> Optional[BroadcastChannel]:
+        with self._lock:
+            return self._channels.get(camera_index)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            channels = list(self._channels.values())
+        
+        return {
+            'channels': [channel.get_stats() for channel in channels]
+        }
+
+
+# ============================================================================
+# INSTANCIA GLOBAL (SINGLETON)
+# ============================================================================
+
+broadcast_hub = BroadcastHub()
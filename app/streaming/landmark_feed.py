@@ -0,0 +1,138 @@
+"""
+📡 LANDMARK FEED - PAYLOADS POR FRAME PARA EL MODO SOLO DATOS
+=============================================================
+Difusión del último payload de landmarks/ángulos a los navegadores
+
+En modo solo datos el pipeline no dibuja ni (casi) codifica video: por cada
+frame publica el payload de analyzer.process_landmarks_only() y cada cliente
+lo recibe como una línea JSON (NDJSON) para dibujar skeleton y HUD.
+
+- El payload se serializa UNA vez por frame, sin importar cuántos clientes
+- Cada cliente recibe siempre el ÚLTIMO payload: si se atrasa, los
+  intermedios se descartan (no se acumula latencia)
+- Sin payload nuevo durante `keepalive` segundos se envía una línea vacía,
+  así Flask detecta clientes desconectados
+- Un feed por cámara (get_landmark_feed(camera_index)): cada estación
+  recibe solo los payloads de su propio stream
+
+Uso:
+    landmark_feed.publish(analyzer.process_landmarks_only(frame, results))
+    
+    for line in landmark_feed.stream():
+        yield line  # b'{"angle": 45.2, ...}\\n'
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import json
+import time
+import threading
+from typing import Optional, Iterator, Dict, Any
+
+import numpy as np
+
+
+def _json_default(value):
+    """Escalares de NumPy (np.float64, np.bool_) → tipos de Python"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Payload → línea JSON compacta terminada en salto de línea"""
+    return json.dumps(payload, separators=(',', ':'), default=_json_default).encode('utf-8') + b'\n'
+
+
+class LandmarkFeed:
+    """Último payload publicado + espera eficiente de payloads nuevos"""
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._seq = 0
+        self._line: Optional[bytes] = None
+        self._clients = 0
+        
+        self.published = 0
+        self.bytes_published = 0
+    
+    def publish(self, payload: Dict[str, Any]):
+        """
+        Publica el payload de un frame (se serializa una sola vez)
+        
+        Args:
+            payload: Resultado de process_landmarks_only() u otro dict JSON
+        """
+        line = encode_payload(payload)
+        
+        with self._condition:
+            self._seq += 1
+            self._line = line
+            self.published += 1
+            self.bytes_published += len(line)
+            self._condition.notify_all()
+    
+    def clear(self):
+        """Olvida el último payload (ej: al detenerse el stream)"""
+        with self._condition:
+            self._line = None
+    
+    def stream(self, keepalive: float = 1.0) -> Iterator[bytes]:
+        """
+        Generador de líneas NDJSON para un cliente
+        
+        Empieza por el último payload disponible y luego entrega solo los
+        nuevos. Termina cuando el cliente se desconecta (GeneratorExit).
+        
+        Args:
+            keepalive: Segundos sin payload antes de enviar una línea vacía
+        """
+        with self._condition:
+            self._clients += 1
+            last_seq = self._seq - 1 if self._line is not None else self._seq
+        
+        try:
+            while True:
+                with self._condition:
+                    deadline = time.time() + keepalive
+                    while self._seq == last_seq:
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    
+                    fresh = self._seq != last_seq and self._line is not None
+                    last_seq = self._seq
+                    line = self._line
+                
+                yield line if fresh else b'\n'
+        finally:
+            with self._condition:
+                self._clients -= 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'clients': self._clients,
+            'published': self.published,
+            'bytes_published': self.bytes_published,
+            'avg_bytes': round(self.bytes_published / self.published) if self.published else 0
+        }
+
+
+# Feeds por cámara (una estación = un índice de cámara)
+_feeds: Dict[int, LandmarkFeed] = {}
+_feeds_lock = threading.Lock()
+
+
+def get_landmark_feed(camera_index: int = 0) -> LandmarkFeed:
+    """Feed de la cámara indicada (se crea en el primer uso)"""
+    with _feeds_lock:
+        feed = _feeds.get(camera_index)
+        if feed is None:
+            feed = _feeds[camera_index] = LandmarkFeed()
+        return feed
+
+
+# Feed de la cámara predeterminada (índice 0)
+landmark_feed = get_landmark_feed(0)
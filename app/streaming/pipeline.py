@@ -0,0 +1,633 @@
+"""
+🏭 STREAM PIPELINE - CAPTURA → INFERENCIA → RENDER → ENCODE
+=============================================================
+Motor de streaming MJPEG con etapas en hilos separados
+
+PROBLEMA:
+El generador original hacía cap.read() → process_frame() → imencode() → yield
+estrictamente en secuencia, así que el throughput quedaba limitado por la SUMA
+de los tiempos de todas las etapas.
+
+SOLUCIÓN:
+- Cada etapa corre en su propio hilo, conectadas por colas acotadas
+- Política "drop-oldest": si una etapa se atrasa, se descarta el frame más
+  viejo de su cola (nunca se bloquea a la etapa anterior)
+- OpenCV y MediaPipe liberan el GIL, así que las etapas realmente se solapan
+  y el throughput queda limitado por la etapa MÁS LENTA
+- Métricas de ocupación por etapa (fracción del tiempo que está trabajando)
+
+El modo secuencial (threaded=False) ejecuta las mismas etapas en línea,
+útil para depuración y comparación.
+
+Modo solo datos (render_mode='data'): la etapa de render llama a
+analyzer.process_landmarks_only() y publica el payload en payload_sink sin
+copiar ni dibujar el frame; el encode envía el frame crudo (baja calidad) o
+solo un keep-alive mínimo (data_video='none').
+
+Uso:
+    pipeline = StreamPipeline(cap, analyzer, jpeg_quality=70)
+    
+    for jpeg_bytes in pipeline.frames():
+        yield (b'--frame\\r\\n' ... + jpeg_bytes + b'\\r\\n')
+    
+    pipeline.get_stats()  # Ocupación por etapa, FPS de salida
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import cv2
+import time
+import threading
+import logging
+import numpy as np
+from collections import deque
+from typing import Optional, Callable, Iterator, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Marcador de fin de stream (viaja por las colas)
+_END = object()
+
+
+class DropOldestQueue:
+    """
+    Cola acotada thread-safe que descarta el elemento MÁS VIEJO al llenarse
+    
+    El productor nunca se bloquea: si el consumidor va atrasado, los frames
+    viejos se pierden y el consumidor siempre recibe los más recientes.
+    """
+    
+    def __init__(self, maxsize: int = 2):
+        self._items = deque()
+        self._maxsize = max(1, maxsize)
+        self._condition = threading.Condition()
+        self.dropped = 0
+    
+    def put(self, item):
+        """Agrega un elemento (descarta el más viejo si la cola está llena)"""
+        with self._condition:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            
+            self._items.append(item)
+            self._condition.notify()
+    
+    def get(self, timeout: float = 0.5):
+        """
+        Obtiene el elemento más antiguo de la cola
+        
+        Returns:
+            El elemento, o None si se agotó el timeout
+        """
+        deadline = time.time() + timeout
+        
+        with self._condition:
+            while not self._items:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            
+            return self._items.popleft()
+    
+    def qsize(self) -> int:
+        with self._condition:
+            return len(self._items)
+
+
+class StageStats:
+    """Métricas de una etapa del pipeline (ocupación y tiempo por frame)"""
+    
+    def __init__(self, name: str, window: float = 2.0):
+        """
+        Args:
+            name: Nombre de la etapa
+            window: Ventana (segundos) para calcular la ocupación
+        """
+        self.name = name
+        self.window = window
+        self.processed = 0
+        self.errors = 0
+        self._started_at = time.time()
+        self._busy = deque(maxlen=512)  # (timestamp_fin, duración)
+        self._lock = threading.Lock()
+    
+    def record(self, started: float, ended: float):
+        """Registra el procesamiento de un frame"""
+        with self._lock:
+            self.processed += 1
+            self._busy.append((ended, ended - started))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: processed, errors, avg_ms y occupancy (0-1) en la ventana
+        """
+        now = time.time()
+        
+        with self._lock:
+            recent = [duration for ended, duration in self._busy if now - ended <= self.window]
+        
+        elapsed = min(self.window, now - self._started_at)
+        occupancy = (sum(recent) / elapsed) if elapsed > 0 else 0.0
+        
+        return {
+            'processed': self.processed,
+            'errors': self.errors,
+            'avg_ms': round(sum(recent) / len(recent) * 1000, 2) if recent else 0.0,
+            'occupancy': round(min(occupancy, 1.0), 3)
+        }
+
+
+class _FrameItem:
+    """Frame en tránsito por el pipeline"""
+    
+    __slots__ = ('seq', 'capture_ts', 'frame', 'results', 'inference_ms', 'image', 'jpeg', 'decode_scale')
+    
+    def __init__(self, seq: int, capture_ts: float, frame: np.ndarray, decode_scale: int = 1):
+        self.seq = seq
+        self.capture_ts = capture_ts
+        self.frame = frame
+        self.results = None
+        self.inference_ms = 0.0
+        self.image: Optional[np.ndarray] = None
+        self.jpeg: Optional[bytes] = None
+        self.decode_scale = decode_scale  # Divisor de resolución con que se decodificó
+
+
+class StreamPipeline:
+    """
+    Pipeline de streaming con etapas solapadas en hilos
+    
+    Etapas:
+        capture   → source.read()
+        inference → analyzer.infer(frame)
+        render    → analyzer.render(frame, results)
+                    (modo 'data': analyzer.process_landmarks_only → payload_sink)
+        encode    → cv2.imencode('.jpg')
+    """
+    
+    STAGES = ('capture', 'inference', 'render', 'encode')
+    RENDER_MODES = ('annotated', 'data')
+    DATA_VIDEO_MODES = ('low', 'none')
+    
+    def __init__(
+        self,
+        source,
+        analyzer,
+        jpeg_quality: int = 70,
+        queue_size: int = 2,
+        threaded: bool = True,
+        error_frame_factory: Optional[Callable[[str], bytes]] = None,
+        quality_controller=None,
+        render_mode: str = 'annotated',
+        payload_sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+        data_video: str = 'low',
+        keepalive_interval: float = 1.0,
+        on_rendered: Optional[Callable[[], None]] = None,
+        reduced_decode_scale: int = 1,
+        frame_sink: Optional[Callable[[np.ndarray], Any]] = None
+    ):
+        """
+        Args:
+            source: Objeto con interfaz read() → (ret, frame)
+                (cv2.VideoCapture o LatestFrameReader)
+            analyzer: Analyzer con infer() y render()
+            jpeg_quality: Calidad JPEG (0-100)
+            queue_size: Capacidad de cada cola entre etapas
+            threaded: True = etapas en hilos; False = secuencial en línea
+            error_frame_factory: Función mensaje → JPEG para errores de procesamiento
+            quality_controller: AdaptiveQualityController opcional (calidad,
+                escala y FPS de salida según la red del cliente)
+            render_mode: 'annotated' (frame dibujado en el servidor) o 'data'
+                (solo análisis; el payload va a payload_sink)
+            payload_sink: Función que recibe el payload de cada frame en modo 'data'
+            data_video: En modo 'data': 'low' (frame crudo) o 'none' (sin video)
+            keepalive_interval: Segundos entre frames keep-alive con data_video='none'
+            on_rendered: Callback tras actualizar el estado del analyzer en cada
+                frame (ej: state_feed.notify para el push SSE)
+            reduced_decode_scale: Con una fuente MJPG (set_decode_scale), divisor
+                de resolución al decodificar cuando no hace falta el frame
+                completo: modo 'data' o salida anotada ya reducida por el
+                controlador de calidad (1 = decodificar siempre completo)
+            frame_sink: Recibe cada frame procesado antes del encode (ej: la
+                grabación de la sesión); no debe bloquear
+        """
+        if render_mode not in self.RENDER_MODES:
+            raise ValueError(f"render_mode inválido: {render_mode}")
+        if data_video not in self.DATA_VIDEO_MODES:
+            raise ValueError(f"data_video inválido: {data_video}")
+        
+        self.source = source
+        self.analyzer = analyzer
+        self.jpeg_quality = jpeg_quality
+        self.queue_size = queue_size
+        self.threaded = threaded
+        self.error_frame_factory = error_frame_factory
+        self.quality_controller = quality_controller
+        self.render_mode = render_mode
+        self.payload_sink = payload_sink
+        self.data_video = data_video
+        self.keepalive_interval = keepalive_interval
+        self.on_rendered = on_rendered
+        self.reduced_decode_scale = reduced_decode_scale
+        self.frame_sink = frame_sink
+        self._set_decode_scale = getattr(source, 'set_decode_scale', None)
+        self._last_keepalive = 0.0
+        self._keepalive_jpeg: Optional[bytes] = None
+        
+        # Colas entre etapas (la última alimenta al consumidor HTTP)
+        self._queues = {
+            'inference': DropOldestQueue(queue_size),
+            'render': DropOldestQueue(queue_size),
+            'encode': DropOldestQueue(queue_size),
+            'output': DropOldestQueue(queue_size)
+        }
+        
+        self._stats = {name: StageStats(name) for name in self.STAGES}
+        
+        self._seq = 0
+        self._running = False
+        self._threads = []
+        self._output_times = deque(maxlen=60)
+        self.frames_out = 0
+    
+    # ------------------------------------------------------------------
+    # CICLO DE VIDA
+    # ------------------------------------------------------------------
+    
+    def start(self) -> 'StreamPipeline':
+        """Arranca los hilos de las etapas (solo en modo threaded)"""
+        if self._running:
+            return self
+        
+        self._running = True
+        
+        if self.threaded:
+            workers = [
+                ('capture', self._capture_loop, ()),
+                ('inference', self._stage_loop, ('inference', self._infer, 'inference', 'render')),
+                ('render', self._stage_loop, ('render', self._render, 'render', 'encode')),
+                ('encode', self._stage_loop, ('encode', self._encode, 'encode', 'output'))
+            ]
+            
+            for name, target, args in workers:
+                thread = threading.Thread(target=target, args=args, name=f"Pipeline-{name}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            
+            logger.info("Pipeline de streaming iniciado (4 etapas en paralelo)")
+        
+        return self
+    
+    def stop(self, timeout: float = 2.0) -> bool:
+        """
+        Detiene las etapas y espera a que terminen los hilos
+        
+        Returns:
+            bool: True si ningún hilo de etapa sigue vivo (ya nadie usa el
+                analyzer); False si alguno no terminó dentro del timeout
+        """
+        if self._running:
+            self._running = False
+            
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join(timeout=timeout)
+            
+            logger.info(f"Pipeline de streaming detenido ({self.frames_out} frames enviados)")
+        
+        # Los que no terminaron quedan registrados (una nueva llamada los espera)
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        if self._threads:
+            logger.warning(f"Pipeline: {len(self._threads)} etapas no terminaron en {timeout}s")
+        return not self._threads
+    
+    def frames(self) -> Iterator[bytes]:
+        """
+        Generador de frames JPEG listos para enviar
+        
+        Termina cuando la fuente deja de entregar frames. Siempre detiene
+        el pipeline al salir (incluido GeneratorExit del cliente).
+        """
+        self.start()
+        
+        try:
+            while self._running:
+                if self.threaded:
+                    item = self._queues['output'].get(timeout=0.5)
+                    if item is None:
+                        continue
+                    if item is _END:
+                        break
+                else:
+                    item = self._run_sequential()
+                    if item is None:
+                        break
+                
+                yield item.jpeg
+                
+                # El cliente consumió el frame: registrar latencia y FPS de salida
+                self._on_delivered(item)
+        finally:
+            self.stop()
+    
+    # ------------------------------------------------------------------
+    # ETAPAS
+    # ------------------------------------------------------------------
+    
+    def _decode_scale(self) -> int:
+        """
+        Divisor de resolución que necesita el próximo frame
+        
+        El frame completo solo hace falta para el stream anotado a escala
+        mayor que 1/reduced_decode_scale; MediaPipe procesa a 640x480 igual.
+        """
+        reduced = self.reduced_decode_scale
+        
+        if reduced <= 1 or self.render_mode == 'data':
+            return reduced
+        
+        if self.quality_controller is not None and self.quality_controller.scale <= 1.0 / reduced:
+            return reduced
+        
+        return 1
+    
+    def _capture(self) -> Optional[_FrameItem]:
+        """Etapa CAPTURE: lee el siguiente frame de la fuente"""
+        decode_scale = 1
+        if self._set_decode_scale is not None:
+            decode_scale = self._decode_scale()
+            self._set_decode_scale(decode_scale)
+        
+        ret, frame = self.source.read()
+        
+        if not ret or frame is None:
+            logger.warning("No se pudo leer frame de la cámara")
+            return None
+        
+        # Con hilo lector, usar el timestamp real de captura
+        capture_ts = getattr(self.source, 'last_timestamp', 0.0) or time.time()
+        
+        self._seq += 1
+        return _FrameItem(self._seq, capture_ts, frame, decode_scale)
+    
+    def _infer(self, item: _FrameItem) -> _FrameItem:
+        """Etapa INFERENCE: MediaPipe sobre el frame"""
+        if getattr(self.analyzer, 'pose', None) is None:
+            return item
+        
+        started = time.time()
+        item.results = self.analyzer.infer(item.frame)
+        item.inference_ms = (time.time() - started) * 1000
+        return item
+    
+    def _render(self, item: _FrameItem) -> _FrameItem:
+        """Etapa RENDER: estado del análisis + anotaciones visuales"""
+        if self.render_mode == 'data':
+            self._render_data(item)
+        elif item.results is None:
+            item.image = self._render_loading_frame(item.frame)
+        else:
+            item.image = self.analyzer.render(item.frame, item.results, item.inference_ms)
+        
+        if self.on_rendered is not None and item.results is not None:
+            self.on_rendered()
+        
+        if self.frame_sink is not None and item.image is not None:
+            self.frame_sink(item.image)
+        
+        return item
+    
+    def _render_data(self, item: _FrameItem) -> _FrameItem:
+        """Etapa RENDER en modo solo datos: payload sin tocar la imagen"""
+        if item.results is None:
+            payload = {'loading': True, 'timestamp': round(time.time(), 3)}
+        else:
+            payload = self.analyzer.process_landmarks_only(item.frame, item.results, item.inference_ms)
+        
+        if self.payload_sink is not None:
+            self.payload_sink(payload)
+        
+        # El frame crudo se envía tal cual (sin copia ni overlay)
+        item.image = item.frame
+        return item
+    
+    def _encode(self, item: _FrameItem) -> Optional[_FrameItem]:
+        """Etapa ENCODE: JPEG del frame anotado"""
+        if self.render_mode == 'data' and self.data_video == 'none':
+            return self._encode_keepalive(item)
+        
+        image = item.image
+        quality = self.jpeg_quality
+        
+        if self.quality_controller is not None:
+            # Limitador de FPS: saltar el frame sin codificarlo
+            if not self.quality_controller.should_emit():
+                return None
+            
+            quality = self.quality_controller.quality
+            # La escala es respecto al frame completo: descontar la ya
+            # aplicada al decodificar
+            scale = self.quality_controller.scale * item.decode_scale
+            
+            if scale < 1.0:
+                image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        ret_encode, buffer = cv2.imencode(
+            '.jpg',
+            image,
+            [cv2.IMWRITE_JPEG_QUALITY, quality]
+        )
+        
+        if not ret_encode:
+            logger.error("Error al codificar frame")
+            return None
+        
+        item.jpeg = buffer.tobytes()
+        item.image = None
+        item.frame = None
+        return item
+    
+    def _encode_keepalive(self, item: _FrameItem) -> Optional[_FrameItem]:
+        """
+        Sin video: un JPEG mínimo cada keepalive_interval segundos
+        
+        Mantiene viva la conexión MJPEG (Flask solo detecta que el cliente
+        se fue al escribir) sin codificar los frames de la cámara.
+        """
+        now = time.time()
+        
+        if now - self._last_keepalive < self.keepalive_interval:
+            return None
+        
+        if self._keepalive_jpeg is None:
+            _, buffer = cv2.imencode('.jpg', np.zeros((8, 8, 3), dtype=np.uint8))
+            self._keepalive_jpeg = buffer.tobytes()
+        
+        self._last_keepalive = now
+        item.jpeg = self._keepalive_jpeg
+        item.image = None
+        item.frame = None
+        return item
+    
+    # ------------------------------------------------------------------
+    # EJECUCIÓN
+    # ------------------------------------------------------------------
+    
+    def _capture_loop(self):
+        """Hilo de la etapa CAPTURE"""
+        stats = self._stats['capture']
+        
+        while self._running:
+            started = time.time()
+            item = self._capture()
+            
+            if item is None:
+                self._queues['inference'].put(_END)
+                break
+            
+            stats.record(started, time.time())
+            self._queues['inference'].put(item)
+    
+    def _stage_loop(self, name: str, func: Callable, in_queue: str, out_queue: str):
+        """Hilo genérico de una etapa: toma de in_queue, procesa y publica en out_queue"""
+        stats = self._stats[name]
+        source_queue = self._queues[in_queue]
+        target_queue = self._queues[out_queue]
+        
+        while self._running:
+            item = source_queue.get(timeout=0.2)
+            
+            if item is None:
+                continue
+            
+            if item is _END:
+                target_queue.put(_END)
+                break
+            
+            result = self._run_stage(name, func, item)
+            if result is not None:
+                target_queue.put(result)
+    
+    def _run_stage(self, name: str, func: Callable, item: _FrameItem) -> Optional[_FrameItem]:
+        """Ejecuta una etapa sobre un frame registrando métricas y errores"""
+        # Frames con error ya codificado pasan directo
+        if item.jpeg is not None:
+            return item
+        
+        stats = self._stats[name]
+        started = time.time()
+        
+        try:
+            result = func(item)
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Error en etapa '{name}': {e}")
+            
+            if self.error_frame_factory is None:
+                return None
+            
+            item.jpeg = self.error_frame_factory(f"Error en procesamiento: {str(e)}")
+            result = item
+        
+        stats.record(started, time.time())
+        return result
+    
+    def _run_sequential(self) -> Optional[_FrameItem]:
+        """Ejecuta las 4 etapas en línea para un frame (modo secuencial)"""
+        while self._running:
+            started = time.time()
+            item = self._capture()
+            
+            if item is None:
+                return None
+            
+            self._stats['capture'].record(started, time.time())
+            
+            for name, func in (('inference', self._infer), ('render', self._render), ('encode', self._encode)):
+                item = self._run_stage(name, func, item)
+                if item is None:
+                    break
+            
+            if item is not None:
+                return item
+        
+        return None
+    
+    def _on_delivered(self, item: _FrameItem):
+        """Registra que el cliente recibió un frame"""
+        self.frames_out += 1
+        self._output_times.append(time.time())
+        
+        record_display = getattr(self.source, 'record_display', None)
+        if record_display is not None:
+            record_display(item.capture_ts)
+    
+    def _render_loading_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Frame crudo con aviso mientras MediaPipe se inicializa"""
+        raw_frame = frame.copy()
+        cv2.putText(
+            raw_frame,
+            "Inicializando MediaPipe...",
+            (50, 50),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.8,
+            (0, 255, 255),  # Amarillo
+            2
+        )
+        cv2.putText(
+            raw_frame,
+            "El skeleton aparecera en unos segundos",
+            (50, 90),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.6,
+            (255, 255, 255),  # Blanco
+            1
+        )
+        return raw_frame
+    
+    # ------------------------------------------------------------------
+    # MÉTRICAS
+    # ------------------------------------------------------------------
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene métricas del pipeline
+        
+        Returns:
+            dict:
+                - mode: 'pipelined' o 'sequential'
+                - render_mode: 'annotated' o 'data'
+                - output_fps: FPS entregados al cliente
+                - frames_out: Total de frames entregados
+                - stages: Por etapa → occupancy, avg_ms, processed, errors,
+                  queue (profundidad de su cola de entrada) y dropped
+                - quality: Estado del controlador adaptativo (si existe)
+        """
+        output_times = list(self._output_times)
+        output_fps = 0.0
+        if len(output_times) > 1 and output_times[-1] > output_times[0]:
+            output_fps = (len(output_times) - 1) / (output_times[-1] - output_times[0])
+        
+        stages = {}
+        for name in self.STAGES:
+            stage = self._stats[name].snapshot()
+            
+            input_queue = self._queues.get(name)
+            stage['queue'] = input_queue.qsize() if input_queue else 0
+            stage['dropped'] = input_queue.dropped if input_queue else 0
+            
+            stages[name] = stage
+        
+        return {
+            'mode': 'pipelined' if self.threaded else 'sequential',
+            'render_mode': self.render_mode,
+            'output_fps': round(output_fps, 1),
+            'frames_out': self.frames_out,
+            'output_dropped': self._queues['output'].dropped,
+            'stages': stages,
+            'quality': self.quality_controller.get_stats() if self.quality_controller else None
+        }
@@ -0,0 +1,341 @@
+"""
+🎬 SESSION RECORDER - GRABACIÓN ASÍNCRONA DE LA SESIÓN
+=======================================================
+Guarda el video anotado de cada análisis como evidencia clínica y llena
+ROMSession.video_path
+
+PROBLEMA:
+Codificar video (cv2.VideoWriter) dentro del loop del stream costaría varios
+ms por frame y bajaría los FPS del análisis en vivo.
+
+SOLUCIÓN:
+- La etapa RENDER del pipeline ofrece cada frame procesado con offer(), que
+  nunca bloquea: solo encola una referencia (sin copia) en una cola acotada
+- Un hilo propio codifica los frames a disco
+- Si el encoder se atrasa y la cola se llena, se descarta el frame más
+  viejo (frames_dropped) en vez de frenar el stream
+- Archivos segmentados (segment_000.mp4, segment_001.mp4, ...): cada
+  segmento cerrado es un video válido, así que un crash pierde como mucho
+  el segmento en curso
+- manifest.json en el directorio de la grabación con los segmentos y las
+  métricas (se reescribe al cerrar cada segmento)
+
+Uso:
+    session_recorders.start(camera_index, directory, owner=lease_id)
+    ...                                       # el pipeline llama a offer()
+    summary = session_recorders.stop(camera_index)
+    summary['video_path']                     # → ROMSession.video_path
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import cv2
+import json
+import time
+import threading
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from .pipeline import DropOldestQueue
+
+logger = logging.getLogger(__name__)
+
+# Marcador de fin de grabación (viaja por la cola de frames)
+_END = object()
+
+
+class SessionRecorder:
+    """
+    Grabador de una sesión: cola acotada + hilo encoder + segmentos
+    
+    Los frames llegan a ritmo variable (el del stream); offer() los limita a
+    fps para que el video se reproduzca a velocidad real.
+    """
+    
+    MANIFEST_NAME = 'manifest.json'
+    
+    def __init__(
+        self,
+        directory: str,
+        fps: float = 15.0,
+        segment_seconds: float = 60.0,
+        queue_size: int = 64,
+        fourcc: str = 'mp4v',
+        extension: str = '.mp4',
+        owner: Optional[str] = None
+    ):
+        """
+        Args:
+            directory: Directorio de la grabación (se crea con el primer frame)
+            fps: FPS del video grabado (los frames de más se saltan)
+            segment_seconds: Duración de cada segmento
+            queue_size: Frames en espera del encoder (política drop-oldest)
+            fourcc: Códec de cv2.VideoWriter
+            extension: Extensión de los segmentos
+            owner: Lease del análisis que graba (solo informativo)
+        """
+        self.directory = Path(directory)
+        self.fps = float(fps) if fps and fps > 0 else 15.0
+        self.segment_frames = max(1, int(round(segment_seconds * self.fps)))
+        self.fourcc = fourcc
+        self.extension = extension
+        self.owner = owner
+        
+        self._queue = DropOldestQueue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._next_frame_at = 0.0
+        
+        # Estado del encoder (solo lo toca el hilo encoder)
+        self._writer = None
+        self._segment_size = None
+        self._segment_written = 0
+        self.segments: List[str] = []
+        
+        # Métricas
+        self.frames_offered = 0
+        self.frames_skipped = 0
+        self.frames_written = 0
+        self.encode_ms = 0.0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+    
+    @property
+    def frames_dropped(self) -> int:
+        """Frames descartados porque el encoder iba atrasado"""
+        return self._queue.dropped
+    
+    # ------------------------------------------------------------------
+    # CICLO DE VIDA
+    # ------------------------------------------------------------------
+    
+    def start(self) -> 'SessionRecorder':
+        """Arranca el hilo encoder"""
+        if self._running:
+            return self
+        
+        self._running = True
+        self.started_at = time.time()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"SessionRecorder-{self.directory.name}",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def offer(self, image: np.ndarray) -> bool:
+        """
+        Ofrece un frame procesado (llamado desde la etapa RENDER)
+        
+        Nunca bloquea: fuera del ritmo de grabación el frame se salta, y con
+        la cola llena se descarta el más viejo.
+        
+        Returns:
+            bool: True si el frame se encoló
+        """
+        if not self._running or image is None:
+            return False
+        
+        self.frames_offered += 1
+        now = time.perf_counter()
+        if now < self._next_frame_at:
+            self.frames_skipped += 1
+            return False
+        
+        # Si el stream se atrasó, no acumular frames "debidos"
+        self._next_frame_at = max(self._next_frame_at + 1.0 / self.fps, now)
+        self._queue.put(image)
+        return True
+    
+    def stop(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Termina la grabación: codifica lo encolado y cierra el último segmento
+        
+        Returns:
+            dict: Resumen (video_path, segmentos, frames escritos/descartados)
+        """
+        if self._running:
+            self._running = False
+            self._queue.put(_END)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"El encoder de {self.directory} no terminó en {timeout}s")
+            self.stopped_at = time.time()
+        
+        return self.get_stats()
+    
+    @property
+    def is_active(self) -> bool:
+        return self._running
+    
+    # ------------------------------------------------------------------
+    # HILO ENCODER
+    # ------------------------------------------------------------------
+    
+    def _run(self):
+        try:
+            while True:
+                frame = self._queue.get(timeout=0.5)
+                if frame is _END:
+                    break
+                if frame is None or self.error:
+                    continue
+                
+                started = time.perf_counter()
+                self._write(frame)
+                self.encode_ms += (time.perf_counter() - started) * 1000
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Error grabando {self.directory}: {e}")
+        finally:
+            self._close_segment()
+    
+    def _write(self, frame: np.ndarray):
+        if self._writer is None or self._segment_written >= self.segment_frames:
+            self._open_segment(frame)
+            if self._writer is None:
+                return
+        
+        # Todos los frames de un segmento deben tener el tamaño del primero
+        # (la escala de salida del stream puede cambiar a mitad de sesión)
+        if (frame.shape[1], frame.shape[0]) != self._segment_size:
+            frame = cv2.resize(frame, self._segment_size, interpolation=cv2.INTER_AREA)
+        
+        self._writer.write(frame)
+        self._segment_written += 1
+        self.frames_written += 1
+    
+    def _open_segment(self, frame: np.ndarray):
+        self._close_segment()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        path = self.directory / f"segment_{len(self.segments):03d}{self.extension}"
+        size = (frame.shape[1], frame.shape[0])
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*self.fourcc), self.fps, size)
+        
+        if not writer.isOpened():
+            self.error = f"No se pudo abrir {path} con el códec '{self.fourcc}'"
+            logger.error(self.error)
+            return
+        
+        self._writer = writer
+        self._segment_size = size
+        self._segment_written = 0
+        self.segments.append(path.name)
+    
+    def _close_segment(self):
+        if self._writer is None:
+            return
+        
+        self._writer.release()
+        self._writer = None
+        self._write_manifest()
+    
+    def _write_manifest(self):
+        try:
+            manifest = self.directory / self.MANIFEST_NAME
+            manifest.write_text(json.dumps(self.get_stats(), indent=2), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"No se pudo escribir el manifest de {self.directory}: {e}")
+    
+    # ------------------------------------------------------------------
+    # MÉTRICAS
+    # ------------------------------------------------------------------
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Resumen de la grabación (lo que se guarda en manifest.json)"""
+        ended = self.stopped_at or time.time()
+        return {
+            'video_path': str(self.directory) if self.segments else None,
+            'segments': list(self.segments),
+            'fps': self.fps,
+            'segment_frames': self.segment_frames,
+            'frames_offered': self.frames_offered,
+            'frames_skipped': self.frames_skipped,
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+            'queued': self._queue.qsize(),
+            'avg_encode_ms': round(self.encode_ms / self.frames_written, 2) if self.frames_written else 0.0,
+            'duration': round(ended - self.started_at, 1) if self.started_at else 0.0,
+            'active': self._running,
+            'owner': self.owner,
+            'error': self.error
+        }
+
+
+class SessionRecorderRegistry:
+    """Grabaciones activas por índice de cámara (una por cámara)"""
+    
+    def __init__(self):
+        self._recorders: Dict[int, SessionRecorder] = {}
+        self._lock = threading.Lock()
+    
+    def start(self, camera_index: int, directory: str, **options) -> SessionRecorder:
+        """
+        Inicia la grabación de una cámara (termina la anterior si había una)
+        
+        Args:
+            camera_index: Cámara cuyo stream se graba
+            directory: Directorio de la grabación
+            **options: Argumentos de SessionRecorder (fps, segment_seconds, ...)
+        """
+        recorder = SessionRecorder(directory, **options)
+        
+        with self._lock:
+            previous = self._recorders.get(camera_index)
+            self._recorders[camera_index] = recorder
+        
+        if previous is not None:
+            summary = previous.stop()
+            logger.warning(
+                f"Grabación previa de la cámara {camera_index} cerrada al iniciar otra: "
+                f"{summary['video_path']}"
+            )
+        
+        logger.info(f"Grabación de la cámara {camera_index} iniciada en {directory}")
+        return recorder.start()
+    
+    def offer(self, camera_index: int, image: np.ndarray) -> bool:
+        """Frame sink del pipeline: no-op si la cámara no está grabando"""
+        recorder = self._recorders.get(camera_index)
+        if recorder is None:
+            return False
+        return recorder.offer(image)
+    
+    def stop(self, camera_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Termina la grabación de una cámara
+        
+        Returns:
+            dict: Resumen de SessionRecorder.stop(), o None si no grababa
+        """
+        with self._lock:
+            recorder = self._recorders.pop(camera_index, None)
+        
+        if recorder is None:
+            return None
+        
+        summary = recorder.stop()
+        logger.info(
+            f"Grabación de la cámara {camera_index} terminada: {summary['video_path']} "
+            f"({summary['frames_written']} frames, {summary['frames_dropped']} descartados)"
+        )
+        return summary
+    
+    def get(self, camera_index: int) -> Optional[SessionRecorder]:
+        return self._recorders.get(camera_index)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            recorders = dict(self._recorders)
+        return {str(index): recorder.get_stats() for index, recorder in recorders.items()}
+
+
+# Instancia global (la usan api.py y los pipelines de video_feed)
+session_recorders = SessionRecorderRegistry()
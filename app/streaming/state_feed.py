@@ -0,0 +1,167 @@
+"""
+🔔 STATE FEED - ESTADO DEL ANÁLISIS POR SERVER-SENT EVENTS
+===========================================================
+Push del estado del analyzer (get_current_data) solo cuando cambia
+
+PROBLEMA:
+live_analysis.js hacía polling de /api/analysis/current_data cada 200ms:
+cada consulta es un request Flask completo (cookie de sesión, JSON, logs)
+aunque nada haya cambiado. Con varias estaciones el polling se vuelve la
+mayor parte del tráfico del servidor.
+
+SOLUCIÓN:
+- Una conexión SSE por cliente (text/event-stream) en lugar de N requests
+- El pipeline avisa con notify() tras cada frame renderizado; los clientes
+  duermen en una Condition hasta que hay algo nuevo
+- Tasa máxima configurable: los cambios que llegan dentro del intervalo
+  mínimo se COALESCEN (se lee el estado una sola vez al final)
+- Solo se envía si el estado cambió, ignorando campos que varían en cada
+  frame (fps, frame_count); esos viajan con el siguiente cambio real o en
+  el refresco periódico
+- Comentarios keep-alive para detectar clientes desconectados
+
+El polling de current_data sigue disponible como fallback.
+
+Uso:
+    state_feed.notify()  # Desde el pipeline, tras cada frame
+    
+    for chunk in state_feed.stream(lambda: analyzer.get_current_data(), max_rate=10):
+        yield chunk  # b'event: state\\ndata: {...}\\n\\n'
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import time
+import threading
+from typing import Optional, Callable, Iterator, Sequence, Dict, Any
+
+from .landmark_feed import encode_payload
+
+# Campos que cambian en cada frame: no cuentan como "cambio" del estado
+VOLATILE_FIELDS = ('fps', 'inference_fps', 'frame_count')
+
+
+def format_event(data: Dict[str, Any], event: str = 'state', event_id: Optional[int] = None) -> bytes:
+    """Mensaje SSE con el dict serializado en una sola línea data:"""
+    header = f"event: {event}\n".encode('utf-8')
+    if event_id is not None:
+        header += f"id: {event_id}\n".encode('utf-8')
+    
+    return header + b'data: ' + encode_payload(data) + b'\n'
+
+
+class StateFeed:
+    """Notificaciones de estado nuevo + generador SSE por cliente"""
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._version = 0
+        self._clients = 0
+        
+        self.notifications = 0
+        self.events_sent = 0
+        self.coalesced = 0
+    
+    def notify(self):
+        """Avisa que el estado del analyzer puede haber cambiado"""
+        with self._condition:
+            self._version += 1
+            self.notifications += 1
+            self._condition.notify_all()
+    
+    def _wait_for_change(self, last_version: int, timeout: float) -> int:
+        """Espera una versión distinta a last_version (o el timeout)"""
+        deadline = time.time() + timeout
+        
+        with self._condition:
+            while self._version == last_version:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            
+            return self._version
+    
+    def stream(
+        self,
+        get_state: Callable[[], Optional[Dict[str, Any]]],
+        max_rate: float = 10.0,
+        refresh: float = 2.0,
+        keepalive: float = 15.0,
+        volatile_fields: Sequence[str] = VOLATILE_FIELDS
+    ) -> Iterator[bytes]:
+        """
+        Generador SSE para un cliente
+        
+        Args:
+            get_state: Función que devuelve el estado actual (None = sin analyzer)
+            max_rate: Eventos por segundo como máximo
+            refresh: Segundos tras los cuales se reenvía el estado si hubo
+                frames nuevos aunque solo cambien campos volátiles (fps)
+            keepalive: Segundos sin eventos antes de enviar un comentario
+            volatile_fields: Campos ignorados al detectar cambios
+        """
+        min_interval = 1.0 / max_rate if max_rate else 0.0
+        last_version = -1
+        emitted_version = -1
+        last_key = None
+        last_emit = 0.0
+        last_check = 0.0
+        last_write = time.time()
+        
+        with self._condition:
+            self._clients += 1
+        
+        try:
+            # Reintento sugerido al navegador si se corta la conexión
+            yield b'retry: 2000\n\n'
+            
+            while True:
+                version = self._wait_for_change(last_version, min(refresh, keepalive))
+                
+                # Limitar la tasa: lo que llegue mientras tanto se coalesce
+                wait = min_interval - (time.time() - last_check)
+                if wait > 0:
+                    time.sleep(wait)
+                    with self._condition:
+                        self.coalesced += self._version - version
+                        version = self._version
+                
+                last_version = version
+                now = last_check = time.time()
+                state = get_state()
+                
+                if state is not None:
+                    key = {k: v for k, v in state.items() if k not in volatile_fields}
+                    
+                    changed = key != last_key
+                    stale = version != emitted_version and now - last_emit >= refresh
+                    
+                    if changed or stale:
+                        last_key = key
+                        emitted_version = version
+                        last_emit = last_write = now
+                        self.events_sent += 1
+                        yield format_event(state, event_id=version)
+                        continue
+                
+                if now - last_write >= keepalive:
+                    last_write = now
+                    yield b': keepalive\n\n'
+        finally:
+            with self._condition:
+                self._clients -= 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'clients': self._clients,
+            'notifications': self.notifications,
+            'events_sent': self.events_sent,
+            'coalesced': self.coalesced
+        }
+
+
+# Instancia global: notify() despierta a todos los clientes y cada uno
+# compara solo el estado de su propio analyzer
+state_feed = StateFeed()
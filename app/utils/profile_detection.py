@@ -5,8 +5,50 @@ Funciones reutilizables para detectar si el usuario está en perfil verdadero
 (un lado visible, otro oculto) usando la coordenada Z de MediaPipe.
 
 Reutilizable por: shoulder_analyzer, elbow_analyzer, hip_analyzer, knee_analyzer
+
+Con un LandmarkFrame usar detect_profile_from_frame (lee los 4 puntos del
+array de una vez en lugar de atributo por atributo).
 """
 
+from app.core.landmark_frame import LandmarkFrame, Z, VISIBILITY
+
+
+def detect_profile_from_frame(
+    landmark_frame,
+    distal_r,
+    distal_l,
+    proximal_r,
+    proximal_l,
+    z_threshold=0.25,
+    vis_threshold=0.4
+):
+    """
+    🎯 Igual que detect_profile_by_z_depth pero con índices sobre un LandmarkFrame
+    
+    Args:
+        landmark_frame: LandmarkFrame del frame (o lista de landmarks de MediaPipe)
+        distal_r, distal_l: Índices distales (ej: mp_pose.PoseLandmark.RIGHT_WRIST)
+        proximal_r, proximal_l: Índices proximales (ej: hombros o codos)
+        z_threshold: Diferencia Z para considerar fuera de plano
+        vis_threshold: Threshold de visibility mínima
+    
+    Returns:
+        str: 'RIGHT', 'LEFT', 'BILATERAL' o 'NONE'
+    """
+    point_distal_r, point_distal_l, point_proximal_r, point_proximal_l = (
+        LandmarkFrame.coerce(landmark_frame).rows((distal_r, distal_l, proximal_r, proximal_l))
+    )
+    
+    return _classify_profile(
+        abs(point_distal_r[Z] - point_proximal_r[Z]),
+        abs(point_distal_l[Z] - point_proximal_l[Z]),
+        point_distal_r[VISIBILITY],
+        point_distal_l[VISIBILITY],
+        z_threshold,
+        vis_threshold
+    )
+
+
 def detect_profile_by_z_depth(
     point_distal_r, 
     point_distal_l, 
@@ -47,6 +89,12 @@ def detect_profile_by_z_depth(
     vis_r = point_distal_r.visibility
     vis_l = point_distal_l.visibility
     
+    return _classify_profile(z_diff_r, z_diff_l, vis_r, vis_l, z_threshold, vis_threshold)
+
+
+def _classify_profile(z_diff_r, z_diff_l, vis_r, vis_l, z_threshold, vis_threshold):
+    """Decisión de detect_profile_by_z_depth a partir de diferencias Z y visibilidades"""
+    
     # 🔇 DEBUG comentado para performance (se ejecuta cada frame)
     # if debug:
     #     print(f"🔍 DEBUG detect_profile_by_z_depth:")
@@ -656,6 +656,29 @@ class DatabaseManager:
         with self.get_session() as session:
             return session.query(ROMSession).filter_by(id=session_id).first()
     
+    def can_edit_rom_session(self, session_id: int, user_id: int) -> Optional[bool]:
+        """
+        Indica si un usuario puede modificar una sesión ROM
+        
+        Pueden hacerlo quien registró la sesión, quien creó al sujeto
+        (Subject.created_by) y los administradores.
+        
+        Returns:
+            bool, o None si la sesión no existe
+        """
+        with self.get_session() as session:
+            rom_session = session.query(ROMSession).filter_by(id=session_id).first()
+            if rom_session is None:
+                return None
+            
+            if rom_session.user_id == user_id:
+                return True
+            if rom_session.subject is not None and rom_session.subject.created_by == user_id:
+                return True
+            
+            user = session.query(User).filter_by(id=user_id).first()
+            return user is not None and user.role == 'admin'
+    
     def get_sessions_by_user(self, user_id: int) -> List[ROMSession]:
         """Obtiene todas las sesiones de un usuario"""
         with self.get_session() as session:
@@ -1,14 +1,26 @@
 """
 📹 CAMERA MANAGER - GESTOR SINGLETON DE CÁMARA WEB
 ===================================================
-Gestiona el acceso exclusivo y thread-safe a la cámara web
+Gestiona el acceso exclusivo y thread-safe a las cámaras web
 
 CARACTERÍSTICAS:
 - Singleton pattern (solo una instancia en toda la app)
+- Pool de dispositivos por índice: varias cámaras USB (una por estación)
+  transmiten en paralelo desde el mismo proceso
+- Lock, dueño del lease, resolución y FPS propios de cada dispositivo
+- Handles calientes: al liberar, la cámara queda abierta y configurada
+  (exposición estabilizada) durante keep_warm segundos; re-adquirirla con
+  la misma configuración es instantáneo
 - Thread-safe con locks para acceso concurrente
 - Context manager para uso seguro (auto-release)
-- Previene que múltiples sesiones usen la cámara simultáneamente
+- Previene que múltiples sesiones usen la MISMA cámara simultáneamente
 - Liberación automática de recursos incluso con errores
+- Hilo lector opcional por dispositivo (slot "último frame" con secuencia)
+- Captura MJPG opcional: el driver entrega JPEG comprimido (más FPS por
+  USB 2.0) y se decodifica a escala reducida salvo que haga falta el frame
+  completo
+- Fuente de frames intercambiable (hardware/frame_sources.py): cámara USB,
+  video en loop o generador sintético para pruebas sin cámara
 
 UBICACIÓN:
 Este módulo está en hardware/ porque la cámara es infraestructura física,
@@ -19,18 +31,701 @@ Fecha: 2025-11-14
 """
 
 import cv2
+import time
 import threading
+import numpy as np
+from collections import deque
 from contextlib import contextmanager
-from typing import Optional, Generator
+from typing import Optional, Generator, Tuple, Union, Dict
 import logging
 
+from hardware.frame_sources import CameraSource, open_frame_source
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
 
+class LatestFrameReader:
+    """
+    Hilo lector dedicado que publica SOLO el frame más reciente
+    
+    El hilo llama a cap.read() continuamente y deja el último frame en un
+    slot protegido por lock junto con un número de secuencia. Los frames
+    que nadie consumió antes de ser reemplazados se cuentan como descartados,
+    así el consumidor siempre procesa la imagen más fresca y el buffer del
+    driver nunca acumula retraso.
+    
+    Expone la misma interfaz que cv2.VideoCapture (read, get, set, isOpened),
+    por lo que puede usarse como reemplazo directo en el loop de streaming.
+    
+    Sobre una MJPGCapture, el hilo solo publica el buffer comprimido y read()
+    lo decodifica: los frames descartados nunca se decodifican.
+    
+    Uso:
+        reader = LatestFrameReader(cap, name='camera-0')
+        reader.start()
+        
+        ret, frame = reader.read()      # Bloquea hasta que haya un frame NUEVO
+        # ... procesar y enviar frame
+        reader.record_display()         # Registra latencia captura → display
+        
+        reader.stop()
+    """
+    
+    # Lecturas fallidas consecutivas antes de considerar la cámara perdida
+    MAX_CONSECUTIVE_FAILURES = 30
+    
+    def __init__(self, capture: cv2.VideoCapture, name: str = 'camera'):
+        """
+        Args:
+            capture: Captura ya abierta y configurada
+            name: Nombre del hilo (para logs)
+        """
+        self._capture = capture
+        self._name = name
+        
+        # MJPGCapture: leer comprimido en el hilo y decodificar en read()
+        self._read_raw = getattr(capture, 'read_compressed', capture.read)
+        self._decode = getattr(capture, 'decode', None)
+        
+        # Slot del último frame (protegido por la condición)
+        self._condition = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_seq = 0
+        self._frame_timestamp = 0.0
+        self._consumed_seq = 0  # Última secuencia entregada a algún consumidor
+        
+        # Estado del lector para la interfaz read()
+        self._last_read_seq = 0
+        self._last_read_timestamp = 0.0
+        
+        # Control del hilo
+        self._running = False
+        self._ended = False
+        self._thread: Optional[threading.Thread] = None
+        
+        # Métricas
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self._latencies_ms = deque(maxlen=60)
+        self._capture_times = deque(maxlen=60)
+    
+    def start(self) -> 'LatestFrameReader':
+        """Arranca el hilo lector (idempotente)"""
+        if self._running:
+            return self
+        
+        self._running = True
+        self._ended = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"FrameReader-{self._name}",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Hilo lector iniciado para '{self._name}'")
+        return self
+    
+    def stop(self, timeout: float = 2.0):
+        """Detiene el hilo lector y despierta a los consumidores en espera"""
+        self._running = False
+        
+        with self._condition:
+            self._condition.notify_all()
+        
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        
+        logger.info(
+            f"Hilo lector detenido para '{self._name}' | "
+            f"capturados={self.frames_captured} descartados={self.frames_dropped}"
+        )
+    
+    def _run(self):
+        """Loop del hilo: leer frames y publicar solo el más reciente"""
+        consecutive_failures = 0
+        
+        while self._running:
+            ret, frame = self._read_raw()
+            timestamp = time.time()
+            
+            if not ret or frame is None:
+                self.read_failures += 1
+                consecutive_failures += 1
+                
+                if consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+                    logger.warning(
+                        f"'{self._name}': {consecutive_failures} lecturas fallidas seguidas - "
+                        f"finalizando hilo lector"
+                    )
+                    break
+                
+                time.sleep(0.01)
+                continue
+            
+            consecutive_failures = 0
+            
+            with self._condition:
+                # Si el frame anterior nunca fue consumido, se descarta
+                if self._frame_seq > self._consumed_seq:
+                    self.frames_dropped += 1
+                
+                self._frame = frame
+                self._frame_seq += 1
+                self._frame_timestamp = timestamp
+                self.frames_captured += 1
+                self._capture_times.append(timestamp)
+                
+                self._condition.notify_all()
+        
+        with self._condition:
+            self._ended = True
+            self._condition.notify_all()
+    
+    def read_latest(
+        self,
+        last_seq: int = 0,
+        timeout: float = 1.0
+    ) -> Tuple[int, Optional[np.ndarray], float]:
+        """
+        Obtiene el frame más reciente con secuencia mayor a last_seq
+        
+        Args:
+            last_seq: Última secuencia que el consumidor ya procesó
+            timeout: Segundos máximos de espera por un frame nuevo
+        
+        Returns:
+            tuple: (secuencia, frame, timestamp_captura)
+                - frame es None si se agotó el timeout o el lector terminó
+                - Sobre una MJPGCapture, frame es el buffer SIN decodificar
+        """
+        deadline = time.time() + timeout
+        
+        with self._condition:
+            if not self._running:
+                return last_seq, None, 0.0
+            
+            while self._frame_seq <= last_seq:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._ended or not self._running:
+                    return last_seq, None, 0.0
+                self._condition.wait(remaining)
+            
+            if self._frame_seq > self._consumed_seq:
+                self._consumed_seq = self._frame_seq
+            
+            return self._frame_seq, self._frame, self._frame_timestamp
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Reemplazo directo de cv2.VideoCapture.read()
+        
+        Bloquea hasta que haya un frame más nuevo que el último entregado.
+        
+        Returns:
+            tuple: (ret, frame)
+        """
+        seq, frame, timestamp = self.read_latest(self._last_read_seq)
+        
+        if frame is not None and self._decode is not None:
+            frame = self._decode(frame)
+        
+        if frame is None:
+            return False, None
+        
+        self._last_read_seq = seq
+        self._last_read_timestamp = timestamp
+        return True, frame
+    
+    def record_display(self, capture_timestamp: Optional[float] = None):
+        """
+        Registra que un frame fue entregado al cliente (para medir latencia)
+        
+        Args:
+            capture_timestamp: Timestamp de captura del frame mostrado.
+                Por defecto, el del último frame devuelto por read().
+        """
+        if capture_timestamp is None:
+            capture_timestamp = self._last_read_timestamp
+        
+        if capture_timestamp:
+            self._latencies_ms.append((time.time() - capture_timestamp) * 1000)
+    
+    @property
+    def last_timestamp(self) -> float:
+        """Timestamp de captura del último frame devuelto por read()"""
+        return self._last_read_timestamp
+    
+    def get_stats(self) -> dict:
+        """
+        Métricas del hilo lector
+        
+        Returns:
+            dict: frames capturados/descartados, FPS de captura y latencia
+        """
+        with self._condition:
+            capture_times = list(self._capture_times)
+            latencies = list(self._latencies_ms)
+            
+            capture_fps = 0.0
+            if len(capture_times) > 1 and capture_times[-1] > capture_times[0]:
+                capture_fps = (len(capture_times) - 1) / (capture_times[-1] - capture_times[0])
+            
+            return {
+                'running': self._running and not self._ended,
+                'frames_captured': self.frames_captured,
+                'frames_dropped': self.frames_dropped,
+                'read_failures': self.read_failures,
+                'capture_fps': round(capture_fps, 1),
+                'latency_ms': round(sum(latencies) / len(latencies), 1) if latencies else None,
+                'latency_max_ms': round(max(latencies), 1) if latencies else None
+            }
+    
+    # Delegar el resto de la interfaz de cv2.VideoCapture
+    def get(self, prop_id: int) -> float:
+        return self._capture.get(prop_id)
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        return self._capture.set(prop_id, value)
+    
+    def isOpened(self) -> bool:
+        return self._capture.isOpened() and not self._ended
+    
+    def set_decode_scale(self, scale: int):
+        """Escala de decodificación de la MJPGCapture subyacente"""
+        set_scale = getattr(self._capture, 'set_decode_scale', None)
+        if set_scale is not None:
+            set_scale(scale)
+    
+    def getBackendName(self) -> str:
+        return self._capture.getBackendName()
+
+
+class MJPGCapture:
+    """
+    Captura MJPG con decodificación a escala reducida
+    
+    Sin FOURCC, muchas webcams entregan 1280x720 en YUYV crudo, que por USB 2.0
+    no pasa de ~10 FPS, y OpenCV decodifica cada frame a tamaño completo aunque
+    MediaPipe solo use 640x480.
+    
+    Este wrapper pide MJPG al driver y desactiva la conversión a BGR
+    (CAP_PROP_CONVERT_RGB=0): read_compressed() devuelve el buffer JPEG tal
+    cual, y decode() lo decodifica con cv2.IMREAD_REDUCED_COLOR_N
+    (el decodificador JPEG reduce en la IDCT: mucho más barato que decodificar
+    completo y luego hacer resize).
+    
+    Si el backend no entrega el buffer comprimido (ya viene como imagen BGR),
+    el frame pasa tal cual.
+    
+    Expone la interfaz de cv2.VideoCapture (read, grab, get, set, isOpened),
+    así que CameraDevice, LatestFrameReader y el pipeline lo usan sin cambios.
+    
+    Uso:
+        cap = MJPGCapture(cv2.VideoCapture(0), decode_scale=2)
+        ret, frame = cap.read()         # 1280x720 → decodificado a 640x360
+        cap.set_decode_scale(1)         # Frame completo (stream anotado HD)
+    """
+    
+    # Escala → flag de cv2.imdecode (el decodificador JPEG solo reduce en 1/2, 1/4, 1/8)
+    DECODE_FLAGS = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8
+    }
+    
+    FOURCC = cv2.VideoWriter_fourcc(*'MJPG')
+    
+    def __init__(self, capture: cv2.VideoCapture, decode_scale: int = 1):
+        """
+        Args:
+            capture: Captura ya abierta (el FOURCC se pide antes de fijar la
+                resolución: varios drivers V4L2 lo requieren en ese orden)
+            decode_scale: Divisor de resolución al decodificar (1, 2, 4 u 8)
+        """
+        self._capture = capture
+        self.decode_scale = 1
+        self.set_decode_scale(decode_scale)
+        
+        capture.set(cv2.CAP_PROP_FOURCC, self.FOURCC)
+        capture.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        
+        # Métricas
+        self.frames_decoded = 0
+        self.passthrough_frames = 0
+        self._decode_times_ms = deque(maxlen=60)
+    
+    @property
+    def is_mjpg(self) -> bool:
+        """True si el driver aceptó el FOURCC MJPG"""
+        return int(self._capture.get(cv2.CAP_PROP_FOURCC)) == self.FOURCC
+    
+    def set_decode_scale(self, scale: int):
+        """Cambia la escala de decodificación (aplica desde el próximo frame)"""
+        if scale not in self.DECODE_FLAGS:
+            raise ValueError(f"decode_scale inválido: {scale} (usar 1, 2, 4 u 8)")
+        self.decode_scale = scale
+    
+    def read_compressed(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Lee el siguiente frame SIN decodificar (buffer JPEG 1D)"""
+        return self._capture.read()
+    
+    def decode(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Decodifica un buffer de read_compressed() a la escala actual"""
+        if buffer is None:
+            return None
+        
+        # El backend ya entregó la imagen decodificada
+        if buffer.ndim == 3:
+            self.passthrough_frames += 1
+            return buffer
+        
+        started = time.perf_counter()
+        frame = cv2.imdecode(buffer.reshape(-1), self.DECODE_FLAGS[self.decode_scale])
+        self._decode_times_ms.append((time.perf_counter() - started) * 1000)
+        self.frames_decoded += 1
+        return frame
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Reemplazo directo de cv2.VideoCapture.read() (frame ya decodificado)"""
+        ret, buffer = self.read_compressed()
+        if not ret:
+            return False, None
+        
+        frame = self.decode(buffer)
+        return frame is not None, frame
+    
+    def get_stats(self) -> dict:
+        decode_times = list(self._decode_times_ms)
+        return {
+            'mjpg': self.is_mjpg,
+            'decode_scale': self.decode_scale,
+            'frames_decoded': self.frames_decoded,
+            'passthrough_frames': self.passthrough_frames,
+            'decode_ms': round(sum(decode_times) / len(decode_times), 2) if decode_times else None
+        }
+    
+    # Delegar el resto de la interfaz de cv2.VideoCapture
+    def grab(self) -> bool:
+        return self._capture.grab()
+    
+    def get(self, prop_id: int) -> float:
+        return self._capture.get(prop_id)
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        return self._capture.set(prop_id, value)
+    
+    def isOpened(self) -> bool:
+        return self._capture.isOpened()
+    
+    def release(self):
+        self._capture.release()
+    
+    def getBackendName(self) -> str:
+        return self._capture.getBackendName()
+
+
+class CameraDevice:
+    """
+    Estado de UN dispositivo de cámara (índice de OpenCV)
+    
+    Cada dispositivo tiene su propio lock, dueño del lease, resolución y FPS:
+    abrir o liberar una cámara no bloquea a las demás.
+    
+    Al liberarse puede quedar CALIENTE (abierto, configurado y con la
+    exposición ya estabilizada) durante keep_warm segundos: un nuevo lease
+    con la misma configuración es instantáneo. Pasado ese tiempo sin uso se
+    cierra solo.
+    """
+    
+    # Lecturas descartadas al reutilizar un handle caliente sin hilo lector
+    # (frames viejos que quedaron en el buffer del driver)
+    WARM_FLUSH_GRABS = 4
+    
+    # Variación de brillo medio (0-255) entre frames para dar la
+    # auto-exposición por estabilizada
+    SETTLE_TOLERANCE = 1.5
+    SETTLE_STABLE_FRAMES = 3
+    
+    def __init__(self, index: int):
+        self.index = index
+        self.lock = threading.Lock()
+        self.capture: Optional[Union[CameraSource, MJPGCapture]] = None
+        self.reader: Optional[LatestFrameReader] = None
+        self.in_use = False
+        self.owner: Optional[str] = None
+        self.leased_at: Optional[float] = None
+        self.leases = 0
+        
+        # Resolución/FPS pedidos y obtenidos en la última apertura
+        self.requested: Optional[Tuple[int, int, Optional[int], bool, str, bool]] = None
+        self.width = 0
+        self.height = 0
+        self.fps = 0
+        
+        # Handle caliente entre leases
+        self.idle_since: Optional[float] = None
+        self._idle_timer: Optional[threading.Timer] = None
+        self.cold_opens = 0
+        self.warm_hits = 0
+        self.last_open_ms = 0.0
+    
+    @property
+    def is_warm(self) -> bool:
+        return self.capture is not None and not self.in_use
+    
+    def prepare(
+        self,
+        width: int,
+        height: int,
+        fps: Optional[int],
+        threaded: bool,
+        settle_timeout: float = 0.0,
+        mjpg: bool = False,
+        source: str = 'camera',
+        source_realtime: bool = True
+    ):
+        """
+        Deja el dispositivo listo para un lease (llamar con self.lock tomado)
+        
+        Reutiliza el handle caliente si la configuración coincide y sigue
+        respondiendo; si no, lo cierra y abre de nuevo.
+        """
+        started = time.time()
+        self._cancel_idle_timer()
+        
+        requested = (width, height, fps, mjpg, source, source_realtime)
+        
+        if self.capture is not None and self.requested == requested and self._reuse_warm(threaded):
+            self.warm_hits += 1
+            logger.info(f"⚡ Cámara {self.index} reutilizada caliente ({(time.time() - started) * 1000:.0f} ms)")
+        else:
+            if self.capture is not None:
+                if self.requested == requested:
+                    logger.warning(f"Cámara {self.index}: el handle caliente dejó de responder, reabriendo")
+                else:
+                    logger.info(f"Cámara {self.index}: configuración distinta, reabriendo")
+                self.close()
+            
+            self.open(width, height, fps, threaded, settle_timeout, mjpg, source, source_realtime)
+        
+        self.idle_since = None
+        self.last_open_ms = (time.time() - started) * 1000
+    
+    def open(
+        self,
+        width: int,
+        height: int,
+        fps: Optional[int],
+        threaded: bool,
+        settle_timeout: float = 0.0,
+        mjpg: bool = False,
+        source: str = 'camera',
+        source_realtime: bool = True
+    ):
+        """
+        Abre y configura el dispositivo (llamar con self.lock tomado)
+        
+        Args:
+            source: Fuente de frames ('camera', 'synthetic' o 'video:<ruta>')
+            source_realtime: Video/sintético a los FPS nominales (False = lo
+                más rápido posible)
+        """
+        try:
+            self.capture = open_frame_source(source, self.index, realtime=source_realtime)
+        except ValueError as e:
+            raise RuntimeError(str(e))
+        
+        if not self.capture.isOpened():
+            self.capture = None
+            raise RuntimeError(f"No se pudo abrir la fuente '{source}' (cámara {self.index})")
+        
+        self.cold_opens += 1
+        
+        # MJPG: el FOURCC se pide ANTES de la resolución
+        if mjpg:
+            self.capture = MJPGCapture(self.capture)
+        
+        # Configurar resolución y FPS
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+        
+        # Verificar resolución real obtenida
+        self.requested = (width, height, fps, mjpg, source, source_realtime)
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = int(self.capture.get(cv2.CAP_PROP_FPS))
+        
+        if settle_timeout > 0:
+            self._settle(settle_timeout)
+        
+        # Hilo lector dedicado (opcional)
+        if threaded:
+            self.reader = LatestFrameReader(self.capture, name=f"camera-{self.index}").start()
+    
+    def _reuse_warm(self, threaded: bool) -> bool:
+        """
+        Prepara el handle caliente para el nuevo lease
+        
+        Returns:
+            bool: False si el handle dejó de responder mientras estaba
+                estacionado (ej: cámara desconectada) y hay que reabrir
+        """
+        # isOpened() del lector es False si su hilo terminó por lecturas fallidas
+        if not self.handle.isOpened():
+            return False
+        
+        # El lease anterior pudo dejar la decodificación reducida
+        if isinstance(self.capture, MJPGCapture):
+            self.capture.set_decode_scale(1)
+        
+        if threaded and self.reader is None:
+            if not self._flush():
+                return False
+            self.reader = LatestFrameReader(self.capture, name=f"camera-{self.index}").start()
+        elif not threaded and self.reader is not None:
+            # El lector drenó el buffer hasta ahora: no hace falta flush
+            self.reader.stop()
+            self.reader = None
+        elif not threaded:
+            return self._flush()
+        
+        return True
+    
+    def _settle(self, timeout: float):
+        """
+        Descarta frames hasta que la auto-exposición se estabiliza
+        
+        Lee frames hasta que el brillo medio varía menos de SETTLE_TOLERANCE
+        durante SETTLE_STABLE_FRAMES frames seguidos (o hasta el timeout).
+        """
+        deadline = time.time() + timeout
+        previous = None
+        stable = 0
+        frames = 0
+        
+        while time.time() < deadline and stable < self.SETTLE_STABLE_FRAMES:
+            ret, frame = self.capture.read()
+            if not ret or frame is None:
+                break
+            
+            frames += 1
+            brightness = float(frame[::8, ::8].mean())
+            stable = stable + 1 if previous is not None and abs(brightness - previous) < self.SETTLE_TOLERANCE else 0
+            previous = brightness
+        
+        logger.info(f"Cámara {self.index}: exposición estabilizada tras {frames} frames")
+    
+    def _flush(self) -> bool:
+        """
+        Descarta los frames viejos del buffer del driver
+        
+        Returns:
+            bool: False si algún grab() falló (el dispositivo no responde)
+        """
+        for _ in range(self.WARM_FLUSH_GRABS):
+            if not self.capture.grab():
+                return False
+        return True
+    
+    def park(self, keep_warm: float):
+        """
+        Fin del lease (llamar con self.lock tomado)
+        
+        Args:
+            keep_warm: Segundos que el handle queda abierto sin uso (0 = cerrar)
+        """
+        self.in_use = False
+        self.owner = None
+        self.leased_at = None
+        
+        # Un handle que dejó de responder no se mantiene caliente
+        if keep_warm <= 0 or self.capture is None or not self.handle.isOpened():
+            self.close()
+            return
+        
+        self.idle_since = time.time()
+        self._idle_timer = threading.Timer(keep_warm, self._expire, args=(self.idle_since,))
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+    
+    def _expire(self, idle_since: float):
+        """Cierra el handle caliente si sigue sin uso desde idle_since"""
+        with self.lock:
+            if self.in_use or self.idle_since != idle_since:
+                return
+            
+            self.close()
+            logger.info(f"Cámara {self.index} cerrada tras {time.time() - idle_since:.0f}s sin uso")
+    
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+    
+    def close(self):
+        """Detiene el lector y libera el dispositivo (llamar con self.lock tomado)"""
+        self._cancel_idle_timer()
+        
+        if self.reader is not None:
+            self.reader.stop()
+            self.reader = None
+        
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        
+        self.in_use = False
+        self.owner = None
+        self.leased_at = None
+        self.idle_since = None
+    
+    @property
+    def handle(self) -> Union[cv2.VideoCapture, MJPGCapture, LatestFrameReader]:
+        return self.reader if self.reader is not None else self.capture
+    
+    def get_status(self) -> dict:
+        """Estado del dispositivo (llamar con self.lock tomado)"""
+        if self.in_use:
+            state = 'in_use'
+        elif self.capture is not None:
+            state = 'warm'
+        else:
+            state = 'closed'
+        
+        return {
+            'camera_index': self.index,
+            'state': state,
+            'available': not self.in_use,
+            'in_use': self.in_use,
+            'current_user': self.owner,
+            'leased_for': round(time.time() - self.leased_at, 1) if self.leased_at else None,
+            'idle_for': round(time.time() - self.idle_since, 1) if self.idle_since else None,
+            'leases': self.leases,
+            'cold_opens': self.cold_opens,
+            'warm_hits': self.warm_hits,
+            'last_open_ms': round(self.last_open_ms, 1),
+            'camera_open': self.capture is not None and self.capture.isOpened(),
+            'source': self.requested[4] if self.requested else None,
+            'resolution': f"{self.width}x{self.height}" if self.capture is not None else None,
+            'fps': self.fps if self.capture is not None else None,
+            'capture': self.reader.get_stats() if self.reader is not None else None,
+            'mjpg': self.capture.get_stats() if isinstance(self.capture, MJPGCapture) else None
+        }
+
+
 class CameraManager:
     """
-    Singleton thread-safe para gestionar acceso exclusivo a la cámara
+    Singleton thread-safe que gestiona un pool de cámaras por índice
+    
+    Cada índice (una estación del laboratorio) se arrienda de forma exclusiva
+    a un usuario; varias estaciones transmiten en paralelo desde el mismo
+    proceso con cámaras distintas.
     
     Uso:
         camera_manager = CameraManager()
@@ -39,6 +734,15 @@ class CameraManager:
             ret, frame = cap.read()
             # ... procesar frame
         # Auto-release al salir del 'with'
+        
+        # Segunda estación con otra cámara USB, en paralelo
+        with camera_manager.acquire_camera(user_id='user456', camera_index=1) as cap:
+            ret, frame = cap.read()
+        
+        # Con hilo lector dedicado (siempre entrega el frame más reciente)
+        with camera_manager.acquire_camera(user_id='user123', threaded=True) as reader:
+            ret, frame = reader.read()
+            reader.record_display()
     """
     
     _instance: Optional['CameraManager'] = None
@@ -57,13 +761,18 @@ class CameraManager:
     
     def _initialize(self):
         """Inicializa las variables de instancia (solo se ejecuta una vez)"""
-        self._camera: Optional[cv2.VideoCapture] = None
-        self._camera_lock = threading.Lock()  # Lock para operaciones de cámara
-        self._in_use = False
-        self._current_user: Optional[str] = None
-        self._camera_index = 0  # Cámara por defecto
+        self._devices: Dict[int, CameraDevice] = {}
+        self._devices_lock = threading.Lock()  # Solo protege el diccionario
         
-        logger.info("CameraManager inicializado (Singleton)")
+        logger.info("CameraManager inicializado (Singleton, multi-dispositivo)")
+    
+    def _device(self, camera_index: int) -> CameraDevice:
+        """Dispositivo del índice (se registra la primera vez que se pide)"""
+        with self._devices_lock:
+            device = self._devices.get(camera_index)
+            if device is None:
+                device = self._devices[camera_index] = CameraDevice(camera_index)
+            return device
     
     @contextmanager
     def acquire_camera(
@@ -71,70 +780,91 @@ class CameraManager:
         user_id: str, 
         camera_index: int = 0,
         width: int = 1280,
-        height: int = 720
-    ) -> Generator[cv2.VideoCapture, None, None]:
+        height: int = 720,
+        threaded: bool = False,
+        fps: Optional[int] = None,
+        keep_warm: float = 0.0,
+        settle_timeout: float = 0.0,
+        mjpg: bool = False,
+        source: str = 'camera',
+        source_realtime: bool = True
+    ) -> Generator[Union[cv2.VideoCapture, MJPGCapture, LatestFrameReader], None, None]:
         """
-        Context manager para adquirir acceso exclusivo a la cámara
+        Context manager para adquirir acceso exclusivo a una cámara
         
         Args:
             user_id: Identificador del usuario/sesión
             camera_index: Índice de la cámara (0 = predeterminada)
             width: Ancho de resolución deseado
             height: Alto de resolución deseado
+            threaded: Si True, un hilo dedicado lee la cámara y se entrega un
+                LatestFrameReader (misma interfaz read()) que descarta frames
+                viejos en lugar de acumularlos en el buffer del driver
+            fps: FPS pedidos al driver (None = el predeterminado del dispositivo)
+            keep_warm: Segundos que la cámara queda abierta tras liberarla;
+                un nuevo lease con la misma configuración la reutiliza sin
+                reabrirla (0 = cerrar al liberar)
+            settle_timeout: Segundos máximos esperando que la auto-exposición
+                se estabilice al abrir en frío (0 = no esperar)
+            mjpg: Pedir MJPG al driver y decodificar con MJPGCapture (la
+                escala se ajusta con set_decode_scale() del objeto entregado)
+            source: Fuente de frames del dispositivo: 'camera' (USB),
+                'synthetic' o 'video:<ruta>' (ver hardware/frame_sources.py)
+            source_realtime: Entregar video/sintético a los FPS nominales
+                (False = lo más rápido posible, para benchmarks)
         
         Yields:
-            cv2.VideoCapture: Objeto de captura de video configurado
+            cv2.VideoCapture | MJPGCapture | LatestFrameReader: Objeto de
+                captura configurado
         
         Raises:
-            RuntimeError: Si la cámara ya está en uso o no se puede abrir
+            RuntimeError: Si esa cámara ya está en uso o no se puede abrir
         
         Example:
-            with camera_manager.acquire_camera('user123') as cap:
+            with camera_manager.acquire_camera('user123', camera_index=1) as cap:
                 ret, frame = cap.read()
                 if ret:
                     # Procesar frame...
         """
-        with self._camera_lock:
+        device = self._device(camera_index)
+        
+        with device.lock:
             # Verificar si ya está en uso
-            if self._in_use:
+            if device.in_use:
                 error_msg = (
-                    f"Cámara en uso por '{self._current_user}'. "
+                    f"Cámara {camera_index} en uso por '{device.owner}'. "
                     f"Cierra la sesión anterior primero."
                 )
                 logger.warning(f"Intento de acceso concurrente por '{user_id}': {error_msg}")
                 raise RuntimeError(error_msg)
             
-            # Intentar abrir la cámara
-            self._camera = cv2.VideoCapture(camera_index)
-            
-            if not self._camera.isOpened():
-                self._camera = None
-                error_msg = f"No se pudo abrir la cámara (índice {camera_index})"
-                logger.error(error_msg)
-                raise RuntimeError(error_msg)
-            
-            # Configurar resolución
-            self._camera.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-            self._camera.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-            
-            # Verificar resolución real obtenida
-            actual_width = int(self._camera.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_height = int(self._camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            actual_fps = int(self._camera.get(cv2.CAP_PROP_FPS))
+            # Reutilizar el handle caliente o abrir la cámara
+            try:
+                device.prepare(
+                    width, height, fps, threaded, settle_timeout, mjpg,
+                    source, source_realtime
+                )
+            except RuntimeError as e:
+                logger.error(str(e))
+                raise
             
             # Marcar como en uso
-            self._in_use = True
-            self._current_user = user_id
-            self._camera_index = camera_index
+            device.in_use = True
+            device.owner = user_id
+            device.leased_at = time.time()
+            device.leases += 1
             
             logger.info(
-                f"Cámara adquirida por '{user_id}' | "
-                f"Resolución: {actual_width}x{actual_height} @ {actual_fps}fps"
+                f"Cámara {camera_index} adquirida por '{user_id}' | "
+                f"Resolución: {device.width}x{device.height} @ {device.fps}fps | "
+                f"Listo en {device.last_open_ms:.0f} ms"
             )
+            
+            capture = device.handle
         
         try:
             # Yield del objeto de cámara (sale del lock para permitir uso)
-            yield self._camera
+            yield capture
             
         except GeneratorExit:
             # Usuario cerró el navegador/tab sin hacer cleanup
@@ -146,86 +876,112 @@ class CameraManager:
             
         finally:
             # SIEMPRE liberar recursos (incluso si hay error)
-            with self._camera_lock:
-                if self._camera is not None:
-                    self._camera.release()
-                    self._camera = None
-                    logger.info(f"Cámara liberada por '{user_id}'")
-                
-                self._in_use = False
-                self._current_user = None
+            with device.lock:
+                # Si hubo force_release, el dispositivo puede pertenecer ya a otro
+                if device.owner == user_id and device.handle is capture:
+                    device.park(keep_warm)
+                    logger.info(
+                        f"Cámara {camera_index} liberada por '{user_id}'"
+                        + (f" (caliente {keep_warm:.0f}s)" if device.is_warm else "")
+                    )
     
-    def is_available(self) -> bool:
+    def is_available(self, camera_index: int = 0) -> bool:
         """
-        Verifica si la cámara está disponible para uso
+        Verifica si una cámara está disponible para uso
+        
+        Args:
+            camera_index: Índice de la cámara
         
         Returns:
             bool: True si está disponible, False si está en uso
         """
-        with self._camera_lock:
-            return not self._in_use
+        device = self._device(camera_index)
+        with device.lock:
+            return not device.in_use
     
-    def get_current_user(self) -> Optional[str]:
+    def get_current_user(self, camera_index: int = 0) -> Optional[str]:
         """
-        Obtiene el ID del usuario que está usando la cámara actualmente
+        Obtiene el ID del usuario que está usando una cámara
+        
+        Args:
+            camera_index: Índice de la cámara
         
         Returns:
             str | None: ID del usuario actual o None si no está en uso
         """
-        with self._camera_lock:
-            return self._current_user
+        device = self._device(camera_index)
+        with device.lock:
+            return device.owner
     
-    def force_release(self) -> bool:
+    def force_release(self, camera_index: int = 0) -> bool:
         """
-        Libera la cámara forzadamente (solo usar en emergencias)
+        Libera una cámara forzadamente (solo usar en emergencias)
+        
+        También cierra el handle caliente de una cámara libre.
         
         ADVERTENCIA: Usar con precaución. Puede dejar al usuario anterior
         en estado inconsistente.
         
+        Args:
+            camera_index: Índice de la cámara
+        
         Returns:
-            bool: True si se liberó exitosamente, False si ya estaba libre
+            bool: True si se liberó exitosamente, False si ya estaba cerrada
         """
-        with self._camera_lock:
-            if not self._in_use:
-                logger.info("force_release(): Cámara ya estaba libre")
-                return False
-            
-            previous_user = self._current_user
+        device = self._device(camera_index)
+        
+        with device.lock:
+            if device.is_warm:
+                device.close()
+                logger.info(f"force_release(): handle caliente de la cámara {camera_index} cerrado")
+                return True
             
-            if self._camera is not None:
-                self._camera.release()
-                self._camera = None
+            if not device.in_use:
+                logger.info(f"force_release(): Cámara {camera_index} ya estaba libre")
+                return False
             
-            self._in_use = False
-            self._current_user = None
+            previous_user = device.owner
+            device.close()
             
             logger.warning(
-                f"FORCE RELEASE ejecutado - Cámara liberada forzadamente "
+                f"FORCE RELEASE ejecutado - Cámara {camera_index} liberada forzadamente "
                 f"(usuario anterior: '{previous_user}')"
             )
             return True
     
     def get_status(self) -> dict:
         """
-        Obtiene el estado actual del gestor de cámara
+        Obtiene el estado de todas las cámaras que se han abierto alguna vez
         
         Returns:
             dict: Diccionario con información de estado
+                - devices: Estado por índice (dueño, resolución, FPS y
+                  'capture' con las métricas del hilo lector o None)
+                - in_use: Índices arrendados
+                - available: Índices registrados y libres
         """
-        with self._camera_lock:
-            return {
-                'available': not self._in_use,
-                'in_use': self._in_use,
-                'current_user': self._current_user,
-                'camera_index': self._camera_index if self._in_use else None,
-                'camera_open': self._camera is not None and self._camera.isOpened() if self._camera else False
-            }
+        with self._devices_lock:
+            devices = sorted((d for d in self._devices.values() if d.leases), key=lambda d: d.index)
+        
+        statuses = {}
+        for device in devices:
+            with device.lock:
+                statuses[device.index] = device.get_status()
+        
+        return {
+            'devices': statuses,
+            'in_use': [index for index, status in statuses.items() if status['in_use']],
+            'available': [index for index, status in statuses.items() if not status['in_use']]
+        }
     
     def __repr__(self) -> str:
         """Representación en string del estado del manager"""
         status = self.get_status()
         if status['in_use']:
-            return f"<CameraManager: IN USE by '{status['current_user']}'>"
+            owners = ', '.join(
+                f"{index}='{status['devices'][index]['current_user']}'" for index in status['in_use']
+            )
+            return f"<CameraManager: IN USE {owners}>"
         else:
             return "<CameraManager: AVAILABLE>"
 
@@ -238,9 +994,12 @@ camera_manager = CameraManager()
 # FUNCIONES DE UTILIDAD
 # ============================================================================
 
-def check_camera_availability() -> tuple[bool, str]:
+def check_camera_availability(camera_index: int = 0) -> tuple[bool, str]:
     """
-    Verifica si la cámara está disponible antes de intentar usarla
+    Verifica si una cámara está disponible antes de intentar usarla
+    
+    Args:
+        camera_index: Índice de la cámara de la estación
     
     Returns:
         tuple: (disponible: bool, mensaje: str)
@@ -251,28 +1010,31 @@ def check_camera_availability() -> tuple[bool, str]:
             flash(message, 'error')
             return redirect(...)
     """
-    if not camera_manager.is_available():
-        current_user = camera_manager.get_current_user()
-        return False, f"La cámara está en uso por '{current_user}'. Cierra esa sesión primero."
+    if not camera_manager.is_available(camera_index):
+        current_user = camera_manager.get_current_user(camera_index)
+        return False, f"La cámara {camera_index} está en uso por '{current_user}'. Cierra esa sesión primero."
     return True, "Cámara disponible"
 
 
-def get_camera_info() -> dict:
+def get_camera_info(camera_index: int = 0) -> dict:
     """
-    Obtiene información técnica de la cámara (requiere que esté libre)
+    Obtiene información técnica de una cámara (requiere que esté libre)
+    
+    Args:
+        camera_index: Índice de la cámara
     
     Returns:
         dict: Información de la cámara o error
     """
-    if not camera_manager.is_available():
+    if not camera_manager.is_available(camera_index):
         return {
             'error': 'Camera in use',
-            'current_user': camera_manager.get_current_user()
+            'current_user': camera_manager.get_current_user(camera_index)
         }
     
     try:
         # Abrir temporalmente para obtener info
-        test_cap = cv2.VideoCapture(0)
+        test_cap = cv2.VideoCapture(camera_index)
         
         if not test_cap.isOpened():
             return {'error': 'Cannot open camera'}
@@ -0,0 +1,324 @@
+"""
+🎞️ FRAME SOURCES - FUENTES DE FRAMES INTERCAMBIABLES
+=====================================================
+Fuentes de video con la interfaz de cv2.VideoCapture (read, grab, get, set,
+isOpened, release) para que CameraManager, LatestFrameReader, MJPGCapture y
+el pipeline de streaming las usen sin saber de dónde vienen los frames.
+
+FUENTES:
+- CameraSource: cámara USB (cv2.VideoCapture(índice)), la de siempre
+- VideoFileSource: archivo de video en loop (ej: app/static/videos/exercises/*.mp4)
+- SyntheticSource: generador determinista (frame N siempre es el mismo)
+
+Las fuentes de archivo y sintética pueden ir a tiempo real (respetan los FPS
+del video) o lo más rápido posible (benchmarks y pruebas de carga sin cámara).
+
+ESPECIFICACIÓN (CAMERA_SOURCE en config):
+    'camera'                    → cámara USB del índice pedido
+    'synthetic'                 → generador sintético
+    'video:<ruta>'              → archivo en loop (ruta relativa a la raíz del proyecto)
+
+Uso:
+    source = open_frame_source('video:app/static/videos/exercises/hip_flexion.mp4', realtime=False)
+    ret, frame = source.read()
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import cv2
+import time
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Raíz del proyecto (para rutas relativas de video:<ruta>)
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SOURCE_TYPES = ('camera', 'video', 'synthetic')
+
+
+class FrameSource:
+    """
+    Interfaz común de las fuentes (subconjunto de cv2.VideoCapture)
+    
+    Las subclases implementan _read_frame(); la base agrega el ritmo de
+    tiempo real, la resolución pedida con set() y las métricas.
+    """
+    
+    backend_name = 'FRAME_SOURCE'
+    
+    def __init__(self, fps: float = 30.0, realtime: bool = True):
+        """
+        Args:
+            fps: FPS nominales de la fuente
+            realtime: True = entregar a fps (como una cámara);
+                False = lo más rápido posible
+        """
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.realtime = realtime
+        self.frames_read = 0
+        
+        # Resolución de salida pedida con set() (None = nativa)
+        self._target_width: Optional[int] = None
+        self._target_height: Optional[int] = None
+        
+        self._opened = True
+        self._next_frame_at = 0.0
+    
+    def _read_frame(self) -> Optional[np.ndarray]:
+        raise NotImplementedError
+    
+    def _native_size(self) -> Tuple[int, int]:
+        raise NotImplementedError
+    
+    def _pace(self):
+        """Espera hasta el instante del próximo frame (modo tiempo real)"""
+        if not self.realtime:
+            return
+        
+        now = time.perf_counter()
+        if self._next_frame_at > now:
+            time.sleep(self._next_frame_at - now)
+            now = self._next_frame_at
+        
+        # Si el consumidor se atrasó, no acumular frames "debidos"
+        self._next_frame_at = max(self._next_frame_at + 1.0 / self.fps, now)
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+        
+        self._pace()
+        frame = self._read_frame()
+        if frame is None:
+            return False, None
+        
+        width, height = self._output_size()
+        if (frame.shape[1], frame.shape[0]) != (width, height):
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        
+        self.frames_read += 1
+        return True, frame
+    
+    def grab(self) -> bool:
+        ret, _frame = self.read()
+        return ret
+    
+    def _output_size(self) -> Tuple[int, int]:
+        native_width, native_height = self._native_size()
+        return self._target_width or native_width, self._target_height or native_height
+    
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._output_size()[0])
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._output_size()[1])
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            self._target_width = int(value)
+            return True
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            self._target_height = int(value)
+            return True
+        if prop_id == cv2.CAP_PROP_FPS and value > 0:
+            self.fps = float(value)
+            return True
+        return False
+    
+    def isOpened(self) -> bool:
+        return self._opened
+    
+    def release(self):
+        self._opened = False
+    
+    def getBackendName(self) -> str:
+        return self.backend_name
+
+
+class CameraSource:
+    """
+    Cámara USB: delega todo en cv2.VideoCapture(índice)
+    
+    No hereda de FrameSource: el driver marca el ritmo y la resolución, y
+    los ajustes de MJPGCapture (FOURCC, CONVERT_RGB) llegan directo a OpenCV.
+    """
+    
+    def __init__(self, camera_index: int = 0):
+        self.camera_index = camera_index
+        self._capture = cv2.VideoCapture(camera_index)
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        return self._capture.read()
+    
+    def grab(self) -> bool:
+        return self._capture.grab()
+    
+    def get(self, prop_id: int) -> float:
+        return self._capture.get(prop_id)
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        return self._capture.set(prop_id, value)
+    
+    def isOpened(self) -> bool:
+        return self._capture.isOpened()
+    
+    def release(self):
+        self._capture.release()
+    
+    def getBackendName(self) -> str:
+        return self._capture.getBackendName()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Archivo de video en loop
+    
+    Al llegar al final vuelve al primer frame (loop=True) o termina
+    (read() devuelve False, como una cámara desconectada).
+    """
+    
+    backend_name = 'VIDEO_FILE'
+    
+    def __init__(self, path: str, loop: bool = True, realtime: bool = True):
+        """
+        Args:
+            path: Ruta del video (relativa a la raíz del proyecto o absoluta)
+            loop: Volver al inicio al terminar
+            realtime: Entregar a los FPS del archivo o lo más rápido posible
+        """
+        resolved = Path(path)
+        if not resolved.is_absolute():
+            resolved = BASE_DIR / resolved
+        
+        self.path = resolved
+        self.loop = loop
+        self.loops = 0
+        self._capture = cv2.VideoCapture(str(resolved))
+        
+        super().__init__(fps=self._capture.get(cv2.CAP_PROP_FPS), realtime=realtime)
+        
+        self._opened = self._capture.isOpened()
+        if not self._opened:
+            logger.error(f"No se pudo abrir el video {resolved}")
+            return
+        
+        self._width = int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._height = int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.frame_count = int(self._capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    def _native_size(self) -> Tuple[int, int]:
+        return self._width, self._height
+    
+    def _read_frame(self) -> Optional[np.ndarray]:
+        ret, frame = self._capture.read()
+        
+        if not ret and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            ret, frame = self._capture.read()
+        
+        return frame if ret else None
+    
+    def release(self):
+        super().release()
+        self._capture.release()
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generador determinista: el frame N depende solo de N
+    
+    Fondo con gradiente fijo, un círculo que recorre una trayectoria
+    circular y el número de frame. Sirve para medir throughput de captura,
+    pipeline y encode sin cámara ni archivos.
+    """
+    
+    backend_name = 'SYNTHETIC'
+    
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 30.0, realtime: bool = True):
+        super().__init__(fps=fps, realtime=realtime)
+        self._width = width
+        self._height = height
+        self._background: Optional[np.ndarray] = None
+        self.frame_index = 0
+    
+    def _native_size(self) -> Tuple[int, int]:
+        # Se genera directamente a la resolución pedida (sin resize)
+        return self._target_width or self._width, self._target_height or self._height
+    
+    def _make_background(self, width: int, height: int) -> np.ndarray:
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[:, :, 0] = (x * 0.6).astype(np.uint8)
+        background[:, :, 1] = (y * 0.6).astype(np.uint8)
+        background[:, :, 2] = 96
+        return background
+    
+    def _read_frame(self) -> np.ndarray:
+        width, height = self._native_size()
+        if self._background is None or self._background.shape[:2] != (height, width):
+            self._background = self._make_background(width, height)
+        
+        frame = self._background.copy()
+        n = self.frame_index
+        self.frame_index += 1
+        
+        angle = 2 * np.pi * (n % 120) / 120
+        center = (
+            int(width / 2 + width / 4 * np.cos(angle)),
+            int(height / 2 + height / 4 * np.sin(angle))
+        )
+        cv2.circle(frame, center, max(height // 12, 4), (255, 255, 255), -1)
+        cv2.putText(frame, f"#{n}", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+        return frame
+
+
+def parse_source_spec(spec: Optional[str]) -> Tuple[str, Optional[str]]:
+    """
+    Interpreta una especificación de fuente
+    
+    Returns:
+        tuple: (tipo, argumento) ej: ('video', 'app/static/videos/...mp4')
+    
+    Raises:
+        ValueError: Si el tipo no existe o falta la ruta del video
+    """
+    spec = (spec or 'camera').strip()
+    kind, _, argument = spec.partition(':')
+    
+    if kind not in SOURCE_TYPES:
+        raise ValueError(f"Fuente de frames desconocida: '{spec}' (usar {', '.join(SOURCE_TYPES)})")
+    if kind == 'video' and not argument:
+        raise ValueError("La fuente 'video' requiere una ruta: 'video:<ruta>'")
+    
+    return kind, argument or None
+
+
+def open_frame_source(spec: Optional[str] = 'camera', camera_index: int = 0, realtime: bool = True):
+    """
+    Abre la fuente indicada por spec
+    
+    Args:
+        spec: 'camera', 'synthetic' o 'video:<ruta>'
+        camera_index: Índice de la cámara (solo para 'camera')
+        realtime: Ritmo de tiempo real para 'video' y 'synthetic'
+    
+    Returns:
+        Objeto con interfaz de cv2.VideoCapture (comprobar isOpened())
+    """
+    kind, argument = parse_source_spec(spec)
+    
+    if kind == 'video':
+        return VideoFileSource(argument, realtime=realtime)
+    if kind == 'synthetic':
+        return SyntheticSource(realtime=realtime)
+    return CameraSource(camera_index)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+📦 ANÁLISIS POR LOTES DE VIDEOS GRABADOS
+========================================
+Corre un analyzer sobre muchos videos (un video por proceso worker) y
+escribe la serie de ángulos por frame y el resumen de cada sesión.
+
+Salida en --output:
+    frames.csv|parquet   → video, frame, timestamp, ángulo(s), confianza, lado, postura
+    summary.csv|parquet  → por video: ángulo máx/mín, ROM, lado, confianza media, FPS
+
+Con --db también crea una rom_session (con video_path) y sus
+angle_measurement por video; requiere --subject-id y --user-id.
+
+Uso:
+    python scripts/batch_analyze.py videos/ --analyzer shoulder_profile --workers 4
+    python scripts/batch_analyze.py "grabaciones/*.mp4" --format parquet --output resultados/
+    python scripts/batch_analyze.py videos/ --db --subject-id 3 --user-id 2
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.core.batch_analysis import (
+    BATCH_ANALYZERS, find_videos, run_batch, write_table, save_to_database
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis offline de videos grabados")
+    parser.add_argument('inputs', nargs='+', help="Videos, directorios o patrones glob")
+    parser.add_argument('--analyzer', default='shoulder_profile', choices=list(BATCH_ANALYZERS))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Procesos worker (1 = sin pool)")
+    parser.add_argument('--output', default='instance/batch', help="Directorio de salida")
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet'])
+    parser.add_argument('--db', nargs='?', const=str(BASE_DIR / 'database' / 'biotrack.db'),
+                        help="Guardar en rom_session/angle_measurement (ruta de la base opcional)")
+    parser.add_argument('--subject-id', type=int, help="Sujeto de las sesiones (con --db)")
+    parser.add_argument('--user-id', type=int, help="Usuario que registra las sesiones (con --db)")
+    args = parser.parse_args()
+    
+    if args.db and (args.subject_id is None or args.user_id is None):
+        parser.error("--db requiere --subject-id y --user-id")
+    
+    # Verificar antes de analizar (no al final de un lote largo)
+    if args.format == 'parquet':
+        try:
+            import pandas, pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet requiere pandas y pyarrow (pip install pandas pyarrow)")
+    
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("❌ No se encontraron videos")
+        return 1
+    
+    on_result = None
+    if args.db:
+        from database.database_manager import DatabaseManager
+        
+        db_manager = DatabaseManager(args.db)
+        
+        def on_result(summary, rows):
+            session_id = save_to_database(db_manager, summary, rows, args.subject_id, args.user_id)
+            print(f"   💾 rom_session {session_id}")
+    
+    print("=" * 70)
+    print(f"📦 LOTE: {len(videos)} videos, analyzer {args.analyzer}, "
+          f"{min(args.workers, len(videos))} workers")
+    print("=" * 70)
+    
+    summaries, frames = run_batch(videos, args.analyzer, workers=args.workers, on_result=on_result)
+    
+    output = Path(args.output)
+    write_table(frames, output / f"frames.{args.format}", args.format)
+    write_table(summaries, output / f"summary.{args.format}", args.format)
+    
+    failed = [s for s in summaries if s.get('error')]
+    
+    print("-" * 70)
+    print(f"  Serie por frame: {output / f'frames.{args.format}'} ({len(frames)} filas)")
+    print(f"  Resumen:         {output / f'summary.{args.format}'} ({len(summaries)} videos)")
+    if failed:
+        print(f"  ⚠️ {len(failed)} videos con error")
+    
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+🧵 BENCHMARK: INFERENCIA EN PROCESO vs POOL DE PROCESOS WORKER
+===============================================================
+Varios streams (hilos, como varias cámaras) infieren frames 640x480:
+
+- En proceso: cada stream con su grafo en el proceso del servidor
+- Pool: cada stream con un RemotePose de app/core/inference_workers.py
+  (frame por memoria compartida, landmarks de vuelta como (33, 4) float32)
+
+Por defecto usa un grafo sintético que consume CPU con OpenCV (no necesita
+el modelo de MediaPipe); con --mediapipe usa mp.solutions.pose.Pose.
+
+Uso:
+    python scripts/benchmark_inference_workers.py [--streams 4] [--workers 4] [--frames 60] [--mediapipe]
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import threading
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import cv2
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from app.core.inference_workers import PoseWorkerPool
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+class SyntheticPose:
+    """Grafo de prueba: trabajo de CPU en C (como TFLite) y 33 landmarks fijos"""
+    
+    def __init__(self, rounds=6, **options):
+        self.rounds = rounds
+    
+    def process(self, image):
+        work = image
+        for _ in range(self.rounds):
+            work = cv2.GaussianBlur(work, (15, 15), 0)
+        
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for i in range(33):
+            landmark = landmarks.landmark.add()
+            landmark.x, landmark.y, landmark.visibility = i / 33, float(work[0, 0, 0]) / 255, 1.0
+        
+        return type('Results', (), {'pose_landmarks': landmarks})()
+    
+    def close(self):
+        pass
+
+
+def make_graph_factory(use_mediapipe):
+    if use_mediapipe:
+        import mediapipe as mp
+        return mp.solutions.pose.Pose
+    return SyntheticPose
+
+
+def run_streams(label, poses, frames):
+    """Un hilo por stream; devuelve frames/s agregados"""
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 255, FRAME_SHAPE, dtype=np.uint8) for _ in range(4)]
+    
+    def stream(pose):
+        for i in range(frames):
+            results = pose.process(images[i % len(images)])
+            assert results.pose_landmarks is not None
+    
+    threads = [threading.Thread(target=stream, args=(pose,)) for pose in poses]
+    
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    fps = len(poses) * frames / elapsed
+    print(f"  {label:<34} {fps:>10.1f} {elapsed * 1000 / frames:>14.1f}")
+    return fps
+
+
+def transfer_cost(iterations=200):
+    """Costo por frame de pasar 640x480x3: pickle vs copia a memoria compartida"""
+    from multiprocessing import shared_memory
+    
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pickle.loads(pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL))
+    pickled = (time.perf_counter() - start) / iterations * 1000
+    
+    shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+    view = np.ndarray(FRAME_SHAPE, dtype=np.uint8, buffer=shm.buf)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        np.copyto(view, frame)
+    copied = (time.perf_counter() - start) / iterations * 1000
+    del view
+    shm.close()
+    shm.unlink()
+    
+    return pickled, copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inferencia en proceso vs pool de procesos")
+    parser.add_argument('--streams', type=int, default=4, help="Streams simultáneos (cámaras)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--frames', type=int, default=60, help="Frames por stream")
+    parser.add_argument('--mediapipe', action='store_true', help="Usar el modelo real de MediaPipe")
+    args = parser.parse_args()
+    
+    graph_factory = make_graph_factory(args.mediapipe)
+    options = {'model_complexity': 0} if args.mediapipe else {}
+    
+    print("=" * 70)
+    print(f"🧵 INFERENCIA: {args.streams} streams x {args.frames} frames, "
+          f"{args.workers} workers, {os.cpu_count()} núcleos "
+          f"({'MediaPipe' if args.mediapipe else 'grafo sintético'})")
+    print("=" * 70)
+    print(f"  {'Modo':<34} {'Frames/s':>10} {'ms/frame/stream':>14}")
+    
+    # Un solo stream en proceso: referencia de un núcleo
+    single = run_streams("En proceso, 1 stream", [graph_factory(**options)], args.frames)
+    local = run_streams(f"En proceso, {args.streams} streams",
+                        [graph_factory(**options) for _ in range(args.streams)], args.frames)
+    
+    pool = PoseWorkerPool(args.workers, max_frame_shape=FRAME_SHAPE, graph_factory=graph_factory)
+    try:
+        poses = [pool.create_pose(**options) for _ in range(args.streams)]
+        pooled = run_streams(f"Pool, {args.streams} streams", poses, args.frames)
+        stats = pool.get_stats()
+    finally:
+        pool.stop()
+    
+    pickled, copied = transfer_cost()
+    
+    print("-" * 70)
+    print(f"  Escalado del pool vs 1 stream: {pooled / single:.2f}x "
+          f"(ideal {min(args.streams, args.workers, os.cpu_count() or 1)}x)")
+    print(f"  Pool vs en proceso ({args.streams} streams): {pooled / local:.2f}x")
+    print(f"  Streams por worker: {stats['streams_per_worker']}, "
+          f"inferencia media en worker {stats['avg_inference_ms']} ms")
+    print(f"  Transferencia de un frame: pickle {pickled:.3f} ms vs memoria compartida {copied:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+🦴 BENCHMARK: ACCESO A LANDMARKS PROTOBUF vs LANDMARKFRAME
+==========================================================
+Costo Python por frame de leer los landmarks en los analyzers:
+
+- Antes: atributo por atributo sobre results.pose_landmarks.landmark[i]
+  (detect_*, get_landmarks_2d por punto, visibilidad del detector de
+  orientación, mapeo de la ROI landmark por landmark) y, en los frames
+  extrapolados, reconstrucción del NormalizedLandmarkList
+- Después: una copia a LandmarkFrame (33, 4) float32 por frame, proyección
+  vectorizada a píxeles y lecturas con tolist()
+
+Las funciones "antes" replican el código previo de los analyzers; las
+"después" son las de la app. No necesita cámara ni el modelo de MediaPipe.
+
+Uso:
+    python scripts/benchmark_landmark_frame.py [--frames 20000]
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from app.core.landmark_frame import LandmarkFrame, PoseResults
+from app.core.landmark_payload import pack_landmarks
+from app.core.orientation_detector import AdaptiveOrientationDetector
+from app.core.roi_tracker import PoseROITracker
+from app.analyzers.shoulder_frontal import ShoulderFrontalAnalyzer, FRONTAL_LANDMARKS
+from app.analyzers.shoulder_profile import ShoulderProfileAnalyzer, PROFILE_LANDMARKS
+
+WIDTH, HEIGHT = 1280, 720
+
+
+class Results:
+    """Resultado con la forma del de pose.process()"""
+    
+    def __init__(self, pose_landmarks):
+        self.pose_landmarks = pose_landmarks
+
+
+def synthetic_landmarks(seed=0):
+    rng = np.random.default_rng(seed)
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for _ in range(33):
+        landmark = landmark_list.landmark.add()
+        landmark.x, landmark.y, landmark.z = rng.uniform(0.1, 0.9, 3)
+        landmark.visibility = rng.uniform(0.7, 1.0)
+    return landmark_list
+
+
+# ----------------------------------------------------------------------
+# ANTES: acceso protobuf (código previo de los analyzers)
+# ----------------------------------------------------------------------
+
+def legacy_point(landmark, w, h):
+    return int(landmark.x * w), int(landmark.y * h)
+
+
+def legacy_frontal(landmarks, w, h):
+    left_vis = landmarks[11].visibility
+    right_vis = landmarks[12].visibility
+    is_frontal = (left_vis + right_vis) / 2 > 0.6 and abs(left_vis - right_vis) < 0.2
+    points = [legacy_point(landmarks[index], w, h) for index in FRONTAL_LANDMARKS]
+    return is_frontal, points
+
+
+def legacy_profile(landmarks, w, h):
+    left_shoulder, right_shoulder, nose = landmarks[11], landmarks[12], landmarks[0]
+    side = 'left' if left_shoulder.visibility > right_shoulder.visibility else 'right'
+    facing = nose.x < (left_shoulder.x + right_shoulder.x) / 2
+    points = [legacy_point(landmarks[index], w, h) for index in PROFILE_LANDMARKS[side]]
+    return side, facing, points
+
+
+def legacy_orientation_visibility(landmarks):
+    total = 0
+    for landmark_ids in ([11, 12, 23, 24], [23, 24], [11, 12, 23, 24, 0]):
+        for landmark_id in landmark_ids:
+            if landmarks[landmark_id].visibility > 0.6:
+                total += landmarks[landmark_id].visibility
+    return total
+
+
+def legacy_roi_map(landmark_list, scale, offset):
+    for landmark in landmark_list.landmark:
+        landmark.x = offset + landmark.x * scale
+        landmark.y = offset + landmark.y * scale
+        landmark.z = landmark.z * scale
+
+
+def legacy_pack_landmarks(landmark_list, precision=4):
+    return [
+        [round(lm.x, precision), round(lm.y, precision), round(lm.visibility, 2)]
+        for lm in landmark_list.landmark
+    ]
+
+
+def legacy_to_landmark_list(array):
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in array.tolist():
+        landmark = landmark_list.landmark.add()
+        landmark.x, landmark.y, landmark.z, landmark.visibility = x, y, z, visibility
+    return landmark_list
+
+
+# ----------------------------------------------------------------------
+# MEDICIÓN
+# ----------------------------------------------------------------------
+
+def time_per_frame(function, frames):
+    """µs por frame"""
+    function()
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acceso a landmarks protobuf vs LandmarkFrame")
+    parser.add_argument('--frames', type=int, default=20000)
+    args = parser.parse_args()
+    
+    landmark_list = synthetic_landmarks()
+    results = Results(landmark_list)
+    array = LandmarkFrame.from_landmark_list(landmark_list).array
+    
+    # Analyzers sin grafo de MediaPipe (solo se usan sus métodos de landmarks)
+    frontal = ShoulderFrontalAnalyzer(pose_factory=lambda **options: None)
+    profile = ShoulderProfileAnalyzer(pose_factory=lambda **options: None)
+    detector = AdaptiveOrientationDetector()
+    tracker = PoseROITracker()
+    roi = (100, 50, 960, 720)
+    
+    def new_frontal():
+        frame = PoseResults.from_mediapipe(results).landmark_frame
+        frontal.detect_frontal_orientation(frame)
+        frame.points_2d(FRONTAL_LANDMARKS, WIDTH, HEIGHT)
+    
+    def new_profile():
+        frame = PoseResults.from_mediapipe(results).landmark_frame
+        side, _confidence, _orientation = profile.detect_side(frame)
+        frame.points_2d(PROFILE_LANDMARKS[side], WIDTH, HEIGHT)
+    
+    def new_extrapolated_frontal():
+        frame = PoseResults(LandmarkFrame(array)).landmark_frame
+        frontal.detect_frontal_orientation(frame)
+        frame.points_2d(FRONTAL_LANDMARKS, WIDTH, HEIGHT)
+    
+    def legacy_roi():
+        copy = landmark_pb2.NormalizedLandmarkList()
+        copy.CopyFrom(landmark_list)
+        legacy_roi_map(copy, 0.75, 0.1)
+        return copy
+    
+    # Frame completo: ROI → orientación → vista frontal → payload del WebSocket
+    def legacy_full_frame():
+        mapped = legacy_roi()
+        legacy_orientation_visibility(mapped.landmark)
+        legacy_frontal(mapped.landmark, WIDTH, HEIGHT)
+        legacy_pack_landmarks(mapped)
+    
+    def new_full_frame():
+        frame = tracker.map_results(results, roi, (HEIGHT, WIDTH, 3)).landmark_frame
+        detector._evaluate_stable_landmarks(frame)
+        frontal.detect_frontal_orientation(frame)
+        frame.points_2d(FRONTAL_LANDMARKS, WIDTH, HEIGHT)
+        pack_landmarks(frame)
+    
+    def legacy_full_extrapolated():
+        landmarks = legacy_to_landmark_list(array)
+        legacy_orientation_visibility(landmarks.landmark)
+        legacy_frontal(landmarks.landmark, WIDTH, HEIGHT)
+        legacy_pack_landmarks(landmarks)
+    
+    def new_full_extrapolated():
+        frame = PoseResults(LandmarkFrame(array)).landmark_frame
+        detector._evaluate_stable_landmarks(frame)
+        frontal.detect_frontal_orientation(frame)
+        frame.points_2d(FRONTAL_LANDMARKS, WIDTH, HEIGHT)
+        pack_landmarks(frame)
+    
+    cases = [
+        ("Vista frontal (2 hombros + 8 puntos)",
+         lambda: legacy_frontal(landmark_list.landmark, WIDTH, HEIGHT),
+         new_frontal),
+        ("Vista perfil (lado + 4 puntos)",
+         lambda: legacy_profile(landmark_list.landmark, WIDTH, HEIGHT),
+         new_profile),
+        ("Visibilidad del detector de orientación",
+         lambda: legacy_orientation_visibility(landmark_list.landmark),
+         lambda: detector._evaluate_stable_landmarks(LandmarkFrame(array))),
+        ("Mapeo ROI → frame completo (33 puntos)",
+         legacy_roi,
+         lambda: tracker.map_results(results, roi, (HEIGHT, WIDTH, 3))),
+        ("Frame extrapolado + vista frontal",
+         lambda: legacy_frontal(legacy_to_landmark_list(array).landmark, WIDTH, HEIGHT),
+         new_extrapolated_frontal),
+        ("TOTAL frame inferido (ROI+orient.+frontal+payload)",
+         legacy_full_frame,
+         new_full_frame),
+        ("TOTAL frame extrapolado (orient.+frontal+payload)",
+         legacy_full_extrapolated,
+         new_full_extrapolated)
+    ]
+    
+    print("=" * 70)
+    print(f"🦴 LANDMARKS POR FRAME: protobuf vs LandmarkFrame ({args.frames} frames)")
+    print("=" * 70)
+    print(f"  {'Caso':<50} {'Antes µs':>9} {'Después µs':>11} {'Mejora':>6}")
+    
+    for label, before, after in cases:
+        before_us = time_per_frame(before, args.frames)
+        after_us = time_per_frame(after, args.frames)
+        print(f"  {label:<50} {before_us:>9.1f} {after_us:>11.1f} {before_us / after_us:>5.1f}x")
+    
+    print("-" * 70)
+    print("  'Después' incluye la copia del protobuf al array (una vez por frame).")
+    print("  Con un solo consumidor la copia puede costar más de lo que ahorra;")
+    print("  los TOTAL miden el frame completo, donde la copia se comparte.")
+
+
+if __name__ == '__main__':
+    main()
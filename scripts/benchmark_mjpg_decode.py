@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+🎞️ BENCHMARK: DECODIFICACIÓN MJPG COMPLETA vs REDUCIDA
+======================================================
+Costo por frame de llevar un JPEG 1280x720 (lo que entrega una webcam en
+modo MJPG) a la entrada de MediaPipe (640x480):
+
+- Completo + resize: cv2.imdecode(IMREAD_COLOR) y cv2.resize
+- Reducido: cv2.imdecode(IMREAD_REDUCED_COLOR_2) (reduce en la IDCT) y resize
+
+Con --camera mide además los FPS reales de la cámara con el FOURCC por
+defecto (normalmente YUYV) y con MJPG (MJPGCapture de hardware/camera_manager.py).
+
+Uso:
+    python scripts/benchmark_mjpg_decode.py [--frames 200] [--camera 0]
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import cv2
+import numpy as np
+
+from hardware.camera_manager import MJPGCapture
+
+PROCESSING_SIZE = (640, 480)
+
+
+def synthetic_jpeg(width=1280, height=720, quality=85):
+    """JPEG con manchas suaves (ruido ampliado), ~100 KB como un frame de webcam"""
+    rng = np.random.default_rng(0)
+    blobs = rng.integers(0, 255, (height // 8, width // 8, 3), dtype=np.uint8)
+    image = cv2.resize(blobs, (width, height), interpolation=cv2.INTER_CUBIC)
+    image = cv2.GaussianBlur(image, (31, 31), 0)
+    
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    assert ok
+    return buffer
+
+
+def time_decode(buffer, flag, frames):
+    """ms por frame de decodificar + resize a la entrada de MediaPipe"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame = cv2.imdecode(buffer, flag)
+        cv2.resize(frame, PROCESSING_SIZE, interpolation=cv2.INTER_LINEAR)
+    return (time.perf_counter() - start) / frames * 1000, frame.shape
+
+
+def camera_fps(index, mjpg, frames, width=1280, height=720):
+    """FPS reales de la cámara con o sin MJPG (None si no abre)"""
+    capture = cv2.VideoCapture(index)
+    if not capture.isOpened():
+        return None, None
+    
+    if mjpg:
+        capture = MJPGCapture(capture, decode_scale=2)
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    
+    try:
+        # Descartar los primeros frames (arranque y auto-exposición)
+        for _ in range(10):
+            capture.read()
+        
+        start = time.perf_counter()
+        read = 0
+        for _ in range(frames):
+            ret, _frame = capture.read()
+            read += bool(ret)
+        fps = read / (time.perf_counter() - start)
+        
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC))
+        return fps, fourcc.to_bytes(4, 'little').decode(errors='replace')
+    finally:
+        capture.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decodificación MJPG completa vs reducida")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--camera', type=int, default=None, help="Índice de cámara para medir FPS reales")
+    args = parser.parse_args()
+    
+    buffer = synthetic_jpeg()
+    
+    print("=" * 70)
+    print(f"🎞️ DECODIFICACIÓN: JPEG 1280x720 ({buffer.nbytes / 1024:.0f} KB) → "
+          f"{PROCESSING_SIZE[0]}x{PROCESSING_SIZE[1]}, {args.frames} frames")
+    print("=" * 70)
+    print(f"  {'Modo':<34} {'ms/frame':>10} {'Decodificado':>16}")
+    
+    results = {}
+    for label, flag in (
+        ("Completo + resize", cv2.IMREAD_COLOR),
+        ("Reducido 1/2 + resize", cv2.IMREAD_REDUCED_COLOR_2),
+        ("Reducido 1/4 + resize", cv2.IMREAD_REDUCED_COLOR_4)
+    ):
+        ms, shape = time_decode(buffer, flag, args.frames)
+        results[label] = ms
+        print(f"  {label:<34} {ms:>10.2f} {f'{shape[1]}x{shape[0]}':>16}")
+    
+    print("-" * 70)
+    print(f"  Reducido 1/2 vs completo: "
+          f"{results['Completo + resize'] / results['Reducido 1/2 + resize']:.2f}x más rápido")
+    
+    if args.camera is not None:
+        print("-" * 70)
+        for label, mjpg in (("FOURCC por defecto", False), ("MJPG", True)):
+            fps, fourcc = camera_fps(args.camera, mjpg, args.frames)
+            if fps is None:
+                print(f"  Cámara {args.camera}: no se pudo abrir")
+                break
+            print(f"  Cámara {args.camera} {label:<22} {fps:>8.1f} FPS  (driver: {fourcc})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+🏁 BENCHMARK: THROUGHPUT DEL PIPELINE SIN CÁMARA
+================================================
+Mide los FPS de salida del pipeline de streaming (captura → inferencia →
+render → encode) con una fuente de hardware/frame_sources.py en modo "lo
+más rápido posible": corre headless en cualquier máquina de CI.
+
+Por defecto la etapa de inferencia es un analyzer nulo (mide captura,
+pipeline y encode); con --analyzer shoulder_profile usa el analyzer real
+(necesita el modelo de MediaPipe).
+
+Uso:
+    python scripts/benchmark_pipeline_throughput.py [--source synthetic] [--frames 300]
+    python scripts/benchmark_pipeline_throughput.py --source video:app/static/videos/exercises/hip_flexion.mp4
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from hardware.camera_manager import CameraManager
+from app.streaming.pipeline import StreamPipeline
+
+
+class NullAnalyzer:
+    """Analyzer sin inferencia: render devuelve el frame tal cual"""
+    
+    pose = object()
+    
+    def infer(self, frame):
+        return True
+    
+    def render(self, frame, results, inference_ms=0.0):
+        return frame
+
+
+def make_analyzer(name):
+    if name == 'null':
+        return NullAnalyzer()
+    
+    from app.analyzers import ShoulderProfileAnalyzer, ShoulderFrontalAnalyzer
+    analyzer_class = {
+        'shoulder_profile': ShoulderProfileAnalyzer,
+        'shoulder_frontal': ShoulderFrontalAnalyzer
+    }[name]
+    return analyzer_class(processing_width=640, processing_height=480, show_skeleton=False)
+
+
+def run(label, manager, args, threaded_pipeline, threaded_capture):
+    analyzer = make_analyzer(args.analyzer)
+    
+    with manager.acquire_camera(
+        user_id='benchmark',
+        width=args.width,
+        height=args.height,
+        threaded=threaded_capture,
+        source=args.source,
+        source_realtime=args.realtime
+    ) as cap:
+        pipeline = StreamPipeline(cap, analyzer, threaded=threaded_pipeline)
+        
+        frames = 0
+        start = time.perf_counter()
+        for _jpeg in pipeline.frames():
+            frames += 1
+            if frames >= args.frames:
+                break
+        elapsed = time.perf_counter() - start
+        stats = pipeline.get_stats()
+    
+    fps = frames / elapsed
+    stages = '  '.join(
+        f"{name[:3]} {stats['stages'][name]['avg_ms']:.1f}"
+        for name in StreamPipeline.STAGES
+    )
+    print(f"  {label:<28} {fps:>8.1f}   {stages}")
+    return fps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput del pipeline con fuentes sin cámara")
+    parser.add_argument('--source', default='synthetic', help="'synthetic' o 'video:<ruta>'")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--analyzer', default='null', choices=['null', 'shoulder_profile', 'shoulder_frontal'])
+    parser.add_argument('--realtime', action='store_true', help="Entregar a los FPS nominales de la fuente")
+    args = parser.parse_args()
+    
+    manager = CameraManager()
+    
+    print("=" * 70)
+    print(f"🏁 PIPELINE: {args.source} {args.width}x{args.height}, {args.frames} frames, "
+          f"analyzer {args.analyzer}, {'tiempo real' if args.realtime else 'sin límite'}")
+    print("=" * 70)
+    print(f"  {'Modo':<28} {'FPS':>8}   ms por etapa")
+    
+    sequential = run("Secuencial", manager, args, threaded_pipeline=False, threaded_capture=False)
+    pipelined = run("Pipeline + hilo lector", manager, args, threaded_pipeline=True, threaded_capture=True)
+    
+    print("-" * 70)
+    print(f"  Pipeline vs secuencial: {pipelined / sequential:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
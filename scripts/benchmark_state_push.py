@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+🔔 BENCHMARK: POLLING vs PUSH SSE DEL ESTADO DEL ANÁLISIS
+=========================================================
+Compara el polling de /api/analysis/current_data (como live_analysis.js)
+con el push SSE de /api/analysis/events: requests HTTP, actualizaciones
+recibidas, bytes y CPU del proceso.
+
+Usa el test client de Flask en el mismo proceso y un analyzer simulado a
+30 FPS que alterna movimiento (el ángulo cambia) y reposo (no cambia).
+
+Uso:
+    python scripts/benchmark_state_push.py [--seconds 10] [--poll-ms 200] [--clients 4]
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import sys
+import math
+import time
+import argparse
+import threading
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.app import create_app
+from app.core.analyzer_pool import analyzer_pool
+from app.streaming import state_feed
+from app.streaming.state_feed import VOLATILE_FIELDS
+
+
+class SimulatedAnalyzer:
+    """Estado con la forma de ShoulderProfileAnalyzer.get_current_data()"""
+    
+    def __init__(self):
+        self.angle = 0.0
+        self.max_rom = 0.0
+        self.frame_count = 0
+        self.started = time.time()
+    
+    def step(self):
+        """Un frame: 2s de movimiento, 2s de reposo"""
+        elapsed = time.time() - self.started
+        self.frame_count += 1
+        
+        if int(elapsed / 2) % 2 == 0:
+            self.angle = round(60 + 50 * math.sin(elapsed * 2), 1)
+            self.max_rom = max(self.max_rom, abs(self.angle))
+    
+    def get_current_data(self):
+        return {
+            'angle': self.angle,
+            'max_rom': self.max_rom,
+            'side': 'HOMBRO DERECHO',
+            'orientation': 'mirando derecha',
+            'confidence': 0.92,
+            'posture_valid': True,
+            'landmarks_detected': True,
+            'fps': 30.0,
+            'inference_fps': 10.0,
+            'inference_mode': 'fixed_rate',
+            'frame_count': self.frame_count
+        }
+
+
+def run_frames(analyzer, stop_event, fps=30):
+    """Simula el pipeline: actualiza el estado y notifica en cada frame"""
+    while not stop_event.is_set():
+        analyzer.step()
+        state_feed.notify()
+        time.sleep(1.0 / fps)
+
+
+def make_client(app):
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['user_id'] = 1
+        flask_session['analyzer_lease'] = 'benchmark'
+    return client
+
+
+def poll_client(app, seconds, interval, totals):
+    client = make_client(app)
+    deadline = time.time() + seconds
+    last_state = None
+    
+    while time.time() < deadline:
+        response = client.get('/api/analysis/current_data')
+        totals['requests'] += 1
+        totals['bytes'] += len(response.data)
+        
+        # Cambio real (mismo criterio que el push: sin fps/frame_count)
+        data = response.get_json()['data']
+        state = {k: v for k, v in data.items() if k not in VOLATILE_FIELDS}
+        if state != last_state:
+            totals['updates'] += 1
+            last_state = state
+        
+        time.sleep(interval)
+
+
+def push_client(app, seconds, totals):
+    client = make_client(app)
+    deadline = time.time() + seconds
+    
+    response = client.get('/api/analysis/events', buffered=False)
+    totals['requests'] += 1
+    
+    try:
+        for chunk in response.response:
+            totals['bytes'] += len(chunk)
+            if chunk.startswith(b'event: state'):
+                totals['updates'] += 1
+            if time.time() >= deadline:
+                break
+    finally:
+        response.close()
+
+
+def measure(label, app, target, args):
+    totals = {'requests': 0, 'updates': 0, 'bytes': 0}
+    per_client = [dict(totals) for _ in range(args.clients)]
+    extra = (args.poll_ms / 1000,) if target is poll_client else ()
+    
+    stop_event = threading.Event()
+    analyzer = SimulatedAnalyzer()
+    analyzer_pool.clear()
+    analyzer_pool.acquire('benchmark', 'simulated', lambda: analyzer)
+    
+    frames = threading.Thread(target=run_frames, args=(analyzer, stop_event), daemon=True)
+    frames.start()
+    
+    cpu_start, wall_start = time.process_time(), time.time()
+    
+    clients = [
+        threading.Thread(target=target, args=(app, args.seconds) + extra + (client_totals,))
+        for client_totals in per_client
+    ]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    
+    cpu = time.process_time() - cpu_start
+    wall = time.time() - wall_start
+    
+    stop_event.set()
+    frames.join()
+    
+    for client_totals in per_client:
+        for key in totals:
+            totals[key] += client_totals[key]
+    
+    print(f"  {label:<22} {totals['requests']:>9} {totals['updates']:>10} "
+          f"{totals['bytes'] / 1024:>9.1f} {cpu * 1000 / wall:>12.1f}")
+    return totals, cpu / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Polling vs push SSE del estado")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--poll-ms', type=int, default=200, help="Intervalo de polling (ms)")
+    parser.add_argument('--clients', type=int, default=4, help="Estaciones conectadas")
+    args = parser.parse_args()
+    
+    app = create_app('testing')
+    app.logger.disabled = True
+    
+    print("=" * 70)
+    print(f"🔔 ESTADO DEL ANÁLISIS: {args.clients} clientes, {args.seconds:.0f}s, "
+          f"polling cada {args.poll_ms}ms, push ≤{app.config['STATE_PUSH_MAX_RATE']}/s")
+    print("=" * 70)
+    print(f"  {'Modo':<22} {'Requests':>9} {'Updates':>10} {'KB':>9} {'CPU ms/s':>12}")
+    
+    poll, poll_cpu = measure("Polling current_data", app, poll_client, args)
+    push, push_cpu = measure("Push SSE", app, push_client, args)
+    
+    print("-" * 70)
+    print(f"  Requests: {poll['requests']} → {push['requests']} "
+          f"({poll['requests'] / max(push['requests'], 1):.0f}x menos)")
+    print(f"  CPU: {poll_cpu * 1000:.1f} → {push_cpu * 1000:.1f} ms por segundo")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+🔤 BENCHMARK DEL RENDERIZADO DE TEXTO
+=====================================
+Compara el camino anterior de add_text_with_pillow (frame completo
+BGR→RGB→PIL→BGR + truetype por llamada) con el actual
+BaseJointAnalyzer.add_text_with_pillow (atlas de glifos de
+app/core/text_renderer.py, dibujando sobre el mismo frame)
+
+Uso:
+    python scripts/benchmark_text_renderer.py [--iterations 300] [--labels 4]
+
+Autor: BIOTRACK Team
+Fecha: 2026-10-16
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar directorio raíz al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.core.base_analyzer import BaseJointAnalyzer
+from app.core.text_renderer import get_text_renderer
+
+
+def pillow_round_trip(frame, text, position, font_size=20, color=(255, 255, 255)):
+    """Implementación anterior de BaseJointAnalyzer.add_text_with_pillow"""
+    pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    draw = ImageDraw.Draw(pil_image)
+    
+    try:
+        font = ImageFont.truetype("arial.ttf", font_size)
+    except Exception:
+        font = ImageFont.load_default()
+    
+    draw.text(position, text, font=font, fill=color)
+    return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+
+
+def run(label, draw_labels, iterations):
+    """Ejecuta draw_labels() iterations veces y devuelve ms por frame"""
+    draw_labels()  # Calentamiento (fuentes / atlas)
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        draw_labels()
+    elapsed = time.perf_counter() - start
+    
+    ms = elapsed / iterations * 1000
+    print(f"  {label:<28} {ms:8.3f} ms/frame")
+    return ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de texto sobre frames")
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--labels', type=int, default=4, help="Etiquetas de ángulo por frame")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+    
+    frame = np.random.randint(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    labels = [(f"{45 + i * 17}°", (200 + i * 150, 200 + i * 60)) for i in range(args.labels)]
+    
+    print("=" * 70)
+    print(f"🔤 TEXTO: {args.labels} etiquetas por frame {args.width}x{args.height}")
+    print("=" * 70)
+    
+    # Igual que draw_angle_arc_advanced: img = add_text_with_pillow(img, ...)
+    def old_path():
+        image = frame
+        for text, position in labels:
+            image = pillow_round_trip(image, text, position, font_size=16)
+        return image
+    
+    def current_path():
+        image = frame
+        for text, position in labels:
+            image = BaseJointAnalyzer.add_text_with_pillow(None, image, text, position, font_size=16)
+        return image
+    
+    old_ms = run("Pillow round-trip", old_path, args.iterations)
+    new_ms = run("add_text_with_pillow actual", current_path, args.iterations)
+    
+    print("-" * 70)
+    print(f"  Texto: {old_ms:.3f} ms → {new_ms:.3f} ms ({old_ms / max(new_ms, 1e-6):.1f}x)")
+    print(f"  Fuente del atlas: {get_text_renderer().get_stats()['font']}")
+
+
+if __name__ == '__main__':
+    main()
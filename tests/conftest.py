@@ -0,0 +1,39 @@
+"""
+Fixtures compartidas de las pruebas
+
+- fake_clock: reloj controlado que reemplaza el módulo time del código
+  probado (cada archivo indica qué módulo parchear)
+
+Uso:
+    @pytest.fixture
+    def clock(fake_clock):
+        return fake_clock(pool_module)
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Reemplaza el módulo time: time() y perf_counter() devuelven now"""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def time(self):
+        return self.now
+    
+    def perf_counter(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Función que instala un FakeClock como `time` del módulo recibido"""
+    def install(module):
+        clock = FakeClock()
+        monkeypatch.setattr(module, 'time', clock)
+        return clock
+    return install
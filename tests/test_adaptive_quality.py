@@ -0,0 +1,128 @@
+"""
+Pruebas del controlador de calidad adaptativa (app/streaming/adaptive_quality.py)
+
+Con reloj controlado y entregas sintéticas (segundos bloqueados por frame):
+- Congestión: baja calidad → escala → FPS, sin salir de los rangos
+- Red holgada sostenida: recupera FPS → escala → calidad
+- Reacciona al cliente más lento; presión intermedia no mejora
+- Limitador de FPS de salida
+
+Uso:
+    python -m pytest tests/test_adaptive_quality.py -q
+"""
+
+import pytest
+
+from app.streaming import adaptive_quality as quality_module
+from app.streaming.adaptive_quality import AdaptiveQualityController
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(quality_module)
+
+
+def small_controller(**kwargs):
+    """Rangos cortos; ventana de 0.5 s = solo cuenta la entrega de cada segundo"""
+    options = dict(
+        quality_range=(40, 60),
+        scale_range=(0.75, 1.0),
+        fps_range=(20, 30),
+        quality_step=10,
+        scale_step=0.125,
+        fps_step=5,
+        window=0.5
+    )
+    options.update(kwargs)
+    return AdaptiveQualityController(**options)
+
+
+def run(controller, clock, seconds, write_seconds, clients=('client',)):
+    """Una entrega por segundo y por cliente; devuelve las acciones tomadas"""
+    actions = []
+    for _ in range(seconds):
+        clock.now += 1.0
+        for client in clients:
+            adjustments = controller.adjustments
+            blocked = write_seconds(client) if callable(write_seconds) else write_seconds
+            controller.record_delivery(client, 10000, blocked)
+            if controller.adjustments != adjustments:
+                actions.append(controller.last_action)
+    return actions
+
+
+def state(controller):
+    return controller.quality, controller.scale, controller.fps
+
+
+# ----------------------------------------------------------------------
+# Orden de degradación y recuperación
+# ----------------------------------------------------------------------
+
+def test_step_down_then_step_up_order(clock):
+    controller = small_controller()
+    assert state(controller) == (60, 1.0, 30)
+    
+    # Cliente bloqueado todo el tiempo: calidad, luego escala, luego FPS
+    down = run(controller, clock, 10, write_seconds=0.5)
+    assert down == ['quality↓ 50', 'quality↓ 40', 'scale↓ 0.875', 'scale↓ 0.75', 'fps↓ 25', 'fps↓ 20']
+    assert state(controller) == (40, 0.75, 20)
+    
+    # Red holgada sostenida (3 ajustes holgados por paso): orden inverso
+    up = run(controller, clock, 18, write_seconds=0.0)
+    assert up == ['fps↑ 25', 'fps↑ 30', 'scale↑ 0.875', 'scale↑ 1.0', 'quality↑ 50', 'quality↑ 60']
+    assert state(controller) == (60, 1.0, 30)
+    
+    # Ya en el máximo no hay más ajustes
+    assert run(controller, clock, 10, write_seconds=0.0) == []
+
+
+def test_upgrade_needs_consecutive_calm_windows(clock):
+    controller = small_controller(upgrade_windows=3)
+    assert run(controller, clock, 1, write_seconds=0.5) == ['quality↓ 50']
+    
+    # Presión intermedia (40%, entre low y high) reinicia la cuenta de holgura
+    assert run(controller, clock, 2, write_seconds=0.0) == []
+    assert run(controller, clock, 1, write_seconds=0.2) == []
+    assert run(controller, clock, 2, write_seconds=0.0) == []
+    assert run(controller, clock, 1, write_seconds=0.0) == ['quality↑ 60']
+
+
+def test_reacts_to_slowest_client(clock):
+    # Ventana de 2 s: el ajuste de cada segundo ve también al cliente lento
+    controller = small_controller(window=2.0)
+    actions = run(
+        controller, clock, 2,
+        write_seconds=lambda client: 2.0 if client == 'slow' else 0.0,
+        clients=('fast', 'slow')
+    )
+    assert actions == ['quality↓ 50']
+    
+    # Sin el cliente lento solo queda presión baja
+    controller.forget_client('slow')
+    stats = controller.get_stats()
+    assert list(stats['clients']) == ['fast']
+    assert stats['clients']['fast']['blocked'] == 0.0
+
+
+def test_initial_quality_is_clamped_to_range(clock):
+    assert small_controller(initial_quality=95).quality == 60
+    assert small_controller(initial_quality=10).quality == 40
+    
+    config = {'STREAM_JPEG_QUALITY': 70, 'STREAM_FPS_RANGE': [10, 24]}
+    controller = AdaptiveQualityController.from_config(config)
+    assert (controller.quality, controller.fps, controller.fps_range) == (70, 24, (10, 24))
+
+
+# ----------------------------------------------------------------------
+# Limitador de FPS
+# ----------------------------------------------------------------------
+
+def test_should_emit_limits_output_fps(clock):
+    controller = small_controller()
+    controller.fps = 10
+    
+    assert controller.should_emit(100.0)
+    assert not controller.should_emit(100.05)
+    assert controller.should_emit(100.095)   # Tolerancia del 10% al jitter
+    assert controller.frames_skipped == 1
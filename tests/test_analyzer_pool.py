@@ -0,0 +1,270 @@
+"""
+Pruebas del pool de analyzers (app/core/analyzer_pool.py)
+
+Con analyzers falsos (sin MediaPipe) y reloj controlado:
+- Hit / reutilización de ociosos con reset()
+- Desalojo LRU (ociosos primero, luego leases abandonados)
+- Rechazo cuando todos los residentes están en uso
+- release() con un analyzer que ya no es el del lease
+- acquire() durante warm() espera el analyzer pre-calentado
+
+Uso:
+    python -m pytest tests/test_analyzer_pool.py -q
+"""
+
+import threading
+
+import pytest
+
+from app.core import analyzer_pool as pool_module
+from app.core.analyzer_pool import AnalyzerPool
+
+
+class FakeAnalyzer:
+    """Analyzer mínimo: cuenta reset() y cleanup()"""
+    
+    def __init__(self, name):
+        self.name = name
+        self.resets = 0
+        self.closed = False
+    
+    def reset(self):
+        self.resets += 1
+    
+    def cleanup(self):
+        self.closed = True
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(pool_module)
+
+
+def factory(name, created=None):
+    def build():
+        analyzer = FakeAnalyzer(name)
+        if created is not None:
+            created.append(analyzer)
+        return analyzer
+    return build
+
+
+# ----------------------------------------------------------------------
+# Leases y reutilización
+# ----------------------------------------------------------------------
+
+def test_same_lease_same_type_is_a_hit(clock):
+    pool = AnalyzerPool(max_instances=2)
+    created = []
+    
+    first = pool.acquire('1@camera0', 'shoulder_profile', factory('a', created))
+    second = pool.acquire('1@camera0', 'shoulder_profile', factory('b', created))
+    
+    assert first is second
+    assert len(created) == 1
+    assert first.resets == 0
+    assert pool.get('1@camera0') is first
+    assert (pool.hits, pool.misses) == (1, 1)
+
+
+def test_released_analyzer_is_reused_with_reset(clock):
+    pool = AnalyzerPool(max_instances=2)
+    created = []
+    
+    first = pool.acquire('1@camera0', 'shoulder_profile', factory('a', created))
+    assert pool.release('1@camera0')
+    assert pool.get('1@camera0') is None
+    
+    # Otra sesión del mismo tipo: el ocioso, reiniciado, sin crear otro
+    clock.advance(1)
+    reused = pool.acquire('2@camera0', 'shoulder_profile', factory('b', created))
+    assert reused is first
+    assert reused.resets == 1
+    assert len(created) == 1
+    assert pool.reuses == 1
+    
+    # Un tipo distinto no reutiliza el ocioso de otro tipo
+    other = pool.acquire('3@camera0', 'shoulder_frontal', factory('c', created))
+    assert other is not first
+    assert pool.get_stats()['by_type'] == {
+        'shoulder_profile': {'leased': 1, 'idle': 0},
+        'shoulder_frontal': {'leased': 1, 'idle': 0}
+    }
+
+
+def test_changing_type_leaves_previous_analyzer_idle(clock):
+    pool = AnalyzerPool(max_instances=3)
+    profile = pool.acquire('1@camera0', 'shoulder_profile', factory('a'))
+    frontal = pool.acquire('1@camera0', 'shoulder_frontal', factory('b'))
+    
+    assert frontal is not profile
+    assert pool.get('1@camera0') is frontal
+    stats = pool.get_stats()
+    assert (stats['leased'], stats['idle']) == (1, 1)
+
+
+def test_release_ignores_stale_analyzer(clock):
+    pool = AnalyzerPool(max_instances=3)
+    profile = pool.acquire('1@camera0', 'shoulder_profile', factory('a'))
+    frontal = pool.acquire('1@camera0', 'shoulder_frontal', factory('b'))
+    
+    # El productor viejo (profile) no libera el lease que ya es de frontal
+    assert not pool.release('1@camera0', profile)
+    assert pool.get('1@camera0') is frontal
+    
+    assert pool.release('1@camera0', frontal)
+    assert not pool.release('1@camera0')
+
+
+# ----------------------------------------------------------------------
+# Desalojo LRU y rechazo
+# ----------------------------------------------------------------------
+
+def test_lru_evicts_least_recently_used_idle_first(clock):
+    pool = AnalyzerPool(max_instances=2)
+    created = []
+    
+    pool.acquire('1@camera0', 'shoulder_profile', factory('a', created))
+    clock.advance(1)
+    pool.acquire('2@camera0', 'shoulder_frontal', factory('b', created))
+    
+    clock.advance(1)
+    pool.release('1@camera0')
+    clock.advance(1)
+    pool.release('2@camera0')
+    
+    # Dos ociosos y un tipo nuevo: sale el menos usado (profile)
+    clock.advance(1)
+    pool.acquire('3@camera0', 'elbow_profile', factory('c', created))
+    
+    profile, frontal, elbow = created
+    assert profile.closed and not frontal.closed and not elbow.closed
+    assert pool.evictions == 1
+    assert pool.get_stats()['resident'] == 2
+
+
+def test_idle_is_evicted_before_abandoned_lease(clock):
+    pool = AnalyzerPool(max_instances=2, lease_ttl=60)
+    created = []
+    
+    pool.acquire('1@camera0', 'shoulder_profile', factory('a', created))   # Abandonado
+    clock.advance(1)
+    pool.acquire('2@camera0', 'shoulder_frontal', factory('b', created))
+    clock.advance(1)
+    pool.release('2@camera0')                                              # Ocioso
+    
+    clock.advance(120)
+    pool.acquire('3@camera0', 'elbow_profile', factory('c', created))
+    assert created[1].closed and not created[0].closed
+    assert pool.get_stats()['leased'] == 2   # (get() renovaría el lease)
+    
+    # Ya sin ociosos: se desaloja el lease abandonado (más de lease_ttl sin uso)
+    clock.advance(120)
+    pool.acquire('4@camera0', 'knee_profile', factory('d', created))
+    assert created[0].closed
+    assert pool.get('1@camera0') is None
+    assert pool.evictions == 2
+
+
+def test_full_pool_of_active_leases_rejects(clock):
+    pool = AnalyzerPool(max_instances=2, lease_ttl=60)
+    created = []
+    
+    pool.acquire('1@camera0', 'shoulder_profile', factory('a', created))
+    pool.acquire('2@camera0', 'shoulder_profile', factory('b', created))
+    
+    clock.advance(10)
+    with pytest.raises(RuntimeError):
+        pool.acquire('3@camera0', 'shoulder_profile', factory('c', created))
+    
+    # No se cerró nada ni se contó como miss
+    assert len(created) == 2
+    assert not any(analyzer.closed for analyzer in created)
+    assert pool.rejections == 1
+    assert pool.misses == 2
+    
+    # Al liberar uno, la tercera sesión lo reutiliza
+    pool.release('1@camera0')
+    assert pool.acquire('3@camera0', 'shoulder_profile', factory('c', created)) is created[0]
+
+
+def test_clear_closes_everything(clock):
+    pool = AnalyzerPool(max_instances=3)
+    created = []
+    pool.acquire('1@camera0', 'shoulder_profile', factory('a', created))
+    pool.acquire('2@camera0', 'shoulder_frontal', factory('b', created))
+    pool.release('2@camera0')
+    
+    pool.clear()
+    assert all(analyzer.closed for analyzer in created)
+    assert pool.get('1@camera0') is None
+    assert pool.get_stats()['resident'] == 0
+
+
+def test_configure_rejects_empty_pool():
+    with pytest.raises(ValueError):
+        AnalyzerPool(max_instances=0)
+
+
+# ----------------------------------------------------------------------
+# Pre-calentamiento
+# ----------------------------------------------------------------------
+
+def blocking_factory(name, release, started, created):
+    """Factory que se queda "inicializando" hasta que se active release"""
+    def build():
+        started.set()
+        assert release.wait(5)
+        analyzer = FakeAnalyzer(name)
+        created.append(analyzer)
+        return analyzer
+    return build
+
+
+def test_acquire_waits_for_warming_analyzer():
+    pool = AnalyzerPool(max_instances=2)
+    release, started, created = threading.Event(), threading.Event(), []
+    results = {}
+    
+    warmer = threading.Thread(
+        target=pool.warm, args=('shoulder_profile', blocking_factory('warm', release, started, created))
+    )
+    warmer.start()
+    assert started.wait(5)
+    
+    def acquire():
+        results['analyzer'] = pool.acquire('1@camera0', 'shoulder_profile', factory('miss', created))
+    
+    client = threading.Thread(target=acquire)
+    client.start()
+    
+    # Mientras el tipo se pre-calienta el acquire espera (no crea otro)
+    client.join(0.2)
+    assert client.is_alive()
+    assert pool.get_stats()['warming'] == {'shoulder_profile': 1}
+    
+    release.set()
+    warmer.join(5)
+    client.join(5)
+    
+    assert [analyzer.name for analyzer in created] == ['warm']
+    assert results['analyzer'] is created[0]
+    assert created[0].resets == 1
+    assert (pool.warmed, pool.reuses, pool.misses) == (1, 1, 0)
+    assert pool.get_stats()['warming'] == {}
+
+
+def test_warm_skips_when_idle_exists_and_failed_warm_unblocks():
+    pool = AnalyzerPool(max_instances=3)
+    assert pool.warm('shoulder_profile', factory('a'))
+    assert not pool.warm('shoulder_profile', factory('b'))
+    assert pool.get_stats()['idle'] == 1
+    
+    def broken():
+        raise RuntimeError("modelo no disponible")
+    
+    # Un warm fallido deja de marcar el tipo: el acquire siguiente crea el suyo
+    with pytest.raises(RuntimeError):
+        pool.warm('shoulder_frontal', broken)
+    assert pool.get_stats()['warming'] == {}
+    assert pool.acquire('1@camera0', 'shoulder_frontal', factory('c')).name == 'c'
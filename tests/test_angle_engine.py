@@ -0,0 +1,300 @@
+"""
+Pruebas de propiedad del motor de ángulos vectorizado (app/core/angle_engine.py)
+
+Para puntos aleatorios (enteros en píxeles y floats 2D/3D), cada función
+por lotes debe dar EXACTAMENTE lo mismo que su versión escalar y que los
+métodos de los analyzers, frame por frame.
+
+Uso:
+    python -m pytest tests/test_angle_engine.py -q
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.core import angle_engine
+from app.core.angle_engine import (
+    JOINT_ANGLES, THREE_POINT, SEGMENT, SIGNED_VERTICAL, FIXED_REFERENCE, JointAngle,
+    three_point_angles, segment_angles, signed_vertical_angles, fixed_reference_angles,
+    three_point_angle, segment_angle, signed_vertical_angle, fixed_reference_angle,
+    compute_joint_angles, to_pixels
+)
+from app.core.base_analyzer import BaseJointAnalyzer
+from app.core.fixed_references import FixedSpatialReferences
+from app.core.landmark_frame import LandmarkFrame
+from app.analyzers.shoulder_frontal import ShoulderFrontalAnalyzer
+from app.analyzers.shoulder_profile import ShoulderProfileAnalyzer
+
+SEEDS = range(8)
+FRAMES = 500
+
+
+def random_points(rng, kind, count=FRAMES):
+    """(count, D) puntos: píxeles enteros, floats 2D o floats 3D, con repetidos"""
+    if kind == 'pixels':
+        points = rng.integers(0, 1280, size=(count, 2))
+    elif kind == 'float2d':
+        points = rng.uniform(-1.0, 2.0, size=(count, 2))
+    else:
+        points = rng.uniform(-1.0, 2.0, size=(count, 3))
+    
+    # Forzar segmentos de largo 0 en algunos frames
+    repeated = rng.random(count) < 0.05
+    return points, repeated
+
+
+def triplets(seed, kind):
+    rng = np.random.default_rng(seed)
+    point1, repeated1 = random_points(rng, kind)
+    point2, _ = random_points(rng, kind)
+    point3, repeated3 = random_points(rng, kind)
+    point1[repeated1] = point2[repeated1]
+    point3[repeated3] = point2[repeated3]
+    return point1, point2, point3
+
+
+def as_tuples(points):
+    return [tuple(point) for point in points.tolist()]
+
+
+def assert_identical(batch, scalars):
+    expected = np.array(scalars, dtype=np.float64)
+    assert batch.shape == expected.shape
+    # Igualdad bit a bit (no allclose)
+    assert np.array_equal(batch, expected), np.flatnonzero(batch != expected)[:10]
+
+
+@pytest.fixture(scope='module')
+def profile_analyzer():
+    return ShoulderProfileAnalyzer(pose_factory=lambda **options: None)
+
+
+@pytest.fixture(scope='module')
+def frontal_analyzer():
+    return ShoulderFrontalAnalyzer(pose_factory=lambda **options: None)
+
+
+# ----------------------------------------------------------------------
+# Lotes == escalar == métodos existentes
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('kind', ['pixels', 'float2d', 'float3d'])
+def test_three_point_matches_calculate_angle_biomechanical(seed, kind):
+    point1, point2, point3 = triplets(seed, kind)
+    batch = three_point_angles(point1, point2, point3)
+    
+    rows = list(zip(as_tuples(point1), as_tuples(point2), as_tuples(point3)))
+    assert_identical(batch, [three_point_angle(*row) for row in rows])
+    assert_identical(batch, [BaseJointAnalyzer.calculate_angle_biomechanical(None, *row) for row in rows])
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('kind', ['pixels', 'float2d'])
+def test_signed_vertical_matches_calculate_extension_angle(seed, kind, profile_analyzer):
+    shoulder, elbow, _ = triplets(seed, kind)
+    sides = np.random.default_rng(seed).choice(['left', 'right'], size=FRAMES)
+    
+    batch = signed_vertical_angles(shoulder, elbow, sides)
+    rows = list(zip(as_tuples(shoulder), as_tuples(elbow), sides.tolist()))
+    
+    assert_identical(batch, [signed_vertical_angle(*row) for row in rows])
+    assert_identical(batch, [profile_analyzer.calculate_extension_angle(*row) for row in rows])
+    
+    # Un solo lado para todos los frames
+    for side in ('left', 'right'):
+        assert_identical(
+            signed_vertical_angles(shoulder, elbow, side),
+            [profile_analyzer.calculate_extension_angle(s, e, side) for s, e, _ in rows]
+        )
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('kind', ['pixels', 'float2d', 'float3d'])
+def test_segment_matches_calculate_abduction_angle(seed, kind, frontal_analyzer):
+    shoulder, hip, elbow = triplets(seed, kind)
+    batch = segment_angles(shoulder, elbow, hip - shoulder)
+    
+    rows = list(zip(as_tuples(shoulder), as_tuples(hip), as_tuples(elbow)))
+    assert_identical(batch, [segment_angle(s, e, np.subtract(h, s)) for s, h, e in rows])
+    if kind != 'float3d':
+        assert_identical(batch, [frontal_analyzer.calculate_abduction_angle(*row) for row in rows])
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('kind', ['pixels', 'float2d'])
+def test_fixed_reference_matches_fixed_spatial_references(seed, kind):
+    references = FixedSpatialReferences()
+    start, end, _ = triplets(seed, kind)
+    segments = end - start
+    
+    for reference in (
+        references.VERTICAL_REFERENCE, references.VERTICAL_DOWN_REFERENCE, references.HORIZONTAL_REFERENCE
+    ):
+        vector = (reference['x'], reference['y'])
+        assert_identical(fixed_reference_angles(segments, vector),
+                         [fixed_reference_angle(segment, vector) for segment in as_tuples(segments)])
+    
+    for orientation, exercise in (('SAGITAL', 'shoulder_flexion'), ('FRONTAL', 'shoulder_abduction')):
+        reference = references.get_fixed_reference_vector(orientation, exercise)
+        assert_identical(fixed_reference_angles(segments, (reference['x'], reference['y'])), [
+            references.calculate_angle_with_fixed_reference({'x': x, 'y': y}, orientation, exercise)
+            for x, y in as_tuples(segments)
+        ])
+
+
+# ----------------------------------------------------------------------
+# Equivalencia con la versión np.dot previa
+# ----------------------------------------------------------------------
+
+def legacy_three_point(point1, point2, point3):
+    vector1 = np.array(point1) - np.array(point2)
+    vector2 = np.array(point3) - np.array(point2)
+    magnitude1 = np.linalg.norm(vector1)
+    magnitude2 = np.linalg.norm(vector2)
+    if magnitude1 * magnitude2 == 0:
+        return 0
+    cos_angle = np.clip(np.dot(vector1, vector2) / (magnitude1 * magnitude2), -1.0, 1.0)
+    return np.degrees(np.arccos(cos_angle))
+
+
+def legacy_extension(shoulder, elbow, side):
+    arm_vector = np.array([elbow[0] - shoulder[0], elbow[1] - shoulder[1]])
+    arm_norm = np.linalg.norm(arm_vector)
+    if arm_norm == 0:
+        return 0.0
+    dot_product = np.clip(np.dot(np.array([0, 1]), arm_vector / arm_norm), -1.0, 1.0)
+    angle_magnitude = np.degrees(np.arccos(dot_product))
+    cross_product = -arm_vector[0]
+    if side == 'left':
+        return float(angle_magnitude if cross_product > 0 else -angle_magnitude)
+    return float(angle_magnitude if cross_product < 0 else -angle_magnitude)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_pixel_inputs_identical_to_previous_np_dot_version(seed):
+    """Con píxeles enteros (lo que usan los analyzers) los productos son exactos"""
+    point1, point2, point3 = triplets(seed, 'pixels')
+    rows = list(zip(as_tuples(point1), as_tuples(point2), as_tuples(point3)))
+    
+    assert_identical(three_point_angles(point1, point2, point3), [legacy_three_point(*row) for row in rows])
+    assert_identical(signed_vertical_angles(point2, point3, 'left'),
+                     [legacy_extension(p2, p3, 'left') for _, p2, p3 in rows])
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_float_inputs_close_to_previous_np_dot_version(seed):
+    """Con floats np.dot (BLAS) puede redondear distinto: difiere como mucho en ulps"""
+    point1, point2, point3 = triplets(seed, 'float3d')
+    legacy = [legacy_three_point(*row) for row in zip(point1, point2, point3)]
+    np.testing.assert_allclose(three_point_angles(point1, point2, point3), legacy, rtol=0, atol=1e-9)
+
+
+# ----------------------------------------------------------------------
+# Valores conocidos
+# ----------------------------------------------------------------------
+
+def test_known_angles():
+    assert three_point_angle((1, 0), (0, 0), (0, 1)) == 90.0
+    assert three_point_angle((1, 0), (0, 0), (-1, 0)) == 180.0
+    assert three_point_angle((1, 0), (0, 0), (2, 0)) == 0.0
+    assert three_point_angle((0, 0), (0, 0), (1, 0)) == 0.0
+    
+    # Brazo hacia abajo = 0°, horizontal = 90°
+    assert segment_angle((0, 0), (0, 10), (0, 5)) == 0.0
+    assert segment_angle((0, 0), (10, 0), (0, 5)) == 90.0
+    assert segment_angle((0, 0), (0, 0), (0, 5)) == 0.0
+    
+    # Perfil izquierdo: brazo hacia -x (adelante) = flexión positiva
+    assert signed_vertical_angle((100, 100), (50, 100), 'left') == 90.0
+    assert signed_vertical_angle((100, 100), (150, 100), 'left') == -90.0
+    assert signed_vertical_angle((100, 100), (150, 100), 'right') == 90.0
+    assert signed_vertical_angle((100, 100), (100, 100), 'left') == 0.0
+    
+    # Goniométrico vs vertical hacia arriba: brazo abajo = 0°, arriba = 180°
+    assert fixed_reference_angle((0, 1), (0, -1)) == 0.0
+    assert fixed_reference_angle((0, -1), (0, -1)) == 180.0
+    assert math.isclose(fixed_reference_angle((1, 0), (0, -1)), 90.0)
+
+
+# ----------------------------------------------------------------------
+# Todas las articulaciones, todos los frames
+# ----------------------------------------------------------------------
+
+def random_landmark_arrays(seed, count=200):
+    rng = np.random.default_rng(seed)
+    arrays = rng.uniform(0.0, 1.0, size=(count, 33, 4)).astype(np.float32)
+    # Algunos frames con codo sobre el hombro (segmento de largo 0)
+    arrays[::17, 13] = arrays[::17, 11]
+    return arrays
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_to_pixels_matches_points_2d(seed):
+    arrays = random_landmark_arrays(seed)
+    pixels = to_pixels(arrays, 1280, 720)
+    
+    for array, frame_pixels in zip(arrays, pixels):
+        assert LandmarkFrame(array).points_2d(range(33), 1280, 720) == tuple(map(tuple, frame_pixels.tolist()))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_compute_joint_angles_matches_scalar_per_joint(seed):
+    pixels = to_pixels(random_landmark_arrays(seed), 1280, 720)
+    angles = compute_joint_angles(pixels)
+    
+    assert list(angles) == [joint.name for joint in JOINT_ANGLES]
+    
+    for joint in JOINT_ANGLES:
+        rows = pixels[:, [int(index) for index in joint.landmarks]].tolist()
+        if joint.kind == THREE_POINT:
+            expected = [three_point_angle(*row) for row in rows]
+        elif joint.kind == SEGMENT:
+            expected = [segment_angle(o, e, np.subtract(r, o)) for o, e, r in rows]
+        else:
+            expected = [signed_vertical_angle(o, e, joint.side) for o, e in rows]
+        assert_identical(angles[joint.name], expected)
+
+
+def test_compute_joint_angles_matches_analyzers(profile_analyzer, frontal_analyzer):
+    arrays = random_landmark_arrays(0, count=50)
+    angles = compute_joint_angles(to_pixels(arrays, 640, 480))
+    
+    for frame, array in enumerate(arrays):
+        landmark_frame = LandmarkFrame(array)
+        for side, index in (('left', (11, 23, 13)), ('right', (12, 24, 14))):
+            shoulder, hip, elbow = landmark_frame.points_2d(index, 640, 480)
+            assert angles[f'{side}_shoulder_flexion'][frame] == \
+                profile_analyzer.calculate_extension_angle(shoulder, elbow, side)
+            assert angles[f'{side}_shoulder_abduction'][frame] == \
+                frontal_analyzer.calculate_abduction_angle(shoulder, hip, elbow)
+
+
+def test_compute_joint_angles_fixed_reference_and_single_frame():
+    joints = (
+        JointAngle('left_arm_vs_up', FIXED_REFERENCE, (11, 13), reference=(0.0, -1.0)),
+        JointAngle('right_arm_vs_down', FIXED_REFERENCE, (12, 14), reference=(0.0, 1.0)),
+    )
+    pixels = to_pixels(random_landmark_arrays(3), 1280, 720)
+    angles = compute_joint_angles(pixels, joints)
+    
+    for joint in joints:
+        start, end = joint.landmarks
+        expected = [fixed_reference_angle(np.subtract(e, s), joint.reference)
+                    for s, e in zip(pixels[:, start].tolist(), pixels[:, end].tolist())]
+        assert_identical(angles[joint.name], expected)
+    
+    # Un solo frame (33, D) → escalares
+    single = compute_joint_angles(pixels[0])
+    batch = compute_joint_angles(pixels)
+    for name, value in single.items():
+        assert value.shape == ()
+        assert value == batch[name][0]
+
+
+def test_module_exports_kinds():
+    assert {joint.kind for joint in angle_engine.JOINT_ANGLES} <= {
+        THREE_POINT, SEGMENT, SIGNED_VERTICAL, FIXED_REFERENCE
+    }
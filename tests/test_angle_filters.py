@@ -0,0 +1,209 @@
+"""
+Pruebas de los filtros temporales de ángulos (app/core/angle_filters.py)
+
+- RollingMedianFilter: igual a np.median sobre la ventana (y al deque +
+  np.median previo, que devolvía el valor crudo con < min_samples)
+- ExponentialMovingAverage: y = y + alpha * (x - y)
+- OneEuroFilter: poco jitter en reposo, poco retraso en movimiento
+- create_filter / AngleFilterBank: configuración por canal y errores
+
+Uso:
+    python -m pytest tests/test_angle_filters.py -q
+"""
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from app.core.angle_filters import (
+    AngleFilterBank, ExponentialMovingAverage, OneEuroFilter, PassthroughFilter,
+    RollingMedianFilter, create_filter
+)
+
+
+def legacy_median(values, window=5, min_samples=3):
+    """Implementación previa: deque(maxlen) + np.median"""
+    history = deque(maxlen=window)
+    output = []
+    for value in values:
+        history.append(value)
+        output.append(float(np.median(list(history))) if len(history) >= min_samples else value)
+    return output
+
+
+# ----------------------------------------------------------------------
+# Mediana móvil
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('window', [1, 2, 5, 8])
+def test_median_matches_np_median(seed, window):
+    rng = np.random.default_rng(seed)
+    # Enteros para forzar repetidos dentro de la ventana
+    values = rng.integers(0, 20, size=300).astype(float).tolist()
+    
+    median = RollingMedianFilter(window=window, min_samples=window)
+    for index, value in enumerate(values):
+        expected = np.median(values[max(0, index - window + 1):index + 1])
+        result = median(value)
+        if index + 1 >= window:
+            assert result == expected
+        else:
+            assert result == value
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_median_matches_legacy_deque(seed):
+    values = np.random.default_rng(seed).uniform(0, 180, size=200).tolist()
+    median = RollingMedianFilter()
+    assert [median(value) for value in values] == legacy_median(values)
+
+
+def test_median_returns_raw_value_below_min_samples():
+    median = RollingMedianFilter(window=5, min_samples=3)
+    assert median(10.0) == 10.0
+    assert median(50.0) == 50.0
+    assert median(20.0) == 20.0   # Mediana de (10, 50, 20)
+
+
+def test_median_reset_forgets_window():
+    median = RollingMedianFilter(window=3, min_samples=1)
+    for value in (100.0, 100.0, 100.0):
+        median(value)
+    median.reset()
+    assert median(1.0) == 1.0
+    assert median(3.0) == 2.0
+
+
+def test_median_rejects_empty_window():
+    with pytest.raises(ValueError):
+        RollingMedianFilter(window=0)
+
+
+# ----------------------------------------------------------------------
+# EMA
+# ----------------------------------------------------------------------
+
+def test_ema_recurrence():
+    ema = ExponentialMovingAverage(alpha=0.25)
+    assert ema(8.0) == 8.0   # Primera muestra sin filtrar
+    assert ema(0.0) == 6.0
+    assert ema(6.0) == 6.0
+    
+    ema.reset()
+    assert ema(2.0) == 2.0
+
+
+def test_ema_alpha_one_is_passthrough():
+    ema = ExponentialMovingAverage(alpha=1.0)
+    values = [3.0, 90.0, -5.0, 45.5]
+    assert [ema(value) for value in values] == values
+
+
+@pytest.mark.parametrize('alpha', [0, -0.1, 1.5])
+def test_ema_rejects_invalid_alpha(alpha):
+    with pytest.raises(ValueError):
+        ExponentialMovingAverage(alpha=alpha)
+
+
+# ----------------------------------------------------------------------
+# One-Euro
+# ----------------------------------------------------------------------
+
+def test_one_euro_reduces_jitter_at_rest():
+    rng = np.random.default_rng(0)
+    noisy = 90.0 + rng.normal(0, 2.0, size=300)
+    
+    one_euro = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+    smoothed = np.array([one_euro(value, index / 30.0) for index, value in enumerate(noisy)])
+    
+    # Después del arranque, mucho menos ruido alrededor del valor real
+    assert np.std(smoothed[30:]) < 0.5 * np.std(noisy[30:])
+    assert abs(np.mean(smoothed[30:]) - 90.0) < 1.0
+
+
+def test_one_euro_beta_reduces_lag_in_motion():
+    # Rampa de 90°/s muestreada a 30 Hz
+    timestamps = np.arange(60) / 30.0
+    ramp = 90.0 * timestamps
+    
+    def lag(beta):
+        one_euro = OneEuroFilter(min_cutoff=0.5, beta=beta)
+        output = [one_euro(value, timestamp) for value, timestamp in zip(ramp, timestamps)]
+        return ramp[-1] - output[-1]
+    
+    assert 0 < lag(1.0) < lag(0.0)
+
+
+def test_one_euro_uses_timestamps_over_frequency():
+    # Mismo salto con el doble de tiempo entre muestras = más avance
+    fast, slow = OneEuroFilter(), OneEuroFilter()
+    fast(0.0, 0.0)
+    slow(0.0, 0.0)
+    assert fast(10.0, 1 / 30) < slow(10.0, 2 / 30)
+    
+    # Sin timestamps usa la frecuencia configurada
+    implicit, explicit = OneEuroFilter(frequency=30.0), OneEuroFilter()
+    implicit(0.0)
+    explicit(0.0, 0.0)
+    assert implicit(10.0) == pytest.approx(explicit(10.0, 1 / 30))
+
+
+def test_one_euro_reset():
+    one_euro = OneEuroFilter()
+    one_euro(0.0, 0.0)
+    one_euro(50.0, 0.1)
+    one_euro.reset()
+    assert one_euro(120.0, 5.0) == 120.0
+
+
+# ----------------------------------------------------------------------
+# Configuración
+# ----------------------------------------------------------------------
+
+def test_create_filter_specs():
+    assert isinstance(create_filter(None), PassthroughFilter)
+    assert isinstance(create_filter('none'), PassthroughFilter)
+    assert isinstance(create_filter('median'), RollingMedianFilter)
+    
+    one_euro = create_filter({'type': 'one_euro', 'min_cutoff': 2.0, 'beta': 0.1})
+    assert isinstance(one_euro, OneEuroFilter)
+    assert (one_euro.min_cutoff, one_euro.beta) == (2.0, 0.1)
+
+
+@pytest.mark.parametrize('spec', [
+    'kalman',
+    {'type': 'median', 'size': 5},   # Parámetro inexistente
+    {'type': 'ema', 'alpha': 2.0},   # Parámetro fuera de rango
+])
+def test_create_filter_errors(spec):
+    with pytest.raises(ValueError):
+        create_filter(spec)
+
+
+def test_filter_bank_per_channel_config():
+    bank = AngleFilterBank({
+        'default': 'median',
+        'left_angle': {'type': 'ema', 'alpha': 0.5}
+    })
+    
+    assert bank.apply('left_angle', 10.0) == 10.0
+    assert bank.apply('left_angle', 20.0) == 15.0
+    bank.apply('right_angle', 1.0)
+    
+    assert bank.describe() == {'left_angle': 'ema', 'right_angle': 'median'}
+    assert bank.get('left_angle') is bank.get('left_angle')
+    
+    # Reinicio de un canal sin tocar los demás
+    bank.reset('left_angle')
+    assert bank.apply('left_angle', 40.0) == 40.0
+    assert len(bank.get('right_angle')._sorted) == 1
+
+
+def test_filter_bank_validates_on_construction():
+    with pytest.raises(ValueError):
+        AngleFilterBank({'left_angle': 'kalman'})
+    
+    # Sin 'default' en la configuración se usa el del constructor
+    assert isinstance(AngleFilterBank(default='ema').get('any'), ExponentialMovingAverage)
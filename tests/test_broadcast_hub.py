@@ -0,0 +1,175 @@
+"""
+Pruebas del hub de difusión (app/streaming/broadcast_hub.py)
+
+Con productores falsos (generadores de bytes, sin cámara ni MediaPipe):
+- Un frame se publica una vez y llega igual a owner y observers
+- Reinicio del canal cuando el owner cambia de ejercicio (producer_key)
+- El productor se detiene al irse el último suscriptor
+- Roles: observer sin canal activo, otro owner, rol inválido
+
+Uso:
+    python -m pytest tests/test_broadcast_hub.py -q
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.streaming.broadcast_hub import ROLE_OBSERVER, ROLE_OWNER, BroadcastHub
+
+
+class FakeProducer:
+    """Generador de frames numerados; registra cuándo termina (libera la "cámara")"""
+    
+    def __init__(self, name, interval=0.01, fail_after=None):
+        self.name = name
+        self.interval = interval
+        self.fail_after = fail_after
+        self.started = threading.Event()
+        self.finished = threading.Event()
+    
+    def __call__(self):
+        return self._frames()
+    
+    def _frames(self):
+        self.started.set()
+        try:
+            for index in range(10000):
+                if self.fail_after is not None and index == self.fail_after:
+                    raise RuntimeError("cámara desconectada")
+                yield f'{self.name}-{index}'.encode()
+                time.sleep(self.interval)
+        finally:
+            self.finished.set()
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def next_frame(subscriber):
+    return next(subscriber.frames(timeout=1.0))
+
+
+@pytest.fixture
+def hub():
+    hub = BroadcastHub()
+    yield hub
+    for channel in hub.get_stats()['channels']:
+        hub.get_channel(channel['camera_index']).stop()
+
+
+# ----------------------------------------------------------------------
+# Difusión
+# ----------------------------------------------------------------------
+
+def test_owner_and_observer_share_published_frames(hub):
+    producer = FakeProducer('profile')
+    owner = hub.subscribe(0, 'owner-1', ROLE_OWNER, producer=producer, producer_key='shoulder_profile')
+    assert next_frame(owner).startswith(b'profile-')
+    
+    observer = hub.subscribe(0, 'instructor', ROLE_OBSERVER)
+    assert next_frame(observer).startswith(b'profile-')
+    assert observer.channel is owner.channel
+    
+    # El mismo dueño desde otra pestaña se une al canal sin crear otro productor
+    again = hub.subscribe(0, 'owner-1', ROLE_OWNER, producer=FakeProducer('other'), producer_key='shoulder_profile')
+    assert again.channel is owner.channel
+    assert next_frame(again).startswith(b'profile-')
+    assert owner.channel.subscriber_count == 3
+
+
+# ----------------------------------------------------------------------
+# Reinicio y cierre
+# ----------------------------------------------------------------------
+
+def test_channel_restarts_when_producer_key_changes(hub):
+    profile = FakeProducer('profile')
+    old = hub.subscribe(0, 'owner-1', ROLE_OWNER, producer=profile, producer_key='shoulder_profile')
+    assert next_frame(old).startswith(b'profile-')
+    
+    frontal = FakeProducer('frontal')
+    new = hub.subscribe(0, 'owner-1', ROLE_OWNER, producer=frontal, producer_key='shoulder_frontal')
+    
+    # El productor viejo terminó (liberó la cámara) antes de crear el nuevo
+    assert profile.finished.is_set()
+    assert new.channel is not old.channel
+    assert hub.get_channel(0) is new.channel
+    assert hub.get_channel(0).producer_key == 'shoulder_frontal'
+    assert next_frame(new).startswith(b'frontal-')
+    
+    # El suscriptor del canal viejo termina su stream
+    assert all(frame.startswith(b'profile-') for frame in old.frames(timeout=0.2))
+
+
+def test_unsubscribing_last_client_stops_producer(hub):
+    producer = FakeProducer('profile')
+    owner = hub.subscribe(0, 'owner-1', ROLE_OWNER, producer=producer, producer_key='shoulder_profile')
+    observer = hub.subscribe(0, 'instructor', ROLE_OBSERVER)
+    channel = owner.channel
+    next_frame(observer)
+    
+    # Queda un cliente: el productor sigue
+    hub.unsubscribe(owner)
+    published = channel.frames_published
+    assert wait_until(lambda: channel.frames_published > published)
+    assert channel.is_active
+    
+    hub.unsubscribe(observer)
+    assert producer.finished.wait(3)
+    assert wait_until(lambda: hub.get_channel(0) is None)
+    assert not channel.is_active
+    
+    # Un owner nuevo arranca un canal nuevo
+    restarted = FakeProducer('profile-2')
+    subscriber = hub.subscribe(0, 'owner-2', ROLE_OWNER, producer=restarted, producer_key='shoulder_profile')
+    assert subscriber.channel is not channel
+    assert next_frame(subscriber).startswith(b'profile-2-')
+
+
+def test_producer_error_publishes_error_frame_and_closes(hub):
+    producer = FakeProducer('profile', fail_after=3)
+    owner = hub.subscribe(
+        0, 'owner-1', ROLE_OWNER, producer=producer, queue_size=10,
+        error_frame_factory=lambda message: f'ERROR: {message}'.encode()
+    )
+    
+    frames = list(owner.frames(timeout=1.0))
+    assert frames[-1] == 'ERROR: cámara desconectada'.encode()
+    assert owner.channel.error == 'cámara desconectada'
+    assert wait_until(lambda: hub.get_channel(0) is None)
+
+
+# ----------------------------------------------------------------------
+# Roles
+# ----------------------------------------------------------------------
+
+def test_observer_needs_active_channel(hub):
+    with pytest.raises(RuntimeError):
+        hub.subscribe(0, 'instructor', ROLE_OBSERVER)
+
+
+def test_other_owner_is_rejected(hub):
+    owner = hub.subscribe(0, 'owner-1', ROLE_OWNER, producer=FakeProducer('profile'))
+    next_frame(owner)
+    
+    with pytest.raises(RuntimeError):
+        hub.subscribe(0, 'owner-2', ROLE_OWNER, producer=FakeProducer('intruder'))
+    assert hub.get_channel(0).owner_id == 'owner-1'
+    
+    # Otra cámara es otro canal
+    other = hub.subscribe(1, 'owner-2', ROLE_OWNER, producer=FakeProducer('camera1'))
+    assert next_frame(other).startswith(b'camera1-')
+
+
+def test_invalid_role_and_missing_producer(hub):
+    with pytest.raises(ValueError):
+        hub.subscribe(0, 'owner-1', 'admin', producer=FakeProducer('profile'))
+    with pytest.raises(ValueError):
+        hub.subscribe(0, 'owner-1', ROLE_OWNER)
@@ -0,0 +1,179 @@
+"""
+Pruebas de los handles calientes del gestor de cámaras (hardware/camera_manager.py)
+
+Con capturas falsas (sin cámara USB):
+- Mismo lease y configuración → se reutiliza el handle caliente
+- Configuración distinta → se cierra y se reabre
+- Handle que murió estacionado (cámara desconectada) → se reabre en vez
+  de entregar un lector muerto
+
+Uso:
+    python -m pytest tests/test_camera_manager.py -q
+"""
+
+import itertools
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from hardware import camera_manager as camera_module
+from hardware.camera_manager import CameraManager, LatestFrameReader
+
+# Índices propios: CameraManager es un singleton compartido por el proceso
+_indices = itertools.count(100)
+
+
+class FakeCapture:
+    """Captura mínima; alive=False simula una cámara desconectada"""
+    
+    def __init__(self):
+        self.alive = True
+        self.opened = True
+        self.props = {cv2.CAP_PROP_FRAME_WIDTH: 64, cv2.CAP_PROP_FRAME_HEIGHT: 48, cv2.CAP_PROP_FPS: 30}
+        self.grabs = 0
+    
+    def read(self):
+        time.sleep(0.002)
+        if not self.alive:
+            return False, None
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+    
+    def grab(self):
+        self.grabs += 1
+        return self.alive
+    
+    def get(self, prop_id):
+        return self.props.get(prop_id, 0)
+    
+    def set(self, prop_id, value):
+        self.props[prop_id] = value
+        return True
+    
+    def isOpened(self):
+        return self.opened
+    
+    def release(self):
+        self.opened = False
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Capturas abiertas por el gestor, en orden"""
+    captures = []
+    
+    def open_fake(source, camera_index, realtime=True):
+        captures.append(FakeCapture())
+        return captures[-1]
+    
+    monkeypatch.setattr(camera_module, 'open_frame_source', open_fake)
+    return captures
+
+
+@pytest.fixture
+def camera():
+    manager = CameraManager()
+    index = next(_indices)
+    yield manager, index
+    manager.force_release(index)
+
+
+def lease(manager, index, user='user-1', **options):
+    """Un lease completo; devuelve el handle entregado"""
+    options.setdefault('keep_warm', 60)
+    options.setdefault('width', 64)
+    options.setdefault('height', 48)
+    
+    # (acquire_camera atrapa las excepciones del lease: verificar afuera)
+    with manager.acquire_camera(user, camera_index=index, **options) as handle:
+        ret, _frame = handle.read()
+    assert ret
+    return handle
+
+
+def device_status(manager, index):
+    return manager._device(index).get_status()
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+# ----------------------------------------------------------------------
+# Reutilización y reapertura
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize('threaded', [False, True])
+def test_warm_hit_reuses_parked_handle(camera, opened, threaded):
+    manager, index = camera
+    
+    lease(manager, index, threaded=threaded)
+    assert device_status(manager, index)['state'] == 'warm'
+    
+    lease(manager, index, user='user-2', threaded=threaded)
+    status = device_status(manager, index)
+    assert len(opened) == 1
+    assert (status['cold_opens'], status['warm_hits']) == (1, 1)
+    assert opened[0].opened
+
+
+def test_config_mismatch_reopens(camera, opened):
+    manager, index = camera
+    
+    lease(manager, index)
+    lease(manager, index, width=32, height=24)
+    
+    status = device_status(manager, index)
+    assert len(opened) == 2
+    assert not opened[0].opened
+    assert (status['cold_opens'], status['warm_hits']) == (2, 0)
+
+
+def test_dead_threaded_handle_is_reopened(camera, opened):
+    manager, index = camera
+    
+    first = lease(manager, index, threaded=True)
+    assert isinstance(first, LatestFrameReader)
+    
+    # Cámara desconectada mientras estaba caliente: el lector termina
+    opened[0].alive = False
+    assert wait_until(lambda: not first.isOpened())
+    
+    second = lease(manager, index, threaded=True)
+    status = device_status(manager, index)
+    assert second is not first
+    assert len(opened) == 2
+    assert not opened[0].opened
+    assert (status['cold_opens'], status['warm_hits']) == (2, 0)
+
+
+def test_dead_handle_without_reader_is_reopened(camera, opened):
+    manager, index = camera
+    lease(manager, index)
+    
+    # isOpened() sigue en True pero el flush de grab() falla
+    opened[0].alive = False
+    lease(manager, index)
+    
+    status = device_status(manager, index)
+    assert len(opened) == 2
+    assert (status['cold_opens'], status['warm_hits']) == (2, 0)
+
+
+def test_failed_stream_is_not_kept_warm(camera, opened):
+    manager, index = camera
+    
+    # El stream termina porque la cámara se desconectó en pleno lease
+    with manager.acquire_camera('user-1', camera_index=index, threaded=True, keep_warm=60) as reader:
+        opened[0].alive = False
+        reader_ended = wait_until(lambda: not reader.isOpened())
+    
+    assert reader_ended
+    assert device_status(manager, index)['state'] == 'closed'
+    assert not opened[0].opened
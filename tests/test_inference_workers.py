@@ -0,0 +1,133 @@
+"""
+Pruebas de las ranuras del pool de inferencia (app/core/inference_workers.py)
+
+Con un proceso worker real y un grafo falso lento (sin MediaPipe):
+- Una ranura con pedido vencido (timeout) no se reutiliza hasta que llega
+  su respuesta tardía
+- La respuesta tardía de un frame viejo nunca se toma como la del frame
+  nuevo ni pisa sus landmarks
+- Con todas las ranuras ocupadas, process() no envía el frame
+
+Uso:
+    python -m pytest tests/test_inference_workers.py -q
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.core.inference_workers import PoseWorkerPool
+from app.core.landmark_frame import LandmarkFrame, PoseResults
+
+FRAME_SHAPE = (8, 8, 3)
+TIMEOUT = 1.0
+
+
+class SlowGraph:
+    """
+    Grafo falso: el canal 0 del frame es su marca y el canal 1 los décimos
+    de segundo que tarda la inferencia. Devuelve landmarks con la marca
+    (marca 0 = sin persona detectada).
+    """
+    
+    def process(self, image):
+        mark, delay = int(image[0, 0, 0]), int(image[0, 0, 1])
+        time.sleep(delay / 10)
+        if mark == 0:
+            return PoseResults(None)
+        return PoseResults(LandmarkFrame(np.full((33, 4), mark, dtype=np.float32)))
+    
+    def close(self):
+        pass
+
+
+def slow_graph(**options):
+    """graph_factory del worker (a nivel de módulo: picklable con spawn)"""
+    return SlowGraph()
+
+
+def frame(mark, delay=0.0):
+    image = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    image[0, 0] = (mark, int(delay * 10), 0)
+    return image
+
+
+def slot_mark(pose, slot):
+    """Marca de los landmarks escritos por el worker en una ranura"""
+    return int(pose._layout.result_view(pose._shm.buf, slot)[0, 0])
+
+
+def mark_of(results):
+    return int(results.landmark_frame.array[0, 0])
+
+
+@pytest.fixture
+def make_pose():
+    pools = []
+    
+    def make(slots):
+        pool = PoseWorkerPool(
+            num_workers=1, max_frame_shape=FRAME_SHAPE, slots=slots,
+            timeout=TIMEOUT, open_timeout=30, graph_factory=slow_graph
+        )
+        pools.append(pool)
+        return pool.create_pose()
+    
+    yield make
+    for pool in pools:
+        pool.stop()
+
+
+# ----------------------------------------------------------------------
+# Respuestas tardías
+# ----------------------------------------------------------------------
+
+def test_timed_out_slot_is_not_reused_until_late_reply(make_pose):
+    pose = make_pose(slots=2)
+    assert mark_of(pose.process(frame(1))) == 1
+    
+    # El worker tarda más que el timeout: la ranura queda ocupada
+    assert pose.process(frame(10, delay=1.5)).landmark_frame is None
+    assert pose.timeouts == 1
+    late_slot = pose._pending[2]
+    
+    # El frame nuevo va a la otra ranura aunque le tocara la vencida
+    pose._next_slot = late_slot
+    assert mark_of(pose.process(frame(20))) == 20
+    assert pose._pending == {}
+    
+    # La respuesta tardía escribió solo en su propia ranura
+    assert slot_mark(pose, late_slot) == 10
+    assert slot_mark(pose, 1 - late_slot) == 20
+
+
+def test_late_reply_never_overwrites_newer_frame(make_pose):
+    pose = make_pose(slots=2)
+    assert pose.process(frame(10, delay=1.5)).landmark_frame is None
+    
+    # La respuesta tardía (con persona) llega mientras se espera el frame
+    # nuevo (sin persona): no se toma como la suya
+    assert pose.process(frame(0)).landmark_frame is None
+    assert pose._pending == {}
+    
+    # Ni la respuesta tardía ni otro frame cambian lo ya devuelto
+    results = pose.process(frame(20))
+    assert mark_of(pose.process(frame(30))) == 30
+    assert mark_of(results) == 20
+
+
+def test_all_slots_busy_skips_frame_without_sending(make_pose):
+    pose = make_pose(slots=1)
+    assert pose.process(frame(10, delay=2.5)).landmark_frame is None
+    sent = pose._pool.requests_sent
+    
+    # Sigue sin respuesta al vencer el segundo plazo: no se envía nada
+    assert pose.process(frame(20)).landmark_frame is None
+    assert pose._pool.requests_sent == sent
+    assert pose.timeouts == 2
+    assert list(pose._pending.values()) == [0]
+    
+    # Llegada la respuesta tardía, la ranura vuelve a usarse
+    assert mark_of(pose.process(frame(30))) == 30
+    assert pose._pending == {}
@@ -0,0 +1,192 @@
+"""
+Pruebas del contador de repeticiones (app/core/repetition_counter.py)
+
+- Transiciones VALLE → SUBIDA → VALLE con histéresis
+- min_amplitude, duración mínima/máxima y max_gap
+- ROM por repetición y summarize_repetitions()
+
+Uso:
+    python -m pytest tests/test_repetition_counter.py -q
+"""
+
+import pytest
+
+from app.core.repetition_counter import RISING, VALLEY, RepetitionCounter, summarize_repetitions
+
+
+def feed(counter, angles, dt=0.1, start=0.0):
+    """Alimenta el contador con muestras cada dt segundos; devuelve las reps contadas"""
+    counted = []
+    for index, angle in enumerate(angles):
+        rep = counter.update(angle, start + index * dt)
+        if rep is not None:
+            counted.append(rep)
+    return counted
+
+
+def raw_counter(**kwargs):
+    """Contador sin prefiltro: la señal llega tal cual a la máquina de estados"""
+    return RepetitionCounter(prefilter='none', **kwargs)
+
+
+# ----------------------------------------------------------------------
+# Máquina de estados
+# ----------------------------------------------------------------------
+
+def test_single_repetition_transitions():
+    counter = raw_counter(min_amplitude=20)
+    
+    assert feed(counter, [10, 12]) == []
+    assert counter.phase == VALLEY
+    
+    # Sube min_amplitude sobre el valle (10): empieza la repetición
+    counter.update(35, 0.2)
+    assert counter.phase == RISING
+    
+    # Pico en 90; umbral de vuelta = 90 - 0.7 * 80 = 34
+    assert counter.update(80, 0.3) is None
+    assert counter.update(90, 0.4) is None
+    assert counter.update(60, 0.5) is None
+    rep = counter.update(30, 0.6)
+    
+    assert counter.phase == VALLEY
+    assert counter.count == 1
+    assert rep['index'] == 1
+    assert (rep['peak'], rep['trough'], rep['rom']) == (90, 10, 80)
+    assert (rep['start'], rep['peak_time'], rep['end']) == (0.0, 0.4, 0.6)
+    assert rep['duration'] == 0.6
+    assert rep['end_trough'] is None
+    
+    # El valle final se sigue refinando hasta la próxima repetición
+    feed(counter, [15, 8], start=0.7)
+    assert counter.reps[-1]['end_trough'] == 8
+
+
+def test_hysteresis_near_peak_and_valley():
+    counter = raw_counter(min_amplitude=20)
+    
+    # Oscilar cerca del pico (umbral 34) no corta la repetición
+    assert feed(counter, [10, 40, 90, 70, 88, 50, 85]) == []
+    assert counter.phase == RISING
+    assert len(feed(counter, [20], start=0.7)) == 1
+    
+    # Oscilar en el valle con menos de min_amplitude no inicia otra
+    assert feed(counter, [10, 25, 12, 28, 11], start=0.8) == []
+    assert counter.phase == VALLEY
+    assert counter.count == 1
+
+
+def test_below_min_amplitude_never_counts():
+    counter = raw_counter(min_amplitude=20)
+    assert feed(counter, [10, 25, 28, 12, 29, 10] * 5) == []
+    assert counter.phase == VALLEY
+    assert counter.count == 0
+    assert counter.rejected == 0
+
+
+def test_per_repetition_rom():
+    counter = raw_counter(min_amplitude=20)
+    reps = feed(counter, [10, 35, 90, 30, 20, 45, 60, 30, 20], dt=0.2)
+    
+    assert [rep['rom'] for rep in reps] == [80, 40]
+    assert [(rep['trough'], rep['peak']) for rep in reps] == [(10, 90), (20, 60)]
+    assert [rep['index'] for rep in reps] == [1, 2]
+    assert reps[0]['end_trough'] == 20
+    assert counter.get_state() == {'count': 2, 'phase': VALLEY, 'last_rep': counter.reps[-1]}
+
+
+# ----------------------------------------------------------------------
+# Rechazos
+# ----------------------------------------------------------------------
+
+def test_too_fast_repetition_is_rejected():
+    counter = raw_counter(min_amplitude=20, min_duration=0.4)
+    assert feed(counter, [10, 40, 90, 20]) == []   # 0.3 s
+    assert counter.count == 0
+    assert counter.rejected == 1
+
+
+def test_too_slow_repetition_is_rejected():
+    counter = raw_counter(min_amplitude=20, max_duration=1.0)
+    assert feed(counter, [10, 40, 60, 80, 90, 85, 20], dt=0.2) == []   # 1.2 s
+    assert counter.rejected == 1
+
+
+def test_gap_abandons_repetition_in_progress():
+    counter = raw_counter(min_amplitude=20, max_gap=1.0)
+    feed(counter, [10, 40, 90])
+    assert counter.phase == RISING
+    
+    # Sin mediciones 2 s: la vuelta al valle no cierra nada
+    assert counter.update(20, 2.2) is None
+    assert counter.phase == VALLEY
+    assert counter.count == 0
+    assert counter.rejected == 0
+
+
+def test_default_prefilter_ignores_single_frame_spike():
+    spike = [10] * 5 + [100] + [10] * 5
+    
+    filtered = RepetitionCounter(min_amplitude=20)
+    assert feed(filtered, spike) == []
+    assert filtered.rejected == 0
+    assert filtered.phase == VALLEY
+    
+    # Sin prefiltro el pico de un frame cuenta como repetición de 90°
+    unfiltered = raw_counter(min_amplitude=20)
+    assert [rep['rom'] for rep in feed(unfiltered, spike)] == [90]
+
+
+def test_reset_and_invalid_arguments():
+    counter = raw_counter(min_amplitude=20)
+    feed(counter, [10, 35, 90, 30], dt=0.2)
+    counter.reset()
+    assert counter.count == 0
+    assert counter.get_state() == {'count': 0, 'phase': VALLEY, 'last_rep': None}
+    
+    # Los tiempos de la nueva sesión son relativos a su primera muestra
+    rep = feed(counter, [10, 35, 90, 30], dt=0.2, start=50.0)[0]
+    assert rep['start'] == 0.0
+    
+    with pytest.raises(ValueError):
+        RepetitionCounter(min_amplitude=0)
+    with pytest.raises(ValueError):
+        RepetitionCounter(return_ratio=1.5)
+
+
+# ----------------------------------------------------------------------
+# Resumen para ROMSession
+# ----------------------------------------------------------------------
+
+def test_summarize_repetitions_across_channels():
+    left = raw_counter(channel='left', min_amplitude=20)
+    right = raw_counter(channel='right', min_amplitude=20)
+    feed(left, [10, 35, 90, 30, 20, 45, 60, 30, 20], dt=0.2)
+    feed(right, [15, 40, 65, 20], dt=0.2)
+    
+    summary = summarize_repetitions([left, right])
+    
+    # Ambos brazos a la vez = una repetición: el máximo entre canales
+    assert summary['repetitions'] == 2
+    assert summary['max_angle'] == 90
+    assert summary['min_angle'] == 10
+    assert summary['rom_value'] == 80
+    assert summary['median_rom'] == 50   # ROMs 40, 50, 80
+    assert summary['rejected'] == 0
+    assert sorted((rep['channel'], rep['rom']) for rep in summary['reps']) == [
+        ('left', 40), ('left', 80), ('right', 50)
+    ]
+    assert [rep['start'] for rep in summary['reps']] == sorted(rep['start'] for rep in summary['reps'])
+
+
+def test_summarize_without_repetitions():
+    counter = raw_counter()
+    feed(counter, [10, 40, 90, 20])   # Descartada por corta
+    
+    summary = summarize_repetitions([counter])
+    assert summary['repetitions'] == 0
+    assert summary['rejected'] == 1
+    assert summary['max_angle'] is None
+    assert summary['median_rom'] is None
+    assert summary['reps'] == []
+    assert summarize_repetitions([])['repetitions'] == 0
@@ -0,0 +1,184 @@
+"""
+Pruebas del grabador de sesión (app/streaming/session_recorder.py)
+
+Con frames sintéticos y reloj controlado (sin cámara):
+- offer() limita al FPS de grabación y nunca bloquea
+- Encoder atrasado: la cola descarta los frames más viejos
+- Segmentos de segment_seconds y manifest.json con las métricas
+- Registro por cámara (una grabación por cámara)
+
+Uso:
+    python -m pytest tests/test_session_recorder.py -q
+"""
+
+import json
+import threading
+import time as real_time
+
+import cv2
+import numpy as np
+import pytest
+
+from app.streaming import session_recorder as recorder_module
+from app.streaming.session_recorder import SessionRecorder, SessionRecorderRegistry
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(recorder_module)
+
+
+def frame(value, size=(48, 64)):
+    """Frame BGR uniforme; el valor identifica el frame"""
+    return np.full((size[0], size[1], 3), value, dtype=np.uint8)
+
+
+def offer_frames(recorder, clock, values, interval):
+    for value in values:
+        clock.now += interval
+        recorder.offer(frame(value))
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = real_time.time() + timeout
+    while real_time.time() < deadline:
+        if predicate():
+            return True
+        real_time.sleep(0.01)
+    return predicate()
+
+
+def count_video_frames(path):
+    capture = cv2.VideoCapture(str(path))
+    frames = 0
+    while capture.read()[0]:
+        frames += 1
+    capture.release()
+    return frames
+
+
+# ----------------------------------------------------------------------
+# Ritmo y descarte
+# ----------------------------------------------------------------------
+
+def test_offer_skips_frames_above_recording_fps(clock, tmp_path):
+    recorder = SessionRecorder(tmp_path / 'rec', fps=8).start()
+    
+    # Stream a 32 FPS, grabación a 8: se encola 1 de cada 4
+    # (intervalos exactos en binario para no depender del redondeo)
+    offer_frames(recorder, clock, range(40), interval=1 / 32)
+    summary = recorder.stop()
+    
+    # El primer frame no tiene ritmo previo: el segundo también entra
+    # (mismo criterio que al recuperarse de un atraso), luego 1 de cada 4
+    assert summary['frames_offered'] == 40
+    assert summary['frames_written'] == 2 + 36 // 4
+    assert summary['frames_skipped'] == 40 - summary['frames_written']
+    assert summary['frames_dropped'] == 0
+
+
+def test_offer_is_noop_when_not_recording(tmp_path):
+    recorder = SessionRecorder(tmp_path / 'rec')
+    assert not recorder.offer(frame(0))
+    assert recorder.frames_offered == 0
+    assert recorder.stop()['video_path'] is None
+    assert not (tmp_path / 'rec').exists()
+
+
+def test_slow_encoder_drops_oldest_frames(clock, tmp_path):
+    recorder = SessionRecorder(tmp_path / 'rec', fps=10, queue_size=3)
+    written, writing, release = [], threading.Event(), threading.Event()
+    
+    def slow_write(image):
+        written.append(int(image[0, 0, 0]))
+        writing.set()
+        assert release.wait(5)
+        SessionRecorder._write(recorder, image)
+    
+    recorder._write = slow_write
+    recorder.start()
+    
+    # El encoder queda bloqueado con el frame 0; llegan 9 más a una cola de 3
+    offer_frames(recorder, clock, [0], interval=0.1)
+    assert writing.wait(5)
+    offer_frames(recorder, clock, range(10, 100, 10), interval=0.1)
+    assert recorder.frames_dropped == 6
+    
+    # Dejar que el encoder vacíe la cola antes de detener
+    release.set()
+    assert wait_until(lambda: recorder.get_stats()['queued'] == 0)
+    summary = recorder.stop()
+    
+    # offer() nunca bloqueó y el encoder recibió los frames más recientes
+    assert written == [0, 70, 80, 90]
+    assert summary['frames_written'] == 4
+    assert summary['frames_dropped'] == 6
+
+
+# ----------------------------------------------------------------------
+# Segmentos y manifest
+# ----------------------------------------------------------------------
+
+def test_segments_roll_over_and_manifest_is_written(clock, tmp_path):
+    directory = tmp_path / 'rec'
+    recorder = SessionRecorder(directory, fps=10, segment_seconds=0.3, owner='1@camera0').start()
+    
+    offer_frames(recorder, clock, range(7), interval=0.1)
+    summary = recorder.stop()
+    
+    assert summary['segment_frames'] == 3
+    assert summary['segments'] == ['segment_000.mp4', 'segment_001.mp4', 'segment_002.mp4']
+    assert summary['video_path'] == str(directory)
+    assert summary['frames_written'] == 7
+    assert summary['error'] is None
+    assert [count_video_frames(directory / name) for name in summary['segments']] == [3, 3, 1]
+    
+    manifest = json.loads((directory / SessionRecorder.MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert manifest['segments'] == summary['segments']
+    assert manifest['frames_written'] == 7
+    assert manifest['owner'] == '1@camera0'
+    assert manifest['active'] is False
+
+
+def test_frames_are_resized_to_segment_size(clock, tmp_path):
+    directory = tmp_path / 'rec'
+    recorder = SessionRecorder(directory, fps=10).start()
+    
+    # La escala de salida del stream cambia a mitad del segmento
+    clock.now += 0.1
+    recorder.offer(frame(0, size=(48, 64)))
+    clock.now += 0.1
+    recorder.offer(frame(0, size=(24, 32)))
+    summary = recorder.stop()
+    
+    assert summary['frames_written'] == 2
+    capture = cv2.VideoCapture(str(directory / summary['segments'][0]))
+    assert (capture.get(cv2.CAP_PROP_FRAME_WIDTH), capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) == (64, 48)
+    capture.release()
+
+
+# ----------------------------------------------------------------------
+# Registro por cámara
+# ----------------------------------------------------------------------
+
+def test_registry_one_recording_per_camera(clock, tmp_path):
+    registry = SessionRecorderRegistry()
+    assert not registry.offer(0, frame(0))
+    assert registry.stop(0) is None
+    
+    first = registry.start(0, tmp_path / 'first', fps=10)
+    clock.now += 0.1
+    assert registry.offer(0, frame(0))
+    
+    # Iniciar otra grabación en la misma cámara cierra la anterior
+    second = registry.start(0, tmp_path / 'second', fps=10)
+    assert not first.is_active
+    assert first.get_stats()['frames_written'] == 1
+    assert registry.get(0) is second
+    
+    clock.now += 0.1
+    registry.offer(0, frame(0))
+    summary = registry.stop(0)
+    assert summary['video_path'] == str(tmp_path / 'second')
+    assert summary['frames_written'] == 1
+    assert registry.get(0) is None
@@ -0,0 +1,204 @@
+"""
+Pruebas de las estadísticas de sesión en streaming (app/core/session_stats.py)
+
+- RunningStats (Welford) contra np.mean / np.var(ddof=1)
+- P2Quantile contra np.percentile (exacto con < 5 muestras, aproximado después)
+- RangeBands: tiempo en cada banda y huecos
+- ChannelStats / summarize_session_stats
+
+Uso:
+    python -m pytest tests/test_session_stats.py -q
+"""
+
+import numpy as np
+import pytest
+
+from app.core.session_stats import (
+    ChannelStats, P2Quantile, RangeBands, RunningStats, summarize_session_stats
+)
+
+
+# ----------------------------------------------------------------------
+# Welford
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize('seed', range(5))
+def test_running_stats_match_numpy(seed):
+    # Desplazamiento grande: la fórmula ingenua (E[x²] - E[x]²) pierde precisión
+    values = 1e6 + np.random.default_rng(seed).normal(90, 15, size=5000)
+    
+    running = RunningStats()
+    for value in values:
+        running.add(float(value))
+    
+    assert running.count == len(values)
+    assert running.min == values.min()
+    assert running.max == values.max()
+    assert running.mean == pytest.approx(np.mean(values), rel=1e-12)
+    assert running.variance == pytest.approx(np.var(values, ddof=1), rel=1e-9)
+    assert running.std == pytest.approx(np.std(values, ddof=1), rel=1e-9)
+
+
+def test_running_stats_few_samples():
+    running = RunningStats()
+    assert running.variance == 0.0
+    
+    running.add(5.0)
+    assert (running.min, running.max, running.mean, running.variance) == (5.0, 5.0, 5.0, 0.0)
+    
+    # Un valor menor que el primero también actualiza el mínimo
+    running.add(3.0)
+    running.add(9.0)
+    assert (running.min, running.max) == (3.0, 9.0)
+    assert running.variance == pytest.approx(np.var([5, 3, 9], ddof=1))
+    
+    running.reset()
+    assert running.count == 0
+    assert running.min is None
+
+
+# ----------------------------------------------------------------------
+# P²
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize('percentile', [5, 50, 95])
+def test_p2_exact_below_five_samples(percentile):
+    values = [40.0, 10.0, 30.0, 20.0]
+    quantile = P2Quantile(percentile)
+    assert quantile.value is None
+    
+    for count, value in enumerate(values, start=1):
+        quantile.add(value)
+        assert quantile.value == pytest.approx(np.percentile(values[:count], percentile))
+
+
+@pytest.mark.parametrize('percentile', [5, 25, 50, 75, 95])
+@pytest.mark.parametrize('series', ['normal', 'uniform', 'sine'])
+def test_p2_close_to_np_percentile(percentile, series):
+    rng = np.random.default_rng(0)
+    if series == 'normal':
+        values = rng.normal(90, 15, size=5000)
+    elif series == 'uniform':
+        values = rng.uniform(0, 180, size=5000)
+    else:
+        # Ángulo de repeticiones: 10°-150° con ruido
+        values = 80 - 70 * np.cos(np.linspace(0, 40 * np.pi, 5000)) + rng.normal(0, 2, size=5000)
+    
+    quantile = P2Quantile(percentile)
+    for value in values:
+        quantile.add(float(value))
+    
+    # Error menor al 1% del rango de la señal
+    spread = values.max() - values.min()
+    assert abs(quantile.value - np.percentile(values, percentile)) < 0.01 * spread
+
+
+@pytest.mark.parametrize('percentile', [0, 100, -5])
+def test_p2_rejects_invalid_percentile(percentile):
+    with pytest.raises(ValueError):
+        P2Quantile(percentile)
+
+
+# ----------------------------------------------------------------------
+# Tiempo en banda
+# ----------------------------------------------------------------------
+
+def test_range_bands_time_in_band():
+    bands = RangeBands(edges=(30, 60), max_gap=1.0)
+    assert bands.labels == ['<30', '30-60', '>=60']
+    
+    # El tiempo hasta la muestra siguiente se asigna a la banda de la anterior
+    for value, timestamp in [(10, 0.0), (20, 0.5), (45, 1.0), (60, 1.5), (70, 3.0), (5, 3.5)]:
+        bands.add(value, timestamp)
+    
+    # 1.5 → 3.0 supera max_gap y no cuenta
+    assert bands.seconds == [1.0, 0.5, 0.5]
+    described = bands.describe()
+    assert [band['range'] for band in described] == bands.labels
+    assert [band['fraction'] for band in described] == [0.5, 0.25, 0.25]
+
+
+def test_range_bands_without_edges_and_invalid_edges():
+    bands = RangeBands(edges=())
+    bands.add(10, 0.0)
+    bands.add(170, 0.5)
+    assert bands.describe() == [{'range': 'all', 'seconds': 0.5, 'fraction': 1.0}]
+    
+    with pytest.raises(ValueError):
+        RangeBands(edges=(60, 30))
+
+
+# ----------------------------------------------------------------------
+# Canal y resumen para ROMSession
+# ----------------------------------------------------------------------
+
+def test_channel_summary():
+    stats = ChannelStats('left', bands=(90,))
+    values = [10.0, 20.0, 100.0, 110.0]
+    for index, value in enumerate(values):
+        stats.update(value, index * 0.5, valid=index != 0)
+    
+    summary = stats.summary()
+    assert summary['channel'] == 'left'
+    assert summary['samples'] == 4
+    assert (summary['min'], summary['max'], summary['mean']) == (10.0, 110.0, 60.0)
+    assert summary['std'] == round(np.std(values, ddof=1), 2)
+    assert summary['p5'] == round(np.percentile(values, 5), 2)
+    assert summary['p95'] == round(np.percentile(values, 95), 2)
+    assert summary['robust_rom'] == round(summary['p95'] - summary['p5'], 2)
+    assert summary['quality_score'] == 75.0
+    assert [band['seconds'] for band in summary['bands']] == [1.0, 0.5]
+    
+    stats.reset()
+    empty = stats.summary()
+    assert empty['samples'] == 0
+    assert empty['mean'] is None and empty['robust_rom'] is None and empty['quality_score'] is None
+
+
+def test_channel_live_summary_is_small_and_stable():
+    stats = ChannelStats('angle')
+    assert stats.live_summary() == {'p5': None, 'p95': None, 'robust_rom': None, 'quality_score': None}
+    
+    for index in range(600):
+        stats.update(30.0 + (index % 100), index / 30, valid=index % 4 != 0)
+    live = stats.live_summary()
+    assert set(live) == {'p5', 'p95', 'robust_rom', 'quality_score'}
+    assert all(isinstance(value, int) for value in live.values())
+    assert live['quality_score'] == 75
+    
+    # Una muestra más en el mismo rango no cambia lo que se emite en vivo
+    stats.update(80.0, 20.0)
+    assert stats.live_summary() == live
+
+
+def test_channel_rejects_inverted_percentiles():
+    with pytest.raises(ValueError):
+        ChannelStats(low_percentile=95, high_percentile=5)
+
+
+def test_summarize_reports_channel_with_largest_robust_rom():
+    rng = np.random.default_rng(1)
+    left, right = ChannelStats('left'), ChannelStats('right')
+    for index in range(1000):
+        timestamp = index / 30
+        left.update(float(rng.uniform(20, 60)), timestamp, valid=True)
+        right.update(float(rng.uniform(10, 150)), timestamp, valid=index % 2 == 0)
+    
+    # Un pico espurio de un frame no define el ROM
+    right.update(179.0, 1000 / 30)
+    
+    result = summarize_session_stats([left, right])
+    assert result['max_angle'] == round(right.high.value, 2)
+    assert result['min_angle'] == round(right.low.value, 2)
+    assert result['max_angle'] < 150
+    assert result['rom_value'] == pytest.approx(result['max_angle'] - result['min_angle'], abs=0.01)
+    assert result['quality_score'] == round(100.0 * 1500 / 2001, 1)
+    assert set(result['channels']) == {'left', 'right'}
+
+
+def test_summarize_without_samples():
+    result = summarize_session_stats([ChannelStats('angle')])
+    assert result['max_angle'] is None
+    assert result['rom_value'] is None
+    assert result['quality_score'] is None
+    assert result['channels']['angle']['samples'] == 0